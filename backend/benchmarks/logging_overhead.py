@@ -0,0 +1,205 @@
+"""
+Per-request logging overhead on the NPC turn path: the old print() lines versus the structured queued logger.
+Replays one ElevenLabs STT + LLM + TTS turn's log calls against a real file and reports the time on the calling
+thread and the end-to-end time including the listener writing every record. The log queue is sized for the run;
+a scenario that drops records is reported as invalid instead of timed.
+
+Usage (from backend/): python benchmarks/logging_overhead.py [--requests 2000]
+"""
+
+import os
+import sys
+import time
+import types
+import logging
+import argparse
+import datetime
+import tempfile
+import importlib.util
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Upper bound on structured records per simulated turn (DEBUG enables every call in structured_request)
+MAX_RECORDS_PER_REQUEST = 32
+
+
+def _load_logging_modules():
+    """Load services.log_queue and services.structured_logging without services/__init__ (which imports every vendor SDK)."""
+    package = types.ModuleType("services")
+    package.__path__ = [os.path.join(BACKEND_DIR, "services")]
+    sys.modules.setdefault("services", package)
+    modules = []
+    for name in ("log_queue", "structured_logging"):
+        spec = importlib.util.spec_from_file_location(f"services.{name}", os.path.join(BACKEND_DIR, "services", f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[spec.name] = module
+        spec.loader.exec_module(module)
+        modules.append(module)
+    return modules
+
+
+class _Word:
+    def __init__(self, text, start, end, logprob):
+        self.text, self.start, self.end, self.logprob, self.type, self.speaker_id = text, start, end, logprob, "word", None
+
+
+class _Transcription:
+    def __init__(self, words):
+        self.text = "".join(word.text for word in words)
+        self.words = words
+        self.language_code, self.language_probability = "tha", 0.98
+
+
+WORDS = [_Word(text, i * 0.3, i * 0.3 + 0.25, -0.05) for i, text in enumerate(["สวัสดี", "ครับ", "ขอ", "ข้าว", "ผัด", "หนึ่ง", "จาน", "ครับ"])]
+TRANSCRIPTION = _Transcription(WORDS)
+LLM_INPUT = "Current charm level: 50\nItems given: []\nConversation (last 2 turns):\n" + "Player: สวัสดีครับ ขอข้าวผัดหนึ่งจานครับ\nNPC: ได้เลยค่ะ\n" * 12
+HELICONE_HEADERS = {"Helicone-User-Id": "user-123", "Helicone-Session-Id": "session-456", "Helicone-Property-Voice": "Aoede", "Helicone-Property-TextLength": "84"}
+
+
+def legacy_request(out):
+    """The print() calls one turn used to make (ElevenLabs STT, LLM, TTS and the endpoint itself)."""
+    def emit(line):
+        print(line, file=out, flush=True)  # Container stdout is unbuffered (PYTHONUNBUFFERED)
+
+    emit(f"[{datetime.datetime.now()}] INFO: /generate-npc-response/ received request for NPC: amara, Name: Amara, Charm: 50, Language: th. Custom message: False, Action: , Stream: False")
+    emit(f"[{datetime.datetime.now()}] INFO: Device detected - Platform: ios, Type: phone, Mobile: True")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs full response object type: {type(TRANSCRIPTION)}")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs response attributes: {dir(TRANSCRIPTION)}")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs transcribed text: '{TRANSCRIPTION.text}'")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs has 'words' attribute: {bool(TRANSCRIPTION.words)}")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs words count: {len(TRANSCRIPTION.words)}")
+    emit(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs first word structure: {dir(TRANSCRIPTION.words[0])}")
+    emit(f"[{datetime.datetime.now()}] INFO: Processing {len(TRANSCRIPTION.words)} words from ElevenLabs")
+    for i, word in enumerate(TRANSCRIPTION.words):
+        emit(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} attributes: {dir(word)}")
+        emit(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} text: '{word.text}'")
+        emit(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} timing: start={word.start}, end={word.end}, confidence={0.95:.3f}")
+    emit(f"[{datetime.datetime.now()}] AUDIO FORMAT: ElevenLabs Scribe")
+    for line in ("  - Duration: 2.400s", "  - Sample Rate: 16000Hz (Optimal: 16000Hz)", "  - Channels: 1 (Mono)",
+                 "  - Sample Width: 2 bytes (16-bit)", "  - Total Frames: 38400", "  - File Size: 76844 bytes"):
+        emit(line)
+    emit(f"[{datetime.datetime.now()}] ✓ Audio format is optimal for ElevenLabs Scribe")
+    emit(f"[{datetime.datetime.now()}] INFO: ElevenLabs STT successful. Transcription: '{TRANSCRIPTION.text}'")
+    emit(f"[{datetime.datetime.now()}] PERFORMANCE: ElevenLabs processing time: {0.812:.3f}s, audio duration: {2.4:.3f}s, RTF: {0.338:.3f}")
+    emit(f"[{datetime.datetime.now()}] PERFORMANCE: ElevenLabs overall confidence: {0.95:.3f}, word count: {len(WORDS)}")
+    emit(f"[{datetime.datetime.now()}] INFO: Standard STT for amara successful. Transcription: '{TRANSCRIPTION.text}'")
+    for line in ("  Categories needed: ['food', 'drink']", "  Categories satisfied: []", "  Current category needed: food",
+                 "  Next category needed: drink", "  Quest complete: False", "  Items given: []", "  Categories accepted: {}"):
+        emit(line)
+    emit("🤖 Calling LLM for Amara...")
+    emit(f"📝 LLM Input: {LLM_INPUT}")
+    emit("🚀 Calling OpenAI LLM with Helicone tracking - User: user-123, Session: session-456, NPC: Amara")
+    emit("📊 Helicone properties: CharmLevel=50, GameMode=npc_chat")
+    emit("✅ Helicone: OpenAI LLM call completed - NPC: Amara, Model: gpt-4.1-mini-2025-04-14")
+    emit("📝 Response received: 84 chars, Emotion: happy")
+    emit("✅ LLM Response completed for Amara: charm_delta=5, item_accepted=False")
+    emit(f"[{datetime.datetime.now()}] INFO: LLM response for amara OK. Target: 'ได้เลยค่ะ ข้าวผัดหนึ่งจาน...', Tone: 'cheerful'")
+    emit(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Helicone-enabled Gemini client acquired for full synthesis")
+    emit(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Starting synthesis. Text length: 84, Estimated cost: ${0.000840:.6f}")
+    emit(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Helicone headers: {HELICONE_HEADERS}")
+    emit(f"[{datetime.datetime.now()}] ✅ PostHog: TTS call tracked - success: True, text_length: 84, voice: Aoede")
+    emit(f"[{datetime.datetime.now()}] ✅ TTS Full - Synthesis completed successfully. Duration: 1432ms, PCM size: 201600 bytes")
+    emit(f"[{datetime.datetime.now()}] ✅ Helicone: TTS call completed via Gateway - user: user-123, cost: ${0.000840:.6f}, voice: Aoede")
+    emit(f"[{datetime.datetime.now()}] INFO: TTS for amara using voice 'Aoede' OK. Audio bytes: 201644 (wav)")
+    emit(f"[{datetime.datetime.now()}] 📊 Request completed - Total: 3.42s, STT: 0.81s, LLM: 1.10s, TTS: 1.43s")
+    emit(f"[{datetime.datetime.now()}] INFO: Sending NPC response for amara. Header JSON (first 60 chars of b64): eyJyZXNwb25zZV90YXJnZXQiOiAiXHUwZTQ0XHUwZTk3XHUwZTQwXHUwZTI1...")
+
+
+def structured_request(stt_log, llm_log, tts_log, npc_log, bind_request_id, request_number):
+    """The same turn through the structured loggers (call sites as in main.py and the services)."""
+    bind_request_id(f"npc_amara_{request_number}")
+    npc_log.info("/generate-npc-response/ received request", npc_id="amara", npc_name="Amara", charm=50,
+                 language="th", custom_message=False, action="", stream=False)
+    npc_log.debug("Device detected", platform="ios", device_type="phone", mobile=True)
+    stt_log.debug("ElevenLabs response", response_type=type(TRANSCRIPTION).__name__, text=TRANSCRIPTION.text,
+                  words=len(TRANSCRIPTION.words))
+    stt_log.debug("Audio format for ElevenLabs Scribe", duration_s=2.4, sample_rate=16000, channels=1,
+                  sample_width=2, frames=38400, size_bytes=76844)
+    stt_log.info("ElevenLabs STT successful", processing_s=0.812, audio_s=2.4, rtf=0.338, confidence=0.95, words=len(WORDS))
+    stt_log.debug("ElevenLabs STT transcription: %r", TRANSCRIPTION.text)
+    npc_log.debug("Standard STT transcription: %r", TRANSCRIPTION.text, npc_id="amara")
+    llm_log.debug("Quest state", npc_id="amara", categories_needed=["food", "drink"], categories_satisfied=[],
+                  current_category_needed="food", next_category_needed="drink", complete=False, items_given=[],
+                  categories_accepted={})
+    llm_log.debug("📝 LLM input: %s", LLM_INPUT, npc="Amara")
+    llm_log.info("🚀 Calling OpenAI LLM via Helicone", npc="Amara", model="gpt-4.1-mini-2025-04-14", user_id="user-123",
+                 session_id="session-456", charm_level=50)
+    llm_log.debug("📝 LLM response received", npc="Amara", chars=84, emotion="happy")
+    llm_log.info("✅ LLM response completed", npc="Amara", charm_delta=5, item_accepted=False)
+    npc_log.debug("LLM response target: %r", "ได้เลยค่ะ ข้าวผัดหนึ่งจาน", npc_id="amara", tone="cheerful")
+    tts_log.debug("TTS Full - Starting synthesis", text_length=84, voice="Aoede", estimated_cost_usd=0.00084,
+                  helicone_headers=sorted(HELICONE_HEADERS))
+    tts_log.info("✅ TTS Full - Synthesis completed", duration_ms=1432, pcm_bytes=201600, voice="Aoede", estimated_cost_usd=0.00084)
+    npc_log.info("📊 Request completed", npc_id="amara", audio_bytes=201644, audio_format="wav",
+                 stt_s=0.812, llm_s=1.1, tts_s=1.432, total_s=3.42)
+    npc_log.debug("Sending NPC response with header data", npc_id="amara", header_bytes=1184)
+
+
+def _time_per_request(fn, requests: int) -> float:
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(i)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def _time_structured(fn, requests: int, log_queue):
+    """(calling-thread µs/request, end-to-end µs/request, records dropped) for one scenario."""
+    log_queue.start_log_queue()
+    dropped_before = log_queue.get_log_queue_stats()["dropped"]
+    start = time.perf_counter()
+    for i in range(requests):
+        fn(i)
+    caller_elapsed = time.perf_counter() - start
+    log_queue.stop_log_queue()  # Blocks until the listener has written every queued record
+    total_elapsed = time.perf_counter() - start
+    dropped = log_queue.get_log_queue_stats()["dropped"] - dropped_before
+    return caller_elapsed / requests * 1e6, total_elapsed / requests * 1e6, dropped
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000, help="Simulated NPC turns per scenario")
+    args = parser.parse_args()
+
+    # Read by log_queue at import: every record of the run must fit, or the timings measure dropped puts
+    os.environ["LOG_QUEUE_SIZE"] = str(args.requests * MAX_RECORDS_PER_REQUEST)
+
+    log_dir = tempfile.mkdtemp(prefix="babblelon_log_bench_")
+    root = logging.getLogger()
+    root.setLevel(logging.INFO)
+    file_handler = logging.FileHandler(os.path.join(log_dir, "structured.log"), encoding="utf-8")
+    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    root.handlers = [file_handler]
+
+    log_queue, structured_logging = _load_logging_modules()
+    stt_log = structured_logging.get_logger("services.stt_service")
+    llm_log = structured_logging.get_logger("services.llm_service")
+    tts_log = structured_logging.get_logger("services.tts_service")
+    npc_log = structured_logging.get_logger("main.npc_response")
+
+    def structured(i):
+        structured_request(stt_log, llm_log, tts_log, npc_log, structured_logging.bind_request_id, i)
+
+    log_queue.stop_log_queue()  # get_logger started the listener; each scenario starts its own
+
+    with open(os.path.join(log_dir, "legacy.log"), "w", encoding="utf-8") as out:
+        legacy_us = _time_per_request(lambda i: legacy_request(out), args.requests)
+
+    print(f"Per-request logging overhead ({args.requests} simulated NPC turns, queue size {os.environ['LOG_QUEUE_SIZE']}):")
+    print(f"  {'print() (before)':<28} {legacy_us:9.1f} µs/request on the calling thread (synchronous, so also end-to-end)")
+    invalid = False
+    for label, level in (("structured, INFO (after)", logging.INFO), ("structured, DEBUG", logging.DEBUG)):
+        root.setLevel(level)
+        caller_us, total_us, dropped = _time_structured(structured, args.requests, log_queue)
+        if dropped:
+            invalid = True
+            print(f"  {label:<28} INVALID: {dropped} records dropped by the log queue")
+            continue
+        print(f"  {label:<28} {caller_us:9.1f} µs/request on the calling thread ({caller_us / legacy_us * 100:5.1f}% of before), "
+              f"{total_us:.1f} µs/request end-to-end")
+    print(f"  logs in {log_dir}")
+    if invalid:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -14,13 +14,31 @@ import tempfile
 import mimetypes
 import struct
 import wave
+import shutil
+import hashlib
+import threading
 from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from dotenv import load_dotenv
 from google import genai
 from google.genai import types
 from tqdm import tqdm
 
+# Worker threads per stage. Each stage calls a different API, so the limits are independent.
+AUDIO_WORKERS = int(os.getenv("VOCAB_AUDIO_WORKERS", "4"))                      # Gemini TTS
+AZURE_WORKERS = int(os.getenv("VOCAB_AZURE_WORKERS", "4"))                      # Azure pronunciation assessment
+TRANSLITERATION_WORKERS = int(os.getenv("VOCAB_TRANSLITERATION_WORKERS", "2"))  # Gemini text, 50 words per call
+TRANSLITERATION_BATCH_SIZE = 50
+
+TTS_MODEL_NAME = "gemini-2.5-flash-preview-tts"
+TEXT_MODEL_NAME = "gemini-2.5-flash"
+TTS_VOICE_NAME = "Aoede"
+
+# Searched in order; files found in backend/assets/audio are migrated to assets/audio
+AUDIO_SEARCH_DIRS = ("assets/audio", "backend/assets/audio")
+MANIFEST_VERSION = 1
+
 
 def save_binary_file(file_name: str, data: bytes) -> None:
     """Save binary data to a file."""
@@ -63,9 +81,10 @@ def is_valid_wav_file(file_path: str) -> bool:
         return False
 
 
-def check_audio_paths_exist(data: dict, project_root: str) -> tuple[int, int]:
+def check_audio_paths_exist(data: dict, project_root: str, unchanged: frozenset = frozenset()) -> tuple[int, int]:
     """
     Check how many vocabulary entries have valid audio_path fields.
+    Entries whose manifest key is in `unchanged` are counted as valid without touching the disk.
     Returns (valid_count, total_count).
     """
     valid_count = 0
@@ -74,6 +93,9 @@ def check_audio_paths_exist(data: dict, project_root: str) -> tuple[int, int]:
     print("\n--- Checking audio_path fields ---")
     for i, entry in enumerate(data['vocabulary']):
         english_phrase = entry['english']
+        if english_phrase in unchanged:
+            valid_count += 1
+            continue
         audio_path = entry.get('audio_path')
         
         if not audio_path:
@@ -167,20 +189,77 @@ def parse_audio_mime_type(mime_type: str) -> dict[str, int]:
     return {"bits_per_sample": bits_per_sample, "rate": rate}
 
 
-def retry_with_backoff(api_func, *args, max_retries=5, min_wait=2, max_wait=30, **kwargs):
+class RateLimitGate:
+    """
+    Shared cool-down for one API. When any worker hits a rate limit, every worker using the gate
+    pauses until the cool-down ends instead of each one hammering the API on its own schedule.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self._resume_at = 0.0
+        self.hits = 0
+
+    def wait(self) -> None:
+        """Block until the current cool-down (if any) has passed."""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def block(self, seconds: float) -> None:
+        """Start (or extend) a cool-down of the given length."""
+        with self._lock:
+            self.hits += 1
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+
+
+GEMINI_RATE_LIMIT = RateLimitGate("Gemini")
+AZURE_RATE_LIMIT = RateLimitGate("Azure Speech")
+
+
+def is_rate_limit_error(err_str: str) -> bool:
+    """True if an error message looks like a 429 / quota / throttling response."""
+    lowered = err_str.lower()
+    return '429' in err_str or 'resource_exhausted' in lowered or 'too many requests' in lowered or 'throttl' in lowered
+
+
+def parse_retry_after(err_str: str) -> float | None:
+    """
+    Server-suggested wait in seconds, if the error carries one
+    (Gemini: "'retryDelay': '27s'", HTTP style: "Retry-After: 30").
+    """
+    match = re.search(r"retry[-_ ]?(?:after|delay)\D{0,5}(\d+(?:\.\d+)?)", err_str, re.IGNORECASE)
+    return float(match.group(1)) if match else None
+
+
+def retry_with_backoff(api_func, *args, max_retries=5, min_wait=2, max_wait=30, rate_limit_gate: RateLimitGate | None = None, **kwargs):
     """
     Retry an API function with exponential backoff on 429/Resource_exhausted errors.
+    A retry delay suggested by the server takes precedence over the backoff when it is longer.
+    With a rate_limit_gate, the wait is shared by every worker calling the same API.
     """
     attempt = 0
     while attempt < max_retries:
+        if rate_limit_gate:
+            rate_limit_gate.wait()
         try:
             return api_func(*args, **kwargs)
         except Exception as e:
             err_str = str(e)
-            if '429' in err_str or 'RESOURCE_EXHAUSTED' in err_str or 'Resource_exhausted' in err_str:
+            if is_rate_limit_error(err_str):
                 wait_time = min(max_wait, min_wait * (2 ** attempt) + random.uniform(0, 1))
+                retry_after = parse_retry_after(err_str)
+                if retry_after is not None and retry_after > wait_time:
+                    wait_time = retry_after + random.uniform(0, 1)
                 tqdm.write(f"  - Rate limit hit (429/Resource_exhausted). Sleeping for {wait_time:.1f}s and retrying...")
-                time.sleep(wait_time)
+                if rate_limit_gate:
+                    rate_limit_gate.block(wait_time)  # Waited out at the top of the next attempt
+                else:
+                    time.sleep(wait_time)
                 attempt += 1
             else:
                 raise
@@ -292,7 +371,7 @@ Expected Output Format:
         return json.loads(cleaned_response)
     
     try:
-        result = retry_with_backoff(api_call)
+        result = retry_with_backoff(api_call, rate_limit_gate=GEMINI_RATE_LIMIT)
         if result and 'azure_pron_mapping' in result:
             # Convert list to dictionary for easy lookup
             word_dict = {}
@@ -313,7 +392,8 @@ Expected Output Format:
         return {}
 
 
-def generate_audio_file(client, model_name, text: str, file_path: str, english_phrase: str) -> tuple[str | None, bool]:
+def generate_audio_file(client, model_name, text: str, file_path: str, english_phrase: str,
+                        voice_name: str = TTS_VOICE_NAME) -> tuple[str | None, bool]:
     """
     Generates an audio file from text using Gemini TTS.
     Follows the same structure as the test notebook.
@@ -330,7 +410,7 @@ def generate_audio_file(client, model_name, text: str, file_path: str, english_p
                 speech_config=types.SpeechConfig(
                     voice_config=types.VoiceConfig(
                         prebuilt_voice_config=types.PrebuiltVoiceConfig(
-                            voice_name='Aoede',
+                            voice_name=voice_name,
                         )
                     )
                 ),
@@ -365,63 +445,82 @@ def generate_audio_file(client, model_name, text: str, file_path: str, english_p
                 os.remove(file_path)
             return None, False
 
-    return retry_with_backoff(api_call)
+    return retry_with_backoff(api_call, rate_limit_gate=GEMINI_RATE_LIMIT)
+
+
+def build_audio_index(project_root: str) -> dict[str, list[tuple[str, str]]]:
+    """
+    Scan the audio directories once.
+    Returns filename -> [(search dir, subdir)], with assets/audio matches before backend/assets/audio ones.
+    """
+    audio_index = defaultdict(list)
+    for search_dir in AUDIO_SEARCH_DIRS:
+        base_dir = os.path.join(project_root, search_dir)
+        if not os.path.isdir(base_dir):
+            continue
+        for subdir in sorted(os.scandir(base_dir), key=lambda d: d.name):
+            if not subdir.is_dir():
+                continue
+            for audio_file in os.scandir(subdir.path):
+                if audio_file.is_file():
+                    audio_index[audio_file.name].append((search_dir, subdir.name))
+    return audio_index
 
 
-def check_existing_audio_files(project_root: str, thai_phrase: str, english_phrase: str) -> str | None:
+def check_existing_audio_files(project_root: str, thai_phrase: str, english_phrase: str,
+                               audio_index: dict[str, list[tuple[str, str]]] | None = None) -> str | None:
     """
     Check if audio already exists for this Thai phrase in any audio directory.
     Also checks for files in backend/assets/audio and migrates them if found.
+    Pass an index from build_audio_index() to avoid rescanning the directories for every entry.
     Returns the relative path to the existing audio file if found, None otherwise.
     """
     # Generate the expected filename for this entry
     sanitized_filename = sanitize_filename(english_phrase) + ".wav"
+    if audio_index is None:
+        audio_index = build_audio_index(project_root)
+    candidates = audio_index.get(sanitized_filename, [])
     
     # First check the correct location: project_root/assets/audio
     audio_base_dir = os.path.join(project_root, 'assets/audio')
-    if os.path.exists(audio_base_dir):
-        for subdir in os.listdir(audio_base_dir):
-            subdir_path = os.path.join(audio_base_dir, subdir)
-            if os.path.isdir(subdir_path):
-                potential_file = os.path.join(subdir_path, sanitized_filename)
-                if os.path.exists(potential_file):
-                    # Validate it's a proper WAV file
-                    if is_valid_wav_file(potential_file):
-                        relative_path = os.path.relpath(potential_file, project_root).replace(os.sep, '/')
-                        tqdm.write(f"  - Found existing audio: '{english_phrase}' -> '{relative_path}'")
-                        return relative_path
-                    else:
-                        tqdm.write(f"  - Found invalid audio file: '{potential_file}' (will be skipped)")
+    for search_dir, subdir in candidates:
+        if search_dir != 'assets/audio':
+            continue
+        potential_file = os.path.join(audio_base_dir, subdir, sanitized_filename)
+        # Validate it's a proper WAV file
+        if is_valid_wav_file(potential_file):
+            relative_path = os.path.relpath(potential_file, project_root).replace(os.sep, '/')
+            tqdm.write(f"  - Found existing audio: '{english_phrase}' -> '{relative_path}'")
+            return relative_path
+        else:
+            tqdm.write(f"  - Found invalid audio file: '{potential_file}' (will be skipped)")
     
     # Also check for files in the wrong location (backend/assets/audio) and migrate them
     backend_audio_base_dir = os.path.join(project_root, 'backend/assets/audio')
-    if os.path.exists(backend_audio_base_dir):
-        for subdir in os.listdir(backend_audio_base_dir):
-            subdir_path = os.path.join(backend_audio_base_dir, subdir)
-            if os.path.isdir(subdir_path):
-                potential_file = os.path.join(subdir_path, sanitized_filename)
-                if os.path.exists(potential_file):
-                    # Validate it's a proper WAV file
-                    if is_valid_wav_file(potential_file):
-                        # Migrate the file to the correct location
-                        correct_subdir = os.path.join(audio_base_dir, subdir)
-                        os.makedirs(correct_subdir, exist_ok=True)
-                        correct_file_path = os.path.join(correct_subdir, sanitized_filename)
-                        
-                        try:
-                            # Copy the file to the correct location
-                            import shutil
-                            shutil.copy2(potential_file, correct_file_path)
-                            tqdm.write(f"  - Migrated audio file from '{potential_file}' to '{correct_file_path}'")
-                            
-                            # Return the relative path from project root
-                            relative_path = os.path.relpath(correct_file_path, project_root).replace(os.sep, '/')
-                            tqdm.write(f"  - Using migrated audio: '{english_phrase}' -> '{relative_path}'")
-                            return relative_path
-                        except Exception as e:
-                            tqdm.write(f"  - Error migrating file '{potential_file}': {e}")
-                    else:
-                        tqdm.write(f"  - Found invalid audio file in backend: '{potential_file}' (will be skipped)")
+    for search_dir, subdir in candidates:
+        if search_dir != 'backend/assets/audio':
+            continue
+        potential_file = os.path.join(backend_audio_base_dir, subdir, sanitized_filename)
+        # Validate it's a proper WAV file
+        if is_valid_wav_file(potential_file):
+            # Migrate the file to the correct location
+            correct_subdir = os.path.join(audio_base_dir, subdir)
+            os.makedirs(correct_subdir, exist_ok=True)
+            correct_file_path = os.path.join(correct_subdir, sanitized_filename)
+            
+            try:
+                # Copy the file to the correct location
+                shutil.copy2(potential_file, correct_file_path)
+                tqdm.write(f"  - Migrated audio file from '{potential_file}' to '{correct_file_path}'")
+                
+                # Return the relative path from project root
+                relative_path = os.path.relpath(correct_file_path, project_root).replace(os.sep, '/')
+                tqdm.write(f"  - Using migrated audio: '{english_phrase}' -> '{relative_path}'")
+                return relative_path
+            except Exception as e:
+                tqdm.write(f"  - Error migrating file '{potential_file}': {e}")
+        else:
+            tqdm.write(f"  - Found invalid audio file in backend: '{potential_file}' (will be skipped)")
     
     return None
 
@@ -455,6 +554,7 @@ def get_azure_tokens_from_audio(audio_file_path: str, speech_key: str, speech_re
     tqdm.write(f"    - Azure Speech config: language=th-TH, region={speech_region}")
 
     temp_wav_path = None
+    throttled_details = None
     try:
         # Check and potentially resample audio
         tqdm.write(f"    - Loading audio file...")
@@ -528,6 +628,8 @@ def get_azure_tokens_from_audio(audio_file_path: str, speech_key: str, speech_re
             # Check if error code attribute exists before accessing it
             if hasattr(cancellation_details, 'code') and cancellation_details.code:
                 tqdm.write(f"    - Error code: {cancellation_details.code}")
+            if is_rate_limit_error(str(cancellation_details.error_details)):
+                throttled_details = cancellation_details.error_details
     except Exception as e:
         tqdm.write(f"    - ERROR during Azure Speech pronunciation assessment for {audio_file_path}: {str(e)}")
         tqdm.write(f"    - Exception type: {type(e).__name__}")
@@ -536,12 +638,183 @@ def get_azure_tokens_from_audio(audio_file_path: str, speech_key: str, speech_re
         if temp_wav_path and os.path.exists(temp_wav_path):
             tqdm.write(f"    - Cleaning up temporary file: {temp_wav_path}")
             os.unlink(temp_wav_path)
+
+    # Raised (not swallowed) so retry_with_backoff can back off and try again
+    if throttled_details:
+        raise RuntimeError(f"Azure Speech throttled (429): {throttled_details}")
     
     tqdm.write(f"    - Azure Speech: Returning empty tokens for '{english_phrase}'")
     return []
 
 
-def process_vocabulary(vocab_file_path: str):
+def write_json_atomic(file_path: str, data: dict) -> None:
+    """
+    Write JSON to a temp file next to file_path and rename it into place,
+    so an interrupted run never leaves a truncated vocabulary file.
+    """
+    directory = os.path.dirname(os.path.abspath(file_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=4)
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(file_path):
+            shutil.copymode(file_path, temp_path)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+
+class ProcessingJournal:
+    """
+    Append-only sidecar journal (<vocab>.journal.jsonl) with one line per finished work item.
+    The vocabulary file is only written at the end of a stage, so after an interruption the
+    journal is what lets the next run skip work that already succeeded.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = defaultdict(dict)  # stage -> key -> result
+        needs_newline = False
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    needs_newline = not line.endswith("\n")
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # Torn final line from a crash mid-write
+                    self.records[record['stage']][record['key']] = record['result']
+        self._file = open(path, 'a', encoding='utf-8')
+        if needs_newline:
+            self._file.write("\n")
+
+    def get(self, stage: str, key: str):
+        return self.records[stage].get(key)
+
+    def get_stage(self, stage: str) -> dict:
+        return dict(self.records[stage])
+
+    def record(self, stage: str, key: str, result) -> None:
+        self.record_many(stage, {key: result})
+
+    def record_many(self, stage: str, results: dict) -> None:
+        """Append results and fsync once. Only called from the main thread."""
+        for key, result in results.items():
+            self.records[stage][key] = result
+            self._file.write(json.dumps({"stage": stage, "key": key, "result": result}, ensure_ascii=False) + "\n")
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self, remove: bool = False) -> None:
+        self._file.close()
+        if remove and os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def run_stage(items: list, worker, max_workers: int, desc: str):
+    """
+    Run worker(item) for every item on a bounded thread pool.
+    Yields (item, result, error) in completion order, on the calling thread, so callers
+    can update shared state and the journal without locks.
+    """
+    if not items:
+        return
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix=desc.replace(" ", "_"))
+    try:
+        futures = {executor.submit(worker, item): item for item in items}
+        for future in tqdm(as_completed(futures), total=len(futures), desc=desc):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+    finally:
+        # On Ctrl-C, drop queued items; anything in flight is redone (or found on disk) next run
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def entry_content_hash(entry: dict, voice_name: str = TTS_VOICE_NAME, tts_model: str = TTS_MODEL_NAME) -> str:
+    """Hash of everything that determines an entry's audio and mapping: phrases, voice and TTS model."""
+    payload = json.dumps([entry['thai'], entry['english'], voice_name, tts_model], ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+class VocabularyManifest:
+    """
+    Sidecar manifest (<vocab>.manifest.json) recording the content hash each entry was last processed
+    with, keyed by English phrase. Lets a rerun classify every entry with one dict lookup instead of
+    re-validating audio on disk.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    manifest = json.load(f)
+                if manifest.get('version') == MANIFEST_VERSION:
+                    self.entries = manifest.get('entries', {})
+            except (OSError, ValueError) as e:
+                print(f"Warning: ignoring unreadable manifest '{path}': {e}")
+
+    def diff(self, vocabulary: list[dict]) -> dict[str, list[str]]:
+        """
+        Classify entries against the manifest:
+        added (not seen before), changed (hash differs), retry (same hash, last run didn't finish it),
+        unchanged (same hash, finished) and removed (in the manifest, no longer in the file).
+        """
+        diff = {"added": [], "changed": [], "retry": [], "unchanged": [], "removed": []}
+        seen = set()
+        for entry in vocabulary:
+            key = entry['english']
+            seen.add(key)
+            previous = self.entries.get(key)
+            if previous is None:
+                diff['added'].append(key)
+            elif previous['hash'] != entry_content_hash(entry):
+                diff['changed'].append(key)
+            elif not previous.get('complete'):
+                diff['retry'].append(key)
+            else:
+                diff['unchanged'].append(key)
+        diff['removed'] = [key for key in self.entries if key not in seen]
+        return diff
+
+    def save(self, vocabulary: list[dict]) -> None:
+        self.entries = {
+            entry['english']: {
+                "hash": entry_content_hash(entry),
+                "audio_path": entry.get('audio_path'),
+                "complete": bool(entry.get('audio_generated') and entry.get('azure_pron_mapping_verified')),
+            }
+            for entry in vocabulary
+        }
+        write_json_atomic(self.path, {
+            "version": MANIFEST_VERSION,
+            "voice": TTS_VOICE_NAME,
+            "tts_model": TTS_MODEL_NAME,
+            "entries": self.entries,
+        })
+
+
+def print_manifest_diff(diff: dict[str, list[str]], limit: int = 20) -> None:
+    """Print counts per category and the first `limit` added/changed/removed phrases."""
+    print("\n--- Changes since last run ---")
+    print(f"  +{len(diff['added'])} added, ~{len(diff['changed'])} changed, -{len(diff['removed'])} removed, "
+          f"{len(diff['retry'])} unfinished, {len(diff['unchanged'])} unchanged")
+    for category, marker in (("added", "+"), ("changed", "~"), ("removed", "-")):
+        for key in diff[category][:limit]:
+            print(f"    {marker} {key}")
+        if len(diff[category]) > limit:
+            print(f"    {marker} ... and {len(diff[category]) - limit} more")
+
+
+def process_vocabulary(vocab_file_path: str, audio_workers: int = AUDIO_WORKERS, azure_workers: int = AZURE_WORKERS,
+                       transliteration_workers: int = TRANSLITERATION_WORKERS, use_manifest: bool = True):
     """
     Processes a vocabulary file to:
     - Check audio_path fields exist before processing
@@ -550,8 +823,12 @@ def process_vocabulary(vocab_file_path: str):
     - Tokenize audio using Azure Speech API
     - Collect all unique Thai words and send to Gemini for consistent transliteration/translation
     - Apply the consistent mappings to all entries
-    - Save progress after each step
     - Add 'audio_generated' and 'azure_pron_mapping_verified' fields
+
+    Each API stage runs on its own bounded thread pool. Finished items are checkpointed in a
+    sidecar journal, and the vocabulary file is written atomically once per stage that changes it.
+    A sidecar manifest of content hashes limits reruns to new or changed entries; use_manifest=False
+    re-examines every entry.
     """
     load_dotenv(dotenv_path=os.path.join(os.getcwd(), '.env'))
 
@@ -571,8 +848,8 @@ def process_vocabulary(vocab_file_path: str):
     # Application Default Credentials (ADC) which might point to Vertex AI.
     client = genai.Client(api_key=gemini_api_key,
                           vertexai=False)
-    tts_model_name = "gemini-2.5-flash-preview-tts"
-    text_model_name = "gemini-2.5-flash"
+    tts_model_name = TTS_MODEL_NAME
+    text_model_name = TEXT_MODEL_NAME
 
     # Define paths - ensure we use the project root, not the current working directory
     # This script may be run from the backend/ directory, so we need to find the actual project root
@@ -598,67 +875,109 @@ def process_vocabulary(vocab_file_path: str):
 
     os.makedirs(audio_output_dir, exist_ok=True)
 
+    manifest = VocabularyManifest(os.path.splitext(vocab_file_path)[0] + ".manifest.json")
+    if not use_manifest:
+        manifest.entries = {}
+    diff = manifest.diff(data['vocabulary'])
+    print_manifest_diff(diff)
+    unchanged = frozenset(diff['unchanged'])
+
+    # Changed entries are redone from scratch; their old audio must not be picked up again
+    changed = set(diff['changed'])
+    regenerate_filenames = set()
+    for entry in data['vocabulary']:
+        if entry['english'] in changed:
+            entry['audio_generated'] = False
+            entry['azure_pron_mapping_verified'] = False
+            regenerate_filenames.add(sanitize_filename(entry['english']) + ".wav")
+
     # Check audio_path fields before processing
-    valid_audio_count, total_count = check_audio_paths_exist(data, project_root)
+    valid_audio_count, total_count = check_audio_paths_exist(data, project_root, unchanged)
     if valid_audio_count == 0:
         print("Warning: No entries have valid audio files. Audio generation will be performed first.")
 
+    journal_path = os.path.splitext(vocab_file_path)[0] + ".journal.jsonl"
+    journal = ProcessingJournal(journal_path)
+    if any(journal.records.values()):
+        print(f"Resuming from journal '{journal_path}'")
+
     tts_failures = 0
     azure_tokenization_failures = 0
     existing_audio_used = 0
     new_audio_generated = 0
+    resumed_from_journal = 0
+
+    # --- Pass 1: Audio Generation ---
+    print(f"\n--- Pass 1: Generating audio files ({audio_workers} workers) ---")
+    relative_audio_dir = os.path.join('assets/audio', file_basename)
+    # Entries whose English phrases sanitize to the same filename share one TTS call
+    audio_jobs = defaultdict(list)
+    for entry in data['vocabulary']:
+        if entry.get('audio_generated'):
+            continue
+        sanitized_filename = sanitize_filename(entry['english']) + ".wav"
+        journaled = journal.get("audio", f"{sanitized_filename}|{entry_content_hash(entry)}")
+        if journaled and os.path.exists(os.path.join(project_root, journaled['audio_path'])):
+            entry['audio_path'] = journaled['audio_path']
+            entry['audio_generated'] = True
+            resumed_from_journal += 1
+            continue
+        audio_jobs[sanitized_filename].append(entry)
+
+    # One directory scan for every lookup below (only needed if something has to be generated)
+    audio_index = build_audio_index(project_root) if audio_jobs else {}
 
-    # --- Pass 1: Audio Generation and immediate JSON update ---
-    print("\n--- Pass 1: Generating audio files ---")
-    for i, entry in enumerate(tqdm(data['vocabulary'], desc="Generating audio")):
+    def generate_entry_audio(sanitized_filename: str) -> tuple[str | None, bool]:
+        """Returns (relative audio path or None, whether an existing file was reused)."""
+        entry = audio_jobs[sanitized_filename][0]
         thai_phrase = entry['thai']
         english_phrase = entry['english']
-        audio_path_key = 'audio_path'
-
-        # Only generate audio if not already done
-        if not entry.get('audio_generated'):
-            # First check if audio already exists anywhere in assets/audio
-            existing_audio_path = check_existing_audio_files(project_root, thai_phrase, english_phrase)
-            
+        # First check if audio already exists anywhere in assets/audio
+        if sanitized_filename not in regenerate_filenames:
+            existing_audio_path = check_existing_audio_files(project_root, thai_phrase, english_phrase, audio_index)
             if existing_audio_path:
-                # Use existing audio file
-                entry[audio_path_key] = existing_audio_path
-                entry['audio_generated'] = True
-                existing_audio_used += 1
-                tqdm.write(f"  - Using existing audio for '{english_phrase}'")
-                # Immediately save progress to disk
-                with open(vocab_file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, ensure_ascii=False, indent=4)
-            else:
-                # Generate new audio file
-                sanitized_filename = sanitize_filename(english_phrase) + ".wav"
-                relative_audio_dir = os.path.join('assets/audio', file_basename)
-                audio_file_path = os.path.join(project_root, relative_audio_dir, sanitized_filename)
-                try:
-                    saved_path, streamed = retry_audio_generation(generate_audio_file, client, tts_model_name, thai_phrase, audio_file_path, english_phrase)
-                    if saved_path:
-                        relative_path = os.path.relpath(saved_path, project_root).replace(os.sep, '/')
-                        entry[audio_path_key] = relative_path
-                        entry['audio_generated'] = True
-                        new_audio_generated += 1
-                        tqdm.write(f"  - Successfully generated audio for '{english_phrase}'")
-                        # Immediately save progress to disk after each audio file
-                        with open(vocab_file_path, 'w', encoding='utf-8') as f:
-                            json.dump(data, f, ensure_ascii=False, indent=4)
-                    else:
-                        tts_failures += 1
-                        tqdm.write(f"  - Failed to generate audio for '{thai_phrase}' after retries (API returned empty data or validation failed).")
-                except Exception as e:
-                    tts_failures += 1
-                    tqdm.write(f"  - Error generating audio for '{thai_phrase}' after retries: {e}")
-                    tqdm.write(traceback.format_exc())
+                return existing_audio_path, True
+        audio_file_path = os.path.join(project_root, relative_audio_dir, sanitized_filename)
+        saved_path, streamed = retry_audio_generation(generate_audio_file, client, tts_model_name, thai_phrase, audio_file_path, english_phrase)
+        if not saved_path:
+            return None, False
+        return os.path.relpath(saved_path, project_root).replace(os.sep, '/'), False
+
+    for sanitized_filename, result, error in run_stage(list(audio_jobs), generate_entry_audio, audio_workers, "Generating audio"):
+        entries = audio_jobs[sanitized_filename]
+        thai_phrase = entries[0]['thai']
+        english_phrase = entries[0]['english']
+        if error is not None:
+            tts_failures += len(entries)
+            tqdm.write(f"  - Error generating audio for '{thai_phrase}' after retries: {error}")
+            tqdm.write("".join(traceback.format_exception(error)))
+            continue
+        relative_path, reused = result
+        if not relative_path:
+            tts_failures += len(entries)
+            tqdm.write(f"  - Failed to generate audio for '{thai_phrase}' after retries (API returned empty data or validation failed).")
+            continue
+        for entry in entries:
+            entry['audio_path'] = relative_path
+            entry['audio_generated'] = True
+        journal.record("audio", f"{sanitized_filename}|{entry_content_hash(entries[0])}", {"audio_path": relative_path})
+        if reused:
+            existing_audio_used += len(entries)
+            tqdm.write(f"  - Using existing audio for '{english_phrase}'")
+        else:
+            new_audio_generated += len(entries)
+            tqdm.write(f"  - Successfully generated audio for '{english_phrase}'")
+
+    if audio_jobs or resumed_from_journal:
+        write_json_atomic(vocab_file_path, data)
 
     # --- Pass 2: Azure Tokenization ---
-    print("\n--- Pass 2: Tokenizing audio with Azure Speech API ---")
+    print(f"\n--- Pass 2: Tokenizing audio with Azure Speech API ({azure_workers} workers) ---")
     entry_tokens = {}  # Store tokens for each entry index
     all_unique_words = set()  # Collect all unique Thai words
-    
-    for i, entry in enumerate(tqdm(data['vocabulary'], desc="Tokenizing audio")):
+    token_jobs = []  # (entry index, journal key)
+
+    for i, entry in enumerate(data['vocabulary']):
         thai_phrase = entry['thai']
         english_phrase = entry['english']
         audio_path = entry.get('audio_path')
@@ -666,6 +985,8 @@ def process_vocabulary(vocab_file_path: str):
         azure_pron_mapping_verified = entry.get('azure_pron_mapping_verified', False)
 
         # Skip if azure pronunciation mapping is already verified
+        if english_phrase in unchanged and azure_pron_mapping_verified:
+            continue
         if azure_pron_mapping_verified:
             tqdm.write(f"  - Skipping '{english_phrase}' - already verified")
             continue
@@ -684,54 +1005,72 @@ def process_vocabulary(vocab_file_path: str):
             tqdm.write(f"  - Skipping tokenization for '{english_phrase}' - audio file not found at '{full_audio_path}'.")
             continue
 
-        tqdm.write(f"  - Tokenizing audio for '{english_phrase}'...")
-        try:
-            # Use Azure Speech SDK for tokenization from audio
-            azure_tokens = get_azure_tokens_from_audio(full_audio_path, azure_speech_key, azure_speech_region, english_phrase, thai_phrase)
-
-            if not azure_tokens:
-                azure_tokenization_failures += 1
-                tqdm.write(f"  - Azure Speech API returned no tokens for '{english_phrase}'.")
-                continue
+        journal_key = f"{entry_content_hash(entry)}|{audio_path}"
+        journaled_tokens = journal.get("tokens", journal_key)
+        if journaled_tokens:
+            entry_tokens[i] = journaled_tokens
+            all_unique_words.update(journaled_tokens)
+            resumed_from_journal += 1
+            continue
+        token_jobs.append((i, journal_key))
+
+    def tokenize_entry(job: tuple[int, str]) -> list[str]:
+        entry = data['vocabulary'][job[0]]
+        tqdm.write(f"  - Tokenizing audio for '{entry['english']}'...")
+        # Use Azure Speech SDK for tokenization from audio
+        return retry_with_backoff(
+            get_azure_tokens_from_audio, os.path.join(project_root, entry['audio_path']),
+            azure_speech_key, azure_speech_region, entry['english'], entry['thai'],
+            rate_limit_gate=AZURE_RATE_LIMIT
+        )
 
-            # Store tokens for this entry and add to unique words set
-            entry_tokens[i] = azure_tokens
-            all_unique_words.update(azure_tokens)
-            tqdm.write(f"  - Successfully tokenized '{english_phrase}' into {len(azure_tokens)} words")
-            
-        except Exception as e:
+    for (i, journal_key), azure_tokens, error in run_stage(token_jobs, tokenize_entry, azure_workers, "Tokenizing audio"):
+        entry = data['vocabulary'][i]
+        if error is not None:
             azure_tokenization_failures += 1
-            tqdm.write(f"  - Error tokenizing '{thai_phrase}': {e}")
-            tqdm.write(traceback.format_exc())
+            tqdm.write(f"  - Error tokenizing '{entry['thai']}': {error}")
+            tqdm.write("".join(traceback.format_exception(error)))
+            continue
+        if not azure_tokens:
+            azure_tokenization_failures += 1
+            tqdm.write(f"  - Azure Speech API returned no tokens for '{entry['english']}'.")
+            continue
+
+        # Store tokens for this entry and add to unique words set
+        entry_tokens[i] = azure_tokens
+        all_unique_words.update(azure_tokens)
+        journal.record("tokens", journal_key, azure_tokens)
+        tqdm.write(f"  - Successfully tokenized '{entry['english']}' into {len(azure_tokens)} words")
 
     # --- Pass 3: Batch Transliteration and Translation with Gemini ---
-    print(f"\n--- Pass 3: Getting consistent transliterations for {len(all_unique_words)} unique words ---")
-    word_mapping_dict = {}
-    
-    if all_unique_words:
-        unique_words_list = list(all_unique_words)
-        tqdm.write(f"  - Unique Thai words found: {unique_words_list}")
-        
-        # Process in batches to avoid hitting API limits (adjust batch size as needed)
-        batch_size = 50  # Adjust based on API limits
-        for batch_start in range(0, len(unique_words_list), batch_size):
-            batch_end = min(batch_start + batch_size, len(unique_words_list))
-            batch_words = unique_words_list[batch_start:batch_end]
-            
-            tqdm.write(f"  - Processing batch {batch_start // batch_size + 1}: words {batch_start + 1}-{batch_end} of {len(unique_words_list)}")
-            
-            try:
-                batch_mapping = get_transliteration_and_translation_batch(batch_words, client, text_model_name)
-                word_mapping_dict.update(batch_mapping)
-                tqdm.write(f"  - Successfully processed {len(batch_mapping)} words in this batch")
-                
-                # Small delay between batches to be respectful to the API
-                if batch_end < len(unique_words_list):
-                    time.sleep(1)
-                    
-            except Exception as e:
-                tqdm.write(f"  - Error processing batch {batch_start // batch_size + 1}: {e}")
-                tqdm.write(traceback.format_exc())
+    print(f"\n--- Pass 3: Getting consistent transliterations for {len(all_unique_words)} unique words ({transliteration_workers} workers) ---")
+    word_mapping_dict = {word: mapping for word, mapping in journal.get_stage("transliteration").items() if word in all_unique_words}
+    resumed_from_journal += len(word_mapping_dict)
+    # Sorted so batches are stable across runs
+    unique_words_list = sorted(all_unique_words - word_mapping_dict.keys())
+
+    if unique_words_list:
+        tqdm.write(f"  - Unique Thai words to process: {unique_words_list}")
+
+        batches = [
+            unique_words_list[batch_start:batch_start + TRANSLITERATION_BATCH_SIZE]
+            for batch_start in range(0, len(unique_words_list), TRANSLITERATION_BATCH_SIZE)
+        ]
+
+        def transliterate_batch(batch_index: int) -> dict[str, dict]:
+            batch_words = batches[batch_index]
+            tqdm.write(f"  - Processing batch {batch_index + 1}/{len(batches)}: {len(batch_words)} words")
+            return get_transliteration_and_translation_batch(batch_words, client, text_model_name)
+
+        for batch_index, batch_mapping, error in run_stage(list(range(len(batches))), transliterate_batch, transliteration_workers, "Transliterating"):
+            if error is not None:
+                tqdm.write(f"  - Error processing batch {batch_index + 1}: {error}")
+                tqdm.write("".join(traceback.format_exception(error)))
+                continue
+            word_mapping_dict.update(batch_mapping)
+            if batch_mapping:
+                journal.record_many("transliteration", batch_mapping)
+            tqdm.write(f"  - Successfully processed {len(batch_mapping)} words in batch {batch_index + 1}")
 
     # --- Pass 4: Apply Consistent Mappings to Entries ---
     print(f"\n--- Pass 4: Applying consistent mappings to vocabulary entries ---")
@@ -778,14 +1117,20 @@ def process_vocabulary(vocab_file_path: str):
             tqdm.write(f"  - Error applying mapping to '{english_phrase}': {e}")
             tqdm.write(traceback.format_exc())
 
-        # Save progress after each entry
-        with open(vocab_file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, ensure_ascii=False, indent=4)
+    if entry_tokens:
+        write_json_atomic(vocab_file_path, data)
+
+    manifest.save(data['vocabulary'])
+
+    # Everything the journal holds is now in the vocabulary file; failed items are retried from scratch next run
+    journal.close(remove=True)
 
     # Print summary
     print(f"\nSUMMARY:")
     print(f"  Existing audio files used: {existing_audio_used}")
     print(f"  New audio files generated: {new_audio_generated}")
+    print(f"  Items resumed from journal: {resumed_from_journal}")
+    print(f"  Unchanged entries skipped: {len(unchanged)}")
     print(f"  TTS API failures: {tts_failures}")
     print(f"  Azure Tokenization failures: {azure_tokenization_failures}")
     print(f"  Mapping application failures: {mapping_failures}")
@@ -802,6 +1147,11 @@ if __name__ == "__main__":
         default='assets/data/beginner_food_vocabulary.json',
         help='Path to the vocabulary JSON file to process.'
     )
+    parser.add_argument('--full', action='store_true', help='Ignore the manifest and re-examine every entry.')
+    parser.add_argument('--audio-workers', type=int, default=AUDIO_WORKERS, help='Concurrent Gemini TTS requests.')
+    parser.add_argument('--azure-workers', type=int, default=AZURE_WORKERS, help='Concurrent Azure Speech tokenization requests.')
+    parser.add_argument('--transliteration-workers', type=int, default=TRANSLITERATION_WORKERS, help='Concurrent Gemini transliteration batches.')
     args = parser.parse_args()
     
-    process_vocabulary(args.file) 
\ No newline at end of file
+    process_vocabulary(args.file, args.audio_workers, args.azure_workers, args.transliteration_workers,
+                       use_manifest=not args.full)
\ No newline at end of file
@@ -1,10 +1,12 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Request, Depends
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Query, Request, Depends, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse, JSONResponse, Response
 from fastapi.security import HTTPBearer
 import uvicorn
 import os
 import io
 import json
+import asyncio
+import re
 import base64
 from pathlib import Path
 from dotenv import load_dotenv
@@ -56,18 +58,36 @@ else:
 # --- End Sentry initialization ---
 
 # Security and validation imports
-from services.auth_service import auth_service, require_auth, optional_auth, check_rate_limit, UserInfo
+from services.auth_service import auth_service, require_auth, require_admin, optional_auth, check_rate_limit, rate_limiter, UserInfo
 from services.validation_service import validation_service, validate_audio_upload, validate_text_input
 from services.security_service import SecurityMiddleware, CORSConfig, request_logger, security_exceptions
 
-from services.tts_service import text_to_speech_full
-from services.llm_service import get_llm_response, NPCResponse, regenerate_npc_vocabulary, process_item_giving
-from services.stt_service import transcribe_audio_simple as transcribe_audio, transcribe_audio as transcribe_audio_advanced, STTResult, parallel_transcribe_audio, transcribe_audio_elevenlabs
-from services.translation_service import translate_text, romanize_target_text, synthesize_speech, create_word_level_translation_mapping, get_language_name, get_thai_writing_tips, get_drawable_vocabulary_items, generate_syllable_writing_guide, analyze_character_components, detect_complex_vowel_patterns, get_complex_vowel_info, generate_complex_vowel_explanation, translate_and_syllabify, translate_with_deepl, translate_and_syllabify_deepl, translate_and_syllabify_enhanced
+from services.audio_encoding import negotiate_audio_format, AUDIO_MEDIA_TYPES
+from services.tts_service import text_to_speech_pcm, text_to_speech_encoded, text_to_speech_stream, wav_stream_header, GEMINI_TTS_VOICES, TTS_SAMPLE_RATE, TTS_CHANNELS, TTS_SAMPLE_WIDTH
+from services.llm_service import get_llm_response, stream_llm_response, NPCResponse, regenerate_npc_vocabulary, process_item_giving
+from services.npc_stream_pipeline import (
+    OrderedTTSPipeline, feed_llm_stream_into_pipeline, encode_frame, encode_json_frame, encode_compact_json_frame, accepts_npc_frames,
+    FRAME_STREAM_INFO, FRAME_AUDIO, FRAME_RESPONSE_DATA, FRAME_TIMING, FRAME_ERROR, NPC_STREAM_MEDIA_TYPE
+)
+from services.stt_service import transcribe_audio_simple as transcribe_audio, transcribe_audio as transcribe_audio_advanced, STTResult, parallel_transcribe_audio, transcribe_audio_elevenlabs, STT_RACE_CONFIDENCE_THRESHOLD
+from services.translation_service import translate_text, romanize_target_text, synthesize_speech, create_word_level_translation_mapping, get_language_name, get_thai_writing_tips, get_drawable_vocabulary_items, generate_syllable_writing_guide, analyze_character_components, detect_complex_vowel_patterns, get_complex_vowel_info, analyze_complex_vowels_batch, generate_complex_vowel_explanation, translate_and_syllabify, translate_with_deepl, translate_and_syllabify_deepl, translate_and_syllabify_enhanced, warm_up_thai_nlp
 from services.pronunciation_service import assess_pronunciation, PronunciationAssessmentResponse
 from services.azure_speech_tracker import get_azure_speech_tracker
 from services.openai_whisper_service import transcribe_audio_openai, translate_audio_openai, OpenAIWhisperResult
 from services.latency_tracker import LatencyTracker, timing_context, DEFAULT_HIGH_LATENCY_THRESHOLD
+from services.client_registry import get_client_registry
+from services.translation_memory import get_translation_memory
+from services.audio_cache import get_audio_cache
+from services.vocabulary_index import get_vocabulary_index
+from services.thai_nlp_engine import get_thai_nlp_engine
+from services.nlp_worker_pool import get_nlp_worker_pool, run_nlp_task
+from services.tts_prefetch import get_tts_prefetch_scheduler, TTS_PREFETCH_ON_STARTUP
+from services.vendor_executor import get_vendor_executor_stats, shutdown_vendor_executors
+from services.loop_monitor import loop_lag_monitor
+from services.log_queue import get_log_queue_stats, stop_log_queue
+from services.latency_metrics import get_latency_metrics
+from services.analytics_dispatcher import get_analytics_dispatcher
+from services.structured_logging import get_logger, configure_logging
 from utils.device_detection import detect_device, get_platform_string, get_mobile_optimized_headers
 
 app = FastAPI(
@@ -79,6 +99,10 @@ app = FastAPI(
 # Add security middleware
 app.add_middleware(SecurityMiddleware)
 
+# Per-module levels (LOG_LEVELS) and optional JSON output (LOG_FORMAT=json) for structured loggers
+configure_logging()
+npc_log = get_logger(f"{__name__}.npc_response")
+
 # Log server startup time
 startup_time = datetime.datetime.now()
 print(f"🚀 Backend server starting up at {startup_time.strftime('%Y-%m-%d %H:%M:%S')}")
@@ -208,6 +232,46 @@ NPC_VOICE_MAP: Dict[str, str] = {
     "default": "Puck" 
 }
 
+def build_npc_response_data(
+    npc_response_data: NPCResponse,
+    player_transcription: str,
+    word_confidence_data: list,
+    pronunciation_score: float,
+    use_enhanced_stt: bool,
+    valid_item_action: bool,
+    action_type: str,
+    action_item: str,
+    updated_quest_state: dict
+) -> dict:
+    """Client-facing NPC response payload, shared by the header and streaming response formats."""
+    return {
+        "input_target": npc_response_data.input_target,
+        "input_english": npc_response_data.input_english,
+        "emotion": npc_response_data.emotion,
+        "response_tone": npc_response_data.response_tone,
+        "response_target": npc_response_data.response_target,
+        "response_english": npc_response_data.response_english,
+        "response_mapping": [m.model_dump() for m in npc_response_data.response_mapping],
+        "input_mapping": [m.model_dump() for m in npc_response_data.input_mapping],
+        "charm_delta": npc_response_data.charm_delta,
+        "charm_reason": npc_response_data.charm_reason,
+        "player_transcription_raw": player_transcription,
+        # NEW: Enhanced STT fields
+        "word_confidence": word_confidence_data,
+        "pronunciation_score": pronunciation_score,
+        "enhanced_stt_used": use_enhanced_stt,
+        # NEW: Quest-related fields
+        "user_item_given": npc_response_data.user_item_given,
+        "user_item_accepted": npc_response_data.user_item_accepted,
+        "item_category": npc_response_data.item_category,
+        # NEW: Action validation (matching notebook pattern)
+        "valid_item_action": valid_item_action,
+        "action_type_received": action_type,
+        "action_item_received": action_item,
+        # NEW: Updated quest state for frontend
+        "updated_quest_state": updated_quest_state if updated_quest_state else {},
+    }
+
 @app.on_event("startup")
 async def startup_event():
     """Log all service configurations at startup"""
@@ -280,8 +344,103 @@ async def startup_event():
     except Exception as e:
         print(f"\u274c Azure Speech Tracker: Failed to initialize - {e}")
     
+    # Warm shared SDK clients so the first request doesn't pay for client construction
+    print("\n🔌 Shared Clients:")
+    probe_clients = os.getenv("CLIENT_REGISTRY_PROBE_ON_STARTUP", "false").lower() == "true"
+    client_status = await asyncio.to_thread(get_client_registry().warm_up, None, probe_clients)
+    for name, ready in client_status.items():
+        print(f"  {'✅' if ready else '❌'} {name}: {'ready' if ready else 'unavailable'}")
+    
+    # Build the vocabulary index up front instead of on the first translation request
+    vocabulary_index = await asyncio.to_thread(get_vocabulary_index)
+    print(f"  ✅ Vocabulary index: {vocabulary_index.get_stats()['entries']} entries")
+    
+    # Seed the translation memory with curated vocabulary so common words never hit a paid API
+    try:
+        prewarmed = await asyncio.to_thread(get_translation_memory().prewarm_from_vocabulary)
+        print(f"  ✅ Translation memory: {prewarmed} vocabulary entries pre-warmed")
+    except Exception as e:
+        print(f"  ❌ Translation memory: pre-warm failed - {e}")
+    
+    # Load pythainlp engines in the background; /health reports 503 until they are ready
+    if os.getenv("THAI_NLP_WARMUP_ON_STARTUP", "true").lower() == "true":
+        app.state.thai_nlp_warm_up = asyncio.create_task(_warm_up_thai_nlp())
+        print("  ⏳ Thai NLP engines: warming up in background")
+    else:
+        get_thai_nlp_engine().skip_warm_up()
+        get_nlp_worker_pool().skip_warm_up()
+        print("  ⏭️  Thai NLP engines: warm-up disabled")
+    
+    # Pre-synthesize scripted NPC lines into the (persistent) audio cache so greetings skip live TTS
+    if TTS_PREFETCH_ON_STARTUP and GEMINI_API_KEY:
+        app.state.tts_prefetch = asyncio.create_task(_prefetch_npc_speech())
+        print(f"  ⏳ TTS prefetch: running in background (budget ${get_tts_prefetch_scheduler().budget_usd:.2f})")
+    else:
+        print("  ⏭️  TTS prefetch: disabled")
+    
+    # Fetch JWKS signing keys in the background so token verification never waits on the network
+    if auth_service.enabled:
+        auth_service.start_jwks_refresh()
+        print("  ✅ JWKS refresh: signing keys fetched in background")
+    
+    # Watch for blocking calls on the event loop
+    loop_lag_monitor.start()
+    print(f"  ✅ Event loop lag monitor: warn above {loop_lag_monitor.warn_threshold * 1000:.0f}ms")
+    
     print("="*80 + "\n")
 
+async def _warm_up_thai_nlp():
+    """Run the pythainlp warm-up off the event loop (and pre-warm the NLP worker processes) and log load times."""
+    worker_pool_start = asyncio.create_task(_start_nlp_worker_pool())
+    try:
+        status = await asyncio.to_thread(warm_up_thai_nlp)
+        failed = [name for name, result in status["engines"].items() if not result["ok"]]
+        timings = ", ".join(f"{name}={result['load_time_ms']}ms" for name, result in status["engines"].items())
+        print(f"[{datetime.datetime.now()}] {'⚠️' if failed else '✅'} Thai NLP warm-up complete in {status['total_time_ms']}ms ({timings})")
+        if failed:
+            print(f"[{datetime.datetime.now()}] ⚠️ Thai NLP engines unavailable: {', '.join(failed)}")
+    except Exception as e:
+        # Never leave /health stuck in warming_up because the warm-up itself crashed
+        print(f"[{datetime.datetime.now()}] ERROR: Thai NLP warm-up failed: {e}")
+        get_thai_nlp_engine().warm_up_status["state"] = "complete"
+    await worker_pool_start
+
+async def _start_nlp_worker_pool():
+    """Spawn the NLP worker processes; each one loads pythainlp models in its initializer."""
+    try:
+        pool_status = await get_nlp_worker_pool().start()
+        if pool_status["processes"]:
+            print(f"[{datetime.datetime.now()}] ✅ NLP worker pool: {pool_status['processes']} processes warm in {pool_status['warm_up_ms']}ms")
+        else:
+            print(f"[{datetime.datetime.now()}] ⏭️  NLP worker pool disabled - Thai NLP runs on worker threads")
+    except Exception as e:
+        # Requests still work: a broken pool falls back to in-process execution
+        print(f"[{datetime.datetime.now()}] ERROR: NLP worker pool failed to start: {e}")
+
+async def _prefetch_npc_speech():
+    """Run the TTS prefetch scheduler for every NPC voice and log coverage."""
+    try:
+        stats = await get_tts_prefetch_scheduler().run(NPC_VOICE_MAP)
+        print(f"[{datetime.datetime.now()}] ✅ TTS prefetch complete - coverage {stats['coverage_pct']}% "
+              f"({stats['synthesized']} synthesized, {stats['skipped_budget']} over budget) in {stats['duration_ms']}ms")
+    except Exception as e:
+        print(f"[{datetime.datetime.now()}] ERROR: TTS prefetch failed: {e}")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop background monitors and release vendor thread pools"""
+    loop_lag_monitor.stop()
+    auth_service.stop_jwks_refresh()
+    prefetch_task = getattr(app.state, "tts_prefetch", None)
+    if prefetch_task and not prefetch_task.done():
+        prefetch_task.cancel()
+    shutdown_vendor_executors(wait=False)
+    get_nlp_worker_pool().shutdown()
+    # Send queued analytics events before the process exits
+    await asyncio.to_thread(get_analytics_dispatcher().flush)
+    print(f"[{datetime.datetime.now()}] INFO: Backend shutdown complete")
+    stop_log_queue()
+
 @app.get("/")
 async def root():
     return {
@@ -311,12 +470,16 @@ async def generate_npc_response_endpoint(
     quest_state_json: Optional[str] = Form("{}"), # NEW: Complete quest state
     use_enhanced_stt: Optional[bool] = Form(False), # NEW: Enable enhanced STT with word confidence
     user_id: Optional[str] = Form(None),          # NEW: For Helicone user tracking
-    session_id: Optional[str] = Form(None)        # NEW: For Helicone session tracking
+    session_id: Optional[str] = Form(None),       # NEW: For Helicone session tracking
+    stream_audio: Optional[bool] = Form(False)    # NEW: Pipelined LLM->TTS with framed, chunked audio body
 ):
-    print(f"[{datetime.datetime.now()}] INFO: /generate-npc-response/ received request for NPC: {npc_id}, Name: {npc_name}, Charm: {charm_level}, Language: {target_language}. Custom message: {custom_message is not None}, Action: {action_type}")
+    npc_log.info(
+        "/generate-npc-response/ received request", npc_id=npc_id, npc_name=npc_name, charm=charm_level,
+        language=target_language, custom_message=custom_message is not None, action=action_type, stream=stream_audio
+    )
     
     # Check rate limits
-    check_rate_limit(user_info)
+    await check_rate_limit(user_info, request)
     
     # Validate inputs
     npc_id = validation_service.validate_npc_id(npc_id)
@@ -344,7 +507,8 @@ async def generate_npc_response_endpoint(
     tracker.add_metadata("action_type", action_type)
     tracker.add_metadata("uses_custom_message", custom_message is not None)
     
-    print(f"[{datetime.datetime.now()}] INFO: Device detected - Platform: {device_info.platform.value}, Type: {device_info.device_type.value}, Mobile: {device_info.is_mobile}")
+    npc_log.debug("Device detected", platform=device_info.platform.value, device_type=device_info.device_type.value,
+                  mobile=device_info.is_mobile)
     
     try:
         # 1. Parse quest state from JSON
@@ -352,9 +516,9 @@ async def generate_npc_response_endpoint(
         if quest_state_json and quest_state_json != "{}":
             try:
                 quest_state = json.loads(quest_state_json)
-                print(f"[{datetime.datetime.now()}] INFO: Quest state loaded for {npc_id}")
+                npc_log.debug("Quest state loaded", npc_id=npc_id)
             except json.JSONDecodeError:
-                print(f"[{datetime.datetime.now()}] WARNING: Invalid quest_state_json for {npc_id}")
+                npc_log.warning("Invalid quest_state_json", npc_id=npc_id)
                 quest_state = {}
         
         # 2. Handle STT or Custom Message
@@ -365,7 +529,7 @@ async def generate_npc_response_endpoint(
             # Item giving: Skip STT, use custom message directly
             latest_player_message = custom_message
             player_transcription = custom_message  # For response consistency
-            print(f"[{datetime.datetime.now()}] INFO: Using custom message for {npc_id}: '{custom_message}'")
+            npc_log.debug("Using custom message: %r", custom_message, npc_id=npc_id)
             # Mark STT as skipped
             tracker.add_metadata("stt_skipped", True)
         else:
@@ -400,7 +564,8 @@ async def generate_npc_response_endpoint(
                     confidence_scores = [word["confidence"] for word in word_confidence_data]
                     pronunciation_score = sum(confidence_scores) / len(confidence_scores)
                 
-                print(f"[{datetime.datetime.now()}] INFO: Enhanced STT for {npc_id} successful. Transcription: '{player_transcription}', Pronunciation Score: {pronunciation_score:.3f}")
+                npc_log.debug("Enhanced STT transcription: %r", player_transcription, npc_id=npc_id,
+                              pronunciation_score=round(pronunciation_score, 3))
             else:
                 # Standard STT (backward compatibility)
                 stt_result = await transcribe_audio(
@@ -411,10 +576,11 @@ async def generate_npc_response_endpoint(
                     session_id=session_id
                 )
                 player_transcription = stt_result.text
-                print(f"[{datetime.datetime.now()}] INFO: Standard STT for {npc_id} successful. Transcription: '{player_transcription}'")
+                npc_log.debug("Standard STT transcription: %r", player_transcription, npc_id=npc_id)
             
             # End timing STT
             stt_duration = tracker.end("stt", {
+                "vendor": stt_result.service_used,
                 "transcription_length": len(player_transcription),
                 "language": target_language,
                 "success": bool(player_transcription)
@@ -428,8 +594,30 @@ async def generate_npc_response_endpoint(
         if not latest_player_message and not action_type:
             raise HTTPException(status_code=400, detail="Player message is empty or invalid.")
 
+        if stream_audio:
+            return _stream_npc_response(
+                tracker=tracker,
+                user_agent=user_agent,
+                npc_id=npc_id,
+                npc_name=npc_name,
+                charm_level=charm_level,
+                target_language=target_language,
+                conversation_history=conversation_history,
+                latest_player_message=latest_player_message,
+                quest_state=quest_state,
+                action_type=action_type,
+                action_item=action_item,
+                player_transcription=player_transcription,
+                word_confidence_data=word_confidence_data,
+                pronunciation_score=pronunciation_score,
+                use_enhanced_stt=use_enhanced_stt,
+                user_id=user_id,
+                session_id=session_id
+            )
+
         # 4. LLM - Get NPC's response with quest parameters and tracking
         tracker.start("llm", {
+            "vendor": "openai",
             "npc_id": npc_id,
             "charm_level": charm_level,
             "has_quest_state": bool(quest_state),
@@ -457,7 +645,8 @@ async def generate_npc_response_endpoint(
             "item_accepted": npc_response_data.user_item_accepted
         })
         
-        print(f"[{datetime.datetime.now()}] INFO: LLM response for {npc_id} OK. Target: '{npc_response_data.response_target[:30]}...', Tone: '{npc_response_data.response_tone}'")
+        npc_log.debug("LLM response target: %r", npc_response_data.response_target, npc_id=npc_id,
+                      tone=npc_response_data.response_tone)
 
         # 4a. Process item giving and update quest state (following notebook pattern)
         # BACKEND ENFORCEMENT: Only process items with valid GIVE_ITEM action (matches notebook)
@@ -472,17 +661,21 @@ async def generate_npc_response_endpoint(
             # Regular conversation or invalid action - no quest processing (following notebook pattern)
             pass
 
-        # 5. TTS - Convert NPC's text response to speech
+        # 5. TTS - Convert NPC's text response to speech, compressed if the client asked for MP3/Opus
         voice_name = NPC_VOICE_MAP.get(npc_id.lower(), NPC_VOICE_MAP["default"])
+        requested_audio_format = negotiate_audio_format(request.headers.get("accept"), device_info)
         
         tracker.start("tts", {
+            "vendor": "gemini",
             "voice_name": voice_name,
             "text_length": len(npc_response_data.response_target),
-            "response_tone": npc_response_data.response_tone
+            "response_tone": npc_response_data.response_tone,
+            "audio_format": requested_audio_format
         })
         
-        npc_audio_bytes = await text_to_speech_full(
+        npc_audio_bytes, audio_format = await text_to_speech_encoded(
             text_to_speak=npc_response_data.response_target, 
+            audio_format=requested_audio_format,
             voice_name=voice_name,
             response_tone=npc_response_data.response_tone,
             user_id=user_id,
@@ -491,53 +684,21 @@ async def generate_npc_response_endpoint(
         
         tts_duration = tracker.end("tts", {
             "audio_bytes": len(npc_audio_bytes) if npc_audio_bytes else 0,
+            "audio_format": audio_format,
             "success": bool(npc_audio_bytes)
         })
+        tracker.add_metadata("audio_format", audio_format)
         
-        print(f"[{datetime.datetime.now()}] INFO: TTS for {npc_id} using voice '{voice_name}' OK. Audio bytes: {len(npc_audio_bytes) if npc_audio_bytes else 'None'}")
-
         if not npc_audio_bytes:
-            print(f"[{datetime.datetime.now()}] ERROR: text_to_speech_full returned empty audio_bytes for NPC {npc_id}, text: '{npc_response_data.response_target}'")
+            npc_log.error("text_to_speech_encoded returned empty audio", npc_id=npc_id, voice=voice_name,
+                          text_length=len(npc_response_data.response_target))
             raise HTTPException(status_code=500, detail="TTS service failed to generate audio for NPC response.")
         
-        # 5. Prepare header data (NPCResponse + player_transcription)
-        header_payload = npc_response_data.model_dump() # NPCResponse fields
-        header_payload["player_transcription"] = player_transcription # Add player's transcription
-        
-        # The JSON data part of the response needs to be base64 encoded to be sent in a header.
-        response_data_dict = {
-            "input_target": npc_response_data.input_target,
-            "input_english": npc_response_data.input_english,
-            "emotion": npc_response_data.emotion,
-            "response_tone": npc_response_data.response_tone,
-            "response_target": npc_response_data.response_target,
-            "response_english": npc_response_data.response_english,
-            "response_mapping": [m.model_dump() for m in npc_response_data.response_mapping],
-            "input_mapping": [m.model_dump() for m in npc_response_data.input_mapping],
-            "charm_delta": npc_response_data.charm_delta,
-            "charm_reason": npc_response_data.charm_reason,
-            "player_transcription_raw": player_transcription,
-            # NEW: Enhanced STT fields
-            "word_confidence": word_confidence_data,
-            "pronunciation_score": pronunciation_score,
-            "enhanced_stt_used": use_enhanced_stt,
-            # NEW: Quest-related fields
-            "user_item_given": npc_response_data.user_item_given,
-            "user_item_accepted": npc_response_data.user_item_accepted,
-            "item_category": npc_response_data.item_category,
-            # NEW: Action validation (matching notebook pattern)
-            "valid_item_action": valid_item_action,
-            "action_type_received": action_type,
-            "action_item_received": action_item,
-            # NEW: Updated quest state for frontend
-            "updated_quest_state": updated_quest_state if updated_quest_state else {},
-        }
-        # Force JSON to ASCII to prevent encoding errors on the client.
-        # This escapes all non-ASCII characters (e.g., to \uXXXX), making it safe
-        # for transport and decoding on the Flutter client.
-        response_data_json = json.dumps(response_data_dict, ensure_ascii=True)
-        response_data_b64 = base64.b64encode(response_data_json.encode('ascii')).decode('ascii')
-
+        # 5. Prepare response data (NPCResponse + player transcription, STT and quest results)
+        response_data_dict = build_npc_response_data(
+            npc_response_data, player_transcription, word_confidence_data, pronunciation_score,
+            use_enhanced_stt, valid_item_action, action_type, action_item, updated_quest_state
+        )
 
         # Finalize timing and create response headers
         tracker.end("total")
@@ -547,27 +708,65 @@ async def generate_npc_response_endpoint(
         # Send metrics to PostHog and alerts to Sentry
         tracker.finalize(send_to_posthog=True)  # Use default threshold (25s)
 
-        print(f"[{datetime.datetime.now()}] INFO: Sending NPC response for {npc_id}. Header JSON (first 60 chars of b64): {response_data_b64[:60]}...")
-        print(f"[{datetime.datetime.now()}] 📊 Request completed - Total: {tracker.get_duration('total'):.2f}s, "
-              f"STT: {tracker.get_duration('stt') or 'N/A'}s, "
-              f"LLM: {tracker.get_duration('llm'):.2f}s, "
-              f"TTS: {tracker.get_duration('tts'):.2f}s")
+        npc_log.info("📊 Request completed", npc_id=npc_id, audio_bytes=len(npc_audio_bytes), audio_format=audio_format,
+                     **{f"{stage}_s": round(duration, 3) for stage, duration in tracker.get_breakdown().items()})
+
+        if accepts_npc_frames(request.headers.get("accept")):
+            # Framed body (same frame types as the streamed response): metadata travels as compact
+            # UTF-8 JSON in the body instead of a base64 header, followed by the complete audio clip
+            body = b"".join([
+                encode_compact_json_frame(FRAME_STREAM_INFO, {
+                    "request_id": tracker.request_id,
+                    "audio_format": audio_format,
+                    "audio_media_type": AUDIO_MEDIA_TYPES[audio_format],
+                    "voice_name": voice_name,
+                }),
+                encode_compact_json_frame(FRAME_RESPONSE_DATA, response_data_dict),
+                encode_frame(FRAME_AUDIO, npc_audio_bytes),
+                encode_compact_json_frame(FRAME_TIMING, {
+                    "request_id": tracker.request_id,
+                    "breakdown": tracker.get_breakdown(),
+                    "high_latency": tracker.is_high_latency()
+                }),
+            ])
+            npc_log.debug("Sending framed NPC response", npc_id=npc_id, body_bytes=len(body), audio_format=audio_format)
+            return Response(
+                content=body,
+                media_type=NPC_STREAM_MEDIA_TYPE,
+                headers={
+                    "X-NPC-Stream-Format": "frames-v1",
+                    "X-Audio-Format": audio_format,
+                    "Vary": "Accept",
+                    **timing_headers,
+                    **mobile_headers
+                }
+            )
+
+        # Legacy format (kept for clients that haven't migrated): the JSON data is base64 encoded into a header.
+        # Force JSON to ASCII to prevent encoding errors on the client.
+        # This escapes all non-ASCII characters (e.g., to \uXXXX), making it safe
+        # for transport and decoding on the Flutter client.
+        response_data_json = json.dumps(response_data_dict, ensure_ascii=True)
+        response_data_b64 = base64.b64encode(response_data_json.encode('ascii')).decode('ascii')
+        npc_log.debug("Sending NPC response with header data", npc_id=npc_id, header_bytes=len(response_data_b64))
         
         # Combine all headers
         response_headers = {
             "X-NPC-Response-Data": response_data_b64,
+            "X-Audio-Format": audio_format,
+            "Vary": "Accept",
             **timing_headers,
             **mobile_headers
         }
         
         return StreamingResponse(
             io.BytesIO(npc_audio_bytes), 
-            media_type="audio/wav",
+            media_type=AUDIO_MEDIA_TYPES[audio_format],
             headers=response_headers
         )
     except HTTPException as e:
         # Re-raise HTTPExceptions (e.g., from STT, LLM, or TTS services if they raise them)
-        print(f"[{datetime.datetime.now()}] ERROR: HTTPException in /generate-npc-response/: {e.detail}")
+        npc_log.error("HTTPException in /generate-npc-response/: %s", e.detail, status_code=e.status_code)
         # Still track the failed request
         if 'tracker' in locals():
             tracker.add_metadata("error_type", "HTTPException")
@@ -575,9 +774,7 @@ async def generate_npc_response_endpoint(
             tracker.finalize(send_to_posthog=True, alert_threshold=20.0)  # Lower threshold for errors
         raise e
     except Exception as e:
-        print(f"[{datetime.datetime.now()}] CRITICAL: Unhandled exception in /generate-npc-response/: {e}")
-        import traceback
-        traceback.print_exc()
+        npc_log.exception("Unhandled exception in /generate-npc-response/: %s", e)
         # Track the failed request
         if 'tracker' in locals():
             tracker.add_metadata("error_type", "UnhandledException")
@@ -585,11 +782,189 @@ async def generate_npc_response_endpoint(
             tracker.finalize(send_to_posthog=True, alert_threshold=15.0)  # Lower threshold for critical errors
         raise HTTPException(status_code=500, detail="An unexpected error occurred processing NPC response.")
 
+def _stream_npc_response(
+    tracker: LatencyTracker,
+    user_agent: str,
+    npc_id: str,
+    npc_name: str,
+    charm_level: int,
+    target_language: str,
+    conversation_history: str,
+    latest_player_message: str,
+    quest_state: dict,
+    action_type: str,
+    action_item: str,
+    player_transcription: str,
+    word_confidence_data: list,
+    pronunciation_score: float,
+    use_enhanced_stt: bool,
+    user_id: Optional[str],
+    session_id: Optional[str]
+) -> StreamingResponse:
+    """
+    Pipelined variant of /generate-npc-response/: the LLM response is streamed sentence by
+    sentence into TTS and audio frames are sent as soon as the first sentence is synthesized.
+
+    Body is a sequence of length-prefixed frames (see services/npc_stream_pipeline.py):
+    M (stream info) -> A* (PCM audio) -> D (response data, same JSON as X-NPC-Response-Data) -> T (timing).
+    An E frame replaces D/T if the pipeline fails after the response has started.
+    """
+    voice_name = NPC_VOICE_MAP.get(npc_id.lower(), NPC_VOICE_MAP["default"])
+    response_tone = {"value": None}
+
+    async def synthesize_sentence(sentence: str) -> bytes:
+        return await text_to_speech_pcm(
+            text_to_speak=sentence,
+            voice_name=voice_name,
+            response_tone=response_tone["value"],
+            user_id=user_id,
+            session_id=session_id
+        )
+
+    async def frames():
+        pipeline = OrderedTTSPipeline(synthesize_sentence)
+        llm_task = None
+        finalized = False
+        try:
+            yield encode_json_frame(FRAME_STREAM_INFO, {
+                "request_id": tracker.request_id,
+                "audio_format": "pcm_s16le",
+                "sample_rate": TTS_SAMPLE_RATE,
+                "channels": TTS_CHANNELS,
+                "sample_width": TTS_SAMPLE_WIDTH,
+                "voice_name": voice_name,
+                "player_transcription_raw": player_transcription,
+                "word_confidence": word_confidence_data,
+                "pronunciation_score": pronunciation_score,
+                "enhanced_stt_used": use_enhanced_stt,
+            })
+
+            tracker.start("llm", {
+                "vendor": "openai",
+                "npc_id": npc_id,
+                "charm_level": charm_level,
+                "has_quest_state": bool(quest_state),
+                "message_length": len(latest_player_message),
+                "streaming": True
+            })
+            tracker.start("tts", {"vendor": "gemini", "voice_name": voice_name, "streaming": True})
+
+            def on_tone(tone: str):
+                response_tone["value"] = tone
+
+            llm_events = stream_llm_response(
+                npc_id=npc_id,
+                npc_name=npc_name,
+                conversation_history=conversation_history,
+                latest_player_message=latest_player_message,
+                current_charm_level=charm_level,
+                target_language=target_language,
+                quest_state=quest_state,
+                action_type=action_type,
+                action_item=action_item,
+                user_id=user_id,
+                session_id=session_id
+            )
+
+            async def timed_llm_events():
+                async for kind, payload in llm_events:
+                    if kind == "final":
+                        # LLM stage ends when the structured response is complete, not when its audio is done
+                        tracker.end("llm", {
+                            "response_length": len(payload.response_target),
+                            "response_tone": payload.response_tone,
+                            "charm_delta": payload.charm_delta,
+                            "item_accepted": payload.user_item_accepted
+                        })
+                    yield kind, payload
+
+            llm_task = asyncio.create_task(feed_llm_stream_into_pipeline(timed_llm_events(), pipeline, on_tone=on_tone))
+
+            audio_bytes = 0
+            async for pcm_chunk in pipeline.audio_chunks():
+                if audio_bytes == 0:
+                    first_audio = tracker.mark("first_audio", {"voice_name": voice_name})
+                    npc_log.info("First audio after %.2fs", first_audio, npc_id=npc_id)
+                audio_bytes += len(pcm_chunk)
+                yield encode_frame(FRAME_AUDIO, pcm_chunk)
+
+            npc_response_data: NPCResponse = await llm_task
+            if npc_response_data is None:
+                raise HTTPException(status_code=500, detail="LLM stream ended without a response.")
+            if audio_bytes == 0:
+                raise HTTPException(status_code=500, detail="TTS service failed to generate audio for NPC response.")
+
+            tracker.end("tts", {
+                "audio_bytes": audio_bytes,
+                "sentences": len(pipeline.sentences),
+                "text_length": len(npc_response_data.response_target),
+                "success": True
+            })
+
+            valid_item_action = (action_type == "GIVE_ITEM" and action_item.strip() != "")
+            updated_quest_state = quest_state
+            if quest_state and valid_item_action:
+                updated_quest_state = process_item_giving(npc_response_data, quest_state)
+
+            yield encode_json_frame(FRAME_RESPONSE_DATA, build_npc_response_data(
+                npc_response_data, player_transcription, word_confidence_data, pronunciation_score,
+                use_enhanced_stt, valid_item_action, action_type, action_item, updated_quest_state
+            ))
+
+            tracker.end("total")
+            yield encode_json_frame(FRAME_TIMING, {
+                "request_id": tracker.request_id,
+                "breakdown": tracker.get_breakdown(),
+                "high_latency": tracker.is_high_latency()
+            })
+            tracker.finalize(send_to_posthog=True)
+            finalized = True
+
+            npc_log.info("📊 Streamed request completed", npc_id=npc_id, total_s=tracker.get_duration("total"),
+                         first_audio_s=tracker.get_duration("first_audio"), sentences=len(pipeline.sentences),
+                         audio_bytes=audio_bytes)
+        except Exception as e:
+            detail = e.detail if isinstance(e, HTTPException) else "An unexpected error occurred processing NPC response."
+            npc_log.exception("Streaming /generate-npc-response/ failed: %s", e, npc_id=npc_id)
+            tracker.add_metadata("error_type", type(e).__name__)
+            tracker.add_metadata("error_detail", str(detail))
+            tracker.finalize(send_to_posthog=True, alert_threshold=20.0)
+            finalized = True
+            yield encode_json_frame(FRAME_ERROR, {"request_id": tracker.request_id, "detail": detail})
+        finally:
+            pipeline.cancel()
+            if llm_task and not llm_task.done():
+                llm_task.cancel()
+            if not finalized:
+                # Client disconnected mid-stream
+                tracker.add_metadata("client_disconnected", True)
+                tracker.finalize(send_to_posthog=True)
+
+    headers = {
+        "X-Request-ID": tracker.request_id,
+        "X-Platform": tracker.platform,
+        "X-NPC-Stream-Format": "frames-v1",
+        "X-Audio-Sample-Rate": str(TTS_SAMPLE_RATE),
+        **get_mobile_optimized_headers(user_agent)
+    }
+    if tracker.get_duration("stt") is not None:
+        headers["X-STT-Duration"] = str(round(tracker.get_duration("stt"), 3))
+
+    return StreamingResponse(frames(), media_type=NPC_STREAM_MEDIA_TYPE, headers=headers)
+
 @app.get("/health")
-async def health_check():
+async def health_check(probe_clients: bool = Query(False, description="Run live health probes against shared SDK clients")):
     """Enhanced health check with security status"""
-    return {
-        "status": "healthy",
+    if probe_clients:
+        registry = get_client_registry()
+        await asyncio.gather(*[
+            asyncio.to_thread(registry.probe, name) for name in registry.get_status().keys()
+        ])
+    nlp_engine = get_thai_nlp_engine()
+    nlp_worker_pool = get_nlp_worker_pool()
+    ready = nlp_engine.ready and nlp_worker_pool.ready
+    payload = {
+        "status": "healthy" if ready else "warming_up",
         "version": "1.0.0",
         "environment": os.getenv("ENVIRONMENT", "development"),
         "security": {
@@ -603,8 +978,32 @@ async def health_check():
             "openai": OPENAI_API_KEY is not None,
             "gemini": GEMINI_API_KEY is not None,
             "azure_speech": AZURE_SPEECH_KEY is not None and AZURE_SPEECH_REGION is not None
-        }
+        },
+        "clients": get_client_registry().get_status(),
+        "auth": auth_service.get_stats(),
+        "rate_limiter": rate_limiter.get_stats(),
+        "event_loop": loop_lag_monitor.get_stats(),
+        "log_queue": get_log_queue_stats(),
+        "analytics": get_analytics_dispatcher().get_stats(),
+        "vendor_executors": get_vendor_executor_stats(),
+        "translation_memory": get_translation_memory().get_stats(),
+        "audio_cache": get_audio_cache().get_stats(),
+        "vocabulary_index": get_vocabulary_index().get_stats(),
+        "thai_nlp": nlp_engine.get_stats(),
+        "nlp_worker_pool": nlp_worker_pool.get_stats(),
+        "tts_prefetch": get_tts_prefetch_scheduler().get_stats(),
+        "thai_nlp_warm_up": nlp_engine.warm_up_status,
+        "latency_percentiles": get_latency_metrics().percentiles()
     }
+    # Not ready until the NLP engines and worker processes are loaded, so load balancers hold traffic off a cold worker
+    if not ready:
+        return JSONResponse(status_code=503, content=payload)
+    return payload
+
+@app.get("/metrics")
+async def metrics():
+    """Per-stage latency quantiles (by NPC, platform and vendor) in Prometheus text format"""
+    return Response(content=get_latency_metrics().to_prometheus(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 
 
@@ -1059,12 +1458,21 @@ async def transcribe_and_translate_elevenlabs_endpoint(
 async def parallel_transcribe_endpoint(
     audio_file: UploadFile = File(...),
     language_code: Optional[str] = Form("tha"),
-    expected_text: Optional[str] = Form("")
+    expected_text: Optional[str] = Form(""),
+    mode: str = Form("compare"),
+    confidence_threshold: float = Form(STT_RACE_CONFIDENCE_THRESHOLD)
 ):
     """
     Legacy parallel transcription endpoint that processes audio through both Google Cloud STT models
     (Chirp_2 vs short) for accuracy comparison and testing.
+    
+    mode="compare" waits for both models; mode="race" returns the first transcription at or above
+    confidence_threshold and cancels the other model, which is then reported with status "cancelled".
     """
+    if mode not in ("compare", "race"):
+        raise HTTPException(status_code=400, detail="mode must be 'compare' or 'race'")
+    if not 0.0 <= confidence_threshold <= 1.0:
+        raise HTTPException(status_code=400, detail="confidence_threshold must be between 0 and 1")
     request_time = datetime.datetime.now()
     print(f"[{request_time}] INFO: /parallel-transcribe/ endpoint hit. File: {audio_file.filename}, Language: {language_code}")
     
@@ -1077,8 +1485,11 @@ async def parallel_transcribe_endpoint(
         
         audio_content_stream = io.BytesIO(audio_bytes)
         
-        # Process through both STT services in parallel
-        parallel_results = await parallel_transcribe_audio(audio_content_stream, language_code, expected_text)
+        # Process through both Google STT models concurrently
+        parallel_results = await parallel_transcribe_audio(
+            audio_content_stream, language_code, expected_text,
+            mode=mode, vendors=["google_chirp2", "google_short"], confidence_threshold=confidence_threshold
+        )
         
         # Convert STTResult objects to response format
         def convert_stt_result(stt_result: STTResult) -> STTServiceResult:
@@ -1100,15 +1511,26 @@ async def parallel_transcribe_endpoint(
                 real_time_factor=stt_result.real_time_factor,
                 word_count=word_count,
                 accuracy_score=accuracy_score,
-                status=status,
-                error=None
+                status="error" if getattr(stt_result, "error", None) else status,
+                error=getattr(stt_result, "error", None)
             )
         
-        google_chirp2_result = convert_stt_result(parallel_results["google_chirp2"])
-        google_short_result = convert_stt_result(parallel_results["google_short"])
+        def cancelled_result(service_name: str) -> STTServiceResult:
+            # Race mode only returns the winner; the other model was cancelled
+            return STTServiceResult(
+                service_name=service_name, transcription="", english_translation="", processing_time=0.0,
+                confidence_score=0.0, audio_duration=0.0, real_time_factor=0.0, word_count=0, accuracy_score=0.0,
+                status="cancelled"
+            )
+        
+        google_chirp2_result = (convert_stt_result(parallel_results["google_chirp2"])
+                                if "google_chirp2" in parallel_results else cancelled_result("google_chirp2"))
+        google_short_result = (convert_stt_result(parallel_results["google_short"])
+                               if "google_short" in parallel_results else cancelled_result("google_short"))
         
         # Create processing summary
         processing_summary = {
+            "mode": mode,
             "total_processing_time": (datetime.datetime.now() - request_time).total_seconds(),
             "google_processing_time": google_chirp2_result.processing_time,
             "google_short_processing_time": google_short_result.processing_time,
@@ -1305,6 +1727,7 @@ async def get_homograph_statistics():
 # --- Pronunciation Assessment Endpoint ---
 @app.post("/pronunciation/assess/", response_model=PronunciationAssessmentResponse)
 async def pronunciation_assessment_endpoint(
+    request: Request,
     user_info: UserInfo = Depends(require_auth),
     audio_file: UploadFile = File(...),
     reference_text: str = Form(...),
@@ -1322,7 +1745,7 @@ async def pronunciation_assessment_endpoint(
     print(f"[{request_time}] INFO: /pronunciation/assess/ received request for text: '{reference_text}' in {language}, revealed: {was_revealed}")
     
     # Check rate limits
-    check_rate_limit(user_info)
+    await check_rate_limit(user_info, request)
     
     # Validate inputs
     validation_service.validate_audio_file(audio_file)
@@ -1468,6 +1891,190 @@ async def synthesize_speech_endpoint(request: SynthesizeSpeechRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"Speech synthesis error: {str(e)}")
 
+# --- Streaming Gemini TTS ---
+
+TTS_STREAM_LATENCY_EVENT = "tts_stream_latency_breakdown"
+
+class StreamSpeechRequest(BaseModel):
+    text: str
+    voice_name: str = "Puck"
+    tone: Optional[str] = None
+    user_id: Optional[str] = None
+    session_id: Optional[str] = None
+
+def _validate_stream_speech_request(text: str, voice_name: str, tone: Optional[str]) -> tuple:
+    """Sanitized (text, voice_name, tone) for a streaming TTS request; raises HTTPException(400)."""
+    text = validation_service.sanitize_text(text or "")
+    if not text:
+        raise HTTPException(status_code=400, detail="Text is required")
+    if voice_name not in GEMINI_TTS_VOICES:
+        raise HTTPException(status_code=400, detail=f"Unsupported voice '{voice_name}'")
+    tone = validation_service.sanitize_text(tone, 100) if tone else None
+    return text, voice_name, tone or None
+
+def _start_tts_stream_tracker(voice_name: str, tone: Optional[str], text: str, transport: str,
+                              user_agent: str, user_id: Optional[str], session_id: Optional[str]) -> LatencyTracker:
+    """LatencyTracker for one streamed synthesis; first_audio is the per-voice time to first PCM chunk."""
+    tracker = LatencyTracker(
+        request_id=f"tts_{voice_name.lower()}_{int(datetime.datetime.now().timestamp() * 1000)}",
+        user_id=user_id or "anonymous",
+        session_id=session_id or "unknown"
+    )
+    tracker.start("total")
+    device_info = detect_device(user_agent)
+    tracker.set_platform(device_info.platform.value)
+    tracker.set_device_type(device_info.device_type.value)
+    tracker.add_metadata("voice_name", voice_name)
+    tracker.add_metadata("response_tone", tone)
+    tracker.add_metadata("text_length", len(text))
+    tracker.add_metadata("transport", transport)
+    tracker.start("tts", {"vendor": "gemini", "voice_name": voice_name, "streaming": True})
+    return tracker
+
+@app.post("/synthesize-speech/stream")
+async def synthesize_speech_stream_endpoint(request: Request, speech_request: StreamSpeechRequest):
+    """
+    Stream Gemini TTS as a chunked WAV (24kHz mono 16-bit) while it is being synthesized.
+    The header declares an unknown length, so players start as soon as the first chunk arrives.
+    """
+    text, voice_name, tone = _validate_stream_speech_request(speech_request.text, speech_request.voice_name, speech_request.tone)
+    print(f"[{datetime.datetime.now()}] INFO: /synthesize-speech/stream received request - voice: {voice_name}, tone: {tone}, text length: {len(text)}")
+    user_agent = request.headers.get("user-agent", "")
+    tracker = _start_tts_stream_tracker(voice_name, tone, text, "http", user_agent, speech_request.user_id, speech_request.session_id)
+
+    pcm_stream = text_to_speech_stream(
+        text, voice_name=voice_name, response_tone=tone,
+        user_id=speech_request.user_id, session_id=speech_request.session_id
+    )
+    # Wait for the first chunk before committing to a 200, so synthesis failures are still reported as errors
+    try:
+        first_chunk = await pcm_stream.__anext__()
+    except StopAsyncIteration:
+        first_chunk = None
+    except HTTPException as e:
+        tracker.add_metadata("error_type", "HTTPException")
+        tracker.add_metadata("error_detail", str(e.detail))
+        tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+        raise
+    if not first_chunk:
+        tracker.add_metadata("error_type", "EmptyAudio")
+        tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+        raise HTTPException(status_code=500, detail="TTS service failed to generate audio.")
+    first_audio = tracker.mark("first_audio", {"voice_name": voice_name})
+    print(f"[{datetime.datetime.now()}] INFO: First audio for voice {voice_name} after {first_audio:.2f}s")
+
+    async def wav_body():
+        finalized = False
+        audio_bytes = len(first_chunk)
+        try:
+            yield wav_stream_header()
+            yield first_chunk
+            async for pcm_chunk in pcm_stream:
+                audio_bytes += len(pcm_chunk)
+                yield pcm_chunk
+            tracker.end("tts", {"audio_bytes": audio_bytes, "success": True})
+            tracker.end("total")
+            tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+            finalized = True
+            print(f"[{datetime.datetime.now()}] 📊 TTS stream completed - voice: {voice_name}, "
+                  f"first audio: {first_audio:.2f}s, total: {tracker.get_duration('total'):.2f}s, audio bytes: {audio_bytes}")
+        except Exception as e:
+            # Headers are already sent; the client sees a truncated WAV
+            print(f"[{datetime.datetime.now()}] ERROR: /synthesize-speech/stream failed mid-stream for voice {voice_name}: {e}")
+            tracker.add_metadata("error_type", type(e).__name__)
+            tracker.add_metadata("error_detail", str(e))
+            tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+            finalized = True
+        finally:
+            await pcm_stream.aclose()
+            if not finalized:
+                # Client disconnected mid-stream
+                tracker.add_metadata("client_disconnected", True)
+                tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+
+    headers = {
+        **tracker.to_response_headers(),
+        "X-TTS-Voice": voice_name,
+        "X-Audio-Sample-Rate": str(TTS_SAMPLE_RATE),
+        **get_mobile_optimized_headers(user_agent)
+    }
+    # Total isn't known yet; the timing headers cover time to first audio
+    headers.pop("X-TOTAL-Duration", None)
+    return StreamingResponse(wav_body(), media_type="audio/wav", headers=headers)
+
+@app.websocket("/synthesize-speech/stream/ws")
+async def synthesize_speech_stream_websocket(websocket: WebSocket):
+    """
+    WebSocket variant of /synthesize-speech/stream; one connection can carry many syntheses.
+    Client sends {"text", "voice_name", "tone", "user_id", "session_id"} per request. Server replies with
+    {"type": "start"}, binary raw PCM messages, then {"type": "done"} with the timing breakdown
+    ({"type": "error"} instead if the request fails).
+    """
+    await websocket.accept()
+    user_agent = websocket.headers.get("user-agent", "")
+    try:
+        while True:
+            try:
+                message = await websocket.receive_json()
+            except json.JSONDecodeError:
+                await websocket.send_json({"type": "error", "detail": "Expected a JSON request message"})
+                continue
+            if not isinstance(message, dict):
+                await websocket.send_json({"type": "error", "detail": "Expected a JSON request message"})
+                continue
+            try:
+                text, voice_name, tone = _validate_stream_speech_request(
+                    message.get("text", ""), message.get("voice_name", "Puck"), message.get("tone")
+                )
+            except HTTPException as e:
+                await websocket.send_json({"type": "error", "detail": e.detail})
+                continue
+
+            user_id, session_id = message.get("user_id"), message.get("session_id")
+            tracker = _start_tts_stream_tracker(voice_name, tone, text, "websocket", user_agent, user_id, session_id)
+            finalized = False
+            try:
+                await websocket.send_json({
+                    "type": "start",
+                    "request_id": tracker.request_id,
+                    "audio_format": "pcm_s16le",
+                    "sample_rate": TTS_SAMPLE_RATE,
+                    "channels": TTS_CHANNELS,
+                    "sample_width": TTS_SAMPLE_WIDTH,
+                    "voice_name": voice_name
+                })
+                audio_bytes = 0
+                async for pcm_chunk in text_to_speech_stream(
+                    text, voice_name=voice_name, response_tone=tone, user_id=user_id, session_id=session_id
+                ):
+                    if audio_bytes == 0:
+                        tracker.mark("first_audio", {"voice_name": voice_name})
+                    audio_bytes += len(pcm_chunk)
+                    await websocket.send_bytes(pcm_chunk)
+                tracker.end("tts", {"audio_bytes": audio_bytes, "success": True})
+                tracker.end("total")
+                await websocket.send_json({
+                    "type": "done",
+                    "request_id": tracker.request_id,
+                    "audio_bytes": audio_bytes,
+                    "breakdown": tracker.get_breakdown()
+                })
+                tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+                finalized = True
+            except HTTPException as e:
+                print(f"[{datetime.datetime.now()}] ERROR: TTS WebSocket stream failed for voice {voice_name}: {e.detail}")
+                tracker.add_metadata("error_type", "HTTPException")
+                tracker.add_metadata("error_detail", str(e.detail))
+                tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+                finalized = True
+                await websocket.send_json({"type": "error", "request_id": tracker.request_id, "detail": e.detail})
+            finally:
+                if not finalized:
+                    tracker.add_metadata("client_disconnected", True)
+                    tracker.finalize(send_to_posthog=True, event_name=TTS_STREAM_LATENCY_EVENT)
+    except WebSocketDisconnect:
+        print(f"[{datetime.datetime.now()}] INFO: TTS WebSocket client disconnected")
+
 # --- NEW SYLLABLE-BASED WRITING GUIDE ENDPOINT ---
 
 class WritingGuideRequest(BaseModel):
@@ -1560,6 +2167,54 @@ class ComplexVowelAnalysisRequest(BaseModel):
     word: str
     target_language: str = "th"
 
+def build_complex_vowel_analysis(word: str, target_language: str, complex_vowels: list) -> dict:
+    """Build the /analyze-complex-vowels/ payload for one word."""
+    result = {
+        "word": word,
+        "target_language": target_language,
+        "complex_vowels_detected": len(complex_vowels),
+        "patterns": []
+    }
+    
+    # Build detailed information for each detected pattern
+    for vowel_pattern in complex_vowels:
+        pattern_info = {
+            "pattern_key": vowel_pattern.pattern_key,
+            "name": vowel_pattern.name,
+            "components": vowel_pattern.components,
+            "component_positions": vowel_pattern.positions,
+            "consonant_position": vowel_pattern.consonant_pos,
+            "romanization": vowel_pattern.romanization,
+            "reading_explanation": vowel_pattern.reading_explanation,
+            "component_explanation": vowel_pattern.component_explanation,
+            "educational_content": generate_complex_vowel_explanation(word, vowel_pattern)
+        }
+        result["patterns"].append(pattern_info)
+    
+    # Add character-by-character analysis with complex vowel context
+    character_analysis = []
+    for i, char in enumerate(word):
+        char_info = {
+            "character": char,
+            "position": i,
+            "complex_vowel_info": None
+        }
+        
+        # Check if this character is part of a complex vowel
+        complex_vowel_info = get_complex_vowel_info(word, i)
+        if complex_vowel_info:
+            char_info["complex_vowel_info"] = {
+                "pattern": complex_vowel_info.pattern_key,
+                "name": complex_vowel_info.name,
+                "role": "consonant" if i == complex_vowel_info.consonant_pos else "vowel_component",
+                "full_pronunciation": complex_vowel_info.romanization
+            }
+        
+        character_analysis.append(char_info)
+    
+    result["character_analysis"] = character_analysis
+    return result
+
 @app.post("/analyze-complex-vowels/")
 async def analyze_complex_vowels_endpoint(request: ComplexVowelAnalysisRequest):
     """
@@ -1580,53 +2235,9 @@ async def analyze_complex_vowels_endpoint(request: ComplexVowelAnalysisRequest):
         if request.target_language.lower() != "th":
             raise HTTPException(status_code=400, detail=f"Complex vowel analysis only supported for Thai (th), not {request.target_language}")
         
-        # Detect complex vowel patterns
+        # Detect complex vowel patterns (one scan; per-character lookups reuse it)
         complex_vowels = detect_complex_vowel_patterns(request.word)
-        
-        result = {
-            "word": request.word,
-            "target_language": request.target_language,
-            "complex_vowels_detected": len(complex_vowels),
-            "patterns": []
-        }
-        
-        # Build detailed information for each detected pattern
-        for vowel_pattern in complex_vowels:
-            pattern_info = {
-                "pattern_key": vowel_pattern.pattern_key,
-                "name": vowel_pattern.name,
-                "components": vowel_pattern.components,
-                "component_positions": vowel_pattern.positions,
-                "consonant_position": vowel_pattern.consonant_pos,
-                "romanization": vowel_pattern.romanization,
-                "reading_explanation": vowel_pattern.reading_explanation,
-                "component_explanation": vowel_pattern.component_explanation,
-                "educational_content": generate_complex_vowel_explanation(request.word, vowel_pattern)
-            }
-            result["patterns"].append(pattern_info)
-        
-        # Add character-by-character analysis with complex vowel context
-        character_analysis = []
-        for i, char in enumerate(request.word):
-            char_info = {
-                "character": char,
-                "position": i,
-                "complex_vowel_info": None
-            }
-            
-            # Check if this character is part of a complex vowel
-            complex_vowel_info = get_complex_vowel_info(request.word, i)
-            if complex_vowel_info:
-                char_info["complex_vowel_info"] = {
-                    "pattern": complex_vowel_info.pattern_key,
-                    "name": complex_vowel_info.name,
-                    "role": "consonant" if i == complex_vowel_info.consonant_pos else "vowel_component",
-                    "full_pronunciation": complex_vowel_info.romanization
-                }
-            
-            character_analysis.append(char_info)
-        
-        result["character_analysis"] = character_analysis
+        result = build_complex_vowel_analysis(request.word, request.target_language, complex_vowels)
         
         print(f"[{datetime.datetime.now()}] INFO: /analyze-complex-vowels/ successful for '{request.word}'. Found {len(complex_vowels)} complex patterns")
         return JSONResponse(content=result)
@@ -1641,6 +2252,50 @@ async def analyze_complex_vowels_endpoint(request: ComplexVowelAnalysisRequest):
         traceback.print_exc()
         raise HTTPException(status_code=500, detail=f"An unexpected error occurred during complex vowel analysis: {str(e)}")
 
+class ComplexVowelBatchRequest(BaseModel):
+    text: Optional[str] = None          # Sentence to tokenize into words
+    words: Optional[List[str]] = None   # Or pre-tokenized words
+    target_language: str = "th"
+
+@app.post("/analyze-complex-vowels/batch")
+async def analyze_complex_vowels_batch_endpoint(request: ComplexVowelBatchRequest):
+    """
+    Complex vowel analysis for every word of a sentence in one request.
+    Returns the same per-word payload as /analyze-complex-vowels/, in word order.
+    """
+    request_time = datetime.datetime.now()
+    print(f"[{request_time}] INFO: /analyze-complex-vowels/batch received request - text: '{request.text}', words: {request.words}")
+    
+    try:
+        if request.target_language.lower() != "th":
+            raise HTTPException(status_code=400, detail=f"Complex vowel analysis only supported for Thai (th), not {request.target_language}")
+        
+        words = request.words
+        if words is None:
+            if not request.text:
+                raise HTTPException(status_code=400, detail="Provide either 'text' or 'words'.")
+            [words] = await run_nlp_task("tokenize_sentences", sentences=[request.text], engine="newmm")
+        words = [word for word in words if word and word.strip()]
+        
+        analyses = analyze_complex_vowels_batch(words)
+        results = [
+            build_complex_vowel_analysis(word, request.target_language, analyses[word]["matches"])
+            for word in words
+        ]
+        
+        total_patterns = sum(result["complex_vowels_detected"] for result in results)
+        print(f"[{datetime.datetime.now()}] INFO: /analyze-complex-vowels/batch successful for {len(words)} words. Found {total_patterns} complex patterns")
+        return JSONResponse(content={"words": words, "results": results, "complex_vowels_detected": total_patterns})
+        
+    except HTTPException as e:
+        print(f"[{datetime.datetime.now()}] ERROR: in /analyze-complex-vowels/batch: {e.detail}")
+        raise e
+    except Exception as e:
+        print(f"[{datetime.datetime.now()}] CRITICAL: Unhandled exception in /analyze-complex-vowels/batch: {e}")
+        import traceback
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=f"An unexpected error occurred during complex vowel analysis: {str(e)}")
+
 @app.get("/sentry-debug")
 async def trigger_error():
     """Test endpoint to verify Sentry integration is working"""
@@ -1684,6 +2339,32 @@ async def get_azure_speech_costs(time_range_hours: int = 24):
         print(f"[{datetime.datetime.now()}] ERROR: Failed to get Azure Speech costs: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to retrieve cost summary: {str(e)}")
 
+@app.get("/azure-speech/requests")
+async def get_azure_speech_requests(
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None, description="'success' or 'failed'"),
+    service: Optional[str] = Query(None, description="'stt', 'tts' or 'pronunciation'"),
+    user_info: UserInfo = Depends(require_admin)
+):
+    """Most recent completed Azure Speech requests, newest first (admin only)"""
+    if status is not None and status not in ("success", "failed"):
+        raise HTTPException(status_code=400, detail="status must be 'success' or 'failed'")
+    requests_data = get_azure_speech_tracker().query_completed(limit, status=status, service=service)
+    return {"status": "success", "count": len(requests_data), "data": requests_data}
+
+@app.get("/monitoring/requests")
+async def get_recent_api_requests(
+    limit: int = Query(100, ge=1, le=1000),
+    status: Optional[str] = Query(None, description="Status code (404) or class (5xx)"),
+    route: Optional[str] = Query(None, description="Route template or path, e.g. /generate-npc-response/"),
+    user_info: UserInfo = Depends(require_admin)
+):
+    """Most recent API requests from the in-memory request log, newest first (admin only)"""
+    if status is not None and not re.fullmatch(r"[1-5](\d\d|xx)", status.lower()):
+        raise HTTPException(status_code=400, detail="status must be a status code (404) or class (5xx)")
+    requests_data = request_logger.query(limit, status=status, route=route)
+    return {"status": "success", "count": len(requests_data), "data": requests_data}
+
 # --- Multi-Service STT/Translation Test Endpoint ---
 
 class MultiServiceTestRequest(BaseModel):
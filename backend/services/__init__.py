@@ -1,3 +1,2 @@
-from . import stt_service
-from . import llm_service
-from . import tts_service 
\ No newline at end of file
+# Submodules are imported explicitly (`from services.stt_service import ...`). Keep this file free of imports:
+# NLP worker processes import services.nlp_worker and must not pull in the vendor SDKs.
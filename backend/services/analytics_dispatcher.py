@@ -0,0 +1,208 @@
+"""
+Non-blocking analytics dispatch: capture() appends to a bounded in-memory queue and a background thread
+sends batches to PostHog, so analytics never adds latency to a player turn. When full, the oldest events are dropped.
+"""
+
+import os
+import time
+import atexit
+import logging
+import datetime
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Union
+
+from .connection_pool import get_connection_pool
+
+POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
+POSTHOG_HOST = os.getenv("POSTHOG_HOST", "https://app.posthog.com")
+# "posthog" sends to PostHog when POSTHOG_API_KEY is set; "noop" counts and discards (tests, local runs)
+ANALYTICS_SINK = os.getenv("ANALYTICS_SINK", "posthog").lower()
+ANALYTICS_QUEUE_SIZE = int(os.getenv("ANALYTICS_QUEUE_SIZE", "5000"))              # Oldest events dropped beyond this
+ANALYTICS_BATCH_SIZE = int(os.getenv("ANALYTICS_BATCH_SIZE", "50"))                # Events per /batch/ request
+ANALYTICS_FLUSH_INTERVAL = float(os.getenv("ANALYTICS_FLUSH_INTERVAL", "2.0"))      # Max seconds an event waits for a batch
+ANALYTICS_SHUTDOWN_TIMEOUT = float(os.getenv("ANALYTICS_SHUTDOWN_TIMEOUT", "5.0"))  # Max seconds spent flushing on shutdown
+# PostHog rejects the whole /batch/ request if any event lacks a distinct_id
+ANALYTICS_ANONYMOUS_ID = os.getenv("ANALYTICS_ANONYMOUS_ID", "anonymous")
+
+
+class PostHogBatchSink:
+    """Sends batches to PostHog's /batch/ endpoint through the shared connection pool"""
+
+    name = "posthog"
+
+    def __init__(self, api_key: str, host: str = POSTHOG_HOST, timeout: float = 5.0):
+        self.api_key = api_key
+        self.url = f"{host.rstrip('/')}/batch/"
+        self.timeout = timeout
+
+    def send(self, events: List[Dict[str, Any]]) -> bool:
+        response = get_connection_pool().post(
+            self.url,
+            json={"api_key": self.api_key, "batch": events},
+            timeout=self.timeout
+        )
+        if response.status_code != 200:
+            logging.warning(f"⚠️ PostHog: batch of {len(events)} events rejected - Status: {response.status_code}")
+            return False
+        return True
+
+
+class NoOpAnalyticsSink:
+    """Accepts and discards every batch; keeps the last events so tests can assert on them"""
+
+    name = "noop"
+
+    def __init__(self, keep: int = 100):
+        self.received = 0
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=keep)
+
+    def send(self, events: List[Dict[str, Any]]) -> bool:
+        self.received += len(events)
+        self.events.extend(events)
+        return True
+
+
+class AnalyticsDispatcher:
+    """Bounded event queue drained in batches by a daemon thread"""
+
+    def __init__(self, sink=None, queue_size: int = ANALYTICS_QUEUE_SIZE, batch_size: int = ANALYTICS_BATCH_SIZE,
+                 flush_interval: float = ANALYTICS_FLUSH_INTERVAL):
+        self.sink = sink if sink is not None else NoOpAnalyticsSink()
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        # deque(maxlen) discards from the left on append, which is exactly drop-oldest
+        self._queue: Deque[Dict[str, Any]] = deque(maxlen=max(1, queue_size))
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+        self.captured = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.batches = 0
+
+    def capture(self, event: str, properties: Optional[Dict[str, Any]] = None,
+                distinct_id: Optional[str] = None, timestamp: Union[str, float, None] = None):
+        """
+        Queue one event. Never blocks on the network; safe to call from the event loop or any thread.
+
+        Args:
+            event: PostHog event name
+            properties: Event properties
+            distinct_id: User the event belongs to (ANALYTICS_ANONYMOUS_ID if None)
+            timestamp: ISO string or epoch seconds; defaults to now, since the event is sent later
+        """
+        if isinstance(timestamp, (int, float)):
+            timestamp = datetime.datetime.fromtimestamp(timestamp).isoformat()
+        payload: Dict[str, Any] = {
+            "event": event,
+            "properties": properties or {},
+            "timestamp": timestamp or datetime.datetime.now().isoformat(),
+            "distinct_id": distinct_id or ANALYTICS_ANONYMOUS_ID,
+        }
+        with self._condition:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(payload)
+            self.captured += 1
+            if len(self._queue) >= self.batch_size:
+                self._condition.notify()
+        self._ensure_started()
+
+    def _ensure_started(self):
+        if self._thread is None and not self._stopping:
+            with self._condition:
+                if self._thread is None and not self._stopping:
+                    self._thread = threading.Thread(target=self._run, name="analytics-dispatcher", daemon=True)
+                    self._thread.start()
+
+    def _take_batch(self) -> List[Dict[str, Any]]:
+        count = min(self.batch_size, len(self._queue))
+        return [self._queue.popleft() for _ in range(count)]
+
+    def _send(self, batch: List[Dict[str, Any]]):
+        try:
+            ok = self.sink.send(batch)
+        except Exception as e:
+            logging.error(f"❌ Analytics: failed to send batch of {len(batch)} events to {self.sink.name}: {e}")
+            ok = False
+        self.batches += 1
+        if ok:
+            self.sent += len(batch)
+        else:
+            self.failed += len(batch)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                if len(self._queue) < self.batch_size and not self._stopping:
+                    self._condition.wait(self.flush_interval)
+                if self._stopping:
+                    return
+                batch = self._take_batch()
+            if batch:
+                self._send(batch)
+
+    def flush(self, timeout: float = ANALYTICS_SHUTDOWN_TIMEOUT):
+        """Stop the flusher and send whatever is still queued, giving up after `timeout` seconds."""
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._condition:
+                batch = self._take_batch()
+            if not batch:
+                break
+            self._send(batch)
+        remaining = len(self._queue)
+        if remaining:
+            logging.warning(f"⚠️ Analytics: {remaining} events unsent at shutdown")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "sink": self.sink.name,
+            "queued": len(self._queue),
+            "max_queued": self._queue.maxlen,
+            "captured": self.captured,
+            "sent": self.sent,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "batches": self.batches,
+        }
+
+
+def _create_sink():
+    if ANALYTICS_SINK == "posthog" and POSTHOG_API_KEY:
+        return PostHogBatchSink(POSTHOG_API_KEY)
+    return NoOpAnalyticsSink()
+
+
+# Global instance getter
+_analytics_dispatcher = None
+_analytics_dispatcher_lock = threading.Lock()
+
+def get_analytics_dispatcher() -> AnalyticsDispatcher:
+    """
+    Get the global analytics dispatcher.
+
+    Returns:
+        AnalyticsDispatcher: The shared instance
+    """
+    global _analytics_dispatcher
+    if _analytics_dispatcher is None:
+        with _analytics_dispatcher_lock:
+            if _analytics_dispatcher is None:
+                _analytics_dispatcher = AnalyticsDispatcher(sink=_create_sink())
+                atexit.register(_analytics_dispatcher.flush)
+    return _analytics_dispatcher
+
+
+def capture_event(event: str, properties: Optional[Dict[str, Any]] = None,
+                  distinct_id: Optional[str] = None, timestamp: Union[str, float, None] = None):
+    """Queue an analytics event on the global dispatcher."""
+    get_analytics_dispatcher().capture(event, properties, distinct_id, timestamp)
@@ -0,0 +1,285 @@
+"""
+Content-addressed cache for synthesized speech (Gemini PCM, Google TTS MP3).
+Keeps hot clips in memory under a byte budget, spills evicted clips to disk and de-duplicates concurrent identical syntheses.
+"""
+
+import os
+import mmap
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+AUDIO_CACHE_ENABLED = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() == "true"
+AUDIO_CACHE_MAX_BYTES = int(os.getenv("AUDIO_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))            # In-memory budget
+AUDIO_CACHE_DISK_MAX_BYTES = int(os.getenv("AUDIO_CACHE_DISK_MAX_BYTES", str(512 * 1024 * 1024)))  # Spill directory budget
+# Set to an empty string to disable the disk tier
+AUDIO_CACHE_DIR = os.getenv(
+    "AUDIO_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "audio")
+)
+
+_FILE_SUFFIX = ".audio"
+
+
+def audio_cache_key(
+    engine: str,
+    text: str,
+    voice: Optional[str] = None,
+    tone: Optional[str] = None,
+    speaking_rate: Optional[float] = None,
+    audio_format: str = "pcm"
+) -> str:
+    """Hash of everything that changes the synthesized audio."""
+    parts = [engine, audio_format, voice or "", (tone or "").strip(), "" if speaking_rate is None else f"{speaking_rate:g}", text]
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    Two-tier audio cache.
+    Memory tier: LRU bounded by total bytes. Disk tier: one file per key, read back with mmap, LRU by byte budget.
+    Disk I/O runs on worker threads so cache hits never block the event loop.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the cache (only once due to singleton)"""
+        if self._initialized:
+            return
+        self.enabled = AUDIO_CACHE_ENABLED
+        self.max_bytes = AUDIO_CACHE_MAX_BYTES
+        self.disk_max_bytes = AUDIO_CACHE_DISK_MAX_BYTES
+        self.cache_dir = AUDIO_CACHE_DIR if self.enabled else ""
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()
+        self._disk_bytes = 0
+        self._state_lock = threading.Lock()
+        self._in_flight: Dict[str, asyncio.Task] = {}
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "single_flight_joins": 0,
+            "memory_evictions": 0,
+            "spills": 0,
+            "disk_evictions": 0,
+            "disk_errors": 0,
+        }
+        if self.cache_dir:
+            self._load_disk_index()
+        self._initialized = True
+
+    # --- Disk tier ---
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _FILE_SUFFIX)
+
+    def _load_disk_index(self):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            files = []
+            for name in os.listdir(self.cache_dir):
+                if name.endswith(_FILE_SUFFIX):
+                    stat = os.stat(os.path.join(self.cache_dir, name))
+                    files.append((stat.st_mtime, name[:-len(_FILE_SUFFIX)], stat.st_size))
+            for _, key, size in sorted(files):
+                self._disk[key] = size
+                self._disk_bytes += size
+            logging.info(f"✅ Audio cache: disk tier at {self.cache_dir} ({len(self._disk)} clips, {self._disk_bytes // 1024}KB)")
+        except OSError as e:
+            self.cache_dir = ""
+            logging.warning(f"⚠️ Audio cache: disk tier unavailable ({e}), using memory tier only")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    data = mapped[:]
+            os.utime(self._path(key))
+            with self._state_lock:
+                if key in self._disk:
+                    self._disk.move_to_end(key)
+            return data
+        except (OSError, ValueError) as e:
+            # ValueError: zero-length file cannot be mapped
+            self.stats["disk_errors"] += 1
+            logging.warning(f"⚠️ Audio cache: could not read clip {key[:12]}: {e}")
+            self._forget_disk(key)
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        if not self.cache_dir or len(data) > self.disk_max_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            self.stats["disk_errors"] += 1
+            logging.warning(f"⚠️ Audio cache: could not spill clip {key[:12]}: {e}")
+            return
+        evicted = []
+        with self._state_lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+            self._disk[key] = len(data)
+            self._disk_bytes += len(data)
+            while self._disk_bytes > self.disk_max_bytes and len(self._disk) > 1:
+                old_key, size = self._disk.popitem(last=False)
+                self._disk_bytes -= size
+                evicted.append(old_key)
+        for old_key in evicted:
+            try:
+                os.remove(self._path(old_key))
+            except OSError:
+                pass
+            self.stats["disk_evictions"] += 1
+
+    def _forget_disk(self, key: str):
+        with self._state_lock:
+            self._disk_bytes -= self._disk.pop(key, 0)
+
+    # --- Memory tier ---
+
+    def _remember(self, key: str, data: bytes):
+        """Insert into the memory tier; returns clips pushed out that are not yet on disk."""
+        spilled = []
+        if len(data) > self.max_bytes:
+            return [(key, data)]
+        with self._state_lock:
+            if key in self._memory:
+                self._memory_bytes -= len(self._memory.pop(key))
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_bytes:
+                old_key, old_data = self._memory.popitem(last=False)
+                self._memory_bytes -= len(old_data)
+                self.stats["memory_evictions"] += 1
+                if old_key not in self._disk:
+                    spilled.append((old_key, old_data))
+        return spilled
+
+    def _spill(self, clips):
+        for key, data in clips:
+            self._write_disk(key, data)
+            self.stats["spills"] += 1
+
+    # --- Public API ---
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for a key, or None."""
+        if not self.enabled:
+            return None
+        with self._state_lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+        if data is not None:
+            self.stats["memory_hits"] += 1
+            return data
+        if self.cache_dir and key in self._disk:
+            data = await asyncio.to_thread(self._read_disk, key)
+            if data is not None:
+                self.stats["disk_hits"] += 1
+                spilled = self._remember(key, data)
+                if spilled:
+                    await asyncio.to_thread(self._spill, spilled)
+                return data
+        return None
+
+    async def put(self, key: str, data: bytes, persist: bool = False):
+        """
+        Store audio. Clips normally reach disk only when evicted from memory;
+        persist=True writes through immediately (used for pre-generated audio that should survive restarts).
+        """
+        if not self.enabled or not data:
+            return
+        spilled = self._remember(key, data)
+        if persist and key not in self._disk:
+            spilled.append((key, data))
+        if spilled and self.cache_dir:
+            await asyncio.to_thread(self._spill, spilled)
+
+    def contains(self, key: str) -> bool:
+        """True if the key is cached in either tier (no I/O)."""
+        return key in self._memory or key in self._disk
+
+    async def _produce(self, key: str, producer: Callable[[], Awaitable[bytes]], persist: bool) -> bytes:
+        try:
+            data = await producer()
+            await self.put(key, data, persist=persist)
+            return data
+        finally:
+            self._in_flight.pop(key, None)
+
+    async def get_or_create(self, key: str, producer: Callable[[], Awaitable[bytes]], persist: bool = False) -> bytes:
+        """
+        Return cached audio or run producer() once, sharing its result with concurrent callers for the same key.
+        The producer runs in its own task, so a cancelled caller (including the one that started it) never cancels
+        it for the others. Failures are not cached; every waiter sees the producer's exception.
+        """
+        if not self.enabled:
+            return await producer()
+        data = await self.get(key)
+        if data is not None:
+            return data
+
+        task = self._in_flight.get(key)
+        if task is not None:
+            self.stats["single_flight_joins"] += 1
+        else:
+            self.stats["misses"] += 1
+            task = asyncio.ensure_future(self._produce(key, producer, persist))
+            self._in_flight[key] = task
+            # Mark retrieved so a failure nobody is still waiting for doesn't log "exception was never retrieved"
+            task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        return await asyncio.shield(task)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Counters and tier sizes for health/monitoring endpoints."""
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"] + self.stats["single_flight_joins"]
+        hits = lookups - self.stats["misses"]
+        return {
+            "enabled": self.enabled,
+            "memory_clips": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes,
+            "disk_tier": bool(self.cache_dir),
+            "disk_clips": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "disk_max_bytes": self.disk_max_bytes,
+            "in_flight": len(self._in_flight),
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            **self.stats,
+        }
+
+
+# Global instance getter
+_audio_cache = None
+
+def get_audio_cache() -> AudioCache:
+    """
+    Get the global audio cache instance.
+
+    Returns:
+        AudioCache: The singleton instance
+    """
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = AudioCache()
+    return _audio_cache
@@ -0,0 +1,115 @@
+"""
+Compressed audio output (MP3, Opus) for synthesized speech.
+Picks a format from the client's Accept header and device, and encodes raw PCM with pydub/ffmpeg.
+"""
+
+import io
+import os
+import shutil
+import logging
+from typing import Dict, List, Optional, Tuple
+
+from utils.device_detection import DeviceInfo, Platform
+
+# Import pydub if available (needs an ffmpeg binary for MP3/Opus)
+try:
+    from pydub import AudioSegment
+    PYDUB_AVAILABLE = True
+except ImportError:
+    PYDUB_AVAILABLE = False
+
+AUDIO_ENCODING_ENABLED = os.getenv("AUDIO_ENCODING_ENABLED", "true").lower() == "true"
+AUDIO_MP3_BITRATE = os.getenv("AUDIO_MP3_BITRATE", "48k")
+AUDIO_OPUS_BITRATE = os.getenv("AUDIO_OPUS_BITRATE", "24k")
+
+# Format -> response media type
+AUDIO_MEDIA_TYPES: Dict[str, str] = {
+    "wav": "audio/wav",
+    "mp3": "audio/mpeg",
+    "opus": "audio/ogg; codecs=opus",
+}
+# Accept media types (lower case, parameters stripped) -> format
+_ACCEPT_FORMATS: Dict[str, str] = {
+    "audio/wav": "wav",
+    "audio/x-wav": "wav",
+    "audio/wave": "wav",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/ogg": "opus",
+    "audio/opus": "opus",
+}
+COMPRESSED_AUDIO_FORMATS = ("opus", "mp3")
+
+
+def compressed_encoding_available() -> bool:
+    """True if pydub and an ffmpeg binary are installed."""
+    return AUDIO_ENCODING_ENABLED and PYDUB_AVAILABLE and shutil.which("ffmpeg") is not None
+
+
+def _parse_accept(accept: str) -> List[Tuple[str, float]]:
+    """(media type, q) pairs from an Accept header, in header order."""
+    entries = []
+    for item in accept.split(","):
+        parts = [part.strip() for part in item.split(";")]
+        media_type = parts[0].lower()
+        if not media_type:
+            continue
+        quality = 1.0
+        for parameter in parts[1:]:
+            if parameter.startswith("q="):
+                try:
+                    quality = float(parameter[2:])
+                except ValueError:
+                    quality = 0.0
+        entries.append((media_type, quality))
+    return entries
+
+
+def negotiate_audio_format(accept: Optional[str], device_info: DeviceInfo) -> str:
+    """
+    Choose "opus", "mp3" or "wav" for a speech response.
+
+    Compressed audio is only sent when the client names a compressed type in Accept, so clients
+    sending */* (or nothing) keep getting WAV. Among equally preferred types Opus wins, except on
+    iOS, where AVFoundation can't play Ogg Opus on older releases and MP3 is preferred.
+    """
+    if not accept or not compressed_encoding_available():
+        return "wav"
+
+    qualities: Dict[str, float] = {}
+    for media_type, quality in _parse_accept(accept):
+        audio_format = _ACCEPT_FORMATS.get(media_type)
+        if audio_format:
+            qualities[audio_format] = max(qualities.get(audio_format, 0.0), quality)
+
+    preference = ["mp3", "opus"] if device_info.platform == Platform.IOS else ["opus", "mp3"]
+    candidates = [fmt for fmt in preference if qualities.get(fmt, 0.0) > 0]
+    if not candidates:
+        return "wav"
+    best = max(candidates, key=lambda fmt: qualities[fmt])  # max() keeps the first of equal candidates
+    # Don't compress for a client that explicitly prefers WAV
+    if qualities.get("wav", 0.0) > qualities[best]:
+        return "wav"
+    return best
+
+
+def encode_pcm(pcm: bytes, audio_format: str, sample_rate: int, channels: int, sample_width: int) -> bytes:
+    """
+    Encode raw little-endian PCM as MP3 or Ogg Opus. Blocking (runs ffmpeg); call it off the event loop.
+    """
+    if audio_format not in COMPRESSED_AUDIO_FORMATS:
+        raise ValueError(f"Unsupported compressed audio format: {audio_format}")
+    if not PYDUB_AVAILABLE:
+        raise RuntimeError("pydub is not installed")
+
+    segment = AudioSegment(data=pcm, sample_width=sample_width, frame_rate=sample_rate, channels=channels)
+    buffer = io.BytesIO()
+    if audio_format == "mp3":
+        segment.export(buffer, format="mp3", bitrate=AUDIO_MP3_BITRATE)
+    else:
+        # Opus is tuned for speech at low bitrates; "voip" favours intelligibility
+        segment.export(buffer, format="ogg", codec="libopus", bitrate=AUDIO_OPUS_BITRATE,
+                       parameters=["-application", "voip"])
+    encoded = buffer.getvalue()
+    logging.debug(f"Encoded {len(pcm)} bytes of PCM to {len(encoded)} bytes of {audio_format}")
+    return encoded
@@ -6,7 +6,11 @@ Handles JWT token validation with Supabase integration.
 import os
 import jwt
 import time
-from typing import Optional, Dict, Any
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional, Dict, Any, Tuple
 from datetime import datetime, timedelta
 from fastapi import HTTPException, Request
 from pydantic import BaseModel
@@ -16,8 +20,17 @@ from functools import wraps
 from jwt import PyJWKClient
 from jwt.exceptions import PyJWKClientError, InvalidTokenError
 
+from .rate_limiter import RateLimitResult, get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))                  # Verified tokens kept
+AUTH_JWKS_REFRESH_INTERVAL = float(os.getenv("AUTH_JWKS_REFRESH_INTERVAL", "600"))        # Background refresh period (s)
+AUTH_JWKS_MIN_REFRESH_INTERVAL = float(os.getenv("AUTH_JWKS_MIN_REFRESH_INTERVAL", "30")) # Floor between refreshes (unknown kid, retries)
+AUTH_JWKS_INITIAL_WAIT = float(os.getenv("AUTH_JWKS_INITIAL_WAIT", "5"))                  # Max wait for the first key set (s)
+# Comma-separated Supabase user ids allowed on operator endpoints (users with app_metadata.role == "admin" also are)
+ADMIN_USER_IDS = {user_id.strip() for user_id in os.getenv("ADMIN_USER_IDS", "").split(",") if user_id.strip()}
+
 class UserInfo(BaseModel):
     """User information extracted from JWT token"""
     user_id: str
@@ -46,11 +59,155 @@ class AuthService:
             try:
                 self.jwk_client = PyJWKClient(self.jwks_url, cache_keys=True)
                 self.enabled = True
+                self._init_caches()
                 logger.info(f"Auth service initialized with JWKS endpoint: {self.jwks_url}")
             except Exception as e:
                 logger.error(f"Failed to initialize JWKS client: {e}")
                 self.enabled = False
     
+    # --- Verified-token cache and JWKS key set ---
+
+    def _init_caches(self):
+        # token sha256 -> (UserInfo, exp, kid); tokens themselves are never stored
+        self._token_cache: "OrderedDict[bytes, Tuple[UserInfo, float, Optional[str]]]" = OrderedDict()
+        self._token_cache_lock = threading.Lock()
+        self.token_cache_hits = 0
+        self.token_cache_misses = 0
+        # kid -> PyJWK, replaced wholesale by the background refresher
+        self._signing_keys: Dict[str, Any] = {}
+        self._keys_loaded = threading.Event()
+        self.jwks_fetched_at = 0.0
+        self.jwks_refreshes = 0
+        self.jwks_refresh_failures = 0
+        self.jwks_last_error: Optional[str] = None
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._refresh_wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._last_refresh_attempt = 0.0
+
+    def _cache_get(self, token_hash: bytes) -> Optional[UserInfo]:
+        with self._token_cache_lock:
+            cached = self._token_cache.get(token_hash)
+            if cached is None:
+                self.token_cache_misses += 1
+                return None
+            if cached[1] <= time.time():
+                del self._token_cache[token_hash]
+                self.token_cache_misses += 1
+                return None
+            self._token_cache.move_to_end(token_hash)
+            self.token_cache_hits += 1
+            return cached[0]
+
+    def _cache_put(self, token_hash: bytes, user_info: UserInfo, exp: float, kid: Optional[str]):
+        with self._token_cache_lock:
+            self._token_cache[token_hash] = (user_info, exp, kid)
+            self._token_cache.move_to_end(token_hash)
+            while len(self._token_cache) > AUTH_TOKEN_CACHE_SIZE:
+                self._token_cache.popitem(last=False)
+
+    def _fetch_jwks(self) -> Dict[str, Any]:
+        """Fetch the JWKS document and return kid -> PyJWK. Blocking; never called on the request path."""
+        jwk_set = self.jwk_client.get_jwk_set(refresh=True)
+        return {key.key_id: key for key in jwk_set.keys if key.key_id}
+
+    def _install_keys(self, keys: Dict[str, Any]):
+        self._signing_keys = keys
+        self.jwks_fetched_at = time.time()
+        self.jwks_refreshes += 1
+        self.jwks_last_error = None
+        self._keys_loaded.set()
+        # Tokens signed by a key that was rotated out stop being served from the cache
+        with self._token_cache_lock:
+            revoked = [token_hash for token_hash, (_, _, kid) in self._token_cache.items() if kid not in keys]
+            for token_hash in revoked:
+                del self._token_cache[token_hash]
+        if revoked:
+            logger.info(f"Dropped {len(revoked)} cached tokens signed by rotated-out keys")
+
+    async def _refresh_loop(self):
+        while True:
+            self._last_refresh_attempt = time.time()
+            try:
+                self._install_keys(await asyncio.to_thread(self._fetch_jwks))
+                logger.info(f"JWKS refreshed: {len(self._signing_keys)} signing keys")
+                interval = AUTH_JWKS_REFRESH_INTERVAL
+            except Exception as e:
+                # Keep serving the previous (stale) key set and retry sooner
+                self.jwks_refresh_failures += 1
+                self.jwks_last_error = str(e)
+                logger.error(f"JWKS refresh failed, serving keys fetched {self._jwks_age():.0f}s ago: {e}")
+                interval = AUTH_JWKS_MIN_REFRESH_INTERVAL
+            try:
+                await asyncio.wait_for(self._refresh_wakeup.wait(), timeout=interval)
+                # Woken early (unknown kid); still respect the floor between fetches
+                await asyncio.sleep(max(0.0, AUTH_JWKS_MIN_REFRESH_INTERVAL - (time.time() - self._last_refresh_attempt)))
+            except asyncio.TimeoutError:
+                pass
+            self._refresh_wakeup.clear()
+
+    def start_jwks_refresh(self):
+        """Start the background JWKS refresher on the running loop (idempotent)."""
+        if not self.enabled:
+            return
+        if self._refresh_task is None or self._refresh_task.done():
+            self._loop = asyncio.get_running_loop()
+            self._refresh_wakeup = asyncio.Event()
+            self._refresh_task = self._loop.create_task(self._refresh_loop())
+            logger.info(f"JWKS background refresh started - every {AUTH_JWKS_REFRESH_INTERVAL:.0f}s")
+
+    def stop_jwks_refresh(self):
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+        self._refresh_task = None
+
+    def _request_jwks_refresh(self):
+        """Ask the refresher to fetch keys soon. Safe to call from request threads; never blocks on the fetch."""
+        if self._loop is not None and self._refresh_wakeup is not None:
+            self._loop.call_soon_threadsafe(self._refresh_wakeup.set)
+
+    def _jwks_age(self) -> float:
+        return time.time() - self.jwks_fetched_at if self.jwks_fetched_at else float("inf")
+
+    def _get_signing_key(self, token: str) -> Tuple[Any, Optional[str]]:
+        """Signing key for a token from the locally held key set."""
+        kid = jwt.get_unverified_header(token).get("kid")
+        if not self._keys_loaded.is_set():
+            if self._refresh_task is None:
+                # No background refresher (scripts, tests): load the key set once inline
+                self._install_keys(self._fetch_jwks())
+            elif not self._keys_loaded.wait(timeout=AUTH_JWKS_INITIAL_WAIT):
+                raise PyJWKClientError("JWKS not loaded yet")
+        key = self._signing_keys.get(kid)
+        if key is None:
+            # Possibly a newly rotated key: refresh in the background, the client's retry will pick it up
+            self._request_jwks_refresh()
+            raise PyJWKClientError(f"Unable to find a signing key that matches kid '{kid}'")
+        return key, kid
+
+    def get_stats(self) -> Dict[str, Any]:
+        if not self.enabled:
+            return {"enabled": False}
+        lookups = self.token_cache_hits + self.token_cache_misses
+        return {
+            "enabled": True,
+            "token_cache": {
+                "entries": len(self._token_cache),
+                "max_entries": AUTH_TOKEN_CACHE_SIZE,
+                "hits": self.token_cache_hits,
+                "misses": self.token_cache_misses,
+                "hit_rate": round(self.token_cache_hits / lookups, 3) if lookups else 0.0,
+            },
+            "jwks": {
+                "keys": len(self._signing_keys),
+                "age_s": round(self._jwks_age(), 1) if self.jwks_fetched_at else None,
+                "refreshing": self._refresh_task is not None and not self._refresh_task.done(),
+                "refreshes": self.jwks_refreshes,
+                "refresh_failures": self.jwks_refresh_failures,
+                "last_error": self.jwks_last_error,
+            },
+        }
+
     def verify_jwt_token(self, token: str) -> Optional[UserInfo]:
         """
         Verify JWT token using JWKS endpoint (modern Supabase approach)
@@ -74,8 +231,15 @@ class AuthService:
             if token.startswith('Bearer '):
                 token = token[7:]
             
-            # Get the signing key from JWKS endpoint
-            signing_key = self.jwk_client.get_signing_key_from_jwt(token)
+            # Clients reuse a token for many turns; skip the signature check until it expires
+            token_hash = hashlib.sha256(token.encode("utf-8")).digest()
+            cached_user = self._cache_get(token_hash)
+            if cached_user is not None:
+                logger.debug(f"Authenticated user from token cache: {cached_user.user_id}")
+                return cached_user
+            
+            # Get the signing key from the locally held JWKS (refreshed in the background)
+            signing_key, kid = self._get_signing_key(token)
             
             # Verify and decode the JWT with modern algorithms (ES256/RS256)
             payload = jwt.decode(
@@ -95,11 +259,14 @@ class AuthService:
                 app_metadata=payload.get("app_metadata", {})
             )
             
+            if payload.get("exp"):
+                self._cache_put(token_hash, user_info, float(payload["exp"]), kid)
+            
             logger.info(f"Successfully authenticated user via JWKS: {user_info.user_id}")
             return user_info
             
         except PyJWKClientError as e:
-            logger.error(f"Failed to fetch JWKS: {e}")
+            logger.error(f"JWKS signing key unavailable: {e}")
             return None
         except jwt.ExpiredSignatureError:
             logger.warning("JWT token has expired")
@@ -182,6 +349,27 @@ def require_auth(request: Request) -> UserInfo:
     """
     return auth_service.authenticate_request(request)
 
+def require_admin(request: Request) -> UserInfo:
+    """
+    FastAPI dependency for operator-only endpoints (request logs with client IPs, user and session ids)
+    
+    Args:
+        request: FastAPI request object
+        
+    Returns:
+        UserInfo object for the authenticated admin
+        
+    Raises:
+        HTTPException: 401 if authentication fails, 403 if the user is not an admin
+    """
+    user_info = auth_service.authenticate_request(request)
+    if user_info.user_id not in ADMIN_USER_IDS and user_info.app_metadata.get("role") != "admin":
+        raise HTTPException(
+            status_code=403,
+            detail="Admin access required"
+        )
+    return user_info
+
 def optional_auth(request: Request) -> Optional[UserInfo]:
     """
     FastAPI dependency for optional authentication
@@ -197,58 +385,31 @@ def optional_auth(request: Request) -> Optional[UserInfo]:
     except HTTPException:
         return None
 
-# Rate limiting (basic implementation)
-class RateLimiter:
-    """Simple in-memory rate limiter"""
-    
-    def __init__(self):
-        self.requests = {}
-        self.beta_limit = 100  # 100 requests per hour for beta
-        self.window = 3600  # 1 hour window
-    
-    def is_allowed(self, user_id: str) -> bool:
-        """
-        Check if request is allowed based on rate limits
-        
-        Args:
-            user_id: User ID for rate limiting
-            
-        Returns:
-            True if request is allowed, False otherwise
-        """
-        current_time = time.time()
-        
-        # Clean old entries
-        if user_id in self.requests:
-            self.requests[user_id] = [
-                req_time for req_time in self.requests[user_id]
-                if current_time - req_time < self.window
-            ]
-        else:
-            self.requests[user_id] = []
-        
-        # Check if under limit
-        if len(self.requests[user_id]) < self.beta_limit:
-            self.requests[user_id].append(current_time)
-            return True
-        
-        return False
-
-# Global rate limiter instance
-rate_limiter = RateLimiter()
+# Rate limiting (sliding-window counter, shared across workers - see rate_limiter.py)
+rate_limiter = get_rate_limiter()
 
-def check_rate_limit(user_info: UserInfo) -> None:
+async def check_rate_limit(user_info: UserInfo, request: Optional[Request] = None) -> RateLimitResult:
     """
-    Check rate limits for user
+    Check rate limits for user. The store write (a SQLite transaction by default) runs in a worker thread,
+    so a busy limiter database never stalls the event loop.
     
     Args:
         user_info: User information
+        request: If given, the result is stored on request.state so X-RateLimit-* headers are added to the response
+        
+    Returns:
+        RateLimitResult for the request
         
     Raises:
         HTTPException: If rate limit is exceeded
     """
-    if not rate_limiter.is_allowed(user_info.user_id):
+    result = await asyncio.to_thread(rate_limiter.check, user_info.user_id)
+    if request is not None:
+        request.state.rate_limit = result
+    if not result.allowed:
         raise HTTPException(
             status_code=429,
-            detail="Rate limit exceeded - please try again later"
-        )
\ No newline at end of file
+            detail="Rate limit exceeded - please try again later",
+            headers=result.headers()
+        )
+    return result
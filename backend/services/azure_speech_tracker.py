@@ -13,12 +13,14 @@ from typing import Optional, Dict, Any, List
 from dataclasses import dataclass, asdict
 from enum import Enum
 import requests
-from .connection_pool import get_connection_pool
+from .analytics_dispatcher import capture_event
 from collections import defaultdict
 import threading
+from .ring_buffer import RingBuffer
 
 # PostHog Configuration
 POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
+AZURE_SPEECH_HISTORY_CAPACITY = int(os.getenv("AZURE_SPEECH_HISTORY_CAPACITY", "1000"))  # Completed requests kept
 
 class AzureSpeechService(Enum):
     """Supported Azure Speech Services"""
@@ -79,6 +81,32 @@ class AzureSpeechResponse:
         data['timestamp'] = self.timestamp.isoformat()
         return data
 
+class CompletedSpeechRecord:
+    """Compact history entry for a finished Azure Speech request"""
+
+    __slots__ = ("request_id", "service", "user_id", "session_id", "language", "started_at", "completed_at",
+                 "success", "response_time_ms", "estimated_cost_usd", "billable_units", "error_code")
+
+    def __init__(self, request_data: "AzureSpeechRequest", response_data: "AzureSpeechResponse"):
+        self.request_id = request_data.request_id
+        self.service = request_data.service.value
+        self.user_id = request_data.user_id
+        self.session_id = request_data.session_id
+        self.language = request_data.language
+        self.started_at = request_data.timestamp.timestamp()
+        self.completed_at = response_data.timestamp.timestamp()
+        self.success = response_data.success
+        self.response_time_ms = response_data.response_time_ms
+        self.estimated_cost_usd = response_data.estimated_cost_usd
+        self.billable_units = response_data.billable_units
+        self.error_code = response_data.error_code
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['started_at'] = datetime.datetime.fromtimestamp(self.started_at).isoformat()
+        data['completed_at'] = datetime.datetime.fromtimestamp(self.completed_at).isoformat()
+        return data
+
 class AzureSpeechCostCalculator:
     """Calculate costs for Azure Speech Services based on official pricing"""
     
@@ -129,7 +157,7 @@ class AzureSpeechTracker:
     
     def __init__(self):
         self.active_requests: Dict[str, AzureSpeechRequest] = {}
-        self.completed_requests: List[Dict[str, Any]] = []
+        self.completed_requests = RingBuffer(AZURE_SPEECH_HISTORY_CAPACITY)
         self.metrics = defaultdict(lambda: defaultdict(int))
         self.cost_totals = defaultdict(float)
         self._lock = threading.Lock()
@@ -219,17 +247,9 @@ class AzureSpeechTracker:
                 self.metrics[service_key]['failed_requests'] += 1
             
             self.metrics[service_key]['total_response_time_ms'] += response_time_ms
-            
-            # Store completed request
-            completed_entry = {
-                'request': request_data.to_dict(),
-                'response': response_data.to_dict()
-            }
-            self.completed_requests.append(completed_entry)
-            
-            # Keep only last 1000 completed requests to prevent memory issues
-            if len(self.completed_requests) > 1000:
-                self.completed_requests = self.completed_requests[-1000:]
+        
+        # Store completed request (the ring overwrites the oldest once full)
+        self.completed_requests.append(CompletedSpeechRecord(request_data, response_data))
         
         # Track to PostHog
         self._track_to_posthog(request_data, response_data)
@@ -243,70 +263,44 @@ class AzureSpeechTracker:
         return response_data
     
     def _track_to_posthog(self, request_data: AzureSpeechRequest, response_data: AzureSpeechResponse):
-        """Send tracking data to PostHog"""
-        if not POSTHOG_API_KEY:
-            return
+        """Queue tracking data for PostHog (sent in the background by the analytics dispatcher)"""
+        properties = {
+            "service": request_data.service.value,
+            "success": response_data.success,
+            "response_time_ms": response_data.response_time_ms,
+            "estimated_cost_usd": response_data.estimated_cost_usd,
+            "billable_units": response_data.billable_units,
+            "language": request_data.language,
+            "region": request_data.region,
+            "timestamp": response_data.timestamp.isoformat(),
+        }
         
-        try:
-            event_data = {
-                "api_key": POSTHOG_API_KEY,
-                "event": f"azure_speech_{request_data.service.value}",
-                "properties": {
-                    "service": request_data.service.value,
-                    "success": response_data.success,
-                    "response_time_ms": response_data.response_time_ms,
-                    "estimated_cost_usd": response_data.estimated_cost_usd,
-                    "billable_units": response_data.billable_units,
-                    "language": request_data.language,
-                    "region": request_data.region,
-                    "timestamp": response_data.timestamp.isoformat(),
-                },
-                "timestamp": response_data.timestamp.isoformat(),
-            }
-            
-            # Add user identification - PostHog requires distinct_id
-            if request_data.user_id:
-                event_data["distinct_id"] = request_data.user_id
-            else:
-                # Use a fallback distinct_id if user_id is None
-                event_data["distinct_id"] = f"anonymous_{request_data.request_id}"
-            
-            if request_data.session_id:
-                event_data["properties"]["session_id"] = request_data.session_id
-            
-            # Add service-specific properties
-            if request_data.service == AzureSpeechService.PRONUNCIATION_ASSESSMENT:
-                if response_data.pronunciation_score:
-                    event_data["properties"]["pronunciation_score"] = response_data.pronunciation_score
-                if response_data.accuracy_score:
-                    event_data["properties"]["accuracy_score"] = response_data.accuracy_score
-                if request_data.reference_text:
-                    event_data["properties"]["reference_text_length"] = len(request_data.reference_text)
-            
-            # Add error details if failed
-            if not response_data.success:
-                if response_data.error_code:
-                    event_data["properties"]["error_code"] = response_data.error_code
-                if response_data.error_message:
-                    event_data["properties"]["error_message"] = response_data.error_message
-            
-            # Send to PostHog using connection pool
-            connection_pool = get_connection_pool()
-            response = connection_pool.post(
-                "https://app.posthog.com/capture/",
-                json=event_data,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                print(f"[{datetime.datetime.now()}] ✅ PostHog: Azure Speech {request_data.service.value} event tracked - "
-                      f"Cost: ${response_data.estimated_cost_usd:.6f}, User: {request_data.user_id}")
-            else:
-                print(f"[{datetime.datetime.now()}] ⚠️ PostHog: Failed to track Azure Speech event - "
-                      f"Status: {response.status_code}")
-                
-        except Exception as e:
-            print(f"[{datetime.datetime.now()}] ⚠️ PostHog: Error tracking Azure Speech event: {e}")
+        if request_data.session_id:
+            properties["session_id"] = request_data.session_id
+        
+        # Add service-specific properties
+        if request_data.service == AzureSpeechService.PRONUNCIATION_ASSESSMENT:
+            if response_data.pronunciation_score:
+                properties["pronunciation_score"] = response_data.pronunciation_score
+            if response_data.accuracy_score:
+                properties["accuracy_score"] = response_data.accuracy_score
+            if request_data.reference_text:
+                properties["reference_text_length"] = len(request_data.reference_text)
+        
+        # Add error details if failed
+        if not response_data.success:
+            if response_data.error_code:
+                properties["error_code"] = response_data.error_code
+            if response_data.error_message:
+                properties["error_message"] = response_data.error_message
+        
+        capture_event(
+            f"azure_speech_{request_data.service.value}",
+            properties,
+            # PostHog requires distinct_id; fall back to the request id for anonymous calls
+            distinct_id=request_data.user_id or f"anonymous_{request_data.request_id}",
+            timestamp=response_data.timestamp.isoformat()
+        )
     
     def get_metrics(self) -> Dict[str, Any]:
         """Get current tracking metrics"""
@@ -339,21 +333,15 @@ class AzureSpeechTracker:
     def get_cost_summary(self, time_range_hours: int = 24) -> Dict[str, Any]:
         """Get cost summary for a specific time range"""
         cutoff_time = datetime.datetime.now() - datetime.timedelta(hours=time_range_hours)
-        
-        with self._lock:
-            recent_requests = [
-                req for req in self.completed_requests 
-                if datetime.datetime.fromisoformat(req['response']['timestamp']) > cutoff_time
-            ]
+        cutoff = cutoff_time.timestamp()
+        recent_requests = self.completed_requests.latest(predicate=lambda record: record.completed_at > cutoff)
         
         cost_by_service = defaultdict(float)
         requests_by_service = defaultdict(int)
         
-        for req in recent_requests:
-            service = req['request']['service']
-            cost = req['response']['estimated_cost_usd']
-            cost_by_service[service] += cost
-            requests_by_service[service] += 1
+        for record in recent_requests:
+            cost_by_service[record.service] += record.estimated_cost_usd
+            requests_by_service[record.service] += 1
         
         return {
             'time_range_hours': time_range_hours,
@@ -364,6 +352,22 @@ class AzureSpeechTracker:
             'period_end': datetime.datetime.now().isoformat()
         }
 
+    def query_completed(self, limit: int = 100, status: Optional[str] = None,
+                        service: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Most recent completed requests first.
+
+        Args:
+            limit: Maximum entries to return
+            status: "success" or "failed"
+            service: "stt", "tts" or "pronunciation"
+        """
+        def matches(record: CompletedSpeechRecord) -> bool:
+            if status is not None and record.success != (status == "success"):
+                return False
+            return service is None or record.service == service
+        return [record.to_dict() for record in self.completed_requests.latest(limit, matches)]
+
 # Global tracker instance
 _tracker_instance = None
 
@@ -0,0 +1,196 @@
+"""
+Process-wide registry for vendor SDK clients (Google Translate/TTS/Speech, Gemini).
+Clients are created lazily once per process, shared across requests, and report health and usage metrics.
+"""
+
+import time
+import logging
+import threading
+import concurrent.futures
+from typing import Any, Callable, Dict, List, Optional
+
+# Health probes run on a worker thread so a hung vendor cannot stall the caller
+DEFAULT_PROBE_TIMEOUT = 5.0
+
+
+class ClientMetrics:
+    """Usage and health counters for a single registered client"""
+
+    def __init__(self):
+        self.created_at: Optional[float] = None
+        self.creation_time_ms: Optional[int] = None
+        self.creation_failures = 0
+        self.acquisitions = 0
+        self.call_errors = 0
+        self.last_error: Optional[str] = None
+        self.last_error_at: Optional[float] = None
+        self.healthy: Optional[bool] = None
+        self.last_probe_at: Optional[float] = None
+        self.last_probe_ms: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "initialized": self.created_at is not None,
+            "created_at": self.created_at,
+            "creation_time_ms": self.creation_time_ms,
+            "creation_failures": self.creation_failures,
+            "acquisitions": self.acquisitions,
+            "call_errors": self.call_errors,
+            "last_error": self.last_error,
+            "last_error_at": self.last_error_at,
+            "healthy": self.healthy,
+            "last_probe_at": self.last_probe_at,
+            "last_probe_ms": self.last_probe_ms,
+        }
+
+
+class _ClientEntry:
+    """Factory, optional health probe and the lazily created instance"""
+
+    def __init__(self, factory: Callable[[], Any], probe: Optional[Callable[[Any], Any]] = None):
+        self.factory = factory
+        self.probe = probe
+        self.instance = None
+        self.lock = threading.Lock()
+        self.metrics = ClientMetrics()
+
+
+class ClientRegistry:
+    """
+    Singleton registry of shared SDK clients.
+    Service modules register a factory (and optionally a cheap health probe) at import time;
+    the client itself is only constructed on first use or during startup warm-up.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the registry (only once due to singleton)"""
+        if self._initialized:
+            return
+        self._entries: Dict[str, _ClientEntry] = {}
+        self._entries_lock = threading.Lock()
+        self._initialized = True
+
+    def register(self, name: str, factory: Callable[[], Any], probe: Optional[Callable[[Any], Any]] = None):
+        """
+        Register a client factory under a name.
+        Re-registering an existing name keeps the already created instance.
+        """
+        with self._entries_lock:
+            if name in self._entries:
+                return
+            self._entries[name] = _ClientEntry(factory, probe)
+        logging.debug(f"Client registry: registered '{name}'")
+
+    def _entry(self, name: str) -> _ClientEntry:
+        entry = self._entries.get(name)
+        if entry is None:
+            raise KeyError(f"Client '{name}' is not registered")
+        return entry
+
+    def get(self, name: str) -> Any:
+        """Return the shared client, creating it on first use (thread-safe)."""
+        entry = self._entry(name)
+        instance = entry.instance
+        if instance is None:
+            with entry.lock:
+                if entry.instance is None:
+                    start_time = time.time()
+                    try:
+                        entry.instance = entry.factory()
+                    except Exception as e:
+                        entry.metrics.creation_failures += 1
+                        entry.metrics.last_error = str(e)
+                        entry.metrics.last_error_at = time.time()
+                        logging.error(f"❌ Client registry: failed to create '{name}': {e}")
+                        raise
+                    entry.metrics.created_at = time.time()
+                    entry.metrics.creation_time_ms = int((entry.metrics.created_at - start_time) * 1000)
+                    logging.info(f"✅ Client registry: created '{name}' in {entry.metrics.creation_time_ms}ms")
+                instance = entry.instance
+        entry.metrics.acquisitions += 1
+        return instance
+
+    def record_error(self, name: str, error: Exception):
+        """Record a failed call made with a registered client."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return
+        entry.metrics.call_errors += 1
+        entry.metrics.last_error = str(error)
+        entry.metrics.last_error_at = time.time()
+
+    def reset(self, name: str):
+        """Drop a client instance so the next get() rebuilds it (e.g. after credential rotation)."""
+        entry = self._entry(name)
+        with entry.lock:
+            entry.instance = None
+            entry.metrics.created_at = None
+
+    def probe(self, name: str, timeout: float = DEFAULT_PROBE_TIMEOUT) -> bool:
+        """
+        Run the client's health probe. Clients without a probe are healthy once constructed.
+        """
+        entry = self._entry(name)
+        start_time = time.time()
+        healthy = False
+        try:
+            client = self.get(name)
+            if entry.probe is None:
+                healthy = True
+            else:
+                executor = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"probe-{name}")
+                try:
+                    executor.submit(entry.probe, client).result(timeout=timeout)
+                    healthy = True
+                finally:
+                    executor.shutdown(wait=False)
+        except Exception as e:
+            entry.metrics.last_error = f"probe failed: {e}"
+            entry.metrics.last_error_at = time.time()
+            logging.warning(f"⚠️ Client registry: health probe failed for '{name}': {e}")
+        entry.metrics.healthy = healthy
+        entry.metrics.last_probe_at = time.time()
+        entry.metrics.last_probe_ms = int((entry.metrics.last_probe_at - start_time) * 1000)
+        return healthy
+
+    def warm_up(self, names: Optional[List[str]] = None, probe: bool = False) -> Dict[str, bool]:
+        """Create (and optionally probe) clients ahead of the first request."""
+        results = {}
+        for name in names or list(self._entries.keys()):
+            try:
+                self.get(name)
+                results[name] = self.probe(name) if probe else True
+            except Exception:
+                results[name] = False
+        return results
+
+    def get_status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-client metrics for health/monitoring endpoints."""
+        return {name: entry.metrics.to_dict() for name, entry in self._entries.items()}
+
+
+# Global instance getter
+_registry = None
+
+def get_client_registry() -> ClientRegistry:
+    """
+    Get the global client registry instance.
+
+    Returns:
+        ClientRegistry: The singleton instance
+    """
+    global _registry
+    if _registry is None:
+        _registry = ClientRegistry()
+    return _registry
@@ -6,8 +6,7 @@ Implements methods from "Handling Homographs in Neural Machine Translation" rese
 import re
 import logging
 from typing import Dict, List, Optional, Tuple
-from pythainlp.tokenize import word_tokenize
-from pythainlp.transliterate import romanize
+from .thai_nlp_engine import get_thai_nlp_engine
 
 # Import our expanded homograph dictionary
 import sys
@@ -187,7 +186,7 @@ class HomographDetectionService:
         if word not in self.homograph_dict or context not in self.homograph_dict[word]:
             # Fallback to standard romanization
             return {
-                'romanization': romanize(word, engine=romanization_engine),
+                'romanization': get_thai_nlp_engine().romanize(word, romanization_engine),
                 'translation': word,
                 'description': 'regular word',
                 'confidence': 0.0,
@@ -210,24 +209,28 @@ class HomographDetectionService:
         Comprehensive homograph analysis for an entire Thai sentence.
         Returns detailed analysis with context detection and enhanced translations.
         """
+        nlp = get_thai_nlp_engine()
+        
         # Tokenize sentence
-        words = word_tokenize(thai_sentence, engine='newmm')
+        words = nlp.tokenize(thai_sentence, 'newmm')
         words = [w.strip() for w in words if w.strip()]
         
+        # Detect context for potential homographs, then romanize the remaining unique words in one batch
+        detected_contexts = [self.detect_homograph_context(word, thai_sentence, words) for word in words]
+        regular_words = [word for word, context in zip(words, detected_contexts) if not context]
+        regular_romanizations = dict(zip(regular_words, nlp.romanize_batch(regular_words, romanization_engine)))
+        
         analysis_results = []
         total_homographs = 0
         
-        for word in words:
-            # Detect context for potential homographs
-            detected_context = self.detect_homograph_context(word, thai_sentence, words)
-            
+        for word, detected_context in zip(words, detected_contexts):
             # Get enhanced translation
             if detected_context:
                 translation_data = self.get_enhanced_translation(word, detected_context, romanization_engine)
                 total_homographs += 1
             else:
                 translation_data = {
-                    'romanization': romanize(word, engine=romanization_engine),
+                    'romanization': regular_romanizations[word],
                     'translation': word,
                     'description': 'regular word',
                     'confidence': 1.0,
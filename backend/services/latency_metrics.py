@@ -0,0 +1,223 @@
+"""
+In-process latency percentiles fed by LatencyTracker.finalize, exported at /metrics in Prometheus text format.
+Durations go into mergeable log-bucketed sketches (relative-error quantiles, DDSketch style) per stage,
+split by NPC, platform and vendor, in time buckets so quantiles cover a sliding window.
+"""
+
+import os
+import math
+import time
+import threading
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+METRICS_WINDOW_SECONDS = int(os.getenv("METRICS_WINDOW_SECONDS", "600"))       # Quantiles cover this much history
+METRICS_BUCKET_SECONDS = int(os.getenv("METRICS_BUCKET_SECONDS", "60"))        # Granularity of the sliding window
+METRICS_RELATIVE_ACCURACY = float(os.getenv("METRICS_RELATIVE_ACCURACY", "0.01"))
+METRICS_QUANTILES = (0.5, 0.95, 0.99)
+METRICS_PREFIX = "babblelon"
+
+# Stage durations (seconds) below this are recorded as this value
+_MIN_TRACKED_VALUE = 1e-4
+
+# (pipeline, stage, dimension, dimension value); dimension is "" for the all-requests series
+SeriesKey = Tuple[str, str, str, str]
+
+
+class QuantileSketch:
+    """
+    Log-bucketed histogram with relative accuracy `alpha`: any quantile is within alpha of the true value.
+    Memory grows with the log of the value range, not with the number of samples; merging adds bucket counts.
+    """
+
+    __slots__ = ("gamma_log", "buckets", "count", "total", "minimum", "maximum")
+
+    def __init__(self, relative_accuracy: float = METRICS_RELATIVE_ACCURACY):
+        gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.gamma_log = math.log(gamma)
+        self.buckets: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = 0.0
+
+    def add(self, value: float):
+        value = max(value, _MIN_TRACKED_VALUE)
+        index = math.ceil(math.log(value) / self.gamma_log)
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        self.minimum = min(self.minimum, value)
+        self.maximum = max(self.maximum, value)
+
+    def merge(self, other: "QuantileSketch"):
+        for index, count in other.buckets.items():
+            self.buckets[index] = self.buckets.get(index, 0) + count
+        self.count += other.count
+        self.total += other.total
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        rank = q * (self.count - 1)
+        seen = 0
+        for index in sorted(self.buckets):
+            seen += self.buckets[index]
+            if seen > rank:
+                # Midpoint (in relative terms) of the bucket's (gamma^(i-1), gamma^i] range
+                value = 2 * math.exp(index * self.gamma_log) / (1 + math.exp(self.gamma_log))
+                return min(max(value, self.minimum), self.maximum)
+        return self.maximum
+
+
+class LatencyMetrics:
+    """Time-bucketed quantile sketches plus lifetime count/sum per series"""
+
+    def __init__(self, window_seconds: int = METRICS_WINDOW_SECONDS, bucket_seconds: int = METRICS_BUCKET_SECONDS):
+        self.bucket_seconds = max(1, bucket_seconds)
+        self.bucket_count = max(1, math.ceil(window_seconds / self.bucket_seconds))
+        # (bucket start, series -> sketch), oldest first
+        self._buckets: Deque[Tuple[int, Dict[SeriesKey, QuantileSketch]]] = deque()
+        self._totals: Dict[SeriesKey, List[float]] = {}   # series -> [count, sum], never reset
+        self._lock = threading.Lock()
+        self.recorded_requests = 0
+
+    def _current_bucket(self, now: float) -> Dict[SeriesKey, QuantileSketch]:
+        bucket_start = int(now // self.bucket_seconds) * self.bucket_seconds
+        if not self._buckets or self._buckets[-1][0] != bucket_start:
+            self._buckets.append((bucket_start, {}))
+        self._expire(now)
+        return self._buckets[-1][1]
+
+    def _expire(self, now: float):
+        oldest_start = int(now // self.bucket_seconds) * self.bucket_seconds - (self.bucket_count - 1) * self.bucket_seconds
+        while self._buckets and self._buckets[0][0] < oldest_start:
+            self._buckets.popleft()
+
+    def record(self, pipeline: str, durations: Dict[str, float], npc: Optional[str] = None,
+               platform: Optional[str] = None, vendors: Optional[Dict[str, str]] = None):
+        """
+        Record one request's stage durations (seconds).
+
+        Args:
+            pipeline: Event name the request was tracked under (e.g. npc_response_latency_breakdown)
+            durations: Stage name -> duration
+            npc, platform: Request-level dimensions
+            vendors: Stage name -> vendor that served it (e.g. {"tts": "gemini"})
+        """
+        vendors = vendors or {}
+        with self._lock:
+            bucket = self._current_bucket(time.time())
+            for stage, duration in durations.items():
+                if duration is None:
+                    continue
+                keys = [(pipeline, stage, "", "")]
+                if npc:
+                    keys.append((pipeline, stage, "npc", npc))
+                if platform:
+                    keys.append((pipeline, stage, "platform", platform))
+                if vendors.get(stage):
+                    keys.append((pipeline, stage, "vendor", vendors[stage]))
+                for key in keys:
+                    sketch = bucket.get(key)
+                    if sketch is None:
+                        sketch = bucket[key] = QuantileSketch()
+                    sketch.add(duration)
+                    totals = self._totals.setdefault(key, [0, 0.0])
+                    totals[0] += 1
+                    totals[1] += duration
+            self.recorded_requests += 1
+
+    def window_sketches(self) -> Tuple[Dict[SeriesKey, QuantileSketch], Dict[SeriesKey, Tuple[int, float]]]:
+        """Per-series sketches merged over the sliding window, and lifetime (count, sum) per series."""
+        with self._lock:
+            self._expire(time.time())
+            merged: Dict[SeriesKey, QuantileSketch] = {}
+            for _, bucket in self._buckets:
+                for key, sketch in bucket.items():
+                    target = merged.get(key)
+                    if target is None:
+                        target = merged[key] = QuantileSketch()
+                    target.merge(sketch)
+            totals = {key: tuple(values) for key, values in self._totals.items()}
+        return merged, totals
+
+    def percentiles(self, pipeline: Optional[str] = None) -> Dict[str, Any]:
+        """Windowed p50/p95/p99 (ms) per stage for the all-requests series, for /health-style JSON."""
+        merged, _ = self.window_sketches()
+        result: Dict[str, Any] = {}
+        for (series_pipeline, stage, dimension, _), sketch in merged.items():
+            if dimension or (pipeline and series_pipeline != pipeline):
+                continue
+            result.setdefault(series_pipeline, {})[stage] = {
+                "count": sketch.count,
+                **{f"p{int(q * 100)}_ms": round(sketch.quantile(q) * 1000, 1) for q in METRICS_QUANTILES},
+            }
+        return result
+
+    def to_prometheus(self) -> str:
+        """
+        Prometheus text exposition: windowed quantiles and lifetime _count/_sum. The all-requests series and each
+        breakdown (npc, platform, vendor) are separate summary families, so summing any one family counts each
+        stage sample once.
+        """
+        merged, totals = self.window_sketches()
+        window = self.bucket_count * self.bucket_seconds
+        families: Dict[str, List[SeriesKey]] = {}
+        for key in sorted(totals):
+            families.setdefault(key[2], []).append(key)
+        lines: List[str] = []
+        for dimension in sorted(families):
+            if dimension:
+                name = f"{METRICS_PREFIX}_stage_latency_by_{dimension}_seconds"
+                lines.append(f"# HELP {name} Request stage latency by {dimension}; quantiles over the last {window}s")
+            else:
+                name = f"{METRICS_PREFIX}_stage_latency_seconds"
+                lines.append(f"# HELP {name} Request stage latency; quantiles over the last {window}s")
+            lines.append(f"# TYPE {name} summary")
+            for key in families[dimension]:
+                labels = _format_labels(key)
+                sketch = merged.get(key)
+                if sketch is not None:
+                    for q in METRICS_QUANTILES:
+                        lines.append(f"{name}{{{labels},quantile=\"{q}\"}} {sketch.quantile(q):.6f}")
+                count, total = totals[key]
+                lines.append(f"{name}_count{{{labels}}} {int(count)}")
+                lines.append(f"{name}_sum{{{labels}}} {total:.6f}")
+        lines.append(f"# HELP {METRICS_PREFIX}_latency_requests_total Requests recorded by LatencyTracker")
+        lines.append(f"# TYPE {METRICS_PREFIX}_latency_requests_total counter")
+        lines.append(f"{METRICS_PREFIX}_latency_requests_total {self.recorded_requests}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(key: SeriesKey) -> str:
+    pipeline, stage, dimension, value = key
+    labels = f'pipeline="{_escape_label(pipeline)}",stage="{_escape_label(stage)}"'
+    if dimension:
+        labels += f',{dimension}="{_escape_label(value)}"'
+    return labels
+
+
+# Global instance getter
+_latency_metrics = None
+_latency_metrics_lock = threading.Lock()
+
+def get_latency_metrics() -> LatencyMetrics:
+    """
+    Get the global latency metrics aggregator.
+
+    Returns:
+        LatencyMetrics: The shared instance
+    """
+    global _latency_metrics
+    if _latency_metrics is None:
+        with _latency_metrics_lock:
+            if _latency_metrics is None:
+                _latency_metrics = LatencyMetrics()
+    return _latency_metrics
@@ -13,11 +13,12 @@ import logging
 import os
 import json
 
-# Import connection pool for optimized requests
-from .connection_pool import get_connection_pool
+# PostHog events go through the background analytics dispatcher
+from .analytics_dispatcher import capture_event
+from .latency_metrics import get_latency_metrics
+from .structured_logging import bind_request_id
 
 # Environment variables
-POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
 SENTRY_DSN = os.getenv("SENTRY_DSN")
 
 # Configurable alert thresholds
@@ -67,6 +68,8 @@ class LatencyTracker:
     
     def __init__(self, request_id: Optional[str] = None, user_id: Optional[str] = None, session_id: Optional[str] = None):
         self.request_id = request_id or str(uuid.uuid4())
+        # Structured log lines from the rest of this request carry its id
+        bind_request_id(self.request_id)
         self.user_id = user_id or "anonymous"
         self.session_id = session_id or "unknown"
         
@@ -84,9 +87,6 @@ class LatencyTracker:
             "timestamp": datetime.datetime.now().isoformat()
         }
         
-        # Connection pool for sending metrics
-        self.connection_pool = get_connection_pool()
-        
         logging.debug(f"LatencyTracker initialized - Request: {self.request_id}")
     
     def start(self, event_name: str, metadata: Optional[Dict[str, Any]] = None):
@@ -114,6 +114,22 @@ class LatencyTracker:
         logging.debug(f"Ended timing: {event_name} - Duration: {event.duration:.3f}s")
         return event.duration
     
+    def mark(self, event_name: str, metadata: Optional[Dict[str, Any]] = None) -> float:
+        """
+        Record a milestone measured from the start of the request
+        (e.g. "first_audio" for time-to-first-audio in streaming responses).
+        """
+        event = TimingEvent(
+            name=event_name,
+            start_time=self.request_start_time,
+            metadata=metadata or {}
+        )
+        event.end()
+        self.events[event_name] = event
+        
+        logging.debug(f"Marked milestone: {event_name} at {event.duration:.3f}s")
+        return event.duration
+    
     def set_platform(self, platform: str):
         """Set the platform (iOS, Android, Web, etc.)"""
         self.platform = platform
@@ -152,18 +168,12 @@ class LatencyTracker:
         return self.get_total_duration() > threshold
     
     def send_to_posthog(self, event_name: str = "npc_response_latency_breakdown"):
-        """Send latency metrics to PostHog"""
-        if not POSTHOG_API_KEY:
-            logging.debug("PostHog API key not configured, skipping metric send")
-            return
-        
+        """Queue latency metrics for PostHog (sent in the background by the analytics dispatcher)"""
         breakdown = self.get_breakdown()
         
-        # Prepare PostHog event
-        event_data = {
-            "api_key": POSTHOG_API_KEY,
-            "event": event_name,
-            "properties": {
+        capture_event(
+            event_name,
+            {
                 **breakdown,
                 **self.metadata,
                 "platform": self.platform,
@@ -174,29 +184,14 @@ class LatencyTracker:
                 "llm_duration": breakdown.get("llm", 0), 
                 "tts_duration": breakdown.get("tts", 0),
                 "total_duration": breakdown.get("total", 0),
+                "time_to_first_audio": breakdown.get("first_audio", breakdown.get("total", 0)),
                 # Add stage percentages
                 "stt_percentage": round((breakdown.get("stt", 0) / breakdown.get("total", 1)) * 100, 1),
                 "llm_percentage": round((breakdown.get("llm", 0) / breakdown.get("total", 1)) * 100, 1),
                 "tts_percentage": round((breakdown.get("tts", 0) / breakdown.get("total", 1)) * 100, 1),
             },
-            "distinct_id": self.user_id,
-            "timestamp": datetime.datetime.now().isoformat()
-        }
-        
-        try:
-            response = self.connection_pool.post(
-                "https://app.posthog.com/capture/",
-                json=event_data,
-                timeout=5
-            )
-            
-            if response.status_code == 200:
-                logging.debug(f"✅ PostHog: Latency tracking sent - Total: {breakdown.get('total')}s")
-            else:
-                logging.warning(f"⚠️ PostHog: Failed to send latency tracking - Status: {response.status_code}")
-                
-        except Exception as e:
-            logging.error(f"❌ PostHog: Error sending latency tracking: {e}")
+            distinct_id=self.user_id
+        )
     
     def send_high_latency_alert(self, threshold: float = DEFAULT_HIGH_LATENCY_THRESHOLD):
         """Send high latency alert to Sentry"""
@@ -231,7 +226,8 @@ class LatencyTracker:
             logging.warning(f"🚨 HIGH LATENCY ALERT: {total_duration:.2f}s for request {self.request_id}")
             logging.warning(f"   Breakdown: {self.get_breakdown()}")
     
-    def finalize(self, send_to_posthog: bool = True, alert_threshold: float = DEFAULT_HIGH_LATENCY_THRESHOLD):
+    def finalize(self, send_to_posthog: bool = True, alert_threshold: float = DEFAULT_HIGH_LATENCY_THRESHOLD,
+                 event_name: str = "npc_response_latency_breakdown"):
         """
         Finalize tracking and send metrics.
         Call this at the end of request processing.
@@ -243,9 +239,12 @@ class LatencyTracker:
         if "total" in self.events and self.events["total"].duration is None:
             self.end("total")
         
+        # Feed the in-process percentile aggregator (/metrics)
+        self.record_metrics(event_name)
+        
         # Send metrics
         if send_to_posthog:
-            self.send_to_posthog()
+            self.send_to_posthog(event_name)
         
         # Send high latency alerts
         self.send_high_latency_alert(alert_threshold)
@@ -255,7 +254,23 @@ class LatencyTracker:
         logging.info(f"🏁 Request {self.request_id} completed in {breakdown.get('total')}s")
         logging.info(f"   Breakdown: STT={breakdown.get('stt', 'N/A')}s, "
                     f"LLM={breakdown.get('llm', 'N/A')}s, "
-                    f"TTS={breakdown.get('tts', 'N/A')}s")
+                    f"TTS={breakdown.get('tts', 'N/A')}s, "
+                    f"FirstAudio={breakdown.get('first_audio', 'N/A')}s")
+    
+    def record_metrics(self, event_name: str = "npc_response_latency_breakdown"):
+        """Add this request's stage durations to the shared latency metrics."""
+        try:
+            durations = {name: event.duration for name, event in self.events.items() if event.duration is not None}
+            # Stages say which vendor served them via a "vendor" key in their end()/start() metadata
+            vendors = {name: str(event.metadata["vendor"]) for name, event in self.events.items() if event.metadata.get("vendor")}
+            get_latency_metrics().record(
+                event_name, durations,
+                npc=self.metadata.get("npc_id"),
+                platform=self.platform if self.platform != "unknown" else None,
+                vendors=vendors
+            )
+        except Exception as e:
+            logging.error(f"❌ Latency metrics: failed to record request {self.request_id}: {e}")
     
     def to_response_headers(self) -> Dict[str, str]:
         """
@@ -266,9 +281,9 @@ class LatencyTracker:
         headers = {}
         
         # Add individual timings
-        for stage in ["stt", "llm", "tts", "total"]:
+        for stage in ["stt", "llm", "tts", "first_audio", "total"]:
             if stage in breakdown:
-                headers[f"X-{stage.upper()}-Duration"] = str(breakdown[stage])
+                headers[f"X-{stage.upper().replace('_', '-')}-Duration"] = str(breakdown[stage])
         
         # Add metadata
         headers["X-Request-ID"] = self.request_id
@@ -1,16 +1,24 @@
 import os
+import re
+import asyncio
+import threading
 import logging
 from openai import OpenAI as OpenAIClient # Renamed to avoid conflict if OpenAI is used elsewhere
 from pydantic import BaseModel, Field # Added Field
-from typing import Literal, Dict, List, Optional # Added List, Optional
+from typing import Literal, Dict, List, Optional, Tuple, Any, AsyncIterator # Added List, Optional
 from fastapi import HTTPException
 import pathlib # For path manipulation
 import json # Added for JSON parsing
 import random # Added for vocabulary selection
+from .vendor_executor import run_in_vendor_executor
+from .structured_logging import get_logger
+
+log = get_logger(__name__)
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 HELICONE_API_KEY = os.getenv("HELICONE_API_KEY")
 POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
+LLM_MODEL = "gpt-4.1-mini-2025-04-14"
 
 if not OPENAI_API_KEY:
     print("WARNING: OPENAI_API_KEY not found in environment variables.")
@@ -326,40 +334,24 @@ Player action: {action_type}
 Action item: {item_or_blank}
 # ------------------------------------------------------------"""
 
-async def get_llm_response(
-    npc_id: str, 
-    npc_name: str, 
-    conversation_history: str, 
+def _prepare_llm_request(
+    npc_id: str,
+    npc_name: str,
+    conversation_history: str,
     latest_player_message: str,
     current_charm_level: int,
-    target_language: str = "Thai",
-    quest_state: Optional[Dict] = None,
-    action_type: str = "",
-    action_item: str = "",
-    user_id: Optional[str] = None,
-    session_id: Optional[str] = None
-) -> NPCResponse:
+    quest_state: Optional[Dict],
+    action_type: str,
+    action_item: str,
+    user_id: Optional[str],
+    session_id: Optional[str]
+) -> Tuple[str, str, Dict[str, str], bool]:
     """
-    Dynamic quest-aware LLM response generation.
-    Uses category tracking for quest completion with backend validation for item giving.
-    
-    Args:
-        npc_id: The identifier for the NPC.
-        npc_name: The name of the NPC.
-        conversation_history: The conversation history.
-        latest_player_message: The most recent message from the player.
-        current_charm_level: The current charm level.
-        target_language: The target language for the conversation.
-        quest_state: Complete quest state with categories, progress, etc.
-        action_type: "GIVE_ITEM" or "" (empty if sending message)
-        action_item: Item being given (empty if sending message)
-    
+    Build the system prompt, LLM input and Helicone headers for an NPC turn.
+
     Returns:
-        NPCResponse object with quest fields.
+        (system_prompt, llm_input, extra_headers, valid_item_action)
     """
-    if not openai_client:
-        raise HTTPException(status_code=500, detail="OpenAI client not initialized. Check API key.")
-
     # Initialize or load NPC configuration with quest state
     npc_config = quest_state if quest_state else {}
     
@@ -376,7 +368,7 @@ async def get_llm_response(
             }
         else:
             # Fallback for missing vocabulary data
-            print(f"WARNING: No vocabulary data found for NPC '{npc_id}', creating empty quest state")
+            log.warning("No vocabulary data found for NPC, creating empty quest state", npc_id=npc_id)
             npc_config = {
                 "name": npc_name,
                 "quest_state": {"categories_needed": [], "scenario_complete": False},  # Changed to False - empty quest shouldn't be complete
@@ -395,14 +387,17 @@ async def get_llm_response(
     # Get quest progress for LLM context
     quest_summary = get_quest_summary(npc_config)
     
-    # Debug logging for quest state
-    print(f"  Categories needed: {npc_config['quest_state']['categories_needed']}")
-    print(f"  Categories satisfied: {quest_summary['categories_satisfied']}")
-    print(f"  Current category needed: {quest_summary['current_category_needed']}")
-    print(f"  Next category needed: {quest_summary['next_category_needed']}")
-    print(f"  Quest complete: {quest_summary['complete']}")
-    print(f"  Items given: {npc_config.get('items_given', [])}")
-    print(f"  Categories accepted: {npc_config.get('categories_accepted', {})}")
+    log.debug(
+        "Quest state",
+        npc_id=npc_id,
+        categories_needed=npc_config["quest_state"]["categories_needed"],
+        categories_satisfied=quest_summary["categories_satisfied"],
+        current_category_needed=quest_summary["current_category_needed"],
+        next_category_needed=quest_summary["next_category_needed"],
+        complete=quest_summary["complete"],
+        items_given=npc_config.get("items_given", []),
+        categories_accepted=npc_config.get("categories_accepted", {})
+    )
     
     # Format conversation history
     conversation_history_last_2_turns = format_conversation_history(conversation_history, 2)
@@ -420,58 +415,239 @@ async def get_llm_response(
         item_or_blank=action_item if valid_item_action else ""
     )
     
-    print(f"🤖 Calling LLM for {npc_name}...")
-    print(f"📝 LLM Input: {llm_input}")
+    # Prepare Helicone tracking headers
+    extra_headers = {}
+    if user_id:
+        extra_headers["Helicone-User-Id"] = user_id
+    if session_id:
+        extra_headers["Helicone-Session-Id"] = session_id
+    # Add context for NPC conversations
+    extra_headers["Helicone-Property-NPC"] = npc_name
+    extra_headers["Helicone-Property-GameMode"] = "npc_chat"
+    extra_headers["Helicone-Property-CharmLevel"] = str(current_charm_level)
+    
+    return system_prompt, llm_input, extra_headers, valid_item_action
+
+def _enforce_npc_response(npc_response: NPCResponse, npc_id: str, npc_name: str, valid_item_action: bool, action_item: str) -> NPCResponse:
+    """Apply backend overrides to a parsed NPCResponse before returning it."""
+    # BACKEND ENFORCEMENT: Override LLM's user_item_given based on action validation
+    if not valid_item_action:
+        npc_response.user_item_given = None  # Force to None if no valid action
+    else:
+        npc_response.user_item_given = action_item  # Ensure it matches what was actually given
+    
+    if not npc_response.response_target:
+        log.warning("⚠️ LLM returned empty response_target", npc_id=npc_id)
+    
+    if not npc_response.response_mapping:
+        log.warning("⚠️ LLM returned empty response_mapping, POS coloring will not work", npc_id=npc_id)
+        npc_response.response_mapping = []
+    
+    # Log successful completion with key details
+    log.info("✅ LLM response completed", npc=npc_name, charm_delta=npc_response.charm_delta,
+             item_accepted=npc_response.user_item_accepted)
+    return npc_response
+
+async def get_llm_response(
+    npc_id: str, 
+    npc_name: str, 
+    conversation_history: str, 
+    latest_player_message: str,
+    current_charm_level: int,
+    target_language: str = "Thai",
+    quest_state: Optional[Dict] = None,
+    action_type: str = "",
+    action_item: str = "",
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> NPCResponse:
+    """
+    Dynamic quest-aware LLM response generation.
+    Uses category tracking for quest completion with backend validation for item giving.
+    
+    Args:
+        npc_id: The identifier for the NPC.
+        npc_name: The name of the NPC.
+        conversation_history: The conversation history.
+        latest_player_message: The most recent message from the player.
+        current_charm_level: The current charm level.
+        target_language: The target language for the conversation.
+        quest_state: Complete quest state with categories, progress, etc.
+        action_type: "GIVE_ITEM" or "" (empty if sending message)
+        action_item: Item being given (empty if sending message)
+    
+    Returns:
+        NPCResponse object with quest fields.
+    """
+    if not openai_client:
+        raise HTTPException(status_code=500, detail="OpenAI client not initialized. Check API key.")
+
+    system_prompt, llm_input, extra_headers, valid_item_action = _prepare_llm_request(
+        npc_id, npc_name, conversation_history, latest_player_message, current_charm_level,
+        quest_state, action_type, action_item, user_id, session_id
+    )
+    
+    # Full LLM input only at DEBUG: it contains the player's message and conversation history
+    log.debug("📝 LLM input: %s", llm_input, npc=npc_name)
     
     try:
-        # Prepare Helicone tracking headers
-        extra_headers = {}
-        if user_id:
-            extra_headers["Helicone-User-Id"] = user_id
-        if session_id:
-            extra_headers["Helicone-Session-Id"] = session_id
-        # Add context for NPC conversations
-        extra_headers["Helicone-Property-NPC"] = npc_name
-        extra_headers["Helicone-Property-GameMode"] = "npc_chat"
-        extra_headers["Helicone-Property-CharmLevel"] = str(current_charm_level)
-        
-        print(f"🚀 Calling OpenAI LLM with Helicone tracking - User: {user_id}, Session: {session_id}, NPC: {npc_name}")
-        print(f"📊 Helicone properties: CharmLevel={current_charm_level}, GameMode=npc_chat")
+        log.info("🚀 Calling OpenAI LLM via Helicone", npc=npc_name, model=LLM_MODEL, user_id=user_id,
+                 session_id=session_id, charm_level=current_charm_level)
         
         # Call OpenAI using correct responses.parse structure with Helicone tracking
-        response = openai_client.responses.parse(
-            model="gpt-4.1-mini-2025-04-14",
+        response = await run_in_vendor_executor(
+            "openai",
+            openai_client.responses.parse,
+            model=LLM_MODEL,
             instructions=system_prompt,
             input=llm_input,
             text_format=NPCResponse,
             extra_headers=extra_headers
         )
         
-        print(f"✅ Helicone: OpenAI LLM call completed - NPC: {npc_name}, Model: gpt-4.1-mini-2025-04-14")
-        print(f"📝 Response received: {len(response.output_parsed.response_target)} chars, Emotion: {response.output_parsed.emotion}")
+        log.debug("📝 LLM response received", npc=npc_name, chars=len(response.output_parsed.response_target),
+                  emotion=response.output_parsed.emotion)
         
-        # BACKEND ENFORCEMENT: Override LLM's user_item_given based on action validation
-        npc_response = response.output_parsed
-        if not valid_item_action:
-            npc_response.user_item_given = None  # Force to None if no valid action
-        else:
-            npc_response.user_item_given = action_item  # Ensure it matches what was actually given
-        
-        if not npc_response.response_target:
-            print(f"⚠️  Warning: LLM for {npc_id} returned empty response_target.")
+        return _enforce_npc_response(response.output_parsed, npc_id, npc_name, valid_item_action, action_item)
         
-        if not npc_response.response_mapping:
-            print(f"⚠️  Warning: LLM for {npc_id} returned empty response_mapping. POS coloring will not work.")
-            npc_response.response_mapping = []
-        
-        # Log successful completion with key details
-        print(f"✅ LLM Response completed for {npc_name}: charm_delta={npc_response.charm_delta}, item_accepted={npc_response.user_item_accepted}")
+    except Exception as e:
+        log.exception("❌ OpenAI LLM call failed: %s", e, npc_id=npc_id, model=LLM_MODEL)
+        raise HTTPException(status_code=500, detail=f"LLM service error: {str(e)}")
 
-        return npc_response
-        
+class _PartialStringField:
+    """
+    Incrementally reads one string field out of a JSON document that is still
+    being streamed, e.g. "response_target" from structured output deltas.
+    """
+
+    def __init__(self, field_name: str):
+        self._pattern = re.compile(r'"' + re.escape(field_name) + r'"\s*:\s*"((?:[^"\\]|\\.)*)(")?', re.DOTALL)
+        self.value = ""
+        self.complete = False
+
+    def update(self, document: str) -> str:
+        """Re-scan the partial document and return newly decoded characters."""
+        if self.complete:
+            return ""
+        match = self._pattern.search(document)
+        if not match:
+            return ""
+        raw = match.group(1)
+        decoded = None
+        # A \uXXXX escape may be cut mid-sequence; back off until the prefix decodes
+        for cut in range(0, min(len(raw), 5) + 1):
+            try:
+                decoded = json.loads(f'"{raw[:len(raw) - cut]}"')
+                break
+            except json.JSONDecodeError:
+                continue
+        if decoded is None:
+            return ""
+        self.complete = match.group(2) is not None
+        new_text = decoded[len(self.value):]
+        self.value = decoded
+        return new_text
+
+async def stream_llm_response(
+    npc_id: str,
+    npc_name: str,
+    conversation_history: str,
+    latest_player_message: str,
+    current_charm_level: int,
+    target_language: str = "Thai",
+    quest_state: Optional[Dict] = None,
+    action_type: str = "",
+    action_item: str = "",
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Any]]:
+    """
+    Streaming variant of get_llm_response for the pipelined NPC endpoint.
+
+    Yields ("tone", str) once the response_tone field is complete, then
+    ("target_delta", str) as response_target text arrives, and finally
+    ("final", NPCResponse) with the same backend enforcement as get_llm_response.
+    """
+    if not openai_client:
+        raise HTTPException(status_code=500, detail="OpenAI client not initialized. Check API key.")
+
+    system_prompt, llm_input, extra_headers, valid_item_action = _prepare_llm_request(
+        npc_id, npc_name, conversation_history, latest_player_message, current_charm_level,
+        quest_state, action_type, action_item, user_id, session_id
+    )
+    extra_headers["Helicone-Property-Streaming"] = "true"
+    
+    log.info("🤖 Streaming OpenAI LLM via Helicone", npc=npc_name, model=LLM_MODEL)
+    log.debug("📝 LLM input: %s", llm_input, npc=npc_name)
+    
+    loop = asyncio.get_running_loop()
+    events: asyncio.Queue = asyncio.Queue()
+    stop_requested = threading.Event()
+
+    def _run_stream():
+        # The OpenAI client is synchronous; iterate it on a worker thread and hand events back to the loop
+        try:
+            with openai_client.responses.stream(
+                model=LLM_MODEL,
+                instructions=system_prompt,
+                input=llm_input,
+                text_format=NPCResponse,
+                extra_headers=extra_headers
+            ) as stream:
+                for event in stream:
+                    if stop_requested.is_set():
+                        return
+                    if event.type == "response.output_text.delta":
+                        loop.call_soon_threadsafe(events.put_nowait, ("delta", event.delta))
+                final_response = stream.get_final_response()
+            loop.call_soon_threadsafe(events.put_nowait, ("final", final_response.output_parsed))
+        except Exception as e:
+            loop.call_soon_threadsafe(events.put_nowait, ("error", e))
+
+    worker = asyncio.ensure_future(run_in_vendor_executor("openai", _run_stream))
+
+    def on_worker_done(task: asyncio.Task):
+        # The executor can fail before _run_stream ever runs (503 when the pool is saturated, RuntimeError after
+        # shutdown); without this sentinel nothing would reach the queue and the loop below would wait forever.
+        # Events queued by _run_stream itself are always ahead of it.
+        events.put_nowait(("worker_done", None if task.cancelled() else task.exception()))
+
+    worker.add_done_callback(on_worker_done)
+    document = ""
+    tone_field = _PartialStringField("response_tone")
+    target_field = _PartialStringField("response_target")
+    tone_sent = False
+
+    try:
+        while True:
+            kind, payload = await events.get()
+            if kind == "delta":
+                document += payload
+                if not tone_sent:
+                    tone_field.update(document)
+                    if not tone_field.complete:
+                        continue
+                    tone_sent = True
+                    yield "tone", tone_field.value
+                new_text = target_field.update(document)
+                if new_text:
+                    yield "target_delta", new_text
+            elif kind == "final":
+                log.info("✅ OpenAI LLM stream completed", npc=npc_name, model=LLM_MODEL)
+                if payload is None:
+                    raise ValueError("LLM stream finished without a parsed NPCResponse")
+                yield "final", _enforce_npc_response(payload, npc_id, npc_name, valid_item_action, action_item)
+                return
+            elif kind == "worker_done":
+                raise payload or RuntimeError("LLM stream worker exited without a response")
+            else:
+                raise payload
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"❌ Helicone: OpenAI LLM call failed - NPC: {npc_name}, Error: {str(e)}")
-        print(f"An unexpected error occurred in get_llm_response for {npc_id}: {e}")
-        import traceback
-        traceback.print_exc()
-        raise HTTPException(status_code=500, detail=f"LLM service error: {str(e)}") 
\ No newline at end of file
+        log.exception("❌ OpenAI LLM stream failed: %s", e, npc_id=npc_id, model=LLM_MODEL)
+        raise HTTPException(status_code=500, detail=f"LLM service error: {str(e)}")
+    finally:
+        stop_requested.set()
+        if not worker.done():
+            worker.cancel()
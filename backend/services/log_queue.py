@@ -0,0 +1,94 @@
+"""
+Queued log delivery for hot paths: records are put on an in-memory queue and a listener thread formats
+and writes them through the root logger's handlers, so request handlers never wait on log I/O.
+"""
+
+import os
+import queue
+import atexit
+import logging
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))   # Records beyond this are dropped, not blocked on
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    Enqueues the record untouched. The stock QueueHandler formats the message in the calling thread;
+    here %-style arguments are only merged on the listener thread.
+    """
+
+    def __init__(self, log_queue: "queue.Queue[logging.LogRecord]"):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class _DrainingQueueListener(QueueListener):
+    """Blocks to enqueue the stop sentinel: the queue may be full at shutdown, and the listener is draining it"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(maxsize=LOG_QUEUE_SIZE)
+_handler = DeferredQueueHandler(_log_queue)
+_listener: Optional[QueueListener] = None
+_listener_lock = threading.Lock()
+
+
+def start_log_queue():
+    """Start the listener thread (idempotent); it writes to the root logger's current handlers."""
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            root_handlers = [handler for handler in logging.getLogger().handlers if handler is not _handler]
+            _listener = _DrainingQueueListener(_log_queue, *root_handlers, respect_handler_level=True)
+            _listener.start()
+
+
+def stop_log_queue():
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    with _listener_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+atexit.register(stop_log_queue)
+
+
+def get_queued_logger(name: str) -> logging.Logger:
+    """
+    Get a logger whose records go through the queue instead of straight to the root handlers.
+
+    Example:
+        request_log = get_queued_logger("babblelon.requests")
+        request_log.info("%s %s - %d", method, path, status_code)  # formatted off the request path
+    """
+    logger = logging.getLogger(name)
+    if _handler not in logger.handlers:
+        logger.addHandler(_handler)
+        logger.propagate = False
+    start_log_queue()
+    return logger
+
+
+def get_log_queue_stats() -> Dict[str, Any]:
+    return {
+        "queued": _log_queue.qsize(),
+        "max_queued": LOG_QUEUE_SIZE,
+        "dropped": _handler.dropped,
+        "running": _listener is not None,
+    }
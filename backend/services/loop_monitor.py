@@ -0,0 +1,72 @@
+"""
+Event loop lag monitor.
+Measures how late a periodic timer fires; sustained lag means something is blocking the event loop.
+"""
+
+import os
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+LOOP_LAG_CHECK_INTERVAL = float(os.getenv("LOOP_LAG_CHECK_INTERVAL", "0.5"))     # Seconds between samples
+LOOP_LAG_WARN_THRESHOLD = float(os.getenv("LOOP_LAG_WARN_THRESHOLD", "0.1"))     # Warn when a sample exceeds this (s)
+LOOP_LAG_WINDOW = int(os.getenv("LOOP_LAG_WINDOW", "120"))                       # Samples kept for stats
+
+
+class LoopLagMonitor:
+    """Samples event loop scheduling delay in a background task"""
+
+    def __init__(self, interval: float = LOOP_LAG_CHECK_INTERVAL, warn_threshold: float = LOOP_LAG_WARN_THRESHOLD,
+                 window: int = LOOP_LAG_WINDOW):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.slow_ticks = 0
+        self.total_ticks = 0
+        self._task: Optional[asyncio.Task] = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, loop.time() - expected)
+            self.samples.append(lag)
+            self.total_ticks += 1
+            self.max_lag = max(self.max_lag, lag)
+            if lag > self.warn_threshold:
+                self.slow_ticks += 1
+                logging.warning(f"⚠️ Event loop lag {lag * 1000:.0f}ms (threshold {self.warn_threshold * 1000:.0f}ms) - a blocking call is running on the loop")
+
+    def start(self):
+        """Start sampling on the running loop (idempotent)."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.get_running_loop().create_task(self._run())
+            logging.info(f"✅ Event loop lag monitor started - interval {self.interval}s, warn at {self.warn_threshold * 1000:.0f}ms")
+
+    def stop(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {"running": self._task is not None, "samples": 0}
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "samples": len(samples),
+            "last_lag_ms": round(self.samples[-1] * 1000, 1),
+            "avg_lag_ms": round(sum(samples) / len(samples) * 1000, 1),
+            "p95_lag_ms": round(p95 * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "slow_ticks": self.slow_ticks,
+            "total_ticks": self.total_ticks,
+        }
+
+
+# Global monitor instance
+loop_lag_monitor = LoopLagMonitor()
@@ -0,0 +1,98 @@
+"""
+Worker-process side of the NLP worker pool: op table, JSON entry point and initializer.
+Imports only pythainlp and the Thai NLP helpers, so a spawned worker never loads FastAPI or the vendor SDKs.
+"""
+
+import os
+import json
+import time
+import signal
+from typing import Any, Callable, Dict
+
+from .thai_nlp_engine import get_thai_nlp_engine
+from .thai_syllable_analysis import build_syllable_writing_guide, build_word_syllable_analysis
+from .thai_writing_guide import get_thai_writing_guide
+
+# Engines the ops below use; loaded by each worker before its first task
+WORKER_WARM_UP_ENGINES = {
+    "tokenizers": ["newmm"],
+    "romanizers": ["royin", "thai2rom"],
+    "syllable_engines": [None, "dict"],
+    "subword_engines": ["tcc"],
+}
+
+
+def _op_analyze_sentences(sentences, tokenizer_engine="newmm", romanizer_engine="royin"):
+    analyzed = get_thai_nlp_engine().analyze_batch(sentences, tokenizer_engine, romanizer_engine)
+    return [{"tokens": sentence.tokens, "romanizations": sentence.romanizations} for sentence in analyzed]
+
+def _op_tokenize_sentences(sentences, engine="newmm"):
+    return get_thai_nlp_engine().tokenize_batch(sentences, engine)
+
+def _romanize_or_keep(token, engine):
+    try:
+        return get_thai_nlp_engine().romanize(token, engine)
+    except Exception:
+        return token
+
+def _op_word_mapping_analysis(text, tokenizer_engine="newmm", romanizer_engine=None, syllable_engine="dict",
+                              syllable_romanizer_engine="thai2rom"):
+    """
+    Everything create_word_level_translation_mapping needs from pythainlp in one round trip: the sentence's
+    non-blank words, syllables of multi-syllable words, and romanizations (a token that fails keeps its text).
+    """
+    nlp = get_thai_nlp_engine()
+    words = [word for word in nlp.tokenize(text, tokenizer_engine) if word.strip()]
+    word_syllables = {}
+    for word in dict.fromkeys(words):
+        try:
+            syllables = nlp.syllables(word, syllable_engine)
+        except Exception:
+            continue
+        if len(syllables) > 1:
+            word_syllables[word] = [syllable for syllable in syllables if syllable.strip()]
+    romanizations = {word: _romanize_or_keep(word, romanizer_engine) for word in dict.fromkeys(words)} if romanizer_engine else {}
+    syllable_romanizations = {
+        syllable: _romanize_or_keep(syllable, syllable_romanizer_engine)
+        for syllables in word_syllables.values() for syllable in syllables
+    }
+    return {
+        "words": words,
+        "word_syllables": word_syllables,
+        "romanizations": romanizations,
+        "syllable_romanizations": syllable_romanizations,
+    }
+
+def _op_ping(hold_ms=0):
+    # Holding the worker briefly makes the remaining pings land on the other workers
+    time.sleep(hold_ms / 1000)
+    return os.getpid()
+
+OPS: Dict[str, Callable[..., Any]] = {
+    "analyze_sentences": _op_analyze_sentences,
+    "tokenize_sentences": _op_tokenize_sentences,
+    "word_mapping_analysis": _op_word_mapping_analysis,
+    "syllable_writing_guide": build_syllable_writing_guide,
+    "word_syllable_analysis": build_word_syllable_analysis,
+    "ping": _op_ping,
+}
+
+
+def encode(message: Dict[str, Any]) -> bytes:
+    return json.dumps(message, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def execute(request: bytes) -> bytes:
+    """Worker entry point: {"op", "args"} JSON in, {"ok", "result"|"error"} JSON out."""
+    try:
+        message = json.loads(request)
+        return encode({"ok": True, "result": OPS[message["op"]](**message.get("args", {}))})
+    except Exception as e:
+        return encode({"ok": False, "error": f"{type(e).__name__}: {e}"})
+
+
+def init_worker():
+    """Pre-warm a worker: load pythainlp engines and the writing guide before the first task."""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # The parent handles shutdown
+    get_thai_nlp_engine().warm_up(**WORKER_WARM_UP_ENGINES)
+    get_thai_writing_guide()
@@ -0,0 +1,209 @@
+"""
+Process pool for CPU-bound Thai NLP (tokenization, thai2rom romanization, writing-guide analysis).
+Keeps long sentences from stalling the event loop; requests and responses cross the process boundary as compact JSON bytes.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException
+
+from .nlp_worker import OPS, encode, execute, init_worker
+
+# 0 disables the pool; tasks then run on a worker thread in this process
+NLP_WORKER_PROCESSES = int(os.getenv("NLP_WORKER_PROCESSES", str(min(2, os.cpu_count() or 1))))
+# Tasks queued beyond the busy workers + this limit are rejected with 503
+NLP_WORKER_MAX_QUEUED = int(os.getenv("NLP_WORKER_MAX_QUEUED", "32"))
+NLP_WORKER_TIMEOUT = float(os.getenv("NLP_WORKER_TIMEOUT", "15"))
+# Upper bound on start(); worker initializers load pythainlp models (thai2rom is the slow one)
+NLP_WORKER_WARM_UP_TIMEOUT = float(os.getenv("NLP_WORKER_WARM_UP_TIMEOUT", "120"))
+# spawn avoids forking a process that already runs vendor executor threads
+NLP_WORKER_START_METHOD = os.getenv("NLP_WORKER_START_METHOD", "spawn")
+
+
+class NLPWorkerPool:
+    """Bounded process pool with queue-depth counters and 503 back-pressure"""
+
+    def __init__(self, processes: int = NLP_WORKER_PROCESSES, max_queued: int = NLP_WORKER_MAX_QUEUED,
+                 timeout: float = NLP_WORKER_TIMEOUT):
+        self.processes = processes
+        self.max_queued = max_queued
+        self.timeout = timeout
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self.restarts = 0
+        self.inline_runs = 0
+        self.total_task_time = 0.0
+        self.warm_up_state = "pending"
+
+    @property
+    def enabled(self) -> bool:
+        return self.processes > 0
+
+    @property
+    def ready(self) -> bool:
+        """True once start() has run (or was skipped); a disabled pool is always ready."""
+        return not self.enabled or self.warm_up_state in ("complete", "failed", "skipped")
+
+    def skip_warm_up(self):
+        """Workers will be spawned lazily by the first task instead of at startup."""
+        self.warm_up_state = "skipped"
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context(NLP_WORKER_START_METHOD),
+                    initializer=init_worker
+                )
+            return self._executor
+
+    def _discard_executor(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self.restarts += 1
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    async def start(self) -> Dict[str, Any]:
+        """Spawn and pre-warm every worker process. Returns per-start timing."""
+        if not self.enabled:
+            return {"processes": 0}
+        self.warm_up_state = "running"
+        start_time = time.time()
+        workers = set()
+        try:
+            executor = self._get_executor()
+            loop = asyncio.get_running_loop()
+            # A ping is only answered once its worker's initializer has finished; keep pinging until every
+            # process has answered
+            ping = encode({"op": "ping", "args": {"hold_ms": 200}})
+            while len(workers) < self.processes and time.time() - start_time < NLP_WORKER_WARM_UP_TIMEOUT:
+                responses = await asyncio.gather(*[
+                    loop.run_in_executor(executor, execute, ping) for _ in range(self.processes)
+                ])
+                workers.update(json.loads(response)["result"] for response in responses)
+        except Exception:
+            self.warm_up_state = "failed"
+            raise
+        self.warm_up_state = "complete"
+        elapsed_ms = int((time.time() - start_time) * 1000)
+        logging.info(f"✅ NLP worker pool: {len(workers)} workers warm in {elapsed_ms}ms")
+        return {"processes": len(workers), "warm_up_ms": elapsed_ms}
+
+    async def run(self, op: str, **args) -> Any:
+        """Run an NLP op in a worker process and return its result."""
+        if not self.enabled:
+            self.inline_runs += 1
+            return await asyncio.to_thread(OPS[op], **args)
+
+        with self._lock:
+            if self.in_flight >= self.processes + self.max_queued:
+                self.rejected += 1
+                logging.warning(f"⚠️ NLP worker pool saturated ({self.in_flight} in flight) - rejecting '{op}'")
+                raise HTTPException(status_code=503, detail="Language processing is busy, please retry shortly.")
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        start_time = time.time()
+        ok = False
+        submitted = False
+        try:
+            try:
+                future = self._get_executor().submit(execute, encode({"op": op, "args": args}))
+                # The slot stays taken until the worker is done with the task, even if this call times out first
+                future.add_done_callback(self._release_slot)
+                submitted = True
+                response = json.loads(await asyncio.wait_for(asyncio.wrap_future(future), timeout=self.timeout))
+            except asyncio.TimeoutError:
+                self.timeouts += 1
+                raise HTTPException(status_code=504, detail=f"Language processing timed out after {self.timeout:.0f}s")
+            except BrokenProcessPool:
+                # A worker died (OOM, segfault in a native model); rebuild the pool and answer this call inline
+                logging.error(f"❌ NLP worker pool broken during '{op}' - restarting pool")
+                self._discard_executor()
+                self.inline_runs += 1
+                result = await asyncio.to_thread(OPS[op], **args)
+                ok = True
+                return result
+            if not response["ok"]:
+                raise RuntimeError(f"NLP worker '{op}' failed: {response['error']}")
+            ok = True
+            return response["result"]
+        finally:
+            if not submitted:
+                self._release_slot()
+            with self._lock:
+                self.total_task_time += time.time() - start_time
+                if ok:
+                    self.completed += 1
+                else:
+                    self.failed += 1
+
+    def _release_slot(self, future: Optional[Future] = None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        finished = self.completed + self.failed
+        return {
+            "processes": self.processes,
+            "warm_up_state": self.warm_up_state,
+            "running": min(self.in_flight, self.processes),
+            "queued": max(0, self.in_flight - self.processes),
+            "max_in_flight": self.max_in_flight,
+            "max_queued": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+            "restarts": self.restarts,
+            "inline_runs": self.inline_runs,
+            "avg_task_time_ms": round(self.total_task_time / finished * 1000, 1) if finished else 0.0,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global instance getter
+_nlp_worker_pool = None
+
+def get_nlp_worker_pool() -> NLPWorkerPool:
+    """
+    Get the global NLP worker pool.
+
+    Returns:
+        NLPWorkerPool: The shared instance (processes start on first use or at startup)
+    """
+    global _nlp_worker_pool
+    if _nlp_worker_pool is None:
+        _nlp_worker_pool = NLPWorkerPool()
+    return _nlp_worker_pool
+
+async def run_nlp_task(op: str, **args) -> Any:
+    """
+    Run a CPU-bound NLP op off the event loop.
+
+    Example:
+        [sentence] = await run_nlp_task("analyze_sentences", sentences=[text], tokenizer_engine="newmm", romanizer_engine="thai2rom")
+    """
+    return await get_nlp_worker_pool().run(op, **args)
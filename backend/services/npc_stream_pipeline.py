@@ -0,0 +1,167 @@
+"""
+Pipelined NPC response streaming (LLM -> sentence chunks -> TTS -> framed audio).
+Lets the client start playback after the first sentence instead of after the full response.
+"""
+
+import os
+import re
+import json
+import struct
+import asyncio
+import logging
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+# Sentences shorter than this are merged with the next one to avoid choppy, per-word TTS calls
+NPC_STREAM_MIN_SENTENCE_CHARS = int(os.getenv("NPC_STREAM_MIN_SENTENCE_CHARS", "24"))
+# Maximum TTS requests in flight for one NPC response
+NPC_STREAM_TTS_CONCURRENCY = int(os.getenv("NPC_STREAM_TTS_CONCURRENCY", "3"))
+
+# Frame layout: 1-byte type, 4-byte big-endian payload length, payload
+FRAME_HEADER = struct.Struct(">cI")
+FRAME_STREAM_INFO = b"M"    # Leading JSON: request id, audio format, STT results
+FRAME_AUDIO = b"A"          # Audio chunk, in playback order (raw PCM when streamed)
+FRAME_RESPONSE_DATA = b"D"  # JSON: same payload as the X-NPC-Response-Data header
+FRAME_TIMING = b"T"         # Trailing JSON: latency breakdown incl. time to first audio
+FRAME_ERROR = b"E"          # JSON error detail; terminates the stream
+
+NPC_STREAM_MEDIA_TYPE = "application/vnd.babblelon.npc-stream"
+
+# Sentence terminators (Latin and CJK punctuation) or whitespace, which Thai uses between clauses
+_BOUNDARY_PATTERN = re.compile(r"[.!?…。！？]+\s*|\s+")
+
+
+def encode_frame(frame_type: bytes, payload: bytes) -> bytes:
+    """Encode a single length-prefixed frame."""
+    return FRAME_HEADER.pack(frame_type, len(payload)) + payload
+
+
+def encode_json_frame(frame_type: bytes, data: Dict[str, Any]) -> bytes:
+    """Encode a JSON frame (ASCII-escaped, matching the legacy header encoding)."""
+    return encode_frame(frame_type, json.dumps(data, ensure_ascii=True).encode("ascii"))
+
+
+def encode_compact_json_frame(frame_type: bytes, data: Dict[str, Any]) -> bytes:
+    """Encode a JSON frame as compact UTF-8 (Thai stays 3 bytes per character instead of a 6-byte escape)."""
+    return encode_frame(frame_type, json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def accepts_npc_frames(accept: Optional[str]) -> bool:
+    """True if the client's Accept header asks for the framed NPC body instead of the legacy header format."""
+    return bool(accept) and NPC_STREAM_MEDIA_TYPE in accept.lower()
+
+
+class SentenceChunker:
+    """
+    Splits streamed text into speakable chunks.
+    A chunk is emitted at a boundary once it reaches min_chars; the remainder is flushed at the end.
+    """
+
+    def __init__(self, min_chars: int = NPC_STREAM_MIN_SENTENCE_CHARS):
+        self.min_chars = min_chars
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """Add streamed text and return any chunks that are now complete."""
+        self._buffer += text
+        chunks = []
+        search_from = 0
+        while True:
+            match = _BOUNDARY_PATTERN.search(self._buffer, search_from)
+            # A boundary at the very end may still grow (e.g. "..." or more whitespace)
+            if not match or match.end() == len(self._buffer):
+                break
+            candidate = self._buffer[:match.end()].strip()
+            if len(candidate) >= self.min_chars:
+                chunks.append(candidate)
+                self._buffer = self._buffer[match.end():]
+                search_from = 0
+            else:
+                search_from = match.end()
+        return chunks
+
+    def flush(self) -> List[str]:
+        """Return whatever text is left once the stream has ended."""
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return [remainder] if remainder else []
+
+
+class OrderedTTSPipeline:
+    """
+    Runs TTS for submitted sentences concurrently but yields audio strictly in submission order.
+    """
+
+    def __init__(self, synthesize: Callable[[str], Awaitable[bytes]], max_concurrency: int = NPC_STREAM_TTS_CONCURRENCY):
+        self._synthesize = synthesize
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._pending: asyncio.Queue = asyncio.Queue()
+        self._tasks: List[asyncio.Task] = []
+        self.sentences: List[str] = []
+
+    async def _run(self, sentence: str) -> bytes:
+        async with self._semaphore:
+            return await self._synthesize(sentence)
+
+    def submit(self, sentence: str):
+        """Start synthesizing a sentence immediately."""
+        task = asyncio.create_task(self._run(sentence))
+        self._tasks.append(task)
+        self.sentences.append(sentence)
+        self._pending.put_nowait(task)
+
+    def close(self):
+        """Signal that no more sentences will be submitted."""
+        self._pending.put_nowait(None)
+
+    async def audio_chunks(self) -> AsyncIterator[bytes]:
+        """Yield synthesized audio in order until close() has been called."""
+        while True:
+            task = await self._pending.get()
+            if task is None:
+                return
+            audio = await task
+            if audio:
+                yield audio
+
+    def cancel(self):
+        """Cancel any outstanding synthesis (client went away or an earlier stage failed)."""
+        for task in self._tasks:
+            if not task.done():
+                task.cancel()
+
+
+async def feed_llm_stream_into_pipeline(
+    llm_events: AsyncIterator,
+    pipeline: OrderedTTSPipeline,
+    on_tone: Optional[Callable[[str], None]] = None,
+    min_chars: int = NPC_STREAM_MIN_SENTENCE_CHARS
+):
+    """
+    Consume stream_llm_response events, submitting each completed sentence to the TTS pipeline.
+    Returns the final NPCResponse. Always closes the pipeline so the audio consumer can finish.
+    """
+    chunker = SentenceChunker(min_chars)
+    streamed_text = ""
+    final_response = None
+    try:
+        async for kind, payload in llm_events:
+            if kind == "tone":
+                if on_tone:
+                    on_tone(payload)
+            elif kind == "target_delta":
+                streamed_text += payload
+                for sentence in chunker.feed(payload):
+                    pipeline.submit(sentence)
+            elif kind == "final":
+                final_response = payload
+
+        if final_response is not None and not streamed_text.strip():
+            # Partial field extraction yielded nothing (e.g. unexpected field order); fall back to the parsed text
+            logging.warning("NPC stream: no incremental response_target text, synthesizing parsed response in one pass")
+            for sentence in chunker.feed(final_response.response_target):
+                pipeline.submit(sentence)
+        for sentence in chunker.flush():
+            pipeline.submit(sentence)
+        return final_response
+    finally:
+        pipeline.close()
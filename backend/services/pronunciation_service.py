@@ -10,7 +10,7 @@ import tempfile
 from dotenv import load_dotenv
 import wave
 import requests  # For PostHog tracking
-from .connection_pool import get_connection_pool
+from .analytics_dispatcher import capture_event
 from typing import Optional
 import uuid
 
@@ -22,9 +22,6 @@ logging.basicConfig(level=logging.INFO)
 
 load_dotenv()
 
-# PostHog Configuration
-POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
-
 def track_pronunciation_assessment_to_posthog(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
@@ -37,44 +34,23 @@ def track_pronunciation_assessment_to_posthog(
     success: bool = True,
     error: Optional[str] = None
 ):
-    """Track pronunciation assessment calls to PostHog for analytics"""
-    if not POSTHOG_API_KEY:
-        return
-    
-    try:
-        event_data = {
-            "api_key": POSTHOG_API_KEY,
-            "event": "pronunciation_assessment",
-            "properties": {
-                "service": "azure_pronunciation",
-                "reference_text_length": len(reference_text),
-                "pronunciation_score": pronunciation_score,
-                "accuracy_score": accuracy_score,
-                "processing_time_ms": processing_time_ms,
-                "item_type": item_type,
-                "complexity": complexity,
-                "success": success,
-                "timestamp": time.time(),
-            },
-            "timestamp": time.time(),
-        }
-        
-        if user_id:
-            event_data["distinct_id"] = user_id
-        if session_id:
-            event_data["properties"]["session_id"] = session_id
-        if error:
-            event_data["properties"]["error"] = error
-            
-        # Send to PostHog using connection pool
-        connection_pool = get_connection_pool()
-        connection_pool.post(
-            "https://app.posthog.com/capture/",
-            json=event_data,
-            timeout=5
-        )
-    except Exception as e:
-        print(f"WARNING: Failed to track pronunciation assessment to PostHog: {e}")
+    """Track pronunciation assessment calls to PostHog for analytics (queued; sent in the background)"""
+    properties = {
+        "service": "azure_pronunciation",
+        "reference_text_length": len(reference_text),
+        "pronunciation_score": pronunciation_score,
+        "accuracy_score": accuracy_score,
+        "processing_time_ms": processing_time_ms,
+        "item_type": item_type,
+        "complexity": complexity,
+        "success": success,
+        "timestamp": time.time(),
+    }
+    if session_id:
+        properties["session_id"] = session_id
+    if error:
+        properties["error"] = error
+    capture_event("pronunciation_assessment", properties, distinct_id=user_id, timestamp=properties["timestamp"])
 
 # --- Transliteration Helper ---
 
@@ -0,0 +1,261 @@
+"""
+Per-user rate limiting with a sliding-window counter: three integers of state per key, O(1) per check.
+State lives in a pluggable store; the SQLite store is shared by every worker process on the host.
+"""
+
+import os
+import math
+import time
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+RATE_LIMIT_REQUESTS = int(os.getenv("RATE_LIMIT_REQUESTS", "100"))               # Requests per window (beta quota)
+RATE_LIMIT_WINDOW_SECONDS = int(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "3600"))
+# "sqlite" shares counts across uvicorn workers on this host; "memory" is per process (tests, single worker)
+RATE_LIMIT_STORE = os.getenv("RATE_LIMIT_STORE", "sqlite").lower()
+RATE_LIMIT_DB_PATH = os.getenv(
+    "RATE_LIMIT_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "rate_limits.sqlite3")
+)
+RATE_LIMIT_EVICT_INTERVAL = float(os.getenv("RATE_LIMIT_EVICT_INTERVAL", "60"))  # Seconds between idle-key sweeps
+
+# (window index, count in that window, count in the window before it)
+WindowState = Tuple[int, int, int]
+
+
+class RateLimitResult:
+    """Outcome of one check, with the values for X-RateLimit-* headers"""
+
+    __slots__ = ("allowed", "limit", "remaining", "reset_at", "retry_after")
+
+    def __init__(self, allowed: bool, limit: int, remaining: int, reset_at: int, retry_after: int):
+        self.allowed = allowed
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_at = reset_at
+        self.retry_after = retry_after
+
+    def headers(self) -> Dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(self.reset_at),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(self.retry_after)
+        return headers
+
+
+def _slide(state: Optional[WindowState], window_index: int) -> Tuple[int, int]:
+    """(current, previous) counts as seen from window_index."""
+    if state is None:
+        return 0, 0
+    index, current, previous = state
+    if index == window_index:
+        return current, previous
+    if index == window_index - 1:
+        return 0, current
+    return 0, 0
+
+
+def evaluate(state: Optional[WindowState], now: float, limit: int, window: int) -> Tuple[WindowState, RateLimitResult]:
+    """
+    Apply one request to a key's state. The previous window's count is weighted by how much of it
+    still overlaps the sliding window, which approximates a true sliding log without storing timestamps.
+    Returns the new state (unchanged counts if denied) and the result.
+    """
+    window_index = int(now // window)
+    current, previous = _slide(state, window_index)
+    elapsed = now - window_index * window
+    weight = 1.0 - elapsed / window
+    estimated = previous * weight + current
+    allowed = estimated + 1 <= limit
+    if allowed:
+        current += 1
+        estimated += 1
+
+    retry_after = 0
+    if not allowed:
+        if current >= limit:
+            # Only the next window's decay of this window's count can free a slot
+            retry_after = (window - elapsed) + window * (1 - (limit - 1) / current)
+        else:
+            # Wait until the previous window's weighted share has decayed enough
+            retry_after = window * (1 - (limit - 1 - current) / previous) - elapsed if previous else 0
+    return (window_index, current, previous), RateLimitResult(
+        allowed=allowed,
+        limit=limit,
+        remaining=max(0, math.floor(limit - estimated)),
+        reset_at=(window_index + 1) * window,
+        retry_after=max(1, math.ceil(retry_after)),
+    )
+
+
+class LocalRateLimitStore:
+    """In-process store. Keys are kept in last-use order so idle keys are evicted from the front in O(1)."""
+
+    name = "memory"
+
+    def __init__(self):
+        self._states: "OrderedDict[str, WindowState]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.evicted = 0
+
+    def hit(self, key: str, now: float, limit: int, window: int) -> RateLimitResult:
+        with self._lock:
+            state, result = evaluate(self._states.get(key), now, limit, window)
+            self._states[key] = state
+            self._states.move_to_end(key)
+            # A key untouched for two windows has no weight left
+            oldest_live = int(now // window) - 1
+            while self._states:
+                first_key, first_state = next(iter(self._states.items()))
+                if first_state[0] >= oldest_live:
+                    break
+                del self._states[first_key]
+                self.evicted += 1
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {"store": self.name, "keys": len(self._states), "evicted": self.evicted}
+
+
+class SQLiteRateLimitStore:
+    """
+    Store in a local SQLite file shared by every worker process on the host.
+    Each check is one BEGIN IMMEDIATE transaction, so concurrent workers can't both spend the last slot.
+    """
+
+    name = "sqlite"
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._db = sqlite3.connect(path, check_same_thread=False, timeout=5.0, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rate_limits (
+                key TEXT PRIMARY KEY,
+                window_index INTEGER NOT NULL,
+                current_count INTEGER NOT NULL,
+                previous_count INTEGER NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS idx_rate_limits_window ON rate_limits (window_index)")
+        self._lock = threading.Lock()
+        self._last_eviction = 0.0
+        self.evicted = 0
+
+    def hit(self, key: str, now: float, limit: int, window: int) -> RateLimitResult:
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._db.execute(
+                    "SELECT window_index, current_count, previous_count FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                state, result = evaluate(tuple(row) if row else None, now, limit, window)
+                self._db.execute(
+                    "INSERT INTO rate_limits (key, window_index, current_count, previous_count) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET window_index = excluded.window_index, "
+                    "current_count = excluded.current_count, previous_count = excluded.previous_count",
+                    (key, *state)
+                )
+                if now - self._last_eviction > RATE_LIMIT_EVICT_INTERVAL:
+                    self._last_eviction = now
+                    self.evicted += self._db.execute(
+                        "DELETE FROM rate_limits WHERE window_index < ?", (int(now // window) - 1,)
+                    ).rowcount
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            keys = self._db.execute("SELECT COUNT(*) FROM rate_limits").fetchone()[0]
+        return {"store": self.name, "keys": keys, "evicted": self.evicted}
+
+
+class RateLimiter:
+    """Sliding-window-counter rate limiter over a pluggable store"""
+
+    def __init__(self, store=None, limit: int = RATE_LIMIT_REQUESTS, window: int = RATE_LIMIT_WINDOW_SECONDS):
+        self.store = store if store is not None else LocalRateLimitStore()
+        self.limit = limit
+        self.window = window
+        self.allowed = 0
+        self.denied = 0
+        self.store_errors = 0
+
+    def check(self, key: str) -> RateLimitResult:
+        """Count one request for key and return whether it is allowed."""
+        try:
+            result = self.store.hit(key, time.time(), self.limit, self.window)
+        except Exception as e:
+            # Fail open: a broken limiter store must not take the API down
+            self.store_errors += 1
+            logging.warning(f"⚠️ Rate limiter store '{self.store.name}' failed, allowing request: {e}")
+            return RateLimitResult(True, self.limit, self.limit, int(time.time()) + self.window, 0)
+        if result.allowed:
+            self.allowed += 1
+        else:
+            self.denied += 1
+        return result
+
+    def is_allowed(self, user_id: str) -> bool:
+        """
+        Check if request is allowed based on rate limits
+
+        Args:
+            user_id: User ID for rate limiting
+
+        Returns:
+            True if request is allowed, False otherwise
+        """
+        return self.check(user_id).allowed
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "limit": self.limit,
+            "window_seconds": self.window,
+            "allowed": self.allowed,
+            "denied": self.denied,
+            "store_errors": self.store_errors,
+            **self.store.get_stats(),
+        }
+
+
+def _create_store():
+    if RATE_LIMIT_STORE == "sqlite" and RATE_LIMIT_DB_PATH:
+        try:
+            store = SQLiteRateLimitStore(RATE_LIMIT_DB_PATH)
+            logging.info(f"✅ Rate limiter: shared SQLite store at {RATE_LIMIT_DB_PATH}")
+            return store
+        except Exception as e:
+            logging.warning(f"⚠️ Rate limiter: SQLite store unavailable ({e}), limits are per process")
+    return LocalRateLimitStore()
+
+
+# Global instance getter
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    Get the global rate limiter.
+
+    Returns:
+        RateLimiter: The shared instance
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        with _rate_limiter_lock:
+            if _rate_limiter is None:
+                _rate_limiter = RateLimiter(store=_create_store())
+    return _rate_limiter
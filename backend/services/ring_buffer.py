@@ -0,0 +1,45 @@
+"""
+Fixed-capacity ring buffer for in-memory history (request log, vendor call records).
+Slots are preallocated, so appends are O(1) and never copy or re-slice the history.
+"""
+
+import threading
+from typing import Any, Callable, List, Optional
+
+
+class RingBuffer:
+    """Thread-safe ring buffer; once full, each append overwrites the oldest entry"""
+
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self._slots: List[Any] = [None] * self.capacity
+        self._next = 0
+        self._size = 0
+        self._lock = threading.Lock()
+        self.total_appended = 0
+
+    def append(self, item: Any):
+        with self._lock:
+            self._slots[self._next] = item
+            self._next = (self._next + 1) % self.capacity
+            if self._size < self.capacity:
+                self._size += 1
+            self.total_appended += 1
+
+    def __len__(self) -> int:
+        return self._size
+
+    def latest(self, limit: Optional[int] = None, predicate: Optional[Callable[[Any], bool]] = None) -> List[Any]:
+        """Up to `limit` entries matching `predicate`, newest first."""
+        results = []
+        with self._lock:
+            for offset in range(1, self._size + 1):
+                if limit is not None and len(results) >= limit:
+                    break
+                item = self._slots[(self._next - offset) % self.capacity]
+                if predicate is None or predicate(item):
+                    results.append(item)
+        return results
+
+    def get_stats(self) -> dict:
+        return {"size": self._size, "capacity": self.capacity, "total_appended": self.total_appended}
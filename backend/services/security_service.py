@@ -3,17 +3,23 @@ Security service and middleware for BabbleOn backend.
 Handles CORS, security headers, request logging, and basic security measures.
 """
 
+import os
 import time
 import logging
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
 from fastapi import Request, Response, HTTPException
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from starlette.middleware.base import BaseHTTPMiddleware
 from starlette.responses import Response as StarletteResponse
 import json
 
+from .ring_buffer import RingBuffer
+from .log_queue import get_queued_logger
+
 logger = logging.getLogger(__name__)
 
+REQUEST_LOG_CAPACITY = int(os.getenv("REQUEST_LOG_CAPACITY", "1000"))   # Recent requests kept in memory
+
 class SecurityMiddleware(BaseHTTPMiddleware):
     """Security middleware for adding security headers and request logging"""
     
@@ -21,9 +27,6 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         # Start timing
         start_time = time.time()
         
-        # Log request
-        logger.info(f"{request.method} {request.url.path} - Client: {request.client}")
-        
         # Add security headers
         response = await call_next(request)
         
@@ -36,8 +39,13 @@ class SecurityMiddleware(BaseHTTPMiddleware):
         # Add timing header
         response.headers["X-Process-Time"] = str(process_time)
         
-        # Log response
-        logger.info(f"{request.method} {request.url.path} - {response.status_code} - {process_time:.3f}s")
+        # Quota headers for endpoints that checked the rate limit (see auth_service.check_rate_limit)
+        rate_limit = getattr(request.state, "rate_limit", None)
+        if rate_limit is not None:
+            response.headers.update(rate_limit.headers())
+        
+        # Record and log the request (log line is written off the request path)
+        request_logger.log_request(request, response, process_time)
         
         return response
     
@@ -89,39 +97,83 @@ class CORSConfig:
                 "*"  # Allow all for development
             ]
 
+class RequestRecord:
+    """One handled request; slots keep a full ring of these small"""
+
+    __slots__ = ("timestamp", "method", "path", "route", "client_ip", "user_agent", "status_code", "duration", "content_length")
+
+    def __init__(self, timestamp: float, method: str, path: str, route: str, client_ip: Optional[str],
+                 user_agent: str, status_code: int, duration: float, content_length: int):
+        self.timestamp = timestamp
+        self.method = method
+        self.path = path
+        self.route = route
+        self.client_ip = client_ip
+        self.user_agent = user_agent
+        self.status_code = status_code
+        self.duration = duration
+        self.content_length = content_length
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _status_matches(status_code: int, status: Union[int, str]) -> bool:
+    """status is an exact code (404, "404") or a class ("5xx")."""
+    status = str(status).lower()
+    if status.endswith("xx"):
+        return str(status_code)[:1] == status[:1]
+    return str(status_code) == status
+
+
 class RequestLogger:
-    """Request logging service"""
+    """Request logging service backed by a fixed-size ring of recent requests"""
     
-    def __init__(self):
-        self.requests = []
-        self.max_logs = 1000  # Keep last 1000 requests
+    def __init__(self, capacity: int = REQUEST_LOG_CAPACITY):
+        self.requests = RingBuffer(capacity)
+        self.max_logs = capacity
+        self._log = get_queued_logger("babblelon.requests")
     
     def log_request(self, request: Request, response: Response, duration: float):
         """Log request details"""
-        log_entry = {
-            "timestamp": time.time(),
-            "method": request.method,
-            "url": str(request.url),
-            "client_ip": request.client.host if request.client else None,
-            "user_agent": request.headers.get("user-agent", ""),
-            "status_code": response.status_code,
-            "duration": duration,
-            "content_length": response.headers.get("content-length", 0)
-        }
+        # Route template (e.g. /thai-writing-tips/{character}) groups requests better than the raw path
+        route = request.scope.get("route")
+        record = RequestRecord(
+            timestamp=time.time(),
+            method=request.method,
+            path=request.url.path,
+            route=getattr(route, "path", request.url.path),
+            client_ip=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent", ""),
+            status_code=response.status_code,
+            duration=duration,
+            content_length=int(response.headers.get("content-length", 0) or 0)
+        )
+        self.requests.append(record)
         
-        # Add to memory log (for development)
-        self.requests.append(log_entry)
-        
-        # Keep only recent logs
-        if len(self.requests) > self.max_logs:
-            self.requests = self.requests[-self.max_logs:]
-        
-        # Log to file/system
-        logger.info(f"API Request: {json.dumps(log_entry)}")
+        # Arguments are merged into the message on the log listener thread
+        self._log.info("API Request: %s %s - %d - %.3fs - Client: %s",
+                       record.method, record.path, record.status_code, duration, record.client_ip)
+    
+    def query(self, limit: int = 100, status: Optional[Union[int, str]] = None,
+              route: Optional[str] = None) -> List[Dict]:
+        """
+        Most recent requests first, optionally filtered.
+
+        Args:
+            limit: Maximum entries to return
+            status: Exact status code (404) or class ("5xx")
+            route: Route template or path (e.g. "/generate-npc-response/")
+        """
+        def matches(record: RequestRecord) -> bool:
+            if status is not None and not _status_matches(record.status_code, status):
+                return False
+            return route is None or route in (record.route, record.path)
+        return [record.to_dict() for record in self.requests.latest(limit, matches)]
     
     def get_recent_requests(self, limit: int = 100) -> List[Dict]:
         """Get recent requests for monitoring"""
-        return self.requests[-limit:]
+        return self.query(limit)
 
 class SecurityUtils:
     """Security utility functions"""
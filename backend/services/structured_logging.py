@@ -0,0 +1,142 @@
+"""
+Structured, level-gated logging for request hot paths. Disabled levels cost one level check; enabled records
+go through the log queue and their message, key=value fields and request id are rendered on the listener thread.
+"""
+
+import os
+import sys
+import json
+import logging
+import contextvars
+from typing import Any, Dict, Optional
+
+from .log_queue import get_queued_logger
+
+# Per-module levels, e.g. "services.stt_service=DEBUG,services.llm_service=WARNING"; other loggers follow the root level
+LOG_LEVELS = os.getenv("LOG_LEVELS", "")
+# "text" keeps the root formatter's line format; "json" emits one JSON object per record
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
+
+# Request id of the request being handled in this context; set when a LatencyTracker is created
+_request_id: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("request_id", default=None)
+
+
+def bind_request_id(request_id: Optional[str]) -> contextvars.Token:
+    """Tag every structured log record from the current task (and tasks it spawns) with request_id."""
+    return _request_id.set(request_id)
+
+
+def get_request_id() -> Optional[str]:
+    return _request_id.get()
+
+
+class StructuredMessage:
+    """
+    Log message kept unformatted until a handler asks for it. %-style args and fields are
+    captured by reference, so only pass values that aren't mutated after the call.
+    """
+
+    __slots__ = ("template", "args", "fields", "request_id")
+
+    def __init__(self, template: str, args: tuple, fields: Dict[str, Any], request_id: Optional[str]):
+        self.template = template
+        self.args = args
+        self.fields = fields
+        self.request_id = request_id
+
+    def message(self) -> str:
+        return self.template % self.args if self.args else self.template
+
+    def __str__(self) -> str:
+        text = self.message()
+        if self.fields:
+            text += " " + " ".join(f"{key}={value!r}" for key, value in self.fields.items())
+        if self.request_id:
+            text += f" request_id={self.request_id}"
+        return text
+
+
+class StructuredLogger:
+    """Thin facade over a queued stdlib logger: debug/info/warning/error/exception(template, *args, **fields)"""
+
+    __slots__ = ("_logger",)
+
+    def __init__(self, logger: logging.Logger):
+        self._logger = logger
+
+    def _log(self, level: int, template: str, args: tuple, fields: Dict[str, Any], exc_info: bool = False):
+        logger = self._logger
+        if not logger.isEnabledFor(level):
+            return
+        # Build the record directly: Logger.log's findCaller stack walk costs more than the record itself
+        caller = sys._getframe(2)
+        record = logger.makeRecord(
+            logger.name, level, caller.f_code.co_filename, caller.f_lineno,
+            StructuredMessage(template, args, fields, _request_id.get()), (),
+            sys.exc_info() if exc_info else None, caller.f_code.co_name
+        )
+        logger.handle(record)
+
+    def is_enabled_for(self, level: int) -> bool:
+        """For callers that would do real work (not just formatting) to build a debug value."""
+        return self._logger.isEnabledFor(level)
+
+    def debug(self, template: str, *args, **fields):
+        self._log(logging.DEBUG, template, args, fields)
+
+    def info(self, template: str, *args, **fields):
+        self._log(logging.INFO, template, args, fields)
+
+    def warning(self, template: str, *args, **fields):
+        self._log(logging.WARNING, template, args, fields)
+
+    def error(self, template: str, *args, **fields):
+        self._log(logging.ERROR, template, args, fields)
+
+    def exception(self, template: str, *args, **fields):
+        """Error with the current exception's traceback (captured now, formatted on the listener thread)."""
+        self._log(logging.ERROR, template, args, fields, exc_info=True)
+
+
+class JsonLogFormatter(logging.Formatter):
+    """One JSON object per record; structured fields and the request id become top-level keys"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "time": self.formatTime(record, "%Y-%m-%dT%H:%M:%S"),
+            "level": record.levelname,
+            "logger": record.name,
+        }
+        if isinstance(record.msg, StructuredMessage):
+            payload["message"] = record.msg.message()
+            payload.update(record.msg.fields)
+            if record.msg.request_id:
+                payload["request_id"] = record.msg.request_id
+        else:
+            payload["message"] = record.getMessage()
+        if record.exc_info:
+            payload["exception"] = self.formatException(record.exc_info)
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+def configure_logging():
+    """Apply LOG_LEVELS and LOG_FORMAT. Call once at startup, after logging.basicConfig."""
+    for entry in LOG_LEVELS.split(","):
+        name, _, level = entry.partition("=")
+        if name.strip() and level.strip():
+            logging.getLogger(name.strip()).setLevel(level.strip().upper())
+    if LOG_FORMAT == "json":
+        for handler in logging.getLogger().handlers:
+            handler.setFormatter(JsonLogFormatter())
+
+
+def get_logger(name: str) -> StructuredLogger:
+    """
+    Get a structured logger for a module.
+
+    Example:
+        log = get_logger(__name__)
+        log.info("STT successful", vendor="google", words=len(words))
+        log.debug("LLM input: %s", llm_input)  # never formatted unless DEBUG is enabled
+    """
+    return StructuredLogger(get_queued_logger(name))
@@ -18,9 +18,14 @@ import logging
 import asyncio
 import numpy as np
 import requests  # For PostHog tracking
-from .connection_pool import get_connection_pool
+from .analytics_dispatcher import capture_event
+from .structured_logging import get_logger
+from .client_registry import get_client_registry
+from .vendor_executor import run_in_vendor_executor
 import json
 
+log = get_logger(__name__)
+
 # AssemblyAI and Speechmatics imports
 # import assemblyai as aai  # Removed - no longer used
 # from speechmatics.batch import AsyncClient as SpeechmaticsAsyncClient, TranscriptionConfig, FormatType  # Removed - no longer used
@@ -43,15 +48,23 @@ if not ELEVENLABS_API_KEY:
 # AssemblyAI and Speechmatics are no longer used
 # Their configurations have been removed
 
-# Initialize Google Cloud Speech client
+# Google Cloud Speech client is shared process-wide via the client registry (created on first use)
 api_endpoint = f"{LOCATION}-speech.googleapis.com"
-speech_client = None
+SPEECH_CLIENT_NAME = "google_speech"
+
+get_client_registry().register(
+    SPEECH_CLIENT_NAME,
+    lambda: SpeechClient(client_options=ClientOptions(api_endpoint=api_endpoint)),
+    probe=lambda client: client.get_recognizer(name=f"projects/{PROJECT_ID}/locations/{LOCATION}/recognizers/_")
+)
 
-try:
-    speech_client = SpeechClient(client_options=ClientOptions(api_endpoint=api_endpoint))
-    logging.info("Google Cloud Speech client initialized successfully")
-except Exception as e:
-    logging.error(f"Failed to initialize Google Cloud Speech client: {e}")
+def get_speech_client() -> Optional[SpeechClient]:
+    """Return the shared Google Cloud Speech client, or None if it cannot be created."""
+    try:
+        return get_client_registry().get(SPEECH_CLIENT_NAME)
+    except Exception as e:
+        logging.error(f"Failed to initialize Google Cloud Speech client: {e}")
+        return None
 
 # Initialize ElevenLabs client
 elevenlabs_client = None
@@ -62,9 +75,6 @@ if ELEVENLABS_API_KEY:
     except Exception as e:
         logging.error(f"Failed to initialize ElevenLabs client: {e}")
 
-# PostHog Configuration
-POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
-
 def track_stt_call_to_posthog(
     service_name: str,
     user_id: Optional[str] = None,
@@ -76,42 +86,21 @@ def track_stt_call_to_posthog(
     success: bool = True,
     error: Optional[str] = None
 ):
-    """Track STT API calls to PostHog for analytics"""
-    if not POSTHOG_API_KEY:
-        return
-    
-    try:
-        event_data = {
-            "api_key": POSTHOG_API_KEY,
-            "event": "stt_call",
-            "properties": {
-                "service": service_name,
-                "audio_duration_s": audio_duration_s,
-                "processing_time_ms": processing_time_ms,
-                "confidence_score": confidence_score,
-                "word_count": word_count,
-                "success": success,
-                "timestamp": datetime.datetime.now().isoformat(),
-            },
-            "timestamp": datetime.datetime.now().isoformat(),
-        }
-        
-        if user_id:
-            event_data["distinct_id"] = user_id
-        if session_id:
-            event_data["properties"]["session_id"] = session_id
-        if error:
-            event_data["properties"]["error"] = error
-            
-        # Send to PostHog using connection pool
-        connection_pool = get_connection_pool()
-        connection_pool.post(
-            "https://app.posthog.com/capture/",
-            json=event_data,
-            timeout=5
-        )
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] WARNING: Failed to track STT call to PostHog: {e}")
+    """Track STT API calls to PostHog for analytics (queued; sent in the background)"""
+    properties = {
+        "service": service_name,
+        "audio_duration_s": audio_duration_s,
+        "processing_time_ms": processing_time_ms,
+        "confidence_score": confidence_score,
+        "word_count": word_count,
+        "success": success,
+        "timestamp": datetime.datetime.now().isoformat(),
+    }
+    if session_id:
+        properties["session_id"] = session_id
+    if error:
+        properties["error"] = error
+    capture_event("stt_call", properties, distinct_id=user_id)
 
 class ErrorCategory(Enum):
     """Enumeration for error classification"""
@@ -431,6 +420,7 @@ async def transcribe_audio(
     metrics = PerformanceMetrics()
     metrics.service_used = "Google Cloud STT v2"
     
+    speech_client = get_speech_client()
     if not speech_client:
         error_msg = "Google Cloud Speech client not initialized. Check credentials."
         metrics.set_error(ErrorCategory.API_AUTHENTICATION)
@@ -447,7 +437,7 @@ async def transcribe_audio(
 
         
         if stream_size == 0:
-            print(f"[{datetime.datetime.now()}] ERROR STT: Stream is empty before calling Google Cloud STT.")
+            log.error("Audio stream is empty before calling Google Cloud STT")
             metrics.set_error(ErrorCategory.EMPTY_AUDIO)
             log_performance_metrics(metrics, "Google Cloud STT", success=False)
             raise HTTPException(status_code=400, detail="Audio stream is empty before STT processing.")
@@ -463,14 +453,10 @@ async def transcribe_audio(
                 sample_width = wav_file.getsampwidth()
                 actual_duration = frames / float(sample_rate)
                 
-                # Enhanced audio format logging
-                print(f"[{datetime.datetime.now()}] AUDIO FORMAT: Google Cloud STT")
-                print(f"  - Duration: {actual_duration:.3f}s")
-                print(f"  - Sample Rate: {sample_rate}Hz (Optimal: 16000Hz)")
-                print(f"  - Channels: {channels} ({'Mono' if channels == 1 else 'Stereo'})")
-                print(f"  - Sample Width: {sample_width} bytes ({sample_width * 8}-bit)")
-                print(f"  - Total Frames: {frames}")
-                print(f"  - File Size: {stream_size} bytes")
+                log.debug(
+                    "Audio format for Google Cloud STT", duration_s=round(actual_duration, 3), sample_rate=sample_rate,
+                    channels=channels, sample_width=sample_width, frames=frames, size_bytes=stream_size
+                )
                 
                 # Validate optimal format for Google Cloud STT
                 format_warnings = []
@@ -482,15 +468,11 @@ async def transcribe_audio(
                     format_warnings.append(f"Sample width is {sample_width} bytes, 16-bit (2 bytes) is optimal")
                 
                 if format_warnings:
-                    print(f"[{datetime.datetime.now()}] FORMAT WARNINGS:")
-                    for warning in format_warnings:
-                        print(f"  ⚠ {warning}")
-                else:
-                    print(f"[{datetime.datetime.now()}] ✓ Audio format is optimal for Google Cloud STT")
+                    log.warning("⚠ Suboptimal audio format for Google Cloud STT", warnings=format_warnings)
                     
         except Exception as e:
             # Fallback to rough approximation if WAV header parsing fails
-            print(f"[{datetime.datetime.now()}] WARNING STT: Could not parse WAV header ({e}), using approximation")
+            log.warning("Could not parse WAV header (%s), using approximation", e)
             actual_duration = max(1.0, stream_size / (16000 * 1 * 2))  # Assume 16kHz, mono, 16-bit
         
         metrics.set_audio_duration(actual_duration)
@@ -542,11 +524,12 @@ async def transcribe_audio(
             try:
                 if attempt > 0:
                     delay = base_delay * (2 ** (attempt - 1))  # Exponential backoff: 1s, 2s, 4s
-                    print(f"[{datetime.datetime.now()}] INFO STT: Retry attempt {attempt + 1}/{max_retries} after {delay}s delay...")
+                    log.info("Google Cloud STT retry attempt %d/%d after %ss delay", attempt + 1, max_retries, delay)
                     await asyncio.sleep(delay)
                 
                 metrics.record_api_start()
-                response = speech_client.recognize(request=request)
+                # Blocking gRPC call; run it on the bounded Google Speech pool so parallel vendors actually overlap
+                response = await run_in_vendor_executor("google_speech", speech_client.recognize, request=request)
                 metrics.record_api_end()
                 
                 # If we get here, the request succeeded
@@ -559,12 +542,12 @@ async def transcribe_audio(
                 ])
                 
                 if attempt < max_retries - 1 and is_timeout_or_unavailable:
-                    print(f"[{datetime.datetime.now()}] WARNING STT: Attempt {attempt + 1} failed with timeout/unavailable error: {retry_exception}")
-                    print(f"[{datetime.datetime.now()}] INFO STT: Will retry in {base_delay * (2 ** attempt)}s...")
+                    log.warning("Google Cloud STT attempt %d failed with timeout/unavailable error, retrying in %ss: %s",
+                                attempt + 1, base_delay * (2 ** attempt), retry_exception)
                     continue
                 else:
                     # Final attempt failed or non-retryable error
-                    print(f"[{datetime.datetime.now()}] ERROR STT: All retry attempts exhausted or non-retryable error: {retry_exception}")
+                    log.error("Google Cloud STT retries exhausted or non-retryable error: %s", retry_exception)
                     raise retry_exception
 
         # Process results
@@ -598,7 +581,8 @@ async def transcribe_audio(
                             "speaker_tag": getattr(word_info, 'speaker_tag', 0) if hasattr(word_info, 'speaker_tag') else 0
                         })
 
-                print(f"[{datetime.datetime.now()}] INFO: Google Cloud STT successful. Transcription: '{transcribed_text}'")
+                log.info("Google Cloud STT successful", words=len(word_confidence_list), confidence=round(overall_confidence, 3))
+                log.debug("Google Cloud STT transcription: %r", transcribed_text)
                 
                 # Perform word comparison if expected text is provided
                 word_comparisons = compare_expected_vs_transcribed(word_confidence_list, expected_text)
@@ -643,7 +627,7 @@ async def transcribe_audio(
                 )
 
         # No results case
-        print(f"[{datetime.datetime.now()}] WARNING: Google Cloud STT returned no results")
+        log.warning("Google Cloud STT returned no results")
         metrics.set_error(ErrorCategory.TRANSCRIPTION_CONFIDENCE_LOW)
         metrics.finish_processing()
         log_performance_metrics(metrics, "Google Cloud STT", success=False)
@@ -665,11 +649,12 @@ async def transcribe_audio(
 
         # Classify the error for better debugging
         error_category = classify_error(e, "google cloud stt")
+        get_client_registry().record_error(SPEECH_CLIENT_NAME, e)
         metrics.set_error(error_category)
         metrics.finish_processing()
         log_performance_metrics(metrics, "Google Cloud STT", success=False)
 
-        print(f"[{datetime.datetime.now()}] ERROR: Error during Google Cloud STT: {e}. Stream pos: {current_pos_after_error}, size: {stream_size_after_error} after error.")
+        log.error("Error during Google Cloud STT: %s", e, stream_pos=current_pos_after_error, stream_size=stream_size_after_error)
         
         # Track failed STT call to PostHog
         track_stt_call_to_posthog(
@@ -700,7 +685,7 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
         STTResult object with transcribed text, word confidence scores, and processing time
     """
     if not elevenlabs_client:
-        print(f"[{datetime.datetime.now()}] ERROR: ElevenLabs client not initialized. Check API key.")
+        log.error("ElevenLabs client not initialized. Check API key.")
         raise HTTPException(status_code=500, detail="ElevenLabs client not initialized. Check API key.")
 
     try:
@@ -713,14 +698,16 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
 
         
         if stream_size == 0:
-            print(f"[{datetime.datetime.now()}] ERROR STT: Stream is empty before calling ElevenLabs STT.")
+            log.error("Audio stream is empty before calling ElevenLabs STT")
             raise HTTPException(status_code=400, detail="Audio stream is empty before STT processing.")
 
         # Start timing for performance comparison
         start_time = datetime.datetime.now()
         
         # Call ElevenLabs Scribe API with word-level timestamps
-        transcription_response = elevenlabs_client.speech_to_text.convert(
+        transcription_response = await run_in_vendor_executor(
+            "elevenlabs",
+            elevenlabs_client.speech_to_text.convert,
             file=audio_stream,  # Pass the BytesIO stream directly
             model_id="scribe_v1",  # Model to use
             language_code=language_code,  # Use the provided language code
@@ -735,17 +722,10 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
         if transcription_response and hasattr(transcription_response, 'text'):
             transcribed_text = transcription_response.text
             
-            # DEBUG: Log the full ElevenLabs response structure
-            print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs full response object type: {type(transcription_response)}")
-            print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs response attributes: {dir(transcription_response)}")
-            print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs transcribed text: '{transcribed_text}'")
-            if hasattr(transcription_response, 'words'):
-                print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs has 'words' attribute: {bool(transcription_response.words)}")
-                if transcription_response.words:
-                    print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs words count: {len(transcription_response.words)}")
-                    print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs first word structure: {dir(transcription_response.words[0]) if transcription_response.words else 'N/A'}")
-            else:
-                print(f"[{datetime.datetime.now()}] DEBUG: ElevenLabs response does NOT have 'words' attribute")
+            log.debug(
+                "ElevenLabs response", response_type=type(transcription_response).__name__, text=transcribed_text,
+                words=len(transcription_response.words) if getattr(transcription_response, 'words', None) else None
+            )
             
             # Extract word-level confidence data if available
             word_confidence_list = []
@@ -756,15 +736,9 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                 if hasattr(transcription_response, 'words') and transcription_response.words:
                     # Use actual word-level data from ElevenLabs
                     confidence_scores = []
-                    print(f"[{datetime.datetime.now()}] INFO: Processing {len(transcription_response.words)} words from ElevenLabs")
-                    
-                    for i, word_info in enumerate(transcription_response.words):
-                        # DEBUG: Log individual word structure
-                        print(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} attributes: {dir(word_info)}")
-                        
+                    for word_info in transcription_response.words:
                         # ElevenLabs uses 'text' attribute, not 'word'
                         word_text = getattr(word_info, 'text', '')
-                        print(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} text: '{word_text}'")
                         
                         # Convert logprob to confidence (logprob is negative, closer to 0 = higher confidence)
                         logprob = getattr(word_info, 'logprob', -1.0)
@@ -775,8 +749,6 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                         start_time = getattr(word_info, 'start', 0.0)
                         end_time = getattr(word_info, 'end', 0.0)
                         
-                        print(f"[{datetime.datetime.now()}] DEBUG: Word {i+1} timing: start={start_time}, end={end_time}, confidence={confidence:.3f}")
-                        
                         word_data = {
                             "word": word_text,
                             "confidence": confidence,
@@ -789,7 +761,7 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                     overall_confidence = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0.5
                 else:
                     # Fallback: Use proper word segmentation for Thai text
-                    print(f"[{datetime.datetime.now()}] INFO: ElevenLabs API did not provide word-level data, using fallback segmentation")
+                    log.info("ElevenLabs API did not provide word-level data, using fallback segmentation")
                     
                     # Use Thai word tokenization for proper word boundaries
                     if language_code in ["tha", "th"]:
@@ -798,17 +770,17 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                             words = word_tokenize(transcribed_text.strip(), engine='newmm')
                             # Filter out empty strings and whitespace-only tokens
                             words = [word.strip() for word in words if word.strip()]
-                            print(f"[{datetime.datetime.now()}] INFO: Thai word tokenization: '{transcribed_text}' -> {words} ({len(words)} words)")
+                            log.debug("Thai word tokenization: %r -> %s", transcribed_text, words)
                         except ImportError:
-                            print(f"[{datetime.datetime.now()}] WARNING: pythainlp not available, falling back to space splitting")
+                            log.warning("pythainlp not available, falling back to space splitting")
                             words = transcribed_text.strip().split()
                         except Exception as e:
-                            print(f"[{datetime.datetime.now()}] WARNING: Thai tokenization failed ({e}), falling back to space splitting")
+                            log.warning("Thai tokenization failed (%s), falling back to space splitting", e)
                             words = transcribed_text.strip().split()
                     else:
                         # For non-Thai languages, use space splitting
                         words = transcribed_text.strip().split()
-                        print(f"[{datetime.datetime.now()}] INFO: Non-Thai language, using space splitting: {len(words)} words")
+                        log.debug("Non-Thai language, using space splitting", words=len(words))
                     
                     base_confidence = 0.7  # Reasonable default confidence
                     overall_confidence = base_confidence
@@ -833,14 +805,10 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                     sample_width = wav_file.getsampwidth()
                     actual_duration = frames / float(sample_rate)
                     
-                    # Enhanced audio format logging
-                    print(f"[{datetime.datetime.now()}] AUDIO FORMAT: ElevenLabs Scribe")
-                    print(f"  - Duration: {actual_duration:.3f}s")
-                    print(f"  - Sample Rate: {sample_rate}Hz (Optimal: 16000Hz)")
-                    print(f"  - Channels: {channels} ({'Mono' if channels == 1 else 'Stereo'})")
-                    print(f"  - Sample Width: {sample_width} bytes ({sample_width * 8}-bit)")
-                    print(f"  - Total Frames: {frames}")
-                    print(f"  - File Size: {stream_size} bytes")
+                    log.debug(
+                        "Audio format for ElevenLabs Scribe", duration_s=round(actual_duration, 3), sample_rate=sample_rate,
+                        channels=channels, sample_width=sample_width, frames=frames, size_bytes=stream_size
+                    )
                     
                     # Validate optimal format for ElevenLabs Scribe
                     format_warnings = []
@@ -852,22 +820,20 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                         format_warnings.append(f"Sample width is {sample_width} bytes, 16-bit (2 bytes) is optimal")
                     
                     if format_warnings:
-                        print(f"[{datetime.datetime.now()}] FORMAT WARNINGS:")
-                        for warning in format_warnings:
-                            print(f"  ⚠ {warning}")
-                    else:
-                        print(f"[{datetime.datetime.now()}] ✓ Audio format is optimal for ElevenLabs Scribe")
+                        log.warning("⚠ Suboptimal audio format for ElevenLabs Scribe", warnings=format_warnings)
                         
             except Exception as e:
-                print(f"[{datetime.datetime.now()}] WARNING: Could not parse WAV header ({e}), using approximation")
+                log.warning("Could not parse WAV header (%s), using approximation", e)
                 actual_duration = max(1.0, stream_size / (16000 * 1 * 2))  # Assume 16kHz, mono, 16-bit
             
             real_time_factor = processing_time / actual_duration if actual_duration > 0 else 0.0
             
             # Performance logging for API comparison
-            print(f"[{datetime.datetime.now()}] INFO: ElevenLabs STT successful. Transcription: '{transcribed_text}'")
-            print(f"[{datetime.datetime.now()}] PERFORMANCE: ElevenLabs processing time: {processing_time:.3f}s, audio duration: {actual_duration:.3f}s, RTF: {real_time_factor:.3f}")
-            print(f"[{datetime.datetime.now()}] PERFORMANCE: ElevenLabs overall confidence: {overall_confidence:.3f}, word count: {len(word_confidence_list)}")
+            log.info(
+                "ElevenLabs STT successful", processing_s=round(processing_time, 3), audio_s=round(actual_duration, 3),
+                rtf=round(real_time_factor, 3), confidence=round(overall_confidence, 3), words=len(word_confidence_list)
+            )
+            log.debug("ElevenLabs STT transcription: %r", transcribed_text)
             
             # Create word comparisons if expected text provided
             word_comparisons = compare_expected_vs_transcribed(word_confidence_list, expected_text) if expected_text.strip() else []
@@ -889,7 +855,7 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
                 real_time_factor=real_time_factor
             )
         else:
-            print(f"[{datetime.datetime.now()}] ERROR: ElevenLabs STT did not return a valid text transcription.")
+            log.error("ElevenLabs STT did not return a valid text transcription")
             return STTResult(
                 text="", 
                 word_confidence=[], 
@@ -901,7 +867,7 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
 
     except ssl.SSLEOFError as ssl_e:
         error_msg = f"SSL EOF error during ElevenLabs STT: {ssl_e}. This might be a temporary network issue or an issue with ElevenLabs." 
-        print(f"[{datetime.datetime.now()}] ERROR: {error_msg}")
+        log.error(error_msg)
         raise HTTPException(status_code=503, detail=error_msg) # 503 Service Unavailable
     except Exception as e:
         # Add stream state check here too
@@ -915,7 +881,7 @@ async def transcribe_audio_elevenlabs(audio_stream: io.BytesIO, language_code: s
             stream_size_after_error = audio_stream.tell()
             audio_stream.seek(original_pos) # Attempt to restore original position
 
-        print(f"[{datetime.datetime.now()}] ERROR: Error during ElevenLabs STT: {e}. Stream pos: {current_pos_after_error}, size: {stream_size_after_error} after error.")
+        log.error("Error during ElevenLabs STT: %s", e, stream_pos=current_pos_after_error, stream_size=stream_size_after_error)
         raise HTTPException(status_code=500, detail=f"Error during speech-to-text processing: {str(e)}")
 
 async def transcribe_audio_short(audio_stream: io.BytesIO, language_code: str = "tha", expected_text: str = "") -> STTResult:
@@ -936,6 +902,7 @@ async def transcribe_audio_short(audio_stream: io.BytesIO, language_code: str =
     metrics = PerformanceMetrics()
     metrics.service_used = "Google Cloud STT v2 (short)"
     
+    speech_client = get_speech_client()
     if not speech_client:
         error_msg = "Google Cloud Speech client not initialized. Check credentials."
         metrics.set_error(ErrorCategory.API_AUTHENTICATION)
@@ -1044,7 +1011,7 @@ async def transcribe_audio_short(audio_stream: io.BytesIO, language_code: str =
 
         # Perform recognition with metrics tracking
         metrics.record_api_start()
-        response = speech_client.recognize(request=request)
+        response = await run_in_vendor_executor("google_speech", speech_client.recognize, request=request)
         metrics.record_api_end()
 
         # Process results with multiple alternatives support
@@ -1145,6 +1112,7 @@ async def transcribe_audio_short(audio_stream: io.BytesIO, language_code: str =
 
         # Classify the error for better debugging
         error_category = classify_error(e, "google cloud stt latest_short")
+        get_client_registry().record_error(SPEECH_CLIENT_NAME, e)
         metrics.set_error(error_category)
         metrics.finish_processing()
         log_performance_metrics(metrics, "Google Cloud STT (latest_short)", success=False)
@@ -1152,84 +1120,173 @@ async def transcribe_audio_short(audio_stream: io.BytesIO, language_code: str =
         print(f"[{datetime.datetime.now()}] ERROR: Error during Google Cloud STT (latest_short): {e}. Stream pos: {current_pos_after_error}, size: {stream_size_after_error} after error.")
         raise HTTPException(status_code=500, detail=f"Error during speech-to-text processing: {str(e)}")
 
-async def parallel_transcribe_audio(audio_stream: io.BytesIO, language_code: str = "tha", expected_text: str = "") -> Dict[str, STTResult]:
+# Parallel STT configuration
+STT_VENDOR_TIMEOUT = float(os.getenv("STT_VENDOR_TIMEOUT", "15.0"))              # Per-vendor timeout (seconds)
+STT_COMPARISON_DEADLINE = float(os.getenv("STT_COMPARISON_DEADLINE", "20.0"))    # Global deadline for comparison mode
+STT_RACE_CONFIDENCE_THRESHOLD = float(os.getenv("STT_RACE_CONFIDENCE_THRESHOLD", "0.8"))
+
+# Vendors available to parallel_transcribe_audio, keyed by result name
+PARALLEL_STT_VENDORS = {
+    "google_chirp2": {
+        "transcribe": transcribe_audio,
+        "service_used": "Google Cloud STT (Chirp_2)",
+        "model_used": "chirp_2",
+        "timeout": float(os.getenv("STT_TIMEOUT_GOOGLE_CHIRP2", str(STT_VENDOR_TIMEOUT))),
+    },
+    "google_short": {
+        "transcribe": transcribe_audio_short,
+        "service_used": "Google Cloud STT (short)",
+        "model_used": "short",
+        "timeout": float(os.getenv("STT_TIMEOUT_GOOGLE_SHORT", str(STT_VENDOR_TIMEOUT))),
+    },
+    "elevenlabs": {
+        "transcribe": transcribe_audio_elevenlabs,
+        "service_used": "ElevenLabs Scribe",
+        "model_used": "scribe_v1",
+        "timeout": float(os.getenv("STT_TIMEOUT_ELEVENLABS", str(STT_VENDOR_TIMEOUT))),
+    },
+}
+
+def _failed_stt_result(vendor: str, expected_text: str, error: str) -> STTResult:
+    """Placeholder result for a vendor that failed, timed out or was cancelled."""
+    config = PARALLEL_STT_VENDORS[vendor]
+    result = STTResult(
+        text="", word_confidence=[], expected_text=expected_text,
+        word_comparisons=[], service_used=config["service_used"],
+        processing_time=0.0, overall_confidence=0.0, model_used=config["model_used"],
+        audio_duration=0.0, real_time_factor=0.0
+    )
+    result.error = error
+    return result
+
+async def _run_stt_vendor(vendor: str, audio_data: bytes, language_code: str, expected_text: str) -> STTResult:
+    """Run one vendor on its own copy of the audio, bounded by the vendor's timeout."""
+    config = PARALLEL_STT_VENDORS[vendor]
+    try:
+        result = await asyncio.wait_for(
+            config["transcribe"](io.BytesIO(audio_data), language_code, expected_text),
+            timeout=config["timeout"]
+        )
+        result.error = None
+        return result
+    except asyncio.TimeoutError:
+        print(f"[{datetime.datetime.now()}] ERROR: {config['service_used']} timed out after {config['timeout']}s")
+        return _failed_stt_result(vendor, expected_text, f"timeout after {config['timeout']}s")
+    except Exception as e:
+        detail = e.detail if isinstance(e, HTTPException) else str(e)
+        print(f"[{datetime.datetime.now()}] ERROR: {config['service_used']} failed: {detail}")
+        return _failed_stt_result(vendor, expected_text, detail)
+
+def _add_word_level_metrics(result: STTResult):
+    """Attach average/variance/low-confidence word metrics used by the comparison endpoints."""
+    if result.word_confidence:
+        confidences = [w['confidence'] for w in result.word_confidence]
+        result.average_word_confidence = sum(confidences) / len(confidences) if confidences else 0.0
+        result.confidence_variance = np.var(confidences) if len(confidences) > 1 else 0.0
+        result.low_confidence_words = [w['word'] for w in result.word_confidence if w['confidence'] < 0.7]
+    else:
+        result.average_word_confidence = result.overall_confidence
+        result.confidence_variance = 0.0
+        result.low_confidence_words = []
+
+async def parallel_transcribe_audio(
+    audio_stream: io.BytesIO,
+    language_code: str = "tha",
+    expected_text: str = "",
+    mode: str = "compare",
+    vendors: Optional[List[str]] = None,
+    confidence_threshold: float = STT_RACE_CONFIDENCE_THRESHOLD,
+    deadline: float = STT_COMPARISON_DEADLINE
+) -> Dict[str, STTResult]:
     """
-    Transcribes audio using three STT services in parallel for comprehensive comparison.
-    Compares Google Cloud Chirp_2, AssemblyAI Universal-1, and Speechmatics Ursa 2 models.
+    Transcribes audio with several STT vendors concurrently.
+    
+    Modes:
+        "compare": every vendor runs to completion (or its own timeout); results that have not
+                   arrived by the global deadline are cancelled and reported as failed.
+        "race":    the first non-empty result at or above confidence_threshold wins and the
+                   remaining vendors are cancelled. If none qualifies before the deadline, the
+                   most confident completed result is returned.
     
     Args:
         audio_stream: A BytesIO stream of the audio file
         language_code: The language code for transcription
         expected_text: Optional expected text to compare against transcription
+        mode: "compare" or "race"
+        vendors: Subset of PARALLEL_STT_VENDORS keys (defaults to all)
+        confidence_threshold: Minimum overall confidence for a race winner
+        deadline: Global deadline in seconds
     
     Returns:
-        Dictionary with three transcription results: 
-        {"google_chirp2": STTResult, "assemblyai_universal": STTResult, "speechmatics_ursa": STTResult}
+        Dictionary of vendor key -> STTResult. Compare mode has one entry per vendor;
+        race mode has a single entry for the winner.
     """
-    # Create copies of the audio stream for parallel processing
-    audio_stream.seek(0)
-    audio_data = audio_stream.getvalue()
+    if mode not in ("compare", "race"):
+        raise HTTPException(status_code=400, detail=f"Unsupported parallel STT mode: {mode}")
     
-    google_chirp2_stream = io.BytesIO(audio_data)
-    assemblyai_stream = io.BytesIO(audio_data)
-    speechmatics_stream = io.BytesIO(audio_data)
+    vendors = vendors or list(PARALLEL_STT_VENDORS.keys())
+    unknown = [v for v in vendors if v not in PARALLEL_STT_VENDORS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown STT vendors: {', '.join(unknown)}")
     
-    results = {}
-    
-    print(f"[{datetime.datetime.now()}] INFO: Starting three-way STT comparison: Google Chirp_2, AssemblyAI Universal-1, Speechmatics Ursa 2")
-    
-    # Process Google Cloud STT with Chirp_2 model
-    try:
-        results["google_chirp2"] = await transcribe_audio(google_chirp2_stream, language_code, expected_text)
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] ERROR: Google Cloud STT (Chirp_2) failed: {e}")
-        results["google_chirp2"] = STTResult(
-            text="", word_confidence=[], expected_text=expected_text, 
-            word_comparisons=[], service_used="Google Cloud STT (Chirp_2)",
-            processing_time=0.0, overall_confidence=0.0, model_used="chirp_2",
-            audio_duration=0.0, real_time_factor=0.0
-        )
+    audio_stream.seek(0)
+    audio_data = audio_stream.getvalue()
     
-    # Process AssemblyAI Universal-1 model
-    try:
-        results["assemblyai_universal"] = await transcribe_audio_assemblyai(assemblyai_stream, language_code, expected_text)
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] ERROR: AssemblyAI Universal-1 failed: {e}")
-        results["assemblyai_universal"] = STTResult(
-            text="", word_confidence=[], expected_text=expected_text, 
-            word_comparisons=[], service_used="AssemblyAI Universal-1",
-            processing_time=0.0, overall_confidence=0.0, model_used="universal-1",
-            audio_duration=0.0, real_time_factor=0.0
-        )
+    log.info("Starting parallel STT", mode=mode, vendors=vendors, deadline_s=deadline)
+    started = time.time()
+    tasks = {
+        asyncio.create_task(_run_stt_vendor(vendor, audio_data, language_code, expected_text)): vendor
+        for vendor in vendors
+    }
+    results: Dict[str, STTResult] = {}
     
-    # Process Speechmatics Ursa 2 model
     try:
-        results["speechmatics_ursa"] = await transcribe_audio_speechmatics(speechmatics_stream, language_code, expected_text)
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] ERROR: Speechmatics Ursa 2 failed: {e}")
-        results["speechmatics_ursa"] = STTResult(
-            text="", word_confidence=[], expected_text=expected_text, 
-            word_comparisons=[], service_used="Speechmatics Ursa 2",
-            processing_time=0.0, overall_confidence=0.0, model_used="ursa-2",
-            audio_duration=0.0, real_time_factor=0.0
-        )
+        if mode == "compare":
+            done, pending = await asyncio.wait(tasks.keys(), timeout=deadline)
+            for task in done:
+                results[tasks[task]] = task.result()
+            for task in pending:
+                task.cancel()
+                results[tasks[task]] = _failed_stt_result(tasks[task], expected_text, f"cancelled at global deadline {deadline}s")
+            # Keep vendor order stable for callers that iterate the dict
+            results = {vendor: results[vendor] for vendor in vendors}
+        else:
+            winner = None
+            pending = set(tasks.keys())
+            loop_deadline = started + deadline
+            while pending and winner is None:
+                remaining = loop_deadline - time.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    result = task.result()
+                    results[tasks[task]] = result
+                    if winner is None and result.text.strip() and result.overall_confidence >= confidence_threshold:
+                        winner = tasks[task]
+            for task in pending:
+                task.cancel()
+            
+            if winner is None:
+                candidates = [v for v, r in results.items() if r.text.strip()]
+                if not candidates:
+                    raise HTTPException(status_code=504, detail=f"No STT vendor returned a transcription within {deadline}s")
+                winner = max(candidates, key=lambda v: results[v].overall_confidence)
+                log.info("No STT result reached the confidence threshold; using best available",
+                         threshold=confidence_threshold, winner=winner)
+            else:
+                log.info("STT race won", winner=winner, confidence=results[winner].overall_confidence, cancelled=len(pending))
+            results = {winner: results[winner]}
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
     
     # Enhanced analysis with word-level metrics
-    print(f"[{datetime.datetime.now()}] INFO: Performing enhanced word-level analysis...")
-    for service_name, result in results.items():
-        if result.word_confidence:
-            # Calculate additional word-level metrics
-            confidences = [w['confidence'] for w in result.word_confidence]
-            result.average_word_confidence = sum(confidences) / len(confidences) if confidences else 0.0
-            result.confidence_variance = np.var(confidences) if len(confidences) > 1 else 0.0
-            result.low_confidence_words = [w['word'] for w in result.word_confidence if w['confidence'] < 0.7]
-            
-        else:
-            result.average_word_confidence = result.overall_confidence
-            result.confidence_variance = 0.0
-            result.low_confidence_words = []
+    for result in results.values():
+        _add_word_level_metrics(result)
     
-    print(f"[{datetime.datetime.now()}] INFO: Three-way STT comparison completed successfully")
+    log.info("Parallel STT completed", mode=mode, duration_s=round(time.time() - started, 3))
     return results
 
 async def transcribe_audio_assemblyai(audio_stream: io.BytesIO, language_code: str = "tha", expected_text: str = "") -> STTResult:
@@ -0,0 +1,199 @@
+"""
+Batch Thai tokenization and romanization with memoisation.
+Sentences are tokenized once and only unique tokens are romanized; results are cached in bounded LRUs
+keyed on (text, engine) so repeated words across requests cost a dict lookup.
+"""
+
+import os
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence
+
+from pythainlp.tokenize import word_tokenize, syllable_tokenize, subword_tokenize
+from pythainlp.transliterate import romanize
+
+THAI_NLP_ROMANIZE_CACHE_SIZE = int(os.getenv("THAI_NLP_ROMANIZE_CACHE_SIZE", "20000"))
+THAI_NLP_TOKENIZE_CACHE_SIZE = int(os.getenv("THAI_NLP_TOKENIZE_CACHE_SIZE", "4096"))
+
+# Text used to exercise each engine during warm-up (covers tone marks, leading vowels and a compound)
+WARM_UP_SAMPLE = "สวัสดีครับ เพื่อนของผมอยากกินข้าวผัดไก่"
+
+
+class _LRUCache:
+    """Small thread-safe LRU map with hit/miss counters"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+        # Computed outside the lock; a concurrent duplicate just recomputes the same value
+        value = compute()
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return value
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+class TokenizedSentence:
+    """A sentence with its tokens and romanizations aligned index by index"""
+
+    __slots__ = ("sentence", "tokens", "romanizations")
+
+    def __init__(self, sentence: str, tokens: List[str], romanizations: List[str]):
+        self.sentence = sentence
+        self.tokens = tokens
+        self.romanizations = romanizations
+
+    def non_empty(self) -> List[tuple]:
+        """(token, romanization) pairs with whitespace-only tokens dropped."""
+        return [(token, roman) for token, roman in zip(self.tokens, self.romanizations) if token.strip()]
+
+
+class ThaiNLPEngine:
+    """
+    Memoising front end for pythainlp tokenizers and romanizers.
+    Cached values are returned as tuples/strings so callers can't mutate shared results.
+    """
+
+    def __init__(self, romanize_cache_size: int = THAI_NLP_ROMANIZE_CACHE_SIZE,
+                 tokenize_cache_size: int = THAI_NLP_TOKENIZE_CACHE_SIZE):
+        self._romanizations = _LRUCache(romanize_cache_size)
+        self._tokenizations = _LRUCache(tokenize_cache_size)
+        self.warm_up_status: Dict[str, Any] = {"state": "pending", "engines": {}}
+
+    # --- Single items ---
+
+    def tokenize(self, text: str, engine: str = "newmm") -> List[str]:
+        """Word tokens for text (pythainlp word_tokenize)."""
+        return list(self._tokenizations.get_or_compute(
+            ("word", engine, text), lambda: tuple(word_tokenize(text, engine=engine))
+        ))
+
+    def syllables(self, word: str, engine: Optional[str] = None) -> List[str]:
+        """Syllables for a word; engine=None uses pythainlp's default syllable tokenizer."""
+        def compute():
+            return tuple(syllable_tokenize(word) if engine is None else syllable_tokenize(word, engine=engine))
+        return list(self._tokenizations.get_or_compute(("syllable", engine, word), compute))
+
+    def subwords(self, word: str, engine: str = "tcc") -> List[str]:
+        """Subword clusters for a word (pythainlp subword_tokenize)."""
+        return list(self._tokenizations.get_or_compute(
+            ("subword", engine, word), lambda: tuple(subword_tokenize(word, engine=engine))
+        ))
+
+    def romanize(self, token: str, engine: str = "royin") -> str:
+        """Romanization of one token. Errors from the engine propagate and are not cached."""
+        return self._romanizations.get_or_compute((token, engine), lambda: romanize(token, engine=engine))
+
+    # --- Batches ---
+
+    def romanize_batch(self, tokens: Sequence[str], engine: str = "royin") -> List[str]:
+        """
+        Romanizations aligned with tokens. Each unique token is romanized once;
+        whitespace-only tokens are passed through unchanged.
+        """
+        unique = {token: token if not token.strip() else self.romanize(token, engine) for token in dict.fromkeys(tokens)}
+        return [unique[token] for token in tokens]
+
+    def tokenize_batch(self, sentences: Sequence[str], engine: str = "newmm") -> List[List[str]]:
+        """Word tokens for each sentence, aligned with the input; repeated sentences are tokenized once."""
+        unique = {sentence: self.tokenize(sentence, engine) for sentence in dict.fromkeys(sentences)}
+        return [list(unique[sentence]) for sentence in sentences]
+
+    def analyze_batch(self, sentences: Sequence[str], tokenizer_engine: str = "newmm",
+                      romanizer_engine: str = "royin") -> List[TokenizedSentence]:
+        """Tokenize every sentence and romanize the union of their unique tokens."""
+        tokenized = self.tokenize_batch(sentences, tokenizer_engine)
+        all_tokens = [token for tokens in tokenized for token in tokens]
+        romanized = dict(zip(all_tokens, self.romanize_batch(all_tokens, romanizer_engine)))
+        return [
+            TokenizedSentence(sentence, tokens, [romanized[token] for token in tokens])
+            for sentence, tokens in zip(sentences, tokenized)
+        ]
+
+    # --- Warm-up ---
+
+    def warm_up(self, tokenizers: Sequence[str] = ("newmm",), romanizers: Sequence[str] = ("royin",),
+                syllable_engines: Sequence[Optional[str]] = (None,), subword_engines: Sequence[str] = ("tcc",)) -> Dict[str, Any]:
+        """
+        Load and exercise each engine once so the first request doesn't pay model load costs
+        (thai2rom loads a neural model; tltk and the dictionary tokenizers build tries on first use).
+        Records per-engine load time; an engine that fails is reported, not raised.
+        """
+        self.warm_up_status = {"state": "running", "started_at": time.time(), "engines": {}}
+        words: List[str] = WARM_UP_SAMPLE.split()
+
+        def run(name: str, exercise: Callable[[], Any]):
+            start_time = time.time()
+            try:
+                output = exercise()
+                result = {"ok": True, "load_time_ms": int((time.time() - start_time) * 1000)}
+                logging.info(f"✅ Thai NLP warm-up: {name} ready in {result['load_time_ms']}ms")
+            except Exception as e:
+                output = None
+                result = {"ok": False, "load_time_ms": int((time.time() - start_time) * 1000), "error": str(e)}
+                logging.warning(f"⚠️ Thai NLP warm-up: {name} failed after {result['load_time_ms']}ms: {e}")
+            self.warm_up_status["engines"][name] = result
+            return output
+
+        for engine in tokenizers:
+            tokens = run(f"tokenizer:{engine}", lambda: self.tokenize(WARM_UP_SAMPLE, engine))
+            if engine == "newmm" and tokens:
+                words = [token for token in tokens if token.strip()]
+        for engine in romanizers:
+            run(f"romanizer:{engine}", lambda: [self.romanize(word, engine) for word in words])
+        for engine in syllable_engines:
+            run(f"syllable:{engine or 'default'}", lambda: [self.syllables(word, engine) for word in words])
+        for engine in subword_engines:
+            run(f"subword:{engine}", lambda: [self.subwords(word, engine) for word in words])
+        self.warm_up_status["state"] = "complete"
+        self.warm_up_status["completed_at"] = time.time()
+        self.warm_up_status["total_time_ms"] = int((self.warm_up_status["completed_at"] - self.warm_up_status["started_at"]) * 1000)
+        return self.warm_up_status
+
+    def skip_warm_up(self):
+        """Mark warm-up as skipped (disabled by configuration); counts as ready."""
+        self.warm_up_status = {"state": "skipped", "engines": {}}
+
+    @property
+    def ready(self) -> bool:
+        return self.warm_up_status["state"] in ("complete", "skipped")
+
+    def get_stats(self) -> Dict[str, Dict[str, int]]:
+        return {"romanize_cache": self._romanizations.get_stats(), "tokenize_cache": self._tokenizations.get_stats()}
+
+
+# Global instance getter
+_thai_nlp_engine = None
+_thai_nlp_engine_lock = threading.Lock()
+
+def get_thai_nlp_engine() -> ThaiNLPEngine:
+    """
+    Get the shared Thai NLP engine.
+
+    Returns:
+        ThaiNLPEngine: The shared instance
+    """
+    global _thai_nlp_engine
+    if _thai_nlp_engine is None:
+        with _thai_nlp_engine_lock:
+            if _thai_nlp_engine is None:
+                _thai_nlp_engine = ThaiNLPEngine()
+    return _thai_nlp_engine
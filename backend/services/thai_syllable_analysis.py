@@ -0,0 +1,1060 @@
+"""
+Thai syllable and writing-guide analysis (syllable structure, writing order, complex vowel patterns).
+Depends only on pythainlp and the writing guide, so NLP worker processes can import it without the vendor SDKs.
+"""
+
+import os
+import re
+import functools
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .thai_nlp_engine import get_thai_nlp_engine
+from .thai_writing_guide import get_thai_writing_guide, tables_for
+
+
+def build_word_syllable_analysis(word: str) -> dict:
+    """
+    Syllable breakdown, component roles and writing steps for a Thai word (no network calls).
+    Runs inside NLP worker processes; the result must be JSON-serializable.
+    """
+    nlp = get_thai_nlp_engine()
+    
+    # Load enhanced writing guide data
+    writing_guide = get_thai_writing_guide()
+    
+    # Step 1: Get syllable boundaries (for multi-syllable words like กระเทียม)
+    # Use word tokenization to identify potential syllable breaks
+    word_segments = nlp.tokenize(word, "newmm")
+    
+    # For single semantic words, analyze as syllables manually
+    if len(word_segments) == 1:
+        syllables = _analyze_syllable_structure(word)
+    else:
+        syllables = word_segments
+    
+    # Step 2: Analyze each syllable comprehensively
+    syllable_analyses = [
+        _analyze_single_syllable(syllable, i + 1, writing_guide)
+        for i, syllable in enumerate(syllables)
+    ]
+    
+    return {
+        "transliteration": nlp.romanize(word, "thai2rom"),
+        "syllable_count": len(syllables),
+        "syllables": syllable_analyses,
+        "high_level_overview": {
+            "word": word,
+            "syllable_structure": f"{len(syllables)} syllable{'s' if len(syllables) > 1 else ''}",
+            "writing_complexity": _assess_writing_complexity(syllables, writing_guide)
+        }
+    }
+
+def _analyze_syllable_structure(word: str) -> list:
+    """
+    Analyze syllable structure within a single word.
+    For words like กระเทียม, identify syllable boundaries.
+    """
+    # Use TCC to get character clusters, then group into syllables
+    tcc_clusters = get_thai_nlp_engine().subwords(word, "tcc")
+    
+    # Basic syllable boundary detection
+    # This is a simplified approach - could be enhanced with more sophisticated logic
+    syllables = []
+    current_syllable = ""
+    
+    for cluster in tcc_clusters:
+        current_syllable += cluster
+        
+        # Check if this forms a complete syllable
+        # Heuristic: if cluster ends with vowel or consonant that can end syllables
+        if _is_syllable_ending(cluster, current_syllable):
+            syllables.append(current_syllable)
+            current_syllable = ""
+    
+    # Add remaining characters as final syllable
+    if current_syllable:
+        syllables.append(current_syllable)
+    
+    return syllables if syllables else [word]
+
+def _is_syllable_ending(cluster: str, current_syllable: str) -> bool:
+    """
+    Determine if a TCC cluster likely ends a syllable.
+    """
+    # Basic heuristics for Thai syllable endings
+    if len(cluster) == 1:
+        char = cluster[0]
+        # Vowels that typically end syllables
+        if char in 'ะาิีุูเแโใไ':
+            return True
+        # Final consonants
+        if char in 'งนมยรลว':
+            return True
+    
+    # Short vowel (ะ) always ends syllable
+    if 'ะ' in cluster:
+        return True
+        
+    return False
+
+def _analyze_single_syllable(syllable: str, syllable_number: int, writing_guide: dict) -> dict:
+    """
+    Comprehensive analysis of a single syllable following educational format.
+    """
+    from pythainlp.util.thai import thai_consonants, thai_vowels, thai_tonemarks
+    
+    nlp = get_thai_nlp_engine()
+    
+    # Get TCC breakdown for detailed analysis
+    tcc_clusters = nlp.subwords(syllable, "tcc")
+    
+    # Analyze components
+    components = {
+        "initial_consonants": [],
+        "consonant_clusters": [],
+        "vowels": [],
+        "final_consonants": [],
+        "tone_marks": []
+    }
+    
+    # Component role analysis
+    component_roles = []
+    
+    for i, cluster in enumerate(tcc_clusters):
+        for char in cluster:
+            if char in thai_consonants:
+                consonant_data = writing_guide.get("consonants", {}).get(char, {})
+                role_data = {
+                    "character": char,
+                    "type": "consonant",
+                    "romanization": consonant_data.get("romanization", ""),
+                    "sound_description": consonant_data.get("sound_description", ""),
+                    "position": "initial" if i == 0 else ("final" if i == len(tcc_clusters) - 1 else "medial"),
+                    "consonant_class": _get_consonant_class(char, writing_guide),
+                    "writing_steps": consonant_data.get("beginner_steps", [])
+                }
+                
+                if i == 0:
+                    components["initial_consonants"].append(role_data)
+                elif i == len(tcc_clusters) - 1:
+                    components["final_consonants"].append(role_data)
+                
+                component_roles.append(role_data)
+                
+            elif char in thai_vowels or _is_vowel_part(char):
+                vowel_data = _get_vowel_data(char, writing_guide)
+                role_data = {
+                    "character": char,
+                    "type": "vowel",
+                    "romanization": vowel_data.get("romanization", ""),
+                    "sound_description": vowel_data.get("sound_description", ""),
+                    "position": vowel_data.get("position", "after"),
+                    "writing_steps": vowel_data.get("beginner_steps", [])
+                }
+                
+                components["vowels"].append(role_data)
+                component_roles.append(role_data)
+                
+            elif char in thai_tonemarks:
+                tone_data = writing_guide.get("tone_marks", {}).get(char, {})
+                role_data = {
+                    "character": char,
+                    "type": "tone_mark",
+                    "romanization": tone_data.get("romanization", ""),
+                    "sound_description": tone_data.get("sound_description", ""),
+                    "position": "above"
+                }
+                
+                components["tone_marks"].append(role_data)
+                component_roles.append(role_data)
+    
+    # Tone analysis
+    tone_analysis = _analyze_tone_rules(syllable, components, writing_guide)
+    
+    # Generate step-by-step writing instructions
+    writing_steps = _generate_syllable_writing_steps(syllable, component_roles, writing_guide)
+    
+    return {
+        "syllable": syllable,
+        "syllable_number": syllable_number,
+        "romanization": nlp.romanize(syllable, "thai2rom"),
+        "tcc_clusters": tcc_clusters,
+        "components": components,
+        "component_roles": component_roles,
+        "tone_analysis": tone_analysis,
+        "writing_steps": writing_steps,
+        "syllable_type": _determine_syllable_type(syllable, components, writing_guide)
+    }
+
+def _is_vowel_part(char: str) -> bool:
+    """Check if character is part of a vowel (including complex vowels)."""
+    vowel_parts = ['เ', 'แ', 'โ', 'ใ', 'ไ', 'ั', 'ิ', 'ี', 'ึ', 'ื', 'ุ', 'ู', 'ะ', 'า', 'ำ', 'ย', 'ว']
+    return char in vowel_parts
+
+def _get_vowel_data(char: str, writing_guide: dict) -> dict:
+    """Get vowel information from writing guide."""
+    if len(char) == 1:
+        data = tables_for(writing_guide).vowel_data.get(char)
+        if data is not None:
+            return data
+    else:
+        # Multi-character input: substring match against the patterns
+        for pattern, data in writing_guide.get("vowels", {}).items():
+            if char in pattern:
+                return data
+    
+    # Default data for unknown vowels
+    return {
+        "romanization": char,
+        "sound_description": f"{char} sound",
+        "position": "after"
+    }
+
+def _analyze_tone_rules(syllable: str, components: dict, writing_guide: dict) -> dict:
+    """Analyze tone rules for the syllable."""
+    # Get initial consonant class
+    initial_consonants = components.get("initial_consonants", [])
+    if not initial_consonants:
+        return {"error": "No initial consonant found"}
+    
+    consonant_class = initial_consonants[0].get("consonant_class", "unknown")
+    
+    # Determine if syllable is live or dead
+    syllable_type = _determine_syllable_type(syllable, components, writing_guide)
+    
+    # Look up tone rule
+    tone_rules = writing_guide.get("tone_rules", {})
+    rule_key = f"{consonant_class}_{syllable_type}"
+    
+    tone_rule = tone_rules.get(rule_key, {})
+    
+    return {
+        "consonant_class": consonant_class,
+        "syllable_type": syllable_type,
+        "resulting_tone": tone_rule.get("result", "unknown"),
+        "rule_explanation": tone_rule.get("explanation", ""),
+        "example": tone_rule.get("example", "")
+    }
+
+def _determine_syllable_type(syllable: str, components: dict, writing_guide: dict) -> str:
+    """Determine if syllable is live or dead."""
+    vowels = components.get("vowels", [])
+    final_consonants = components.get("final_consonants", [])
+    
+    # Check for short vowels
+    has_short_vowel = any(
+        vowel.get("romanization", "").endswith("a") and len(vowel.get("romanization", "")) == 1 
+        for vowel in vowels
+    )
+    
+    # Check for final consonants
+    if final_consonants:
+        final_char = final_consonants[0].get("character", "")
+        # Stop consonants make dead syllables
+        if final_char in "กจดตบป":
+            return "dead_syllable"
+        # Sonorant consonants make live syllables  
+        elif final_char in "งนมยรลว":
+            return "live_syllable"
+    
+    # No final consonant
+    if has_short_vowel:
+        return "dead_syllable"
+    else:
+        return "live_syllable"
+
+def _generate_syllable_writing_steps(syllable: str, component_roles: list, writing_guide: dict) -> list:
+    """Generate detailed step-by-step writing instructions for the syllable."""
+    steps = []
+    step_number = 1
+    
+    # Group components by writing order
+    before_components = [c for c in component_roles if c.get("position") == "before"]
+    consonant_components = [c for c in component_roles if c.get("type") == "consonant"]
+    above_components = [c for c in component_roles if c.get("position") == "above"]
+    after_components = [c for c in component_roles if c.get("position") == "after"]
+    
+    # Step 1: Before components (leading vowels)
+    for component in before_components:
+        steps.append({
+            "step": step_number,
+            "component": component["character"],
+            "type": component["type"],
+            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) BEFORE the consonant",
+            "sound_description": component.get("sound_description", ""),
+            "writing_tips": component.get("writing_steps", [])
+        })
+        step_number += 1
+    
+    # Step 2: Consonants
+    for component in consonant_components:
+        steps.append({
+            "step": step_number,
+            "component": component["character"],
+            "type": component["type"],
+            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')} sound)",
+            "sound_description": component.get("sound_description", ""),
+            "consonant_class": component.get("consonant_class", ""),
+            "writing_tips": component.get("writing_steps", [])
+        })
+        step_number += 1
+    
+    # Step 3: Above components (vowel marks, tone marks)
+    for component in above_components:
+        steps.append({
+            "step": step_number,
+            "component": component["character"],
+            "type": component["type"],
+            "instruction": f"Add {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) ABOVE the consonant",
+            "sound_description": component.get("sound_description", ""),
+            "writing_tips": component.get("writing_steps", [])
+        })
+        step_number += 1
+    
+    # Step 4: After components (final vowels, consonants)
+    for component in after_components:
+        steps.append({
+            "step": step_number,
+            "component": component["character"],
+            "type": component["type"],
+            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) AFTER the consonant",
+            "sound_description": component.get("sound_description", ""),
+            "writing_tips": component.get("writing_steps", [])
+        })
+        step_number += 1
+    
+    return steps
+
+def _assess_writing_complexity(syllables: list, writing_guide: dict) -> str:
+    """Assess the writing complexity of the word."""
+    total_components = sum(len(syllable) for syllable in syllables)
+    
+    if total_components <= 3:
+        return "beginner"
+    elif total_components <= 6:
+        return "intermediate"
+    else:
+        return "advanced"
+
+def _get_character_type(char: str, thai_writing_guide: dict) -> str:
+    """Get the type of a Thai character from the writing guide."""
+    if len(char) == 1:
+        return tables_for(thai_writing_guide).character_type.get(char, "Unknown")
+    
+    consonants = thai_writing_guide.get("consonants", {})
+    vowels = thai_writing_guide.get("vowels", {})
+    tone_marks = thai_writing_guide.get("tone_marks", {})
+    
+    if char in consonants:
+        return "Consonant"
+    elif char in tone_marks:
+        return "Tone Mark"
+    else:
+        # Check vowels (some have ◌ placeholder)
+        for vowel_key in vowels:
+            if char in vowel_key.replace("◌", ""):
+                return "Vowel"
+        return "Unknown"
+
+def _get_character_romanization(char: str, thai_writing_guide: dict) -> str:
+    """Get the romanization of a Thai character from the writing guide."""
+    if len(char) == 1:
+        tables = tables_for(thai_writing_guide)
+        if char in tables.consonant_romanization:
+            return tables.consonant_romanization[char]
+        return tables.vowel_romanization.get(char, "")
+    
+    consonants = thai_writing_guide.get("consonants", {})
+    vowels = thai_writing_guide.get("vowels", {})
+    
+    if char in consonants:
+        # Use initial pronunciation for consonants
+        return consonants[char].get("pronunciation", {}).get("initial", "")
+    else:
+        # Check vowels (some have ◌ placeholder)
+        for vowel_key, vowel_data in vowels.items():
+            if char in vowel_key.replace("◌", ""):
+                return vowel_data.get("pronunciation", {}).get("romanization", "")
+    
+    return ""
+
+def _get_tone_effect(tone_mark: str, consonant_class: str, thai_writing_guide: dict) -> str:
+    """Get the tone effect based on tone mark and consonant class."""
+    return tables_for(thai_writing_guide).tone_effect.get((tone_mark, consonant_class), "")
+
+def _get_consonant_class(consonant: str, thai_writing_guide: dict) -> str:
+    """Get the class of a Thai consonant."""
+    return tables_for(thai_writing_guide).consonant_class.get(consonant, "")
+
+def build_syllable_writing_guide(word: str) -> dict:
+    """
+    Build the syllable writing guide for a Thai word (see generate_syllable_writing_guide).
+    Runs inside NLP worker processes; the result must be JSON-serializable.
+    """
+    try:
+        nlp = get_thai_nlp_engine()
+        
+        # Load Thai writing guide data
+        thai_writing_guide = get_thai_writing_guide()
+        if not thai_writing_guide:
+            return {"error": "Failed to load Thai writing guide data"}
+        
+        # Step 1: Break word into proper syllables using dictionary-based engine
+        try:
+            syllables = nlp.syllables(word, "dict")
+            # Fallback to word tokenization if syllable tokenization fails or returns empty
+            if not syllables:
+                syllables = nlp.tokenize(word, "newmm")
+                print(f"Fallback to word tokenization for: {word} -> {syllables}")
+        except Exception as e:
+            print(f"Syllable tokenization failed for {word}: {e}, using word tokenization")
+            syllables = nlp.tokenize(word, "newmm")
+        
+        # Filter out empty syllables
+        syllables = [s for s in syllables if s.strip()]
+        
+        if not syllables:
+            return {"error": f"Failed to tokenize word: {word}"}
+        
+        # Step 2: Process each syllable
+        syllable_data = []
+        
+        for syllable in syllables:
+            # Parse syllable components
+            components = parse_syllable_components(syllable)
+            
+            # Generate romanization for individual syllable
+            syllable_romanization = nlp.romanize(syllable, "thai2rom")
+            
+            # Assemble tips in correct writing order
+            tips = assemble_tips_in_order(components, thai_writing_guide)
+            
+            # Determine writing order sequence
+            writing_order = _determine_writing_order(components)
+            
+            # IMPORTANT: Add character-level analysis with complex vowel detection
+            characters = []
+            complex_vowels = detect_complex_vowel_patterns(syllable)
+            
+            for i, char in enumerate(syllable):
+                # Get basic character information from thai_writing_guide
+                char_type = _get_character_type(char, thai_writing_guide)
+                char_romanization = _get_character_romanization(char, thai_writing_guide)
+                
+                # Special handling for tone marks - calculate tone effect
+                if char_type == "Tone Mark":
+                    # Find the consonant this tone mark applies to (usually previous consonant)
+                    affected_consonant = None
+                    for j in range(i-1, -1, -1):  # Look backwards for consonant
+                        prev_char = syllable[j]
+                        if _get_character_type(prev_char, thai_writing_guide) == "Consonant":
+                            affected_consonant = prev_char
+                            break
+                    
+                    if affected_consonant:
+                        consonant_class = _get_consonant_class(affected_consonant, thai_writing_guide)
+                        tone_effect = _get_tone_effect(char, consonant_class, thai_writing_guide)
+                        char_romanization = tone_effect.replace("_", " ")  # "falling_tone" -> "falling tone"
+                
+                char_info = {
+                    "character": char,
+                    "position": i,
+                    "type": char_type,
+                    "romanization": char_romanization,
+                    "complex_vowel_member": False
+                }
+                
+                # Mark complex vowel members (ONLY the vowel components, not consonants)
+                for vowel_pattern in complex_vowels:
+                    if i in vowel_pattern.positions:  # Only vowel components, not consonant_pos
+                        char_info["complex_vowel_member"] = True
+                        char_info["complex_vowel_pattern"] = vowel_pattern.pattern_key
+                        char_info["complex_vowel_role"] = "component"
+                        # For the sound carrier (final position), use complex vowel sound with original in parentheses
+                        if i == vowel_pattern.positions[-1]:  # Last component (sound carrier)
+                            original_sound = char_info["romanization"] or ""
+                            char_info["romanization"] = f"{vowel_pattern.romanization}({original_sound})" if original_sound else vowel_pattern.romanization
+                            char_info["type"] = "Complex Vowel"
+                        # For silent components, add (silent) annotation
+                        elif i in vowel_pattern.positions[:-1]:  # Other components (silent)
+                            original_sound = char_info["romanization"] or ""
+                            char_info["romanization"] = f"{original_sound}(silent)" if original_sound else "(silent)"
+                            char_info["type"] = "Complex Vowel"
+                        break
+                
+                characters.append(char_info)
+            
+            syllable_info = {
+                "syllable": syllable,
+                "romanization": syllable_romanization,
+                "components": components,
+                "writing_order": writing_order,
+                "tips": tips,
+                "characters": characters  # Add character-level analysis
+            }
+            
+            syllable_data.append(syllable_info)
+        
+        # Step 3: Prepare final response
+        result = {
+            "word": word,
+            "syllables": syllable_data,
+            "traceable_canvases": syllables,  # Each syllable is a separate canvas
+            "total_syllables": len(syllables)
+        }
+        
+        return result
+        
+    except Exception as e:
+        print(f"Error generating syllable writing guide for '{word}': {e}")
+        return {
+            "error": str(e),
+            "word": word,
+            "fallback": True
+        }
+
+def parse_syllable_components(syllable: str) -> dict:
+    """
+    Parse a single syllable into its grammatical components.
+    
+    Process:
+    1. Identify vowels that come before consonants (เ, แ, โ, ใ, ไ)
+    2. Identify initial consonants and clusters
+    3. Identify vowels above/below consonants
+    4. Identify vowels that come after consonants
+    5. Identify final consonants
+    6. Identify tone marks
+    
+    Returns component dictionary with positions
+    """
+    
+    # Define component categories
+    BEFORE_VOWELS = ["เ", "แ", "โ", "ใ", "ไ"]
+    ABOVE_VOWELS = ["◌ิ", "◌ี", "◌ึ", "◌ื", "◌ั", "◌ํ", "ิ", "ี", "ึ", "ื", "ั", "ํ"]
+    BELOW_VOWELS = ["◌ุ", "◌ู", "◌ฺ", "ุ", "ู", "ฺ"]
+    AFTER_VOWELS = ["◌ะ", "◌า", "◌ำ", "◌ๅ", "ะ", "า", "ำ", "ๅ", "อ", "ย", "ว"]
+    TONE_MARKS = ["◌่", "◌้", "◌๊", "◌๋", "่", "้", "๊", "๋"]
+    
+    # Thai consonants range
+    CONSONANTS = "กขฃคฅฆงจฉชซฌญฎฏฐฑฒณดตถทธนบปผฝพฟภมยรลวศษสหฬอฮ"
+    
+    # Common consonant clusters
+    CONSONANT_CLUSTERS = ["กร", "กล", "คร", "คล", "ปร", "ปล", "ทร", "ผล", "พร", "พล", "สร", "หร", "หล", "หม", "หน", "หย", "หว"]
+    
+    components = {
+        "before_vowels": [],
+        "initial_consonants": [],
+        "consonant_clusters": [],
+        "above_vowels": [],
+        "below_vowels": [],
+        "after_vowels": [],
+        "final_consonants": [],
+        "tone_marks": []
+    }
+    
+    i = 0
+    while i < len(syllable):
+        char = syllable[i]
+        
+        # Check for consonant clusters first (2-character sequences)
+        if i < len(syllable) - 1:
+            cluster = syllable[i:i+2]
+            if cluster in CONSONANT_CLUSTERS:
+                components["consonant_clusters"].append(cluster)
+                components["initial_consonants"].extend(list(cluster))
+                i += 2
+                continue
+        
+        # Individual character analysis
+        if char in BEFORE_VOWELS:
+            components["before_vowels"].append(char)
+        elif char in ABOVE_VOWELS:
+            components["above_vowels"].append(char)
+        elif char in BELOW_VOWELS:
+            components["below_vowels"].append(char)
+        elif char in AFTER_VOWELS:
+            components["after_vowels"].append(char)
+        elif char in TONE_MARKS:
+            components["tone_marks"].append(char)
+        elif char in CONSONANTS:
+            # Determine if initial or final consonant based on position
+            remaining_chars = syllable[i+1:]
+            
+            # If there are more consonants or vowels after this, it's likely initial
+            has_vowels_after = any(c in ABOVE_VOWELS + BELOW_VOWELS + AFTER_VOWELS for c in remaining_chars)
+            has_consonants_after = any(c in CONSONANTS for c in remaining_chars)
+            
+            if has_vowels_after or has_consonants_after:
+                components["initial_consonants"].append(char)
+            else:
+                components["final_consonants"].append(char)
+        
+        i += 1
+    
+    return components
+
+def assemble_tips_in_order(components: dict, thai_writing_guide: dict) -> dict:
+    """
+    Assemble writing tips following Thai writing order.
+    
+    Order:
+    1. Leading vowels (before)
+    2. Initial consonants (including clusters)
+    3. Vowels above/below
+    4. Following vowels (after)
+    5. Final consonants
+    6. Tone marks
+    
+    Returns tips organized by category (general, step_by_step, pronunciation)
+    """
+    
+    tips = {
+        "general": [],
+        "step_by_step": [],
+        "pronunciation": []
+    }
+    
+    step_number = 1
+    
+    # Get character data from writing guide
+    consonants_data = thai_writing_guide.get("consonants", {})
+    vowels_data = thai_writing_guide.get("vowels", {})
+    tone_marks_data = thai_writing_guide.get("tone_marks", {})
+    
+    # 1. Leading vowels (before)
+    for vowel in components.get("before_vowels", []):
+        vowel_info = _find_vowel_info(vowel, vowels_data)
+        if vowel_info:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": vowel,
+                "instruction": f"Write the leading vowel '{vowel}' first",
+                "details": vowel_info.get("steps", []),
+                "sound": vowel_info.get("sound_description", "")
+            })
+            tips["pronunciation"].append(f"'{vowel}' makes {vowel_info.get('sound_description', 'vowel sound')}")
+            step_number += 1
+    
+    # 2. Initial consonants (including clusters)
+    if components.get("consonant_clusters"):
+        for cluster in components["consonant_clusters"]:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": cluster,
+                "instruction": f"Write the consonant cluster '{cluster}'",
+                "details": [f"Write {cluster[0]} then {cluster[1]} close together"],
+                "sound": f"Makes {cluster} sound as a unit"
+            })
+            step_number += 1
+    else:
+        for consonant in components.get("initial_consonants", []):
+            consonant_info = consonants_data.get(consonant, {})
+            if consonant_info:
+                tips["step_by_step"].append({
+                    "step": step_number,
+                    "character": consonant,
+                    "instruction": f"Write the consonant '{consonant}'",
+                    "details": consonant_info.get("steps", []),
+                    "sound": consonant_info.get("sound_description", "")
+                })
+                tips["pronunciation"].append(f"'{consonant}' makes {consonant_info.get('sound_description', 'consonant sound')}")
+                step_number += 1
+    
+    # 3. Vowels above/below
+    for vowel in components.get("above_vowels", []) + components.get("below_vowels", []):
+        vowel_info = _find_vowel_info(vowel, vowels_data)
+        position = "above" if vowel in components.get("above_vowels", []) else "below"
+        if vowel_info:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": vowel,
+                "instruction": f"Add vowel mark '{vowel}' {position} the consonant",
+                "details": vowel_info.get("steps", []),
+                "sound": vowel_info.get("sound_description", "")
+            })
+            step_number += 1
+    
+    # 4. Following vowels (after)
+    for vowel in components.get("after_vowels", []):
+        vowel_info = _find_vowel_info(vowel, vowels_data)
+        if vowel_info:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": vowel,
+                "instruction": f"Write the following vowel '{vowel}'",
+                "details": vowel_info.get("steps", []),
+                "sound": vowel_info.get("sound_description", "")
+            })
+            step_number += 1
+    
+    # 5. Final consonants
+    for consonant in components.get("final_consonants", []):
+        consonant_info = consonants_data.get(consonant, {})
+        if consonant_info:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": consonant,
+                "instruction": f"Write the final consonant '{consonant}'",
+                "details": consonant_info.get("steps", []),
+                "sound": consonant_info.get("sound_description", "")
+            })
+            step_number += 1
+    
+    # 6. Tone marks (always last)
+    for tone in components.get("tone_marks", []):
+        tone_info = tone_marks_data.get(tone, {})
+        if tone_info:
+            tips["step_by_step"].append({
+                "step": step_number,
+                "character": tone,
+                "instruction": f"Add tone mark '{tone}' above",
+                "details": tone_info.get("steps", []),
+                "sound": tone_info.get("sound_description", "")
+            })
+            step_number += 1
+    
+    # Add general tips
+    if components.get("consonant_clusters"):
+        tips["general"].append("This syllable contains consonant clusters that work together")
+    
+    if components.get("before_vowels"):
+        tips["general"].append("Leading vowels are written first but pronounced after consonants")
+    
+    if components.get("tone_marks"):
+        tips["general"].append("Tone marks are always written last")
+    
+    return tips
+
+def _determine_writing_order(components: dict) -> list:
+    """Determine the correct writing order for all components in a syllable."""
+    order = []
+    
+    # 1. Leading vowels first
+    order.extend(components.get("before_vowels", []))
+    
+    # 2. Initial consonants (respecting clusters)
+    if components.get("consonant_clusters"):
+        order.extend(components["consonant_clusters"])
+    else:
+        order.extend(components.get("initial_consonants", []))
+    
+    # 3. Vowels above/below
+    order.extend(components.get("above_vowels", []))
+    order.extend(components.get("below_vowels", []))
+    
+    # 4. Following vowels
+    order.extend(components.get("after_vowels", []))
+    
+    # 5. Final consonants
+    order.extend(components.get("final_consonants", []))
+    
+    # 6. Tone marks always last
+    order.extend(components.get("tone_marks", []))
+    
+    return order
+
+def _find_vowel_info(vowel: str, vowels_data: dict) -> dict:
+    """Find vowel information from the Thai writing guide."""
+    # Direct lookup with ◌ placeholder
+    if f"◌{vowel}" in vowels_data:
+        return vowels_data[f"◌{vowel}"]
+    
+    # Lookup with vowel as prefix
+    if f"{vowel}◌" in vowels_data:
+        return vowels_data[f"{vowel}◌"]
+    
+    # Direct lookup
+    if vowel in vowels_data:
+        return vowels_data[vowel]
+    
+    # Search in all vowel patterns
+    for pattern, data in vowels_data.items():
+        if vowel in pattern:
+            return data
+    
+    # Return empty dict if not found
+    return {}
+
+# ============================================================================
+# COMPLEX VOWEL PATTERN DETECTION SYSTEM
+# ============================================================================
+
+
+@dataclass
+class ComplexVowelMatch:
+    """Represents a detected complex vowel pattern in Thai text."""
+    pattern_key: str          # e.g., "เ◌ือ"
+    name: str                # e.g., "Sara Uea"
+    components: List[str]     # e.g., ["เ", "ื", "อ"]
+    positions: List[int]      # Character positions in word
+    consonant_pos: int        # Position of consonant in pattern
+    romanization: str         # e.g., "uea"
+    reading_explanation: str  # Educational explanation
+    component_explanation: str # How components work together
+
+# Complex vowel patterns with their regex patterns and metadata
+# Updated regex patterns to handle tone marks (่ ้ ๊ ๋) and cluster consonants properly
+COMPLEX_VOWEL_PATTERNS = {
+    "เ◌ือ": {
+        "name": "Sara Uea",
+        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ื([์่้๊๋]?)อ",
+        "components": ["เ", "ื", "อ"],
+        "romanization": "uea",
+        "position": "surrounding",
+        "description": "A complex vowel sound unique to Thai"
+    },
+    "เ◌า": {
+        "name": "Sara Ao", 
+        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)า",
+        "components": ["เ", "า"],
+        "romanization": "ao",
+        "position": "surrounding",
+        "description": "An 'ow' sound, as in 'cow'"
+    },
+    "เ◌ะ": {
+        "name": "Sara E Short",
+        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
+        "components": ["เ", "ะ"],
+        "romanization": "e",
+        "position": "surrounding", 
+        "description": "A short 'e' sound, as in 'bet'"
+    },
+    "แ◌ะ": {
+        "name": "Sara Ae Short",
+        "regex": r"แ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
+        "components": ["แ", "ะ"],
+        "romanization": "ae",
+        "position": "surrounding",
+        "description": "A short 'a' sound, as in 'cat'"
+    },
+    "โ◌ะ": {
+        "name": "Sara O Short",
+        "regex": r"โ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
+        "components": ["โ", "ะ"],
+        "romanization": "o",
+        "position": "surrounding",
+        "description": "A short 'o' sound, as in 'pot'"
+    },
+    "เ◌อ": {
+        "name": "Sara Oe",
+        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)อ",
+        "components": ["เ", "อ"],
+        "romanization": "oe",
+        "position": "surrounding",
+        "description": "A neutral vowel sound, like the 'u' in 'fur'"
+    },
+    "เ◌ีย": {
+        "name": "Sara Ia",
+        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ีย",
+        "components": ["เ", "ี", "ย"],
+        "romanization": "ia", 
+        "position": "surrounding",
+        "description": "An 'ia' sound, as in 'maria'"
+    },
+    "◌ัย": {
+        "name": "Sara Ai",
+        "regex": r"([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ัย",
+        "components": ["ั", "ย"],
+        "romanization": "ai",
+        "position": "surrounding",
+        "description": "An 'ai' sound, as in 'my'"
+    },
+    "◌ัว": {
+        "name": "Sara Ua",
+        "regex": r"([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ัว",
+        "components": ["ั", "ว"],
+        "romanization": "ua",
+        "position": "surrounding",
+        "description": "A 'ua' sound, as in 'suave'"
+    }
+}
+
+# Educational explanation templates
+VOWEL_READING_EXPLANATIONS = {
+    "เ◌ือ": "Even though เ is written before the consonant, the full vowel เ◌ือ is pronounced after. The three parts (เ + ื + อ) work together to create the 'uea' sound. Always read the vowel after the consonant, even if เ is written first!",
+    "เ◌า": "The เ is written before the consonant but pronounced after it. Together with า, they create the 'ao' sound that comes after the consonant.",
+    "เ◌ะ": "The เ leads but is pronounced after the consonant, combining with ะ to make a short 'e' sound.",
+    "แ◌ะ": "The แ comes first visually but sounds after the consonant, joining with ะ for a short 'ae' sound.",
+    "โ◌ะ": "The โ is written first but pronounced after the consonant, working with ะ to create a short 'o' sound.",
+    "เ◌อ": "The เ leads in writing but follows in pronunciation, combining with อ for the neutral 'oe' sound.",
+    "เ◌ีย": "The เ starts the pattern but is pronounced after the consonant, along with ี and ย creating the 'ia' sound.",
+    "◌ัย": "The ั sits above the consonant and ย follows it, together making the 'ai' sound.",
+    "◌ัว": "The ั goes above the consonant and ว comes after, creating the 'ua' sound together."
+}
+
+COMPLEX_VOWEL_CACHE_SIZE = int(os.getenv("COMPLEX_VOWEL_CACHE_SIZE", "4096"))
+
+def _compile_complex_vowel_scanner():
+    """
+    Combine every COMPLEX_VOWEL_PATTERNS regex into one alternation, in dict order.
+    Alternative i is wrapped in group p{i}; its consonant group (the first group) is renamed c{i}.
+    """
+    alternatives = []
+    for index, pattern_info in enumerate(COMPLEX_VOWEL_PATTERNS.values()):
+        regex = re.sub(r"\((?!\?)", f"(?P<c{index}>", pattern_info["regex"], count=1)
+        alternatives.append(f"(?P<p{index}>{regex})")
+    return re.compile("|".join(alternatives))
+
+_COMPLEX_VOWEL_SCANNER = _compile_complex_vowel_scanner()
+_COMPLEX_VOWEL_KEYS = list(COMPLEX_VOWEL_PATTERNS.keys())
+
+def _build_complex_vowel_match(word: str, pattern_key: str, match: "re.Match", consonant_group_name: str) -> ComplexVowelMatch:
+    """Work out component positions for one scanner match."""
+    pattern_info = COMPLEX_VOWEL_PATTERNS[pattern_key]
+    # Extract consonant group and build component positions
+    consonant_group = match.group(consonant_group_name)  # The consonant(s) in the pattern
+    start_pos = match.start()
+    end_pos = match.end()
+    
+    # Calculate exact positions of each component
+    positions = []
+    components = pattern_info["components"]
+    
+    # Map components to their actual positions in the word
+    if pattern_key.startswith("เ"):
+        # Leading vowel patterns: เ + consonant + other components
+        positions.append(start_pos)  # เ position
+        consonant_pos = start_pos + 1
+        
+        # Find actual positions of remaining vowel components in the matched text
+        matched_text = match.group(0)
+        
+        # For เ◌ือ pattern, find ื and อ positions
+        if pattern_key == "เ◌ือ":
+            # Find ื position
+            ue_pos = word.find("ื", start_pos)
+            if ue_pos != -1:
+                positions.append(ue_pos)
+            
+            # Find อ position  
+            o_pos = word.find("อ", ue_pos if ue_pos != -1 else start_pos)
+            if o_pos != -1:
+                positions.append(o_pos)
+        else:
+            # Fallback for other patterns
+            current_pos = start_pos + 1 + len(consonant_group)
+            for component in components[1:]:  # Skip เ, already added
+                positions.append(current_pos)
+                current_pos += len(component)
+            
+    elif pattern_key.startswith("แ") or pattern_key.startswith("โ"):
+        # Leading vowel patterns: แ/โ + consonant + ะ
+        positions.append(start_pos)  # แ/โ position
+        consonant_pos = start_pos + 1
+        positions.append(start_pos + 1 + len(consonant_group))  # ะ position
+        
+    else:
+        # Patterns starting with ◌ (consonant first)
+        consonant_pos = start_pos
+        current_pos = start_pos + len(consonant_group)
+        for component in components:
+            positions.append(current_pos)
+            current_pos += len(component)
+    
+    # Create explanation with actual word context
+    reading_explanation = VOWEL_READING_EXPLANATIONS[pattern_key]
+    component_explanation = f"In {word}: {' + '.join(components)} around {consonant_group} = {pattern_info['romanization']} sound"
+    
+    # Create the match object
+    complex_match = ComplexVowelMatch(
+        pattern_key=pattern_key,
+        name=pattern_info["name"],
+        components=components,
+        positions=positions,
+        consonant_pos=consonant_pos,
+        romanization=pattern_info["romanization"],
+        reading_explanation=reading_explanation,
+        component_explanation=component_explanation
+    )
+    
+    return complex_match
+
+@functools.lru_cache(maxsize=COMPLEX_VOWEL_CACHE_SIZE)
+def _scan_complex_vowels(word: str) -> Tuple[Tuple[ComplexVowelMatch, ...], Tuple[Optional[int], ...]]:
+    """
+    Scan a word once with the combined regex.
+    Returns the matches and, for every character position, the index of the match covering it (or None).
+    Cached per word; the returned match objects are shared and must not be modified.
+    """
+    matches = []
+    position_index: List[Optional[int]] = [None] * len(word)
+    for match in _COMPLEX_VOWEL_SCANNER.finditer(word):
+        pattern_number = int(match.lastgroup[1:])
+        complex_match = _build_complex_vowel_match(word, _COMPLEX_VOWEL_KEYS[pattern_number], match, f"c{pattern_number}")
+        for position in complex_match.positions + [complex_match.consonant_pos]:
+            if 0 <= position < len(word) and position_index[position] is None:
+                position_index[position] = len(matches)
+        matches.append(complex_match)
+    return tuple(matches), tuple(position_index)
+
+def detect_complex_vowel_patterns(word: str) -> List[ComplexVowelMatch]:
+    """
+    Detect complex vowel patterns in Thai text.
+    
+    Args:
+        word: Thai text to analyze
+        
+    Returns:
+        List of detected complex vowel patterns with positions and metadata, in word order
+    """
+    return list(_scan_complex_vowels(word)[0])
+
+def get_complex_vowel_info(word: str, character_position: int) -> Optional[ComplexVowelMatch]:
+    """
+    Get complex vowel information for a character at a specific position.
+    
+    Args:
+        word: Thai text containing the character
+        character_position: Position of character to check
+        
+    Returns:
+        ComplexVowelMatch if character is part of a complex vowel, None otherwise
+    """
+    matches, position_index = _scan_complex_vowels(word)
+    if 0 <= character_position < len(position_index):
+        match_number = position_index[character_position]
+        if match_number is not None:
+            return matches[match_number]
+    return None
+
+def analyze_complex_vowels_batch(words: List[str]) -> Dict[str, Dict[str, object]]:
+    """
+    Complex vowel analysis for many words (e.g. every token of a sentence) in one call.
+    Each distinct word is scanned once.
+    
+    Returns:
+        {word: {"matches": [ComplexVowelMatch, ...], "position_matches": [ComplexVowelMatch or None per character]}}
+    """
+    results = {}
+    for word in dict.fromkeys(words):
+        matches, position_index = _scan_complex_vowels(word)
+        results[word] = {
+            "matches": list(matches),
+            "position_matches": [matches[i] if i is not None else None for i in position_index]
+        }
+    return results
+
+def generate_complex_vowel_explanation(word: str, complex_vowel: ComplexVowelMatch) -> str:
+    """
+    Generate educational explanation for a complex vowel pattern.
+    
+    Args:
+        word: The word containing the pattern
+        complex_vowel: The detected complex vowel pattern
+        
+    Returns:
+        Detailed educational explanation
+    """
+    explanation_parts = [
+        f"**{complex_vowel.name} ({complex_vowel.pattern_key})**",
+        "",
+        f"🔤 **Components:** {' + '.join(complex_vowel.components)}",
+        f"🔊 **Sound:** {complex_vowel.romanization}",
+        "",
+        f"📖 **Reading Order:** {complex_vowel.reading_explanation}",
+        "",
+        f"💡 **In this word:** {complex_vowel.component_explanation}"
+    ]
+    
+    return "\n".join(explanation_parts)
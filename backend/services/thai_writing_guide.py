@@ -0,0 +1,153 @@
+"""
+Memoised Thai writing guide (assets/data/thai_writing_guide.json).
+Loaded once into a read-only structure with per-character lookup tables, and reloaded when the file is edited.
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+THAI_WRITING_GUIDE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "assets", "data", "thai_writing_guide.json"
+)
+# How often callers re-check the guide's mtime for content edits; 0 checks on every call
+WRITING_GUIDE_CHECK_INTERVAL = float(os.getenv("WRITING_GUIDE_CHECK_INTERVAL", "2.0"))
+
+# Tone mark -> key in pronunciation_system.tone_mark_rules
+TONE_MARK_KEYS = {
+    "่": "mai_ek",
+    "้": "mai_tho",
+    "๊": "mai_tri",
+    "๋": "mai_chattawa"
+}
+
+
+class _FrozenDict(dict):
+    """dict that rejects mutation, so a shared guide can't be corrupted by one request. Still JSON-serializable."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Thai writing guide data is read-only; copy it before modifying")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    update = pop = popitem = clear = setdefault = _readonly
+
+    def __reduce__(self):
+        # Pickle/deepcopy produce a plain, mutable dict
+        return (dict, (dict(self),))
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _FrozenDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class WritingGuideTables:
+    """Per-character lookups precomputed from the guide (single characters only)"""
+
+    def __init__(self, guide: Dict[str, Any]):
+        consonants = guide.get("consonants", {})
+        vowels = guide.get("vowels", {})
+        tone_marks = guide.get("tone_marks", {})
+
+        self.consonant_class = {char: data.get("class", "") for char, data in consonants.items()}
+        self.consonant_romanization = {
+            char: data.get("pronunciation", {}).get("initial", "") for char, data in consonants.items()
+        }
+
+        # First vowel pattern (in file order) containing each character, as the linear scans returned
+        self.vowel_data: Dict[str, Dict[str, Any]] = {}
+        for pattern, data in vowels.items():
+            for char in pattern:
+                self.vowel_data.setdefault(char, data)
+        self.vowel_romanization = {
+            char: data.get("pronunciation", {}).get("romanization", "")
+            for char, data in self.vowel_data.items() if char != "◌"
+        }
+
+        self.character_type: Dict[str, str] = {char: "Vowel" for char in self.vowel_romanization}
+        self.character_type.update({char: "Tone Mark" for char in tone_marks})
+        self.character_type.update({char: "Consonant" for char in consonants})
+
+        tone_mark_rules = guide.get("pronunciation_system", {}).get("tone_mark_rules", {})
+        self.tone_effect: Dict[Tuple[str, str], str] = {}
+        for mark, key in TONE_MARK_KEYS.items():
+            for consonant_class, effect in tone_mark_rules.get(key, {}).get("effect_by_consonant_class", {}).items():
+                self.tone_effect[(mark, consonant_class)] = effect
+
+
+class ThaiWritingGuide(_FrozenDict):
+    """The read-only guide data, carrying its lookup tables as an attribute"""
+
+    tables: WritingGuideTables
+
+
+def _build_guide(data: Dict[str, Any]) -> ThaiWritingGuide:
+    guide = ThaiWritingGuide((key, _freeze(value)) for key, value in data.items())
+    guide.tables = WritingGuideTables(guide)
+    return guide
+
+
+def tables_for(guide: Dict[str, Any]) -> WritingGuideTables:
+    """Lookup tables for a guide; builds them for plain dicts that didn't come from the loader."""
+    tables = getattr(guide, "tables", None)
+    return tables if tables is not None else WritingGuideTables(guide)
+
+
+class _WritingGuideLoader:
+    """Holds the current guide and reloads it when the file's mtime changes"""
+
+    def __init__(self, path: str = THAI_WRITING_GUIDE_PATH, check_interval: float = WRITING_GUIDE_CHECK_INTERVAL):
+        self.path = path
+        self.check_interval = check_interval
+        self._guide: Optional[ThaiWritingGuide] = None
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self._lock = threading.Lock()
+        self.reloads = 0
+
+    def get(self) -> ThaiWritingGuide:
+        now = time.time()
+        if self._guide is not None and now - self._last_check < self.check_interval:
+            return self._guide
+        with self._lock:
+            self._last_check = now
+            try:
+                mtime = os.stat(self.path).st_mtime
+            except OSError as e:
+                if self._guide is None:
+                    print(f"Error loading Thai writing guide: {e}")
+                    return _build_guide({})
+                return self._guide
+            if self._guide is not None and mtime == self._mtime:
+                return self._guide
+            try:
+                with open(self.path, 'r', encoding='utf-8') as file:
+                    data = json.load(file)
+            except Exception as e:
+                print(f"Error loading Thai writing guide: {e}")
+                # Keep serving the last good version while an edit is in progress
+                return self._guide if self._guide is not None else _build_guide({})
+            self._guide = _build_guide(data)
+            self._mtime = mtime
+            self.reloads += 1
+            if self.reloads > 1:
+                logging.info(f"✅ Thai writing guide reloaded after edit ({len(self._guide.get('consonants', {}))} consonants)")
+            return self._guide
+
+
+_loader = _WritingGuideLoader()
+
+def get_thai_writing_guide() -> ThaiWritingGuide:
+    """
+    Get the shared, read-only Thai writing guide.
+
+    Returns:
+        ThaiWritingGuide: Guide data (a read-only dict) with precomputed lookup tables
+    """
+    return _loader.get()
@@ -0,0 +1,350 @@
+"""
+Translation memory: caches paid translation results keyed on (source text, source language, target language, provider).
+An in-process LRU tier sits in front of a SQLite tier that survives restarts; both expire entries after a TTL.
+"""
+
+import os
+import json
+import time
+import asyncio
+import sqlite3
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+TRANSLATION_MEMORY_ENABLED = os.getenv("TRANSLATION_MEMORY_ENABLED", "true").lower() == "true"
+TRANSLATION_MEMORY_MAX_ENTRIES = int(os.getenv("TRANSLATION_MEMORY_MAX_ENTRIES", "20000"))       # LRU tier size
+TRANSLATION_MEMORY_TTL_SECONDS = int(os.getenv("TRANSLATION_MEMORY_TTL_SECONDS", str(30 * 24 * 3600)))
+# Set to an empty string to keep the memory in-process only
+TRANSLATION_MEMORY_DB_PATH = os.getenv(
+    "TRANSLATION_MEMORY_DB_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "cache", "translation_memory.sqlite3")
+)
+VOCABULARY_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "data")
+
+# Language code aliases so "en" and "en-US" share entries
+_LANGUAGE_ALIASES = {"en-us": "en", "en-gb": "en", "th-th": "th"}
+
+MemoryKey = Tuple[str, str, str, str]
+
+
+def _normalize_language(language: str) -> str:
+    language = (language or "").strip().lower()
+    return _LANGUAGE_ALIASES.get(language, language)
+
+
+def make_key(text: str, source_language: str, target_language: str, provider: str) -> MemoryKey:
+    """Build a translation memory key; surrounding whitespace is not significant."""
+    return (text.strip(), _normalize_language(source_language), _normalize_language(target_language), provider)
+
+
+class TranslationMemory:
+    """
+    Two-tier translation cache with hit/miss counters.
+    SQLite access is serialized with a lock; lookups are primary-key reads on a local file.
+    Code on the event loop uses the *_async methods, which keep SQLite reads and commits on worker threads.
+    """
+
+    _instance = None
+    _lock = threading.Lock()
+
+    def __new__(cls):
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    cls._instance._initialized = False
+        return cls._instance
+
+    def __init__(self):
+        """Initialize the memory (only once due to singleton)"""
+        if self._initialized:
+            return
+        self.enabled = TRANSLATION_MEMORY_ENABLED
+        self.max_entries = TRANSLATION_MEMORY_MAX_ENTRIES
+        self.ttl_seconds = TRANSLATION_MEMORY_TTL_SECONDS
+        self._entries: "OrderedDict[MemoryKey, Tuple[str, float]]" = OrderedDict()
+        self._entries_lock = threading.Lock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._db_lock = threading.Lock()
+        self.stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expired": 0,
+            "prewarmed": 0,
+            "disk_errors": 0,
+        }
+        if self.enabled and TRANSLATION_MEMORY_DB_PATH:
+            self._open_db(TRANSLATION_MEMORY_DB_PATH)
+        self._initialized = True
+
+    def _open_db(self, path: str):
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            db = sqlite3.connect(path, check_same_thread=False, timeout=5.0)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute(
+                """
+                CREATE TABLE IF NOT EXISTS translation_memory (
+                    source_text TEXT NOT NULL,
+                    source_language TEXT NOT NULL,
+                    target_language TEXT NOT NULL,
+                    provider TEXT NOT NULL,
+                    translated_text TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    PRIMARY KEY (source_text, source_language, target_language, provider)
+                )
+                """
+            )
+            db.execute("CREATE INDEX IF NOT EXISTS idx_translation_memory_expires ON translation_memory (expires_at)")
+            db.commit()
+            self._db = db
+            logging.info(f"✅ Translation memory: disk tier at {path}")
+        except Exception as e:
+            self._db = None
+            logging.warning(f"⚠️ Translation memory: disk tier unavailable ({e}), using in-process tier only")
+
+    def _remember(self, key: MemoryKey, translated_text: str, expires_at: float):
+        with self._entries_lock:
+            self._entries[key] = (translated_text, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    def _lookup_memory(self, key: MemoryKey, now: float) -> Optional[str]:
+        with self._entries_lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry[1] > now:
+                    self._entries.move_to_end(key)
+                    self.stats["memory_hits"] += 1
+                    return entry[0]
+                del self._entries[key]
+                self.stats["expired"] += 1
+        return None
+
+    def _lookup_disk(self, keys: List[MemoryKey], now: float) -> Dict[MemoryKey, str]:
+        """Primary-key reads for keys that missed the LRU tier; hits are promoted into it. Blocking."""
+        found: Dict[MemoryKey, str] = {}
+        try:
+            with self._db_lock:
+                rows = [
+                    (key, self._db.execute(
+                        "SELECT translated_text, expires_at FROM translation_memory "
+                        "WHERE source_text = ? AND source_language = ? AND target_language = ? AND provider = ?",
+                        key
+                    ).fetchone())
+                    for key in keys
+                ]
+        except sqlite3.Error as e:
+            self.stats["disk_errors"] += 1
+            logging.warning(f"⚠️ Translation memory read failed: {e}")
+            return found
+        for key, row in rows:
+            if row is None:
+                continue
+            if row[1] > now:
+                self._remember(key, row[0], row[1])
+                self.stats["disk_hits"] += 1
+                found[key] = row[0]
+            else:
+                self.stats["expired"] += 1
+        return found
+
+    def get(self, text: str, source_language: str, target_language: str, provider: str) -> Optional[str]:
+        """Return a cached translation, or None on a miss. Blocking on an LRU miss; use get_async from the event loop."""
+        if not self.enabled or not text or not text.strip():
+            return None
+        key = make_key(text, source_language, target_language, provider)
+        now = time.time()
+        cached = self._lookup_memory(key, now)
+        if cached is None and self._db is not None:
+            cached = self._lookup_disk([key], now).get(key)
+        if cached is None:
+            self.stats["misses"] += 1
+        return cached
+
+    async def get_async(self, text: str, source_language: str, target_language: str, provider: str) -> Optional[str]:
+        """get() for async callers: LRU hits return inline, the SQLite tier is read on a worker thread."""
+        return (await self.get_many_async([text], source_language, target_language, provider)).get(text)
+
+    async def get_many_async(self, texts: Iterable[str], source_language: str, target_language: str,
+                             provider: str) -> Dict[str, str]:
+        """
+        Cached translations for many texts as {text: translation}; misses are left out.
+        LRU hits return inline; every SQLite read for the rest happens in one worker-thread hop.
+        """
+        if not self.enabled:
+            return {}
+        now = time.time()
+        found: Dict[str, str] = {}
+        missed: Dict[MemoryKey, List[str]] = {}
+        for text in dict.fromkeys(texts):
+            if not text or not text.strip():
+                continue
+            key = make_key(text, source_language, target_language, provider)
+            cached = self._lookup_memory(key, now)
+            if cached is not None:
+                found[text] = cached
+            else:
+                missed.setdefault(key, []).append(text)
+        if missed and self._db is not None:
+            disk_hits = await asyncio.to_thread(self._lookup_disk, list(missed), now)
+            for key, translated_text in disk_hits.items():
+                for text in missed.pop(key):
+                    found[text] = translated_text
+        self.stats["misses"] += sum(len(texts_for_key) for texts_for_key in missed.values())
+        return found
+
+    def put(self, text: str, source_language: str, target_language: str, provider: str, translated_text: str,
+            ttl_seconds: Optional[int] = None):
+        """Store a translation in both tiers."""
+        self.put_many([(text, source_language, target_language, provider, translated_text)], ttl_seconds)
+
+    async def put_async(self, text: str, source_language: str, target_language: str, provider: str,
+                        translated_text: str, ttl_seconds: Optional[int] = None):
+        """put() for async callers: the LRU tier is updated inline, the SQLite write runs on a worker thread."""
+        await self.put_many_async([(text, source_language, target_language, provider, translated_text)], ttl_seconds)
+
+    def _remember_rows(self, items: Iterable[Tuple[str, str, str, str, str]], ttl_seconds: Optional[int]) -> List[tuple]:
+        """Add items to the LRU tier and return them as translation_memory rows."""
+        now = time.time()
+        expires_at = now + (ttl_seconds if ttl_seconds is not None else self.ttl_seconds)
+        rows = []
+        for text, source_language, target_language, provider, translated_text in items:
+            if not text or not text.strip() or not translated_text:
+                continue
+            key = make_key(text, source_language, target_language, provider)
+            self._remember(key, translated_text, expires_at)
+            rows.append(key + (translated_text, now, expires_at))
+        self.stats["writes"] += len(rows)
+        return rows
+
+    def _write_rows(self, rows: List[tuple]):
+        """One disk transaction for rows. Blocking."""
+        try:
+            with self._db_lock:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translation_memory "
+                    "(source_text, source_language, target_language, provider, translated_text, created_at, expires_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    rows
+                )
+                self._db.commit()
+        except sqlite3.Error as e:
+            self.stats["disk_errors"] += 1
+            logging.warning(f"⚠️ Translation memory write failed: {e}")
+
+    def put_many(self, items: Iterable[Tuple[str, str, str, str, str]], ttl_seconds: Optional[int] = None) -> int:
+        """Store many (text, source, target, provider, translation) tuples in one disk transaction."""
+        if not self.enabled:
+            return 0
+        rows = self._remember_rows(items, ttl_seconds)
+        if rows and self._db is not None:
+            self._write_rows(rows)
+        return len(rows)
+
+    async def put_many_async(self, items: Iterable[Tuple[str, str, str, str, str]], ttl_seconds: Optional[int] = None) -> int:
+        """put_many() for async callers: the disk transaction runs on a worker thread."""
+        if not self.enabled:
+            return 0
+        rows = self._remember_rows(items, ttl_seconds)
+        if rows and self._db is not None:
+            await asyncio.to_thread(self._write_rows, rows)
+        return len(rows)
+
+    def purge_expired(self) -> int:
+        """Delete expired rows from both tiers; returns the number of disk rows removed."""
+        now = time.time()
+        with self._entries_lock:
+            expired_keys = [key for key, (_, expires_at) in self._entries.items() if expires_at <= now]
+            for key in expired_keys:
+                del self._entries[key]
+        removed = 0
+        if self._db is not None:
+            try:
+                with self._db_lock:
+                    removed = self._db.execute("DELETE FROM translation_memory WHERE expires_at <= ?", (now,)).rowcount
+                    self._db.commit()
+            except sqlite3.Error as e:
+                self.stats["disk_errors"] += 1
+                logging.warning(f"⚠️ Translation memory purge failed: {e}")
+        self.stats["expired"] += len(expired_keys) + max(removed, 0)
+        return removed
+
+    def prewarm_from_vocabulary(self, data_dir: str = VOCABULARY_DATA_DIR, provider: str = "google") -> int:
+        """
+        Seed the memory with curated pairs from assets/data/*vocabulary*.json.
+        Adds thai -> english for each item and its word/syllable mappings, and english -> thai for each item.
+        """
+        if not self.enabled or not os.path.isdir(data_dir):
+            return 0
+        items = []
+        for filename in sorted(os.listdir(data_dir)):
+            if not filename.endswith(".json") or "vocabulary" not in filename:
+                continue
+            try:
+                with open(os.path.join(data_dir, filename), "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logging.warning(f"⚠️ Translation memory: could not read {filename}: {e}")
+                continue
+            for entry in data.get("vocabulary", []):
+                for mapping in entry.get("word_mapping", []) + entry.get("syllable_mapping", []):
+                    if mapping.get("thai") and mapping.get("translation"):
+                        items.append((mapping["thai"], "th", "en", provider, mapping["translation"]))
+                # Added after the mappings so the item's own english label wins for single-word items
+                thai, english = entry.get("thai"), entry.get("english")
+                if thai and english:
+                    items.append((thai, "th", "en", provider, english))
+                    items.append((english, "en", "th", provider, thai))
+        count = self.put_many(items)
+        self.stats["prewarmed"] += count
+        logging.info(f"✅ Translation memory: pre-warmed {count} vocabulary entries from {data_dir}")
+        return count
+
+    def clear(self):
+        """Drop every cached translation (both tiers)."""
+        with self._entries_lock:
+            self._entries.clear()
+        if self._db is not None:
+            with self._db_lock:
+                self._db.execute("DELETE FROM translation_memory")
+                self._db.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for health/monitoring endpoints."""
+        lookups = self.stats["memory_hits"] + self.stats["disk_hits"] + self.stats["misses"]
+        hits = self.stats["memory_hits"] + self.stats["disk_hits"]
+        return {
+            "enabled": self.enabled,
+            "disk_tier": self._db is not None,
+            "memory_entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            **self.stats,
+        }
+
+
+# Global instance getter
+_translation_memory = None
+
+def get_translation_memory() -> TranslationMemory:
+    """
+    Get the global translation memory instance.
+
+    Returns:
+        TranslationMemory: The singleton instance
+    """
+    global _translation_memory
+    if _translation_memory is None:
+        _translation_memory = TranslationMemory()
+    return _translation_memory
@@ -1,6 +1,7 @@
 import os
 import base64
 import asyncio
+import functools
 import json
 import time
 import logging
@@ -16,6 +17,18 @@ import pythainlp
 import sys
 sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
 from data.language_data import KNOWN_THAI_COMPOUNDS
+from .client_registry import get_client_registry
+from .vendor_executor import run_in_vendor_executor
+from .translation_memory import get_translation_memory
+from .audio_cache import get_audio_cache, audio_cache_key
+from .vocabulary_index import get_vocabulary_index
+from .thai_writing_guide import get_thai_writing_guide
+from .thai_nlp_engine import get_thai_nlp_engine
+from .thai_syllable_analysis import (
+    detect_complex_vowel_patterns, get_complex_vowel_info, analyze_complex_vowels_batch,
+    generate_complex_vowel_explanation, _get_consonant_class
+)
+from .nlp_worker_pool import run_nlp_task
 
 # Import homograph detection service
 try:
@@ -77,10 +90,12 @@ def get_language_name(target_language: str) -> str:
     config = LANGUAGE_CONFIGS.get(target_language.lower(), LANGUAGE_CONFIGS["th"])
     return config.get("name", target_language.upper())
 
+@functools.lru_cache(maxsize=None)
 def get_best_romanization_engine(preferred_engine: str = "tltk") -> str:
     """
     Get the best available romanization engine with fallback.
     Tries preferred engine first, falls back to reliable alternatives.
+    The probe result is cached per preferred engine for the life of the process.
     """
     try:
         from pythainlp.transliterate import romanize
@@ -177,6 +192,29 @@ def post_process_thai2rom_romanization(word: str, romanized: str) -> str:
     
     return corrected
 
+def warm_up_thai_nlp() -> dict:
+    """
+    Load the pythainlp engines this process uses inline: the tokenizer/romanizer named in LANGUAGE_CONFIGS,
+    the thai2rom/royin romanizers (royin is the default path and the fallback), the dictionary and default
+    syllable tokenizers, and TCC subword clusters. tltk is never selected (no config prefers it), so it is not loaded.
+    NLP worker processes warm their own engines (see nlp_worker.init_worker).
+    Blocking; run it off the event loop.
+    """
+    tokenizers, romanizers = ["newmm"], ["royin", "thai2rom"]
+    for config in LANGUAGE_CONFIGS.values():
+        if config.get("tokenizer_available") and config.get("tokenizer_engine") not in tokenizers:
+            tokenizers.append(config["tokenizer_engine"])
+        if config.get("romanizer_available") and config.get("romanizer_engine") not in romanizers:
+            romanizers.append(config["romanizer_engine"])
+    status = get_thai_nlp_engine().warm_up(
+        tokenizers=tokenizers, romanizers=romanizers, syllable_engines=[None, "dict"], subword_engines=["tcc"]
+    )
+    # Resolve (and cache) the engine choice for each configured romanizer
+    for config in LANGUAGE_CONFIGS.values():
+        if config.get("romanizer_available"):
+            get_best_romanization_engine(config.get("romanizer_engine", "royin"))
+    return status
+
 def get_language_config(target_language: str) -> dict:
     """Get language-specific configuration with dynamic romanization engine selection."""
     config = LANGUAGE_CONFIGS.get(target_language.lower(), LANGUAGE_CONFIGS["th"]).copy()
@@ -189,18 +227,52 @@ def get_language_config(target_language: str) -> dict:
     return config
 
 def load_thai_writing_guide() -> dict:
-    """Load the Thai writing guide JSON data."""
-    try:
-        # Get the project root directory (go up from backend/services/)
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(os.path.dirname(current_dir))
-        guide_path = os.path.join(project_root, "assets", "data", "thai_writing_guide.json")
-        
-        with open(guide_path, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except Exception as e:
-        print(f"Error loading Thai writing guide: {e}")
-        return {}
+    """
+    Get the Thai writing guide data.
+    Served from a shared read-only copy with per-character lookup tables; reloaded when the JSON file changes.
+    """
+    return get_thai_writing_guide()
+
+# Shared Google Cloud clients (created lazily, reused across requests)
+TRANSLATE_CLIENT_NAME = "google_translate"
+TTS_CLIENT_NAME = "google_tts"
+
+get_client_registry().register(
+    TRANSLATE_CLIENT_NAME,
+    translate_v3.TranslationServiceClient,
+    probe=lambda client: client.get_supported_languages(
+        parent=f"projects/{get_google_cloud_project_id()}/locations/global",
+        display_language_code="en"
+    )
+)
+get_client_registry().register(
+    TTS_CLIENT_NAME,
+    texttospeech.TextToSpeechClient,
+    probe=lambda client: client.list_voices(language_code="th-TH")
+)
+
+DEEPL_CLIENT_NAME = "deepl"
+
+def _create_deepl_translator():
+    import deepl  # Optional dependency; only needed when DeepL translation is used
+    deepl_api_key = os.getenv("DEEPL_API_KEY")
+    if not deepl_api_key:
+        raise HTTPException(status_code=500, detail="DeepL API key not configured")
+    return deepl.Translator(deepl_api_key)
+
+get_client_registry().register(
+    DEEPL_CLIENT_NAME,
+    _create_deepl_translator,
+    probe=lambda translator: translator.get_usage()
+)
+
+def get_translate_client() -> translate_v3.TranslationServiceClient:
+    """Return the process-wide Google Cloud Translation client."""
+    return get_client_registry().get(TRANSLATE_CLIENT_NAME)
+
+def get_tts_client() -> texttospeech.TextToSpeechClient:
+    """Return the process-wide Google Cloud Text-to-Speech client."""
+    return get_client_registry().get(TTS_CLIENT_NAME)
 
 def get_google_cloud_project_id():
     """Retrieves the Google Cloud Project ID from environment variables."""
@@ -212,11 +284,16 @@ def get_google_cloud_project_id():
 
 async def translate_text(text: str, target_language: str = "th", source_language: str = "en-US") -> dict:
     """Translates text from source to target language using Google Cloud Translate API."""
+    cached = await get_translation_memory().get_async(text, source_language, target_language, "google")
+    if cached is not None:
+        return {"translated_text": cached}
     try:
         project_id = get_google_cloud_project_id()
-        client = translate_v3.TranslationServiceClient()
+        client = get_translate_client()
         parent = f"projects/{project_id}/locations/global"
-        response = client.translate_text(
+        response = await run_in_vendor_executor(
+            TRANSLATE_CLIENT_NAME,
+            client.translate_text,
             request={
                 "parent": parent,
                 "contents": [text],
@@ -227,9 +304,11 @@ async def translate_text(text: str, target_language: str = "th", source_language
         )
         translated_text = response.translations[0].translated_text
         print(f"Successfully translated '{text}' from {source_language} to {target_language}: '{translated_text}'")
+        await get_translation_memory().put_async(text, source_language, target_language, "google", translated_text)
         return {"translated_text": translated_text}
     except Exception as e:
         print(f"Error during Google Cloud translation: {e}")
+        get_client_registry().record_error(TRANSLATE_CLIENT_NAME, e)
         raise HTTPException(status_code=500, detail=f"Google Cloud Translation API error: {e}")
 
 async def romanize_target_text(target_text: str, target_language: str = "th") -> dict:
@@ -247,20 +326,16 @@ async def romanize_target_text(target_text: str, target_language: str = "th") ->
     try:
         # Import language-specific libraries only when needed
         if target_language.lower() == "th":
-            from pythainlp.transliterate import romanize
-            from pythainlp.tokenize import word_tokenize
-            
-            # 1. Tokenize the target text into words
-            target_words = word_tokenize(target_text, engine=lang_config["tokenizer_engine"])
-
-            # 2. Romanize each word and 3. Join with spaces
-            romanized_parts = []
-            for word in target_words:
-                if word.strip(): # Ensure word is not just whitespace
-                    romanized_word = romanize(word, engine=lang_config["romanizer_engine"])
-                    romanized_parts.append(romanized_word)
+            # 1. Tokenize the target text into words, 2. romanize each unique word once (in the NLP worker pool)
+            [sentence] = await run_nlp_task(
+                "analyze_sentences", sentences=[target_text],
+                tokenizer_engine=lang_config["tokenizer_engine"], romanizer_engine=lang_config["romanizer_engine"]
+            )
 
-            spaced_romanization = " ".join(romanized_parts)
+            # 3. Join with spaces, skipping whitespace-only tokens
+            spaced_romanization = " ".join(
+                roman for token, roman in zip(sentence["tokens"], sentence["romanizations"]) if token.strip()
+            )
         else:
             # For other languages, implement specific romanization logic here
             spaced_romanization = target_text  # Fallback
@@ -268,41 +343,12 @@ async def romanize_target_text(target_text: str, target_language: str = "th") ->
         print(f"Successfully romanized '{target_text}' to '{spaced_romanization}' for {target_language}")
         return {"romanized_text": spaced_romanization}
         
+    except HTTPException:
+        raise  # NLP worker pool back-pressure/timeout
     except Exception as e:
         print(f"Error during romanization for {target_language}: {e}")
         raise HTTPException(status_code=500, detail=f"Romanization error for {target_language}: {e}")
 
-async def _translate_one_word(client, parent: str, word: str, source_lang: str, target_lang: str) -> tuple[str, str]:
-    """Helper function to translate a single word for parallel execution."""
-    try:
-        clean_word = word.strip('.,!?;:"()[]{}')
-        if not clean_word:
-            return word, ""
-        response = client.translate_text(
-            request={
-                "parent": parent,
-                "contents": [clean_word],
-                "mime_type": "text/plain",
-                "source_language_code": source_lang,
-                "target_language_code": target_lang,
-            }
-        )
-        return word, response.translations[0].translated_text
-    except Exception as e:
-        print(f"Error translating individual word '{word}' from {source_lang} to {target_lang}: {e}")
-        return word, "" # Return empty string on error to handle it gracefully downstream
-
-async def _romanize_word_async(word: str, engine: str) -> str:
-    """Helper function to romanize a single word for parallel execution."""
-    try:
-        if not word.strip():
-            return ""
-        from pythainlp.transliterate import romanize
-        return romanize(word, engine=engine)
-    except Exception as e:
-        print(f"Error romanizing word '{word}': {e}")
-        return word  # Return original word on error
-
 async def _analyze_subword_async(subword: str) -> dict:
     """Helper function to analyze a single subword for parallel execution."""
     try:
@@ -339,6 +385,72 @@ async def _analyze_subword_async(subword: str) -> dict:
         print(f"Error analyzing subword '{subword}': {e}")
         return {'subword': subword, 'analysis': {}, 'error': str(e)}
 
+# Google Translate v3 accepts up to 1024 segments per request; keep batches well under the
+# recommended 5k code points so one slow request doesn't hold up the rest.
+TRANSLATE_BATCH_MAX_ITEMS = int(os.getenv("TRANSLATE_BATCH_MAX_ITEMS", "128"))
+TRANSLATE_BATCH_MAX_CHARS = int(os.getenv("TRANSLATE_BATCH_MAX_CHARS", "4500"))
+
+def _chunk_for_translation(texts: List[str]) -> List[List[str]]:
+    """Split texts into request-sized batches by item count and total characters."""
+    batches, current, current_chars = [], [], 0
+    for text in texts:
+        if current and (len(current) >= TRANSLATE_BATCH_MAX_ITEMS or current_chars + len(text) > TRANSLATE_BATCH_MAX_CHARS):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(text)
+        current_chars += len(text)
+    if current:
+        batches.append(current)
+    return batches
+
+async def translate_texts_batch(texts: List[str], target_language: str = "en-US", source_language: str = "th") -> Dict[str, str]:
+    """
+    Translates many short texts with as few Google Cloud Translate requests as possible.
+    Duplicates are translated once. Returns {source text: translated text}; texts from a
+    failed batch are missing from the result so callers can apply their own fallback.
+    """
+    unique_texts = list(dict.fromkeys(text for text in texts if text and text.strip()))
+    memory = get_translation_memory()
+    translations = await memory.get_many_async(unique_texts, source_language, target_language, "google")
+    unique_texts = [text for text in unique_texts if text not in translations]
+    if not unique_texts:
+        return translations
+
+    project_id = get_google_cloud_project_id()
+    client = get_translate_client()
+    parent = f"projects/{project_id}/locations/global"
+    batches = _chunk_for_translation(unique_texts)
+
+    async def translate_batch(batch: List[str]):
+        response = await run_in_vendor_executor(
+            TRANSLATE_CLIENT_NAME,
+            client.translate_text,
+            request={
+                "parent": parent,
+                "contents": batch,
+                "mime_type": "text/plain",
+                "source_language_code": source_language,
+                "target_language_code": target_language,
+            }
+        )
+        return batch, [t.translated_text for t in response.translations]
+
+    results = await asyncio.gather(*[translate_batch(batch) for batch in batches], return_exceptions=True)
+    new_entries = []
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"Error during batched Google Cloud translation ({source_language} -> {target_language}): {result}")
+            get_client_registry().record_error(TRANSLATE_CLIENT_NAME, result)
+            continue
+        batch, translated = result
+        translations.update(zip(batch, translated))
+        new_entries.extend((text, source_language, target_language, "google", translation) for text, translation in zip(batch, translated))
+    # One disk transaction for every batch
+    await memory.put_many_async(new_entries)
+
+    print(f"Batch translated {len(unique_texts)} unique texts ({len(texts)} requested) from {source_language} to {target_language} in {len(batches)} request(s)")
+    return translations
+
 async def create_word_level_translation_mapping(english_text: str, target_language: str = "th") -> dict:
     """
     Creates word-level mappings using a reverse-translation approach for accuracy.
@@ -346,7 +458,8 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
     2. Tokenizes the correct target sentence into words.
     3. In parallel:
         a. Synthesizes speech from the full, correct sentence.
-        b. Translates each target language word BACK to English to create mappings.
+        b. Translates the target words (and Thai syllables) BACK to English in batched,
+           de-duplicated requests to create mappings.
     4. Combines the results, ensuring the UI reflects the correct sentence structure.
     """
     if not english_text or not english_text.strip():
@@ -360,11 +473,13 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
     try:
         lang_config = get_language_config(target_language)
         project_id = get_google_cloud_project_id()
-        client = translate_v3.TranslationServiceClient()
+        client = get_translate_client()
         parent = f"projects/{project_id}/locations/global"
 
         # 1. Translate the entire sentence first for correct word order
-        full_sentence_response = client.translate_text(
+        full_sentence_response = await run_in_vendor_executor(
+            TRANSLATE_CLIENT_NAME,
+            client.translate_text,
             request={
                 "parent": parent,
                 "contents": [english_text],
@@ -376,25 +491,41 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
         full_target_text = full_sentence_response.translations[0].translated_text
         print(f"Full sentence translation (EN->TH): '{english_text}' -> '{full_target_text}'")
 
-        # 2. Tokenize the correct target sentence into words
+        # 2. Tokenize the target sentence, split multi-syllable Thai words and romanize both
+        #    (CPU-bound pythainlp work; one round trip to the NLP worker pool)
+        romanized_words = {}
+        syllable_romanizations = {}
+        word_syllables = {}
         if lang_config.get("tokenizer_available", False) and target_language.lower() == "th":
-            from pythainlp.tokenize import word_tokenize
-            target_words = [word for word in word_tokenize(full_target_text, engine=lang_config["tokenizer_engine"]) if word.strip()]
+            analysis = await run_nlp_task(
+                "word_mapping_analysis", text=full_target_text, tokenizer_engine=lang_config["tokenizer_engine"],
+                romanizer_engine=lang_config["romanizer_engine"] if lang_config.get("romanizer_available", False) else None
+            )
+            target_words = analysis["words"]
+            word_syllables = analysis["word_syllables"]
+            romanized_words = analysis["romanizations"]
+            syllable_romanizations = analysis["syllable_romanizations"]
         else:
             target_words = [word for word in full_target_text.strip().split() if word.strip()]
 
-        # 3. Prepare parallel tasks
-        tasks = []
-
-        # Task A: Synthesize speech from the full, correct sentence
-        tasks.append(synthesize_speech(full_target_text, target_language))
-
-        # Task B: Translate each target word BACK to English for mapping
-        for word in target_words:
-            tasks.append(_translate_one_word(client, parent, word, lang_config["code"], "en-US"))
-
-        # 4. Run all tasks concurrently
-        print(f"Executing {len(tasks)} parallel tasks (1 TTS + {len(target_words)} Word Translations)...")
+        # 3. Collect every back-translation we need (words, plus syllables of multi-syllable Thai words)
+        #    so they can be sent as a few batched, de-duplicated Translate requests.
+        clean_words = {word: word.strip('.,!?;:"()[]{}') for word in target_words}
+        all_syllables = [s for syllables in word_syllables.values() for s in syllables]
+
+        # Word back-translations use the target language as source; syllables are always Thai
+        back_translation_jobs = {lang_config["code"]: [w for w in clean_words.values() if w]}
+        back_translation_jobs.setdefault("th", [])
+        back_translation_jobs["th"] = back_translation_jobs["th"] + all_syllables
+
+        # 4. Run TTS and the batched back-translations concurrently
+        source_languages = [lang for lang, texts in back_translation_jobs.items() if texts]
+        tasks = [synthesize_speech(full_target_text, target_language)]
+        tasks.extend(
+            translate_texts_batch(back_translation_jobs[lang], "en-US", source_language=lang)
+            for lang in source_languages
+        )
+        print(f"Executing {len(tasks)} parallel tasks (1 TTS + batched back-translation of {len(target_words)} words, {len(all_syllables)} syllables)...")
         results = await asyncio.gather(*tasks, return_exceptions=True)
         print("Parallel execution finished.")
 
@@ -407,32 +538,25 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
         else:
             audio_base64 = tts_result.get("audio_base64", "")
 
-        # Subsequent results are from individual word back-translations (TH -> EN)
+        # Remaining results are {source text: English} per source language
+        translations_by_language = {}
+        for lang, res in zip(source_languages, results[1:]):
+            if isinstance(res, Exception):
+                print(f"Batched back-translation from {lang} failed: {res}")
+                translations_by_language[lang] = {}
+            else:
+                translations_by_language[lang] = res
+        word_translations = translations_by_language.get(lang_config["code"], {})
+        syllable_translations_lookup = translations_by_language.get("th", {})
         back_translations = {
-            original_word: translated_word
-            for res in results[1:]
-            if not isinstance(res, Exception) and (original_word := res[0]) and (translated_word := res[1])
+            word: word_translations.get(clean_word, "")
+            for word, clean_word in clean_words.items()
         }
 
-        # 6. Create final word mappings with parallel romanization
+        # 6. Create final word mappings
         word_mappings = []
         
-        # If Thai, romanize all words in parallel
-        if lang_config.get("romanizer_available", False) and target_language.lower() == "th":
-            from pythainlp.transliterate import romanize
-            romanization_tasks = [
-                _romanize_word_async(word, lang_config["romanizer_engine"]) 
-                for word in target_words
-            ]
-            romanization_results = await asyncio.gather(*romanization_tasks, return_exceptions=True)
-            romanized_words = {
-                target_words[i]: result if not isinstance(result, Exception) else target_words[i]
-                for i, result in enumerate(romanization_results)
-            }
-        else:
-            romanized_words = {word: word for word in target_words}
-        
-        # Create word mappings with syllable-level translations for Thai
+        # Create word mappings, scattering the batched syllable translations back onto each word
         for target_word in target_words:
             english_mapping = back_translations.get(target_word, "")
             romanized_word = romanized_words.get(target_word, target_word)
@@ -444,61 +568,19 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
             }
             
             # Add syllable-level translations for Thai words
-            if target_language.lower() == "th" and target_word.strip():
-                try:
-                    from pythainlp.tokenize import syllable_tokenize
-                    syllables = syllable_tokenize(target_word, engine="dict")
-                    if syllables and len(syllables) > 1:  # Only add if we got multiple syllables
-                        syllable_translations = []
-                        
-                        # Translate each syllable individually 
-                        for syllable in syllables:
-                            if syllable.strip():
-                                try:
-                                    syllable_response = client.translate_text(
-                                        request={
-                                            "parent": parent,
-                                            "contents": [syllable],
-                                            "mime_type": "text/plain",
-                                            "source_language_code": "th",
-                                            "target_language_code": "en-US",
-                                        }
-                                    )
-                                    syllable_translation = syllable_response.translations[0].translated_text
-                                    
-                                    # Generate individual syllable romanization
-                                    try:
-                                        from pythainlp.transliterate import romanize
-                                        syllable_romanization = romanize(syllable, engine="thai2rom")
-                                    except Exception:
-                                        syllable_romanization = syllable
-                                    
-                                    syllable_translations.append({
-                                        "syllable": syllable,
-                                        "translation": syllable_translation,
-                                        "romanization": syllable_romanization
-                                    })
-                                except Exception as syl_e:
-                                    print(f"Failed to translate syllable '{syllable}': {syl_e}")
-                                    # Generate romanization for fallback case too
-                                    try:
-                                        from pythainlp.transliterate import romanize
-                                        fallback_romanization = romanize(syllable, engine="thai2rom")
-                                    except Exception:
-                                        fallback_romanization = syllable
-                                        
-                                    syllable_translations.append({
-                                        "syllable": syllable,
-                                        "translation": english_mapping,  # fallback to full word translation
-                                        "romanization": fallback_romanization
-                                    })
-                        
-                        if syllable_translations:
-                            word_mapping["syllable_mappings"] = syllable_translations
-                            print(f"Added syllable mappings for '{target_word}': {syllable_translations}")
-                            
-                except Exception as e:
-                    print(f"Error creating syllable mappings for '{target_word}': {e}")
+            if target_word in word_syllables:
+                syllable_translations = []
+                for syllable in word_syllables[target_word]:
+                    syllable_translations.append({
+                        "syllable": syllable,
+                        # Fall back to the full word translation if the syllable batch failed
+                        "translation": syllable_translations_lookup.get(syllable) or english_mapping,
+                        "romanization": syllable_romanizations.get(syllable, syllable)
+                    })
+                
+                if syllable_translations:
+                    word_mapping["syllable_mappings"] = syllable_translations
+                    print(f"Added syllable mappings for '{target_word}': {syllable_translations}")
             
             word_mappings.append(word_mapping)
 
@@ -516,8 +598,11 @@ async def create_word_level_translation_mapping(english_text: str, target_langua
         print(f"Successfully created mapping for '{english_text}' with reverse translation.")
         return final_result
         
+    except HTTPException:
+        raise  # NLP worker pool back-pressure/timeout
     except Exception as e:
         print(f"Error during reverse-translation mapping for {target_language}: {e}")
+        get_client_registry().record_error(TRANSLATE_CLIENT_NAME, e)
         raise HTTPException(status_code=500, detail=f"Word-level translation mapping error for {target_language}: {e}")
 
 async def synthesize_speech(text: str, target_language: str = "th", custom_voice: Optional[str] = None) -> dict:
@@ -528,7 +613,7 @@ async def synthesize_speech(text: str, target_language: str = "th", custom_voice
     try:
         lang_config = get_language_config(target_language)
         
-        client = texttospeech.TextToSpeechClient()
+        client = get_tts_client()
 
         synthesis_input = texttospeech.SynthesisInput(text=text)
 
@@ -541,21 +626,32 @@ async def synthesize_speech(text: str, target_language: str = "th", custom_voice
             name=voice_name
         )
 
+        speaking_rate = 0.8
         audio_config = texttospeech.AudioConfig(
             audio_encoding=texttospeech.AudioEncoding.MP3,
-            speaking_rate=0.8
+            speaking_rate=speaking_rate
         )
 
-        response = client.synthesize_speech(
-            request={"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+        async def synthesize() -> bytes:
+            response = await run_in_vendor_executor(
+                TTS_CLIENT_NAME,
+                client.synthesize_speech,
+                request={"input": synthesis_input, "voice": voice, "audio_config": audio_config}
+            )
+            return response.audio_content
+
+        # Same text/voice/rate always yields the same MP3, so serve repeats from the audio cache
+        cache_key = audio_cache_key(
+            "google_tts", text, voice=f"{language_code}/{voice_name}", speaking_rate=speaking_rate, audio_format="mp3"
         )
-        
-        audio_base64 = base64.b64encode(response.audio_content).decode("utf-8")
+        audio_content = await get_audio_cache().get_or_create(cache_key, synthesize)
+        audio_base64 = base64.b64encode(audio_content).decode("utf-8")
         print(f"Successfully synthesized audio for '{text}' in {target_language}")
         return {"audio_base64": audio_base64}
 
     except Exception as e:
         print(f"Error during Google Cloud TTS synthesis for {target_language}: {e}")
+        get_client_registry().record_error(TTS_CLIENT_NAME, e)
         raise HTTPException(status_code=500, detail=f"Google Cloud TTS API error for {target_language}: {e}")
 
 # Legacy function names for backward compatibility
@@ -838,19 +934,6 @@ def _is_consonant(char: str) -> bool:
     # Thai consonant range in Unicode
     return '\u0e01' <= char <= '\u0e2e'
 
-def _get_consonant_class(char: str, writing_guide: dict) -> str:
-    """Get the consonant class (high, mid, low) for tone rules."""
-    tone_interaction = writing_guide.get("consonant_interaction_rules", {}).get("tone_interaction", {})
-    
-    if char in tone_interaction.get("high_class", []):
-        return "high"
-    elif char in tone_interaction.get("mid_class", []):
-        return "mid"
-    elif char in tone_interaction.get("low_class", []):
-        return "low"
-    else:
-        return "unknown"
-
 def _detect_consonant_position_in_word(char: str, word: str, position: int) -> str:
     """Detect if consonant is at beginning, middle, or end of semantic word."""
     if position == 0:
@@ -962,9 +1045,15 @@ async def split_word_for_tracing(word: str, target_language: str = "th") -> dict
             return {"error": f"Unsupported language: {target_language}"}
         
         # Step 1: Standard tokenization for semantic word boundaries
-        semantic_words = word_tokenize(word, engine='newmm')
+        nlp = get_thai_nlp_engine()
+        semantic_words = nlp.tokenize(word, 'newmm')
         logging.info(f"Semantic tokenization: {word} → {semantic_words}")
         
+        # TCC clusters per semantic word, then romanize every unique word and cluster in one batch
+        word_clusters = [nlp.subwords(semantic_word, 'tcc') for semantic_word in semantic_words]
+        to_romanize = semantic_words + [cluster for clusters in word_clusters for cluster in clusters]
+        romanized_lookup = dict(zip(to_romanize, nlp.romanize_batch(to_romanize, config["romanizer_engine"])))
+        
         # Step 2: Determine if this is a compound word
         is_compound = len(semantic_words) > 1
         
@@ -972,21 +1061,20 @@ async def split_word_for_tracing(word: str, target_language: str = "th") -> dict
         constituent_word_data = []
         all_tcc_clusters = []
         
-        for semantic_word in semantic_words:
-            # Get TCC breakdown for this semantic word
-            tcc_clusters = subword_tokenize(semantic_word, engine='tcc')
+        for semantic_word, tcc_clusters in zip(semantic_words, word_clusters):
+            # TCC breakdown for this semantic word
             all_tcc_clusters.extend(tcc_clusters)
             
             # Get translation from vocabulary files
             translation = await get_translation_from_vocabulary(semantic_word)
             
             # Get romanization
-            romanized = romanize(semantic_word, engine=config["romanizer_engine"])
+            romanized = romanized_lookup[semantic_word]
             
             # Build detailed TCC analysis for writing guidance
             tcc_details = []
             for cluster in tcc_clusters:
-                cluster_romanized = romanize(cluster, engine=config["romanizer_engine"])
+                cluster_romanized = romanized_lookup[cluster]
                 tcc_details.append({
                 "cluster": cluster,
                     "romanized": cluster_romanized,
@@ -1029,405 +1117,44 @@ async def analyze_word_syllables(word: str, target_language: str = "th") -> dict
         return {"error": f"Syllable analysis not supported for {target_language}"}
     
     try:
-        from pythainlp import word_tokenize
-        from pythainlp.tokenize import subword_tokenize
-        from pythainlp.transliterate import romanize
-        
-        # Load enhanced writing guide data
-        writing_guide = load_thai_writing_guide()
-        
-        # Step 1: Get syllable boundaries (for multi-syllable words like กระเทียม)
-        # Use word tokenization to identify potential syllable breaks
-        word_segments = word_tokenize(word, engine='newmm')
-        
-        # For single semantic words, analyze as syllables manually
-        if len(word_segments) == 1:
-            syllables = _analyze_syllable_structure(word)
-        else:
-            syllables = word_segments
-        
-        # Step 2: Analyze each syllable comprehensively
-        syllable_analyses = []
-        
-        for i, syllable in enumerate(syllables):
-            syllable_analysis = await _analyze_single_syllable(syllable, i + 1, writing_guide)
-            syllable_analyses.append(syllable_analysis)
+        # CPU-bound tokenization and component analysis runs in the NLP worker pool
+        analysis = await run_nlp_task("word_syllable_analysis", word=word)
         
         # Step 3: Build comprehensive response
-        result = {
+        return {
             "word": word,
-            "transliteration": romanize(word, engine="thai2rom"),
+            "transliteration": analysis["transliteration"],
             "translation": await get_translation_from_vocabulary(word),
-            "syllable_count": len(syllables),
-            "syllables": syllable_analyses,
-            "high_level_overview": {
-                "word": word,
-                "syllable_structure": f"{len(syllables)} syllable{'s' if len(syllables) > 1 else ''}",
-                "writing_complexity": _assess_writing_complexity(syllables, writing_guide)
-            }
+            "syllable_count": analysis["syllable_count"],
+            "syllables": analysis["syllables"],
+            "high_level_overview": analysis["high_level_overview"]
         }
         
-        return result
-        
+    except HTTPException:
+        raise
     except Exception as e:
         error_msg = f"Error analyzing syllables for '{word}': {str(e)}"
         logging.error(error_msg)
         return {"error": error_msg}
 
-def _analyze_syllable_structure(word: str) -> list:
-    """
-    Analyze syllable structure within a single word.
-    For words like กระเทียม, identify syllable boundaries.
-    """
-    from pythainlp.tokenize import subword_tokenize
-    
-    # Use TCC to get character clusters, then group into syllables
-    tcc_clusters = subword_tokenize(word, engine='tcc')
-    
-    # Basic syllable boundary detection
-    # This is a simplified approach - could be enhanced with more sophisticated logic
-    syllables = []
-    current_syllable = ""
-    
-    for cluster in tcc_clusters:
-        current_syllable += cluster
-        
-        # Check if this forms a complete syllable
-        # Heuristic: if cluster ends with vowel or consonant that can end syllables
-        if _is_syllable_ending(cluster, current_syllable):
-            syllables.append(current_syllable)
-            current_syllable = ""
-    
-    # Add remaining characters as final syllable
-    if current_syllable:
-        syllables.append(current_syllable)
-    
-    return syllables if syllables else [word]
-
-def _is_syllable_ending(cluster: str, current_syllable: str) -> bool:
-    """
-    Determine if a TCC cluster likely ends a syllable.
-    """
-    # Basic heuristics for Thai syllable endings
-    if len(cluster) == 1:
-        char = cluster[0]
-        # Vowels that typically end syllables
-        if char in 'ะาิีุูเแโใไ':
-            return True
-        # Final consonants
-        if char in 'งนมยรลว':
-            return True
-    
-    # Short vowel (ะ) always ends syllable
-    if 'ะ' in cluster:
-        return True
-        
-    return False
-
-async def _analyze_single_syllable(syllable: str, syllable_number: int, writing_guide: dict) -> dict:
-    """
-    Comprehensive analysis of a single syllable following educational format.
-    """
-    from pythainlp.tokenize import subword_tokenize
-    from pythainlp.transliterate import romanize
-    from pythainlp.util.thai import thai_consonants, thai_vowels, thai_tonemarks
-    
-    # Get TCC breakdown for detailed analysis
-    tcc_clusters = subword_tokenize(syllable, engine='tcc')
-    
-    # Analyze components
-    components = {
-        "initial_consonants": [],
-        "consonant_clusters": [],
-        "vowels": [],
-        "final_consonants": [],
-        "tone_marks": []
-    }
-    
-    # Component role analysis
-    component_roles = []
-    
-    for i, cluster in enumerate(tcc_clusters):
-        for char in cluster:
-            if char in thai_consonants:
-                consonant_data = writing_guide.get("consonants", {}).get(char, {})
-                role_data = {
-                    "character": char,
-                    "type": "consonant",
-                    "romanization": consonant_data.get("romanization", ""),
-                    "sound_description": consonant_data.get("sound_description", ""),
-                    "position": "initial" if i == 0 else ("final" if i == len(tcc_clusters) - 1 else "medial"),
-                    "consonant_class": _get_consonant_class(char, writing_guide),
-                    "writing_steps": consonant_data.get("beginner_steps", [])
-                }
-                
-                if i == 0:
-                    components["initial_consonants"].append(role_data)
-                elif i == len(tcc_clusters) - 1:
-                    components["final_consonants"].append(role_data)
-                
-                component_roles.append(role_data)
-                
-            elif char in thai_vowels or _is_vowel_part(char):
-                vowel_data = _get_vowel_data(char, writing_guide)
-                role_data = {
-                    "character": char,
-                    "type": "vowel",
-                    "romanization": vowel_data.get("romanization", ""),
-                    "sound_description": vowel_data.get("sound_description", ""),
-                    "position": vowel_data.get("position", "after"),
-                    "writing_steps": vowel_data.get("beginner_steps", [])
-                }
-                
-                components["vowels"].append(role_data)
-                component_roles.append(role_data)
-                
-            elif char in thai_tonemarks:
-                tone_data = writing_guide.get("tone_marks", {}).get(char, {})
-                role_data = {
-                    "character": char,
-                    "type": "tone_mark",
-                    "romanization": tone_data.get("romanization", ""),
-                    "sound_description": tone_data.get("sound_description", ""),
-                    "position": "above"
-                }
-                
-                components["tone_marks"].append(role_data)
-                component_roles.append(role_data)
-    
-    # Tone analysis
-    tone_analysis = _analyze_tone_rules(syllable, components, writing_guide)
-    
-    # Generate step-by-step writing instructions
-    writing_steps = _generate_syllable_writing_steps(syllable, component_roles, writing_guide)
-    
-    return {
-        "syllable": syllable,
-        "syllable_number": syllable_number,
-        "romanization": romanize(syllable, engine="thai2rom"),
-        "tcc_clusters": tcc_clusters,
-        "components": components,
-        "component_roles": component_roles,
-        "tone_analysis": tone_analysis,
-        "writing_steps": writing_steps,
-        "syllable_type": _determine_syllable_type(syllable, components, writing_guide)
-    }
-
-def _get_consonant_class(char: str, writing_guide: dict) -> str:
-    """Get consonant class from writing guide data."""
-    consonant_classes = writing_guide.get("consonant_classes", {})
-    
-    for class_name, class_data in consonant_classes.items():
-        if char in class_data.get("consonants", []):
-            return class_name
-    
-    return "unknown"
-
-def _is_vowel_part(char: str) -> bool:
-    """Check if character is part of a vowel (including complex vowels)."""
-    vowel_parts = ['เ', 'แ', 'โ', 'ใ', 'ไ', 'ั', 'ิ', 'ี', 'ึ', 'ื', 'ุ', 'ู', 'ะ', 'า', 'ำ', 'ย', 'ว']
-    return char in vowel_parts
-
-def _get_vowel_data(char: str, writing_guide: dict) -> dict:
-    """Get vowel information from writing guide."""
-    vowels = writing_guide.get("vowels", {})
-    
-    # Direct lookup
-    for pattern, data in vowels.items():
-        if char in pattern:
-            return data
-    
-    # Default data for unknown vowels
-    return {
-        "romanization": char,
-        "sound_description": f"{char} sound",
-        "position": "after"
-    }
-
-def _analyze_tone_rules(syllable: str, components: dict, writing_guide: dict) -> dict:
-    """Analyze tone rules for the syllable."""
-    # Get initial consonant class
-    initial_consonants = components.get("initial_consonants", [])
-    if not initial_consonants:
-        return {"error": "No initial consonant found"}
-    
-    consonant_class = initial_consonants[0].get("consonant_class", "unknown")
-    
-    # Determine if syllable is live or dead
-    syllable_type = _determine_syllable_type(syllable, components, writing_guide)
-    
-    # Look up tone rule
-    tone_rules = writing_guide.get("tone_rules", {})
-    rule_key = f"{consonant_class}_{syllable_type}"
-    
-    tone_rule = tone_rules.get(rule_key, {})
-    
-    return {
-        "consonant_class": consonant_class,
-        "syllable_type": syllable_type,
-        "resulting_tone": tone_rule.get("result", "unknown"),
-        "rule_explanation": tone_rule.get("explanation", ""),
-        "example": tone_rule.get("example", "")
-    }
-
-def _determine_syllable_type(syllable: str, components: dict, writing_guide: dict) -> str:
-    """Determine if syllable is live or dead."""
-    vowels = components.get("vowels", [])
-    final_consonants = components.get("final_consonants", [])
-    
-    # Check for short vowels
-    has_short_vowel = any(
-        vowel.get("romanization", "").endswith("a") and len(vowel.get("romanization", "")) == 1 
-        for vowel in vowels
-    )
-    
-    # Check for final consonants
-    if final_consonants:
-        final_char = final_consonants[0].get("character", "")
-        # Stop consonants make dead syllables
-        if final_char in "กจดตบป":
-            return "dead_syllable"
-        # Sonorant consonants make live syllables  
-        elif final_char in "งนมยรลว":
-            return "live_syllable"
-    
-    # No final consonant
-    if has_short_vowel:
-        return "dead_syllable"
-    else:
-        return "live_syllable"
-
-def _generate_syllable_writing_steps(syllable: str, component_roles: list, writing_guide: dict) -> list:
-    """Generate detailed step-by-step writing instructions for the syllable."""
-    steps = []
-    step_number = 1
-    
-    # Group components by writing order
-    before_components = [c for c in component_roles if c.get("position") == "before"]
-    consonant_components = [c for c in component_roles if c.get("type") == "consonant"]
-    above_components = [c for c in component_roles if c.get("position") == "above"]
-    after_components = [c for c in component_roles if c.get("position") == "after"]
-    
-    # Step 1: Before components (leading vowels)
-    for component in before_components:
-        steps.append({
-            "step": step_number,
-            "component": component["character"],
-            "type": component["type"],
-            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) BEFORE the consonant",
-            "sound_description": component.get("sound_description", ""),
-            "writing_tips": component.get("writing_steps", [])
-        })
-        step_number += 1
-    
-    # Step 2: Consonants
-    for component in consonant_components:
-        steps.append({
-            "step": step_number,
-            "component": component["character"],
-            "type": component["type"],
-            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')} sound)",
-            "sound_description": component.get("sound_description", ""),
-            "consonant_class": component.get("consonant_class", ""),
-            "writing_tips": component.get("writing_steps", [])
-        })
-        step_number += 1
-    
-    # Step 3: Above components (vowel marks, tone marks)
-    for component in above_components:
-        steps.append({
-            "step": step_number,
-            "component": component["character"],
-            "type": component["type"],
-            "instruction": f"Add {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) ABOVE the consonant",
-            "sound_description": component.get("sound_description", ""),
-            "writing_tips": component.get("writing_steps", [])
-        })
-        step_number += 1
-    
-    # Step 4: After components (final vowels, consonants)
-    for component in after_components:
-        steps.append({
-            "step": step_number,
-            "component": component["character"],
-            "type": component["type"],
-            "instruction": f"Write {component['type']} \"{component['character']}\" ({component.get('romanization', '')}) AFTER the consonant",
-            "sound_description": component.get("sound_description", ""),
-            "writing_tips": component.get("writing_steps", [])
-        })
-        step_number += 1
-    
-    return steps
-
-def _assess_writing_complexity(syllables: list, writing_guide: dict) -> str:
-    """Assess the writing complexity of the word."""
-    total_components = sum(len(syllable) for syllable in syllables)
-    
-    if total_components <= 3:
-        return "beginner"
-    elif total_components <= 6:
-        return "intermediate"
-    else:
-        return "advanced"
-
 async def get_translation_from_vocabulary(word: str) -> str:
     """
-    Get translation for a word from vocabulary files, with Google Translate fallback.
-    Only loads files containing 'vocabulary' in the filename.
+    Get translation for a word from the curated vocabulary index, with Google Translate fallback.
+    The index covers files containing 'vocabulary' in the filename and reloads when they change.
     """
     try:
-        # Load vocabulary from files containing 'vocabulary'
-        vocab_translations = {}
-        
-        assets_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'assets', 'data')
-        if os.path.exists(assets_path):
-            for filename in os.listdir(assets_path):
-                if filename.endswith('.json') and 'vocabulary' in filename:
-                    file_path = os.path.join(assets_path, filename)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            data = json.load(f)
-                            if 'vocabulary' in data:
-                                for item in data['vocabulary']:
-                                    if 'thai' in item and 'english' in item:
-                                        vocab_translations[item['thai']] = item['english']
-                                        
-                                        # Also add word_mapping constituents
-                                        if 'word_mapping' in item:
-                                            for mapping in item['word_mapping']:
-                                                if 'thai' in mapping and 'translation' in mapping:
-                                                    vocab_translations[mapping['thai']] = mapping['translation']
-                    except Exception as e:
-                        logging.warning(f"Error loading vocabulary from {filename}: {e}")
-        
         # Check if word exists in vocabulary
-        if word in vocab_translations:
-            return vocab_translations[word]
+        vocab_translation = get_vocabulary_index().lookup(word)
+        if vocab_translation is not None:
+            return vocab_translation
         
         # Fallback to Google Translate for unknown words
         try:
-            from google.cloud import translate_v3
-            
-            project_id = os.getenv("GOOGLE_CLOUD_PROJECT")
-            if project_id:
-                client = translate_v3.TranslationServiceClient()
-                parent = f"projects/{project_id}/locations/global"
-                
-                response = client.translate_text(
-                    request={
-                        "parent": parent,
-                        "contents": [word],
-                        "mime_type": "text/plain",
-                        "source_language_code": "th",
-                        "target_language_code": "en",
-                    }
-                )
-                
-                if response.translations:
-                    translation = response.translations[0].translated_text.strip()
+            if os.getenv("GOOGLE_CLOUD_PROJECT"):
+                translation = (await translate_text(word, "en", source_language="th"))["translated_text"].strip()
+                if translation:
                     logging.info(f"Google Translate: {word} → {translation}")
                     return translation
-                
         except Exception as e:
             logging.warning(f"Google Translate failed for '{word}': {e}")
         
@@ -1972,6 +1699,17 @@ async def split_compound_word(word: str, target_language: str = "th") -> dict:
         if target_language.lower() == "th":
             from pythainlp.tokenize import subword_tokenize, word_tokenize
             
+            # Compounds made entirely of curated vocabulary split along the known words
+            vocabulary_parts = get_vocabulary_index().split_compound(word.strip())
+            if vocabulary_parts:
+                return {
+                    "original_word": word,
+                    "is_compound": True,
+                    "constituent_words": vocabulary_parts,
+                    "subword_clusters": vocabulary_parts,
+                    "method": "vocabulary_index"
+                }
+            
             # First try word tokenization to see if it's already a single word
             word_tokens = word_tokenize(word.strip(), engine=lang_config["tokenizer_engine"])
             
@@ -2046,68 +1784,6 @@ async def filter_drawable_items_from_translation(word_mappings: List, target_lan
 
 # --- NEW SYLLABLE-BASED WRITING GUIDE FUNCTIONS ---
 
-def _get_character_type(char: str, thai_writing_guide: dict) -> str:
-    """Get the type of a Thai character from the writing guide."""
-    consonants = thai_writing_guide.get("consonants", {})
-    vowels = thai_writing_guide.get("vowels", {})
-    tone_marks = thai_writing_guide.get("tone_marks", {})
-    
-    if char in consonants:
-        return "Consonant"
-    elif char in tone_marks:
-        return "Tone Mark"
-    else:
-        # Check vowels (some have ◌ placeholder)
-        for vowel_key in vowels:
-            if char in vowel_key.replace("◌", ""):
-                return "Vowel"
-        return "Unknown"
-
-def _get_character_romanization(char: str, thai_writing_guide: dict) -> str:
-    """Get the romanization of a Thai character from the writing guide."""
-    consonants = thai_writing_guide.get("consonants", {})
-    vowels = thai_writing_guide.get("vowels", {})
-    
-    if char in consonants:
-        # Use initial pronunciation for consonants
-        return consonants[char].get("pronunciation", {}).get("initial", "")
-    else:
-        # Check vowels (some have ◌ placeholder)
-        for vowel_key, vowel_data in vowels.items():
-            if char in vowel_key.replace("◌", ""):
-                return vowel_data.get("pronunciation", {}).get("romanization", "")
-    
-    return ""
-
-def _get_tone_effect(tone_mark: str, consonant_class: str, thai_writing_guide: dict) -> str:
-    """Get the tone effect based on tone mark and consonant class."""
-    pronunciation_system = thai_writing_guide.get("pronunciation_system", {})
-    tone_marks = pronunciation_system.get("tone_mark_rules", {})
-    
-    # Map tone marks to their keys
-    tone_map = {
-        "่": "mai_ek",
-        "้": "mai_tho", 
-        "๊": "mai_tri",
-        "๋": "mai_chattawa"
-    }
-    
-    tone_key = tone_map.get(tone_mark)
-    if not tone_key:
-        return ""
-        
-    tone_rule = tone_marks.get(tone_key, {})
-    effects = tone_rule.get("effect_by_consonant_class", {})
-    
-    return effects.get(consonant_class, "")
-
-def _get_consonant_class(consonant: str, thai_writing_guide: dict) -> str:
-    """Get the class of a Thai consonant."""
-    consonants = thai_writing_guide.get("consonants", {})
-    if consonant in consonants:
-        return consonants[consonant].get("class", "")
-    return ""
-
 async def generate_syllable_writing_guide(word: str, target_language: str = "th") -> dict:
     """
     Main function to generate syllable-based writing guide using PyThaiNLP syllable tokenization.
@@ -2136,633 +1812,8 @@ async def generate_syllable_writing_guide(word: str, target_language: str = "th"
     if target_language.lower() != "th":
         return {"error": f"Syllable-based writing guide not supported for {target_language}"}
     
-    try:
-        from pythainlp.tokenize import syllable_tokenize, word_tokenize
-        from pythainlp.transliterate import romanize
-        
-        # Load Thai writing guide data
-        thai_writing_guide = load_thai_writing_guide()
-        if not thai_writing_guide:
-            return {"error": "Failed to load Thai writing guide data"}
-        
-        # Step 1: Break word into proper syllables using dictionary-based engine
-        try:
-            syllables = syllable_tokenize(word, engine="dict")
-            # Fallback to word tokenization if syllable tokenization fails or returns empty
-            if not syllables:
-                syllables = word_tokenize(word, engine="newmm")
-                print(f"Fallback to word tokenization for: {word} -> {syllables}")
-        except Exception as e:
-            print(f"Syllable tokenization failed for {word}: {e}, using word tokenization")
-            syllables = word_tokenize(word, engine="newmm")
-        
-        # Filter out empty syllables
-        syllables = [s for s in syllables if s.strip()]
-        
-        if not syllables:
-            return {"error": f"Failed to tokenize word: {word}"}
-        
-        # Step 2: Process each syllable
-        syllable_data = []
-        
-        for syllable in syllables:
-            # Parse syllable components
-            components = parse_syllable_components(syllable)
-            
-            # Generate romanization for individual syllable
-            syllable_romanization = romanize(syllable, engine="thai2rom")
-            
-            # Assemble tips in correct writing order
-            tips = assemble_tips_in_order(components, thai_writing_guide)
-            
-            # Determine writing order sequence
-            writing_order = _determine_writing_order(components)
-            
-            # IMPORTANT: Add character-level analysis with complex vowel detection
-            characters = []
-            complex_vowels = detect_complex_vowel_patterns(syllable)
-            
-            for i, char in enumerate(syllable):
-                # Get basic character information from thai_writing_guide
-                char_type = _get_character_type(char, thai_writing_guide)
-                char_romanization = _get_character_romanization(char, thai_writing_guide)
-                
-                # Special handling for tone marks - calculate tone effect
-                if char_type == "Tone Mark":
-                    # Find the consonant this tone mark applies to (usually previous consonant)
-                    affected_consonant = None
-                    for j in range(i-1, -1, -1):  # Look backwards for consonant
-                        prev_char = syllable[j]
-                        if _get_character_type(prev_char, thai_writing_guide) == "Consonant":
-                            affected_consonant = prev_char
-                            break
-                    
-                    if affected_consonant:
-                        consonant_class = _get_consonant_class(affected_consonant, thai_writing_guide)
-                        tone_effect = _get_tone_effect(char, consonant_class, thai_writing_guide)
-                        char_romanization = tone_effect.replace("_", " ")  # "falling_tone" -> "falling tone"
-                
-                char_info = {
-                    "character": char,
-                    "position": i,
-                    "type": char_type,
-                    "romanization": char_romanization,
-                    "complex_vowel_member": False
-                }
-                
-                # Mark complex vowel members (ONLY the vowel components, not consonants)
-                for vowel_pattern in complex_vowels:
-                    if i in vowel_pattern.positions:  # Only vowel components, not consonant_pos
-                        char_info["complex_vowel_member"] = True
-                        char_info["complex_vowel_pattern"] = vowel_pattern.pattern_key
-                        char_info["complex_vowel_role"] = "component"
-                        # For the sound carrier (final position), use complex vowel sound with original in parentheses
-                        if i == vowel_pattern.positions[-1]:  # Last component (sound carrier)
-                            original_sound = char_info["romanization"] or ""
-                            char_info["romanization"] = f"{vowel_pattern.romanization}({original_sound})" if original_sound else vowel_pattern.romanization
-                            char_info["type"] = "Complex Vowel"
-                        # For silent components, add (silent) annotation
-                        elif i in vowel_pattern.positions[:-1]:  # Other components (silent)
-                            original_sound = char_info["romanization"] or ""
-                            char_info["romanization"] = f"{original_sound}(silent)" if original_sound else "(silent)"
-                            char_info["type"] = "Complex Vowel"
-                        break
-                
-                characters.append(char_info)
-            
-            syllable_info = {
-                "syllable": syllable,
-                "romanization": syllable_romanization,
-                "components": components,
-                "writing_order": writing_order,
-                "tips": tips,
-                "characters": characters  # Add character-level analysis
-            }
-            
-            syllable_data.append(syllable_info)
-        
-        # Step 3: Prepare final response
-        result = {
-            "word": word,
-            "syllables": syllable_data,
-            "traceable_canvases": syllables,  # Each syllable is a separate canvas
-            "total_syllables": len(syllables)
-        }
-        
-        return result
-        
-    except Exception as e:
-        print(f"Error generating syllable writing guide for '{word}': {e}")
-        return {
-            "error": str(e),
-            "word": word,
-            "fallback": True
-        }
-
-def parse_syllable_components(syllable: str) -> dict:
-    """
-    Parse a single syllable into its grammatical components.
-    
-    Process:
-    1. Identify vowels that come before consonants (เ, แ, โ, ใ, ไ)
-    2. Identify initial consonants and clusters
-    3. Identify vowels above/below consonants
-    4. Identify vowels that come after consonants
-    5. Identify final consonants
-    6. Identify tone marks
-    
-    Returns component dictionary with positions
-    """
-    
-    # Define component categories
-    BEFORE_VOWELS = ["เ", "แ", "โ", "ใ", "ไ"]
-    ABOVE_VOWELS = ["◌ิ", "◌ี", "◌ึ", "◌ื", "◌ั", "◌ํ", "ิ", "ี", "ึ", "ื", "ั", "ํ"]
-    BELOW_VOWELS = ["◌ุ", "◌ู", "◌ฺ", "ุ", "ู", "ฺ"]
-    AFTER_VOWELS = ["◌ะ", "◌า", "◌ำ", "◌ๅ", "ะ", "า", "ำ", "ๅ", "อ", "ย", "ว"]
-    TONE_MARKS = ["◌่", "◌้", "◌๊", "◌๋", "่", "้", "๊", "๋"]
-    
-    # Thai consonants range
-    CONSONANTS = "กขฃคฅฆงจฉชซฌญฎฏฐฑฒณดตถทธนบปผฝพฟภมยรลวศษสหฬอฮ"
-    
-    # Common consonant clusters
-    CONSONANT_CLUSTERS = ["กร", "กล", "คร", "คล", "ปร", "ปล", "ทร", "ผล", "พร", "พล", "สร", "หร", "หล", "หม", "หน", "หย", "หว"]
-    
-    components = {
-        "before_vowels": [],
-        "initial_consonants": [],
-        "consonant_clusters": [],
-        "above_vowels": [],
-        "below_vowels": [],
-        "after_vowels": [],
-        "final_consonants": [],
-        "tone_marks": []
-    }
-    
-    i = 0
-    while i < len(syllable):
-        char = syllable[i]
-        
-        # Check for consonant clusters first (2-character sequences)
-        if i < len(syllable) - 1:
-            cluster = syllable[i:i+2]
-            if cluster in CONSONANT_CLUSTERS:
-                components["consonant_clusters"].append(cluster)
-                components["initial_consonants"].extend(list(cluster))
-                i += 2
-                continue
-        
-        # Individual character analysis
-        if char in BEFORE_VOWELS:
-            components["before_vowels"].append(char)
-        elif char in ABOVE_VOWELS:
-            components["above_vowels"].append(char)
-        elif char in BELOW_VOWELS:
-            components["below_vowels"].append(char)
-        elif char in AFTER_VOWELS:
-            components["after_vowels"].append(char)
-        elif char in TONE_MARKS:
-            components["tone_marks"].append(char)
-        elif char in CONSONANTS:
-            # Determine if initial or final consonant based on position
-            remaining_chars = syllable[i+1:]
-            
-            # If there are more consonants or vowels after this, it's likely initial
-            has_vowels_after = any(c in ABOVE_VOWELS + BELOW_VOWELS + AFTER_VOWELS for c in remaining_chars)
-            has_consonants_after = any(c in CONSONANTS for c in remaining_chars)
-            
-            if has_vowels_after or has_consonants_after:
-                components["initial_consonants"].append(char)
-            else:
-                components["final_consonants"].append(char)
-        
-        i += 1
-    
-    return components
-
-def assemble_tips_in_order(components: dict, thai_writing_guide: dict) -> dict:
-    """
-    Assemble writing tips following Thai writing order.
-    
-    Order:
-    1. Leading vowels (before)
-    2. Initial consonants (including clusters)
-    3. Vowels above/below
-    4. Following vowels (after)
-    5. Final consonants
-    6. Tone marks
-    
-    Returns tips organized by category (general, step_by_step, pronunciation)
-    """
-    
-    tips = {
-        "general": [],
-        "step_by_step": [],
-        "pronunciation": []
-    }
-    
-    step_number = 1
-    
-    # Get character data from writing guide
-    consonants_data = thai_writing_guide.get("consonants", {})
-    vowels_data = thai_writing_guide.get("vowels", {})
-    tone_marks_data = thai_writing_guide.get("tone_marks", {})
-    
-    # 1. Leading vowels (before)
-    for vowel in components.get("before_vowels", []):
-        vowel_info = _find_vowel_info(vowel, vowels_data)
-        if vowel_info:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": vowel,
-                "instruction": f"Write the leading vowel '{vowel}' first",
-                "details": vowel_info.get("steps", []),
-                "sound": vowel_info.get("sound_description", "")
-            })
-            tips["pronunciation"].append(f"'{vowel}' makes {vowel_info.get('sound_description', 'vowel sound')}")
-            step_number += 1
-    
-    # 2. Initial consonants (including clusters)
-    if components.get("consonant_clusters"):
-        for cluster in components["consonant_clusters"]:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": cluster,
-                "instruction": f"Write the consonant cluster '{cluster}'",
-                "details": [f"Write {cluster[0]} then {cluster[1]} close together"],
-                "sound": f"Makes {cluster} sound as a unit"
-            })
-            step_number += 1
-    else:
-        for consonant in components.get("initial_consonants", []):
-            consonant_info = consonants_data.get(consonant, {})
-            if consonant_info:
-                tips["step_by_step"].append({
-                    "step": step_number,
-                    "character": consonant,
-                    "instruction": f"Write the consonant '{consonant}'",
-                    "details": consonant_info.get("steps", []),
-                    "sound": consonant_info.get("sound_description", "")
-                })
-                tips["pronunciation"].append(f"'{consonant}' makes {consonant_info.get('sound_description', 'consonant sound')}")
-                step_number += 1
-    
-    # 3. Vowels above/below
-    for vowel in components.get("above_vowels", []) + components.get("below_vowels", []):
-        vowel_info = _find_vowel_info(vowel, vowels_data)
-        position = "above" if vowel in components.get("above_vowels", []) else "below"
-        if vowel_info:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": vowel,
-                "instruction": f"Add vowel mark '{vowel}' {position} the consonant",
-                "details": vowel_info.get("steps", []),
-                "sound": vowel_info.get("sound_description", "")
-            })
-            step_number += 1
-    
-    # 4. Following vowels (after)
-    for vowel in components.get("after_vowels", []):
-        vowel_info = _find_vowel_info(vowel, vowels_data)
-        if vowel_info:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": vowel,
-                "instruction": f"Write the following vowel '{vowel}'",
-                "details": vowel_info.get("steps", []),
-                "sound": vowel_info.get("sound_description", "")
-            })
-            step_number += 1
-    
-    # 5. Final consonants
-    for consonant in components.get("final_consonants", []):
-        consonant_info = consonants_data.get(consonant, {})
-        if consonant_info:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": consonant,
-                "instruction": f"Write the final consonant '{consonant}'",
-                "details": consonant_info.get("steps", []),
-                "sound": consonant_info.get("sound_description", "")
-            })
-            step_number += 1
-    
-    # 6. Tone marks (always last)
-    for tone in components.get("tone_marks", []):
-        tone_info = tone_marks_data.get(tone, {})
-        if tone_info:
-            tips["step_by_step"].append({
-                "step": step_number,
-                "character": tone,
-                "instruction": f"Add tone mark '{tone}' above",
-                "details": tone_info.get("steps", []),
-                "sound": tone_info.get("sound_description", "")
-            })
-            step_number += 1
-    
-    # Add general tips
-    if components.get("consonant_clusters"):
-        tips["general"].append("This syllable contains consonant clusters that work together")
-    
-    if components.get("before_vowels"):
-        tips["general"].append("Leading vowels are written first but pronounced after consonants")
-    
-    if components.get("tone_marks"):
-        tips["general"].append("Tone marks are always written last")
-    
-    return tips
-
-def _determine_writing_order(components: dict) -> list:
-    """Determine the correct writing order for all components in a syllable."""
-    order = []
-    
-    # 1. Leading vowels first
-    order.extend(components.get("before_vowels", []))
-    
-    # 2. Initial consonants (respecting clusters)
-    if components.get("consonant_clusters"):
-        order.extend(components["consonant_clusters"])
-    else:
-        order.extend(components.get("initial_consonants", []))
-    
-    # 3. Vowels above/below
-    order.extend(components.get("above_vowels", []))
-    order.extend(components.get("below_vowels", []))
-    
-    # 4. Following vowels
-    order.extend(components.get("after_vowels", []))
-    
-    # 5. Final consonants
-    order.extend(components.get("final_consonants", []))
-    
-    # 6. Tone marks always last
-    order.extend(components.get("tone_marks", []))
-    
-    return order
-
-def _find_vowel_info(vowel: str, vowels_data: dict) -> dict:
-    """Find vowel information from the Thai writing guide."""
-    # Direct lookup with ◌ placeholder
-    if f"◌{vowel}" in vowels_data:
-        return vowels_data[f"◌{vowel}"]
-    
-    # Lookup with vowel as prefix
-    if f"{vowel}◌" in vowels_data:
-        return vowels_data[f"{vowel}◌"]
-    
-    # Direct lookup
-    if vowel in vowels_data:
-        return vowels_data[vowel]
-    
-    # Search in all vowel patterns
-    for pattern, data in vowels_data.items():
-        if vowel in pattern:
-            return data
-    
-    # Return empty dict if not found
-    return {} 
-
-# ============================================================================
-# COMPLEX VOWEL PATTERN DETECTION SYSTEM
-# ============================================================================
-
-import re
-from dataclasses import dataclass
-from typing import List, Dict, Optional, Tuple
-
-@dataclass
-class ComplexVowelMatch:
-    """Represents a detected complex vowel pattern in Thai text."""
-    pattern_key: str          # e.g., "เ◌ือ"
-    name: str                # e.g., "Sara Uea"
-    components: List[str]     # e.g., ["เ", "ื", "อ"]
-    positions: List[int]      # Character positions in word
-    consonant_pos: int        # Position of consonant in pattern
-    romanization: str         # e.g., "uea"
-    reading_explanation: str  # Educational explanation
-    component_explanation: str # How components work together
-
-# Complex vowel patterns with their regex patterns and metadata
-# Updated regex patterns to handle tone marks (่ ้ ๊ ๋) and cluster consonants properly
-COMPLEX_VOWEL_PATTERNS = {
-    "เ◌ือ": {
-        "name": "Sara Uea",
-        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ื([์่้๊๋]?)อ",
-        "components": ["เ", "ื", "อ"],
-        "romanization": "uea",
-        "position": "surrounding",
-        "description": "A complex vowel sound unique to Thai"
-    },
-    "เ◌า": {
-        "name": "Sara Ao", 
-        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)า",
-        "components": ["เ", "า"],
-        "romanization": "ao",
-        "position": "surrounding",
-        "description": "An 'ow' sound, as in 'cow'"
-    },
-    "เ◌ะ": {
-        "name": "Sara E Short",
-        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
-        "components": ["เ", "ะ"],
-        "romanization": "e",
-        "position": "surrounding", 
-        "description": "A short 'e' sound, as in 'bet'"
-    },
-    "แ◌ะ": {
-        "name": "Sara Ae Short",
-        "regex": r"แ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
-        "components": ["แ", "ะ"],
-        "romanization": "ae",
-        "position": "surrounding",
-        "description": "A short 'a' sound, as in 'cat'"
-    },
-    "โ◌ะ": {
-        "name": "Sara O Short",
-        "regex": r"โ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ะ",
-        "components": ["โ", "ะ"],
-        "romanization": "o",
-        "position": "surrounding",
-        "description": "A short 'o' sound, as in 'pot'"
-    },
-    "เ◌อ": {
-        "name": "Sara Oe",
-        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)อ",
-        "components": ["เ", "อ"],
-        "romanization": "oe",
-        "position": "surrounding",
-        "description": "A neutral vowel sound, like the 'u' in 'fur'"
-    },
-    "เ◌ีย": {
-        "name": "Sara Ia",
-        "regex": r"เ([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ีย",
-        "components": ["เ", "ี", "ย"],
-        "romanization": "ia", 
-        "position": "surrounding",
-        "description": "An 'ia' sound, as in 'maria'"
-    },
-    "◌ัย": {
-        "name": "Sara Ai",
-        "regex": r"([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ัย",
-        "components": ["ั", "ย"],
-        "romanization": "ai",
-        "position": "surrounding",
-        "description": "An 'ai' sound, as in 'my'"
-    },
-    "◌ัว": {
-        "name": "Sara Ua",
-        "regex": r"([ก-ฮ]+(?:[์่้๊๋]?[ก-ฮ]*)*[์่้๊๋]?)ัว",
-        "components": ["ั", "ว"],
-        "romanization": "ua",
-        "position": "surrounding",
-        "description": "A 'ua' sound, as in 'suave'"
-    }
-}
-
-# Educational explanation templates
-VOWEL_READING_EXPLANATIONS = {
-    "เ◌ือ": "Even though เ is written before the consonant, the full vowel เ◌ือ is pronounced after. The three parts (เ + ื + อ) work together to create the 'uea' sound. Always read the vowel after the consonant, even if เ is written first!",
-    "เ◌า": "The เ is written before the consonant but pronounced after it. Together with า, they create the 'ao' sound that comes after the consonant.",
-    "เ◌ะ": "The เ leads but is pronounced after the consonant, combining with ะ to make a short 'e' sound.",
-    "แ◌ะ": "The แ comes first visually but sounds after the consonant, joining with ะ for a short 'ae' sound.",
-    "โ◌ะ": "The โ is written first but pronounced after the consonant, working with ะ to create a short 'o' sound.",
-    "เ◌อ": "The เ leads in writing but follows in pronunciation, combining with อ for the neutral 'oe' sound.",
-    "เ◌ีย": "The เ starts the pattern but is pronounced after the consonant, along with ี and ย creating the 'ia' sound.",
-    "◌ัย": "The ั sits above the consonant and ย follows it, together making the 'ai' sound.",
-    "◌ัว": "The ั goes above the consonant and ว comes after, creating the 'ua' sound together."
-}
-
-def detect_complex_vowel_patterns(word: str) -> List[ComplexVowelMatch]:
-    """
-    Detect complex vowel patterns in Thai text.
-    
-    Args:
-        word: Thai text to analyze
-        
-    Returns:
-        List of detected complex vowel patterns with positions and metadata
-    """
-    detected_patterns = []
-    
-    for pattern_key, pattern_info in COMPLEX_VOWEL_PATTERNS.items():
-        regex_pattern = pattern_info["regex"]
-        
-        # Find all matches for this pattern
-        matches = re.finditer(regex_pattern, word)
-        
-        for match in matches:
-            # Extract consonant group and build component positions
-            consonant_group = match.group(1)  # The consonant(s) in the pattern
-            start_pos = match.start()
-            end_pos = match.end()
-            
-            # Calculate exact positions of each component
-            positions = []
-            components = pattern_info["components"]
-            
-            # Map components to their actual positions in the word
-            if pattern_key.startswith("เ"):
-                # Leading vowel patterns: เ + consonant + other components
-                positions.append(start_pos)  # เ position
-                consonant_pos = start_pos + 1
-                
-                # Find actual positions of remaining vowel components in the matched text
-                matched_text = match.group(0)
-                
-                # For เ◌ือ pattern, find ื and อ positions
-                if pattern_key == "เ◌ือ":
-                    # Find ื position
-                    ue_pos = word.find("ื", start_pos)
-                    if ue_pos != -1:
-                        positions.append(ue_pos)
-                    
-                    # Find อ position  
-                    o_pos = word.find("อ", ue_pos if ue_pos != -1 else start_pos)
-                    if o_pos != -1:
-                        positions.append(o_pos)
-                else:
-                    # Fallback for other patterns
-                    current_pos = start_pos + 1 + len(consonant_group)
-                    for component in components[1:]:  # Skip เ, already added
-                        positions.append(current_pos)
-                        current_pos += len(component)
-                    
-            elif pattern_key.startswith("แ") or pattern_key.startswith("โ"):
-                # Leading vowel patterns: แ/โ + consonant + ะ
-                positions.append(start_pos)  # แ/โ position
-                consonant_pos = start_pos + 1
-                positions.append(start_pos + 1 + len(consonant_group))  # ะ position
-                
-            else:
-                # Patterns starting with ◌ (consonant first)
-                consonant_pos = start_pos
-                current_pos = start_pos + len(consonant_group)
-                for component in components:
-                    positions.append(current_pos)
-                    current_pos += len(component)
-            
-            # Create explanation with actual word context
-            reading_explanation = VOWEL_READING_EXPLANATIONS[pattern_key]
-            component_explanation = f"In {word}: {' + '.join(components)} around {consonant_group} = {pattern_info['romanization']} sound"
-            
-            # Create the match object
-            complex_match = ComplexVowelMatch(
-                pattern_key=pattern_key,
-                name=pattern_info["name"],
-                components=components,
-                positions=positions,
-                consonant_pos=consonant_pos,
-                romanization=pattern_info["romanization"],
-                reading_explanation=reading_explanation,
-                component_explanation=component_explanation
-            )
-            
-            detected_patterns.append(complex_match)
-    
-    return detected_patterns
-
-def get_complex_vowel_info(word: str, character_position: int) -> Optional[ComplexVowelMatch]:
-    """
-    Get complex vowel information for a character at a specific position.
-    
-    Args:
-        word: Thai text containing the character
-        character_position: Position of character to check
-        
-    Returns:
-        ComplexVowelMatch if character is part of a complex vowel, None otherwise
-    """
-    detected_patterns = detect_complex_vowel_patterns(word)
-    
-    for pattern in detected_patterns:
-        # Check if the character position is part of this complex vowel
-        if character_position in pattern.positions or character_position == pattern.consonant_pos:
-            return pattern
-    
-    return None
-
-def generate_complex_vowel_explanation(word: str, complex_vowel: ComplexVowelMatch) -> str:
-    """
-    Generate educational explanation for a complex vowel pattern.
-    
-    Args:
-        word: The word containing the pattern
-        complex_vowel: The detected complex vowel pattern
-        
-    Returns:
-        Detailed educational explanation
-    """
-    explanation_parts = [
-        f"**{complex_vowel.name} ({complex_vowel.pattern_key})**",
-        "",
-        f"🔤 **Components:** {' + '.join(complex_vowel.components)}",
-        f"🔊 **Sound:** {complex_vowel.romanization}",
-        "",
-        f"📖 **Reading Order:** {complex_vowel.reading_explanation}",
-        "",
-        f"💡 **In this word:** {complex_vowel.component_explanation}"
-    ]
-    
-    return "\n".join(explanation_parts)
+    # Tokenization, romanization and per-character analysis are CPU-bound; run them in the NLP worker pool
+    return await run_nlp_task("syllable_writing_guide", word=word)
 
 async def translate_and_syllabify(english_text: str, target_language: str = 'th') -> dict:
     # 1. Translate full English text to target
@@ -2770,7 +1821,20 @@ async def translate_and_syllabify(english_text: str, target_language: str = 'th'
     target_text = full_translation['translated_text']
     
     # 2. Tokenize target text into words
-    words = word_tokenize(target_text, engine='newmm')
+    nlp = get_thai_nlp_engine()
+    words = nlp.tokenize(target_text, 'newmm')
+    
+    # Syllabify every word and romanize the unique syllables in one pass
+    word_syllables = {word: nlp.syllables(word) for word in words if word and word.strip()}
+    all_syllables = [syl for syllables in word_syllables.values() for syl in syllables]
+    syllable_romanizations = dict(zip(all_syllables, nlp.romanize_batch(all_syllables)))
+    
+    # Back-translate all words in one batched request instead of one request per word
+    back_translations = {}
+    if target_language.lower() not in ['en', 'en-us']:
+        back_translations = await translate_texts_batch(
+            [word for word in words if word and word.strip()], 'en', source_language=target_language
+        )
     
     word_mappings = []
     for word in words:
@@ -2784,19 +1848,21 @@ async def translate_and_syllabify(english_text: str, target_language: str = 'th'
             # If target language is English, the word is already in English
             whole_translation = word
         else:
-            # Translate non-English target word back to English
-            back_translation = await translate_text(word, 'en', source_language=target_language)
-            whole_translation = back_translation['translated_text']
+            # Translate non-English target word back to English (batched above; retry singly if the batch failed)
+            whole_translation = back_translations.get(word)
+            if whole_translation is None:
+                back_translation = await translate_text(word, 'en', source_language=target_language)
+                whole_translation = back_translation['translated_text']
         
-        # 4. Syllabify and romanize
-        syllables = syllable_tokenize(word)
+        # 4. Syllabify and romanize (computed above)
+        syllables = word_syllables[word]
         
         # 5. Determine if this is a known compound
         is_compound = len(syllables) > 1 and is_known_compound(word)
         
         syllable_mappings = []
         for syl in syllables:
-            syl_roman = romanize(syl)
+            syl_roman = syllable_romanizations[syl]
             syllable_mappings.append({
                 'syllable': syl,
                 'romanization': syl_roman,
@@ -2822,29 +1888,34 @@ async def translate_with_deepl(text: str, target_language: str = "th", source_la
     """
     Translate text using DeepL API from English to Thai.
     """
+    cached = await get_translation_memory().get_async(text, source_language, target_language, "deepl")
+    if cached is not None:
+        return {
+            "translated_text": cached,
+            "source_text": text,
+            "source_language": source_language,
+            "target_language": target_language,
+            "service": "deepl"
+        }
     try:
-        import deepl
-        
-        # Get DeepL API key from environment
-        deepl_api_key = os.getenv("DEEPL_API_KEY")
-        if not deepl_api_key:
-            raise HTTPException(status_code=500, detail="DeepL API key not configured")
-        
-        # Initialize DeepL translator
-        translator = deepl.Translator(deepl_api_key)
+        # Shared translator (created once per process, like the Google clients)
+        translator = get_client_registry().get(DEEPL_CLIENT_NAME)
         
         # DeepL language code mapping
         deepl_target_lang = "TH" if target_language == "th" else target_language.upper()
         deepl_source_lang = "EN" if source_language == "en" else source_language.upper()
         
-        # Translate using DeepL
-        result = translator.translate_text(
+        # Translate using DeepL; blocking HTTP call, so it runs on the DeepL vendor pool
+        result = await run_in_vendor_executor(
+            DEEPL_CLIENT_NAME,
+            translator.translate_text,
             text, 
             source_lang=deepl_source_lang,
             target_lang=deepl_target_lang
         )
         
         translated_text = result.text
+        await get_translation_memory().put_async(text, source_language, target_language, "deepl", translated_text)
         
         return {
             "translated_text": translated_text,
@@ -2854,9 +1925,12 @@ async def translate_with_deepl(text: str, target_language: str = "th", source_la
             "service": "deepl"
         }
         
+    except HTTPException:
+        raise
     except ImportError:
         raise HTTPException(status_code=500, detail="DeepL library not installed")
     except Exception as e:
+        get_client_registry().record_error(DEEPL_CLIENT_NAME, e)
         logging.error(f"DeepL translation error: {e}")
         raise HTTPException(status_code=500, detail=f"DeepL translation failed: {str(e)}")
 
@@ -2987,23 +2061,18 @@ async def romanize_sentence_contextual_fallback(thai_sentence: str, target_langu
     lang_config = get_language_config(target_language)
     
     try:
-        from pythainlp.transliterate import romanize
-        from pythainlp.tokenize import word_tokenize
-        
-        # 1. Tokenize Thai sentence into words first
-        thai_words = word_tokenize(thai_sentence, engine=lang_config["tokenizer_engine"])
-        
-        # 2. Romanize each word individually
-        romanized_words = []
-        for word in thai_words:
-            if word.strip():
-                romanized_word = romanize(word, engine=engine)
-                # Apply post-processing corrections for thai2rom
-                if engine == "thai2rom":
-                    romanized_word = post_process_thai2rom_romanization(word, romanized_word)
-                romanized_words.append(romanized_word)
-            else:
-                romanized_words.append(word)
+        # 1. Tokenize Thai sentence into words, 2. romanize each unique word once (in the NLP worker pool)
+        [sentence] = await run_nlp_task(
+            "analyze_sentences", sentences=[thai_sentence],
+            tokenizer_engine=lang_config["tokenizer_engine"], romanizer_engine=engine
+        )
+        thai_words, romanized_words = sentence["tokens"], sentence["romanizations"]
+        # Apply post-processing corrections for thai2rom
+        if engine == "thai2rom":
+            romanized_words = [
+                post_process_thai2rom_romanization(word, roman) if word.strip() else roman
+                for word, roman in zip(thai_words, romanized_words)
+            ]
         
         # 3. Create full romanization from individual words
         full_romanization = ' '.join(romanized_words)
@@ -3056,24 +2125,19 @@ async def romanize_sentence_contextual(thai_sentence: str, target_language: str
         preferred_engine = lang_config.get("romanizer_engine", "royin")
         best_engine = get_best_romanization_engine(preferred_engine)
         
-        # Use word-by-word romanization approach for all engines
-        from pythainlp.transliterate import romanize
-        from pythainlp.tokenize import word_tokenize
-        
-        # 1. Tokenize Thai sentence into words first
-        thai_words = word_tokenize(thai_sentence, engine=lang_config["tokenizer_engine"])
-        
-        # 2. Romanize each word individually using the best available engine
-        romanized_words = []
-        for word in thai_words:
-            if word.strip():
-                romanized_word = romanize(word, engine=best_engine)
-                # Apply post-processing corrections for thai2rom
-                if best_engine == "thai2rom":
-                    romanized_word = post_process_thai2rom_romanization(word, romanized_word)
-                romanized_words.append(romanized_word)
-            else:
-                romanized_words.append(word)
+        # Use word-by-word romanization approach for all engines:
+        # 1. Tokenize Thai sentence into words, 2. romanize each unique word once (in the NLP worker pool)
+        [sentence] = await run_nlp_task(
+            "analyze_sentences", sentences=[thai_sentence],
+            tokenizer_engine=lang_config["tokenizer_engine"], romanizer_engine=best_engine
+        )
+        thai_words, romanized_words = sentence["tokens"], sentence["romanizations"]
+        # Apply post-processing corrections for thai2rom
+        if best_engine == "thai2rom":
+            romanized_words = [
+                post_process_thai2rom_romanization(word, roman) if word.strip() else roman
+                for word, roman in zip(thai_words, romanized_words)
+            ]
         
         # 3. Create full romanization from individual words
         full_romanization = ' '.join(romanized_words)
@@ -3088,6 +2152,8 @@ async def romanize_sentence_contextual(thai_sentence: str, target_language: str
             'method': f'spaced_sentence_romanization_{best_engine}'
         }
         
+    except HTTPException:
+        raise  # NLP worker pool back-pressure/timeout; the inline fallback would just add load
     except Exception as e:
         logging.error(f"Error in spaced sentence romanization: {e}")
         # Fallback to word-level approach
@@ -3258,6 +2324,23 @@ async def romanize_word_level_fallback(thai_sentence: str, target_language: str
 
 
 async def get_contextual_word_translation(thai_word: str, thai_sentence: str, english_sentence: str, word_index: int = 0) -> str:
+    """
+    Contextual word translation backed by the translation memory.
+    The memory key includes both sentences and the word position, since the same word can translate differently in context.
+    """
+    memory = get_translation_memory()
+    context_key = "\n".join([thai_word, thai_sentence, english_sentence, str(word_index)])
+    cached = await memory.get_async(context_key, "th", "en", "contextual")
+    if cached is not None:
+        return cached
+    translation = await _resolve_contextual_word_translation(thai_word, thai_sentence, english_sentence, word_index)
+    # Fallbacks return the word itself or an "[Unknown: ...]" marker; don't pin those in the memory
+    if translation and translation != thai_word and not translation.startswith("["):
+        await memory.put_async(context_key, "th", "en", "contextual", translation)
+    return translation
+
+
+async def _resolve_contextual_word_translation(thai_word: str, thai_sentence: str, english_sentence: str, word_index: int = 0) -> str:
     """
     Enhanced contextual word translation with homograph detection and phrase context preservation.
     This resolves homophone issues and maintains contextual accuracy.
@@ -3274,9 +2357,8 @@ async def get_contextual_word_translation(thai_word: str, thai_sentence: str, en
         # 1. NEW: Try homograph-aware translation first for ambiguous words
         if HOMOGRAPH_SERVICE_AVAILABLE:
             try:
-                # Tokenize sentence for context
-                from pythainlp.tokenize import word_tokenize
-                words = word_tokenize(thai_sentence, engine='newmm')
+                # Tokenize sentence for context (in the NLP worker pool)
+                [words] = await run_nlp_task("tokenize_sentences", sentences=[thai_sentence], engine="newmm")
                 
                 # Detect homograph context
                 detected_context = homograph_service.detect_homograph_context(thai_word, thai_sentence, words)
@@ -0,0 +1,188 @@
+"""
+Background prefetch of predictable NPC speech (initial dialogues, NPC vocabulary) into the audio cache.
+Runs at startup with bounded concurrency and a cost budget; clips are persisted, so a redeploy only synthesizes new lines.
+"""
+
+import os
+import json
+import time
+import asyncio
+import logging
+import itertools
+from typing import Any, Dict, List, Optional
+
+from .audio_cache import get_audio_cache
+from .tts_service import text_to_speech_pcm, tts_pcm_cache_key, estimate_gemini_tts_cost
+
+TTS_PREFETCH_ON_STARTUP = os.getenv("TTS_PREFETCH_ON_STARTUP", "true").lower() == "true"
+TTS_PREFETCH_CONCURRENCY = int(os.getenv("TTS_PREFETCH_CONCURRENCY", "2"))       # Leaves Gemini capacity for live requests
+TTS_PREFETCH_BUDGET_USD = float(os.getenv("TTS_PREFETCH_BUDGET_USD", "0.25"))     # Estimated spend per run
+TTS_PREFETCH_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "data")
+
+
+class PrefetchJob:
+    """One line to synthesize in one voice"""
+
+    __slots__ = ("npc_id", "source", "text", "voice_name", "tone", "cache_key", "estimated_cost")
+
+    def __init__(self, npc_id: str, source: str, text: str, voice_name: str, tone: Optional[str]):
+        self.npc_id = npc_id
+        self.source = source
+        self.text = text
+        self.voice_name = voice_name
+        self.tone = tone
+        self.cache_key = tts_pcm_cache_key(text, voice_name, tone)
+        # Tone is sent to Gemini as a prefix, so it counts toward the billed characters
+        prompt_length = len(text) + (len(f"In a {tone.strip()} tone: ") if tone and tone.strip() else 0)
+        self.estimated_cost = estimate_gemini_tts_cost(prompt_length)
+
+
+class TTSPrefetchScheduler:
+    """Plans and runs prefetch jobs; keeps per-run counters for /health"""
+
+    def __init__(self, data_dir: str = TTS_PREFETCH_DATA_DIR, concurrency: int = TTS_PREFETCH_CONCURRENCY,
+                 budget_usd: float = TTS_PREFETCH_BUDGET_USD):
+        self.data_dir = data_dir
+        self.concurrency = concurrency
+        self.budget_usd = budget_usd
+        self.jobs: List[PrefetchJob] = []
+        self.stats: Dict[str, Any] = {"state": "idle"}
+
+    def _load(self, filename: str) -> Any:
+        try:
+            with open(os.path.join(self.data_dir, filename), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.warning(f"⚠️ TTS prefetch: could not read {filename}: {e}")
+            return None
+
+    def plan(self, voice_map: Dict[str, str]) -> List[PrefetchJob]:
+        """
+        Lines each NPC will predictably speak, in that NPC's voice: the initial dialogue first (played on every
+        conversation start), then the NPC's vocabulary words. Duplicates (same text, voice and tone) are dropped.
+        """
+        default_voice = voice_map.get("default", "Puck")
+        jobs: Dict[str, PrefetchJob] = {}
+
+        def add(job: PrefetchJob):
+            jobs.setdefault(job.cache_key, job)
+
+        dialogues = self._load("npc_initial_dialogues.json") or {}
+        for npc_id, dialogue in dialogues.items():
+            text = (dialogue.get("response_target") or "").strip()
+            if text:
+                add(PrefetchJob(npc_id, "initial_dialogue", text, voice_map.get(npc_id.lower(), default_voice), dialogue.get("tone")))
+
+        # Vocabulary is interleaved across NPCs so a tight budget doesn't go entirely to the first NPC
+        vocabulary_jobs = []
+        for npc_id, voice_name in voice_map.items():
+            if npc_id == "default":
+                continue
+            vocabulary = (self._load(f"npc_vocabulary_{npc_id}.json") or {}).get("vocabulary", [])
+            vocabulary_jobs.append([
+                PrefetchJob(npc_id, "vocabulary", item["thai"].strip(), voice_name, None)
+                for item in vocabulary if (item.get("thai") or "").strip()
+            ])
+        for round_jobs in itertools.zip_longest(*vocabulary_jobs):
+            for job in round_jobs:
+                if job is not None:
+                    add(job)
+
+        self.jobs = list(jobs.values())
+        return self.jobs
+
+    def coverage(self) -> Dict[str, Any]:
+        """Share of planned lines currently in the audio cache, overall and per voice."""
+        cache = get_audio_cache()
+        by_voice: Dict[str, List[int]] = {}
+        for job in self.jobs:
+            counts = by_voice.setdefault(job.voice_name, [0, 0])
+            counts[1] += 1
+            if cache.contains(job.cache_key):
+                counts[0] += 1
+        cached = sum(counts[0] for counts in by_voice.values())
+        return {
+            "lines": len(self.jobs),
+            "cached": cached,
+            "coverage_pct": round(cached / len(self.jobs) * 100, 1) if self.jobs else 100.0,
+            "by_voice": {
+                voice: round(counts[0] / counts[1] * 100, 1) for voice, counts in by_voice.items()
+            }
+        }
+
+    async def run(self, voice_map: Dict[str, str]) -> Dict[str, Any]:
+        """Synthesize every planned line that isn't cached yet, stopping before the estimated budget is exceeded."""
+        start_time = time.time()
+        cache = get_audio_cache()
+        jobs = self.plan(voice_map)
+        pending = [job for job in jobs if not cache.contains(job.cache_key)]
+        self.stats = {
+            "state": "running",
+            "started_at": start_time,
+            "planned": len(jobs),
+            "already_cached": len(jobs) - len(pending),
+            "synthesized": 0,
+            "failed": 0,
+            "skipped_budget": 0,
+            "estimated_cost_usd": 0.0,
+            "budget_usd": self.budget_usd,
+        }
+
+        # Reserve budget in plan order so the most valuable lines (initial dialogues) are funded first
+        funded = []
+        reserved = 0.0
+        for job in pending:
+            if reserved + job.estimated_cost > self.budget_usd:
+                self.stats["skipped_budget"] += 1
+                continue
+            reserved += job.estimated_cost
+            funded.append(job)
+
+        semaphore = asyncio.Semaphore(max(1, self.concurrency))
+
+        async def prefetch(job: PrefetchJob):
+            async with semaphore:
+                try:
+                    await text_to_speech_pcm(
+                        job.text, voice_name=job.voice_name, response_tone=job.tone,
+                        user_id="tts_prefetch", persist=True
+                    )
+                    self.stats["synthesized"] += 1
+                    self.stats["estimated_cost_usd"] = round(self.stats["estimated_cost_usd"] + job.estimated_cost, 6)
+                except Exception as e:
+                    self.stats["failed"] += 1
+                    logging.warning(f"⚠️ TTS prefetch: {job.npc_id} {job.source} line failed ({job.voice_name}): {e}")
+
+        await asyncio.gather(*[prefetch(job) for job in funded])
+
+        self.stats["state"] = "complete"
+        self.stats["duration_ms"] = int((time.time() - start_time) * 1000)
+        self.stats.update(self.coverage())
+        logging.info(
+            f"✅ TTS prefetch: {self.stats['synthesized']} synthesized, {self.stats['already_cached']} already cached, "
+            f"{self.stats['failed']} failed, {self.stats['skipped_budget']} over budget - "
+            f"coverage {self.stats['coverage_pct']}% (~${self.stats['estimated_cost_usd']:.4f})"
+        )
+        return self.stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Run counters plus live coverage (clips can be evicted after the run)."""
+        if not self.jobs:
+            return self.stats
+        return {**self.stats, **self.coverage()}
+
+
+# Global instance getter
+_tts_prefetch_scheduler = None
+
+def get_tts_prefetch_scheduler() -> TTSPrefetchScheduler:
+    """
+    Get the global TTS prefetch scheduler.
+
+    Returns:
+        TTSPrefetchScheduler: The shared instance
+    """
+    global _tts_prefetch_scheduler
+    if _tts_prefetch_scheduler is None:
+        _tts_prefetch_scheduler = TTSPrefetchScheduler()
+    return _tts_prefetch_scheduler
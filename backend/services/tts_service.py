@@ -9,14 +9,38 @@ import wave # Import the wave module
 import io   # Import the io module
 from typing import Optional
 import requests  # For PostHog tracking
-from .connection_pool import get_connection_pool
+from .analytics_dispatcher import capture_event
+from .client_registry import get_client_registry
+from .vendor_executor import run_in_vendor_executor
+from .audio_cache import get_audio_cache, audio_cache_key
+from .audio_encoding import encode_pcm, COMPRESSED_AUDIO_FORMATS
+from .structured_logging import get_logger
 import json
 import time
+import struct
+import asyncio
+import threading
+
+log = get_logger(__name__)
 
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
 POSTHOG_API_KEY = os.getenv("POSTHOG_API_KEY")
 HELICONE_API_KEY = os.getenv("HELICONE_API_KEY")
 
+# Gemini TTS output format: raw 24kHz mono 16-bit PCM
+TTS_MODEL = "gemini-2.5-flash-preview-tts"
+TTS_SAMPLE_RATE = 24000
+TTS_CHANNELS = 1
+TTS_SAMPLE_WIDTH = 2
+
+# Prebuilt Gemini TTS voices accepted by the streaming endpoints
+GEMINI_TTS_VOICES = frozenset({
+    "Zephyr", "Puck", "Charon", "Kore", "Fenrir", "Leda", "Orus", "Aoede", "Callirrhoe", "Autonoe",
+    "Enceladus", "Iapetus", "Umbriel", "Algieba", "Despina", "Erinome", "Algenib", "Rasalgethi",
+    "Laomedeia", "Achernar", "Alnilam", "Schedar", "Gacrux", "Pulcherrima", "Achird",
+    "Zubenelgenubi", "Vindemiatrix", "Sadachbia", "Sadaltager", "Sulafat"
+})
+
 # Configure the genai client globally if not already done, or ensure it's configured before use.
 # genai.configure(api_key=GEMINI_API_KEY) # This is often done at application startup.
 # For services, it might be better to ensure the key exists and let the calling function handle client instantiation
@@ -47,44 +71,22 @@ def track_tts_call_to_posthog(
     success: bool = True,
     error: Optional[str] = None
 ):
-    """Track TTS API calls to PostHog for analytics"""
-    if not POSTHOG_API_KEY:
-        return
-    
-    try:
-        event_data = {
-            "api_key": POSTHOG_API_KEY,
-            "event": "gemini_tts_call",
-            "properties": {
-                "service": "gemini_tts",
-                "text_length": text_length,
-                "voice_name": voice_name,
-                "duration_ms": duration_ms,
-                "success": success,
-                "timestamp": datetime.datetime.now().isoformat(),
-            },
-            "timestamp": datetime.datetime.now().isoformat(),
-        }
-        
-        if user_id:
-            event_data["distinct_id"] = user_id
-        if session_id:
-            event_data["properties"]["session_id"] = session_id
-        if error:
-            event_data["properties"]["error"] = error
-            
-        # Send to PostHog using connection pool
-        connection_pool = get_connection_pool()
-        connection_pool.post(
-            "https://app.posthog.com/capture/",
-            json=event_data,
-            timeout=5
-        )
-        print(f"[{datetime.datetime.now()}] ✅ PostHog: TTS call tracked - success: {success}, text_length: {text_length}, voice: {voice_name}")
-    except Exception as e:
-        print(f"[{datetime.datetime.now()}] WARNING: Failed to track TTS call to PostHog: {e}")
+    """Track TTS API calls to PostHog for analytics (queued; sent in the background)"""
+    properties = {
+        "service": "gemini_tts",
+        "text_length": text_length,
+        "voice_name": voice_name,
+        "duration_ms": duration_ms,
+        "success": success,
+        "timestamp": datetime.datetime.now().isoformat(),
+    }
+    if session_id:
+        properties["session_id"] = session_id
+    if error:
+        properties["error"] = error
+    capture_event("gemini_tts_call", properties, distinct_id=user_id)
 
-def create_helicone_gemini_client() -> genai.Client:
+def _build_helicone_gemini_client() -> genai.Client:
     """Create a Gemini client that routes through Helicone Gateway for cost tracking"""
     if not GEMINI_API_KEY:
         raise ValueError("GEMINI_API_KEY is required")
@@ -111,6 +113,18 @@ def create_helicone_gemini_client() -> genai.Client:
     print(f"[{datetime.datetime.now()}] 📊 Helicone Gateway: https://gateway.helicone.ai -> https://generativelanguage.googleapis.com")
     return client
 
+GEMINI_CLIENT_NAME = "gemini"
+
+get_client_registry().register(
+    GEMINI_CLIENT_NAME,
+    _build_helicone_gemini_client,
+    probe=lambda client: client.models.get(model=TTS_MODEL)
+)
+
+def create_helicone_gemini_client() -> genai.Client:
+    """Return the shared Helicone-enabled Gemini client (built once per process by the client registry)"""
+    return get_client_registry().get(GEMINI_CLIENT_NAME)
+
 def add_helicone_headers_for_tts(
     user_id: Optional[str] = None,
     session_id: Optional[str] = None,
@@ -143,92 +157,208 @@ def estimate_gemini_tts_cost(text_length: int) -> float:
     return text_length * cost_per_character
 
 
-async def text_to_speech_stream(text_to_speak: str):
+def _extract_stream_audio(chunk_response) -> Optional[bytes]:
+    """Raw PCM carried by one generate_content_stream chunk, if any."""
+    if chunk_response.candidates:
+        candidate = chunk_response.candidates[0]
+        if candidate.content and candidate.content.parts:
+            part = candidate.content.parts[0]
+            if part.inline_data and part.inline_data.data:
+                return part.inline_data.data
+    return None
+
+
+def _pump_tts_stream(stream_factory, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue, stop: threading.Event):
     """
-    Converts text to speech using Google Gemini TTS and yields audio chunks.
-    text_to_speak: The text to be converted to speech.
-    Yields bytes of audio data.
+    Iterate the blocking Gemini stream on a vendor thread and hand audio chunks to the event loop.
+    Stops early (at the next chunk) once the consumer sets stop, e.g. after a client disconnect.
+    """
+    for chunk_response in stream_factory():
+        if stop.is_set():
+            break
+        data = _extract_stream_audio(chunk_response)
+        if data:
+            loop.call_soon_threadsafe(queue.put_nowait, data)
+
+
+async def text_to_speech_stream(
+    text_to_speak: str,
+    voice_name: str = "Puck",
+    response_tone: Optional[str] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
+):
     """
+    Converts text to speech using Google Gemini TTS and yields raw PCM chunks
+    (24kHz, mono, 16-bit little-endian) as they arrive.
+    The blocking SDK stream is consumed on the Gemini vendor pool, so the event loop never waits on it.
+    A fully streamed clip is added to the audio cache; a cached clip is yielded as a single chunk.
+    """
+    cache = get_audio_cache()
+    cache_key = tts_pcm_cache_key(text_to_speak, voice_name, response_tone)
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        yield cached
+        return
+
     if not GEMINI_API_KEY:
-        print(f"[{datetime.datetime.now()}] ERROR: TTS Stream - Google GenAI client not configured. API key missing.")
+        log.error("TTS Stream - Google GenAI client not configured. API key missing.")
         raise HTTPException(status_code=500, detail="TTS Stream: Google GenAI client not configured. Check API key.")
 
+    final_text_to_speak = text_to_speak
+    if response_tone and response_tone.strip():
+        final_text_to_speak = f"In a {response_tone.strip()} tone: {text_to_speak}"
+
+    start_time = time.time()
+    stop = threading.Event()
+    pump_task = None
     try:
         # Initialize Helicone-enabled Gemini client
         client = create_helicone_gemini_client()
-        print(f"[{datetime.datetime.now()}] DEBUG: TTS Stream - Helicone-enabled Gemini client initialized for streaming")
+        log.debug("TTS Stream - Helicone-enabled Gemini client acquired", voice=voice_name)
 
-        stream = client.models.generate_content_stream(
-            model="gemini-2.5-flash-preview-tts", 
-            contents=text_to_speak,
-            config=genai_types.GenerateContentConfig(
-                response_modalities=["AUDIO"],
-                speech_config=genai_types.SpeechConfig(
-                    voice_config=genai_types.VoiceConfig(
-                        prebuilt_voice_config=genai_types.PrebuiltVoiceConfig(
-                            voice_name="Puck" # Consistent voice
+        def open_stream():
+            return client.models.generate_content_stream(
+                model=TTS_MODEL,
+                contents=final_text_to_speak,
+                config=genai_types.GenerateContentConfig(
+                    response_modalities=["AUDIO"],
+                    speech_config=genai_types.SpeechConfig(
+                        voice_config=genai_types.VoiceConfig(
+                            prebuilt_voice_config=genai_types.PrebuiltVoiceConfig(
+                                voice_name=voice_name
+                            )
                         )
-                    )
+                    ),
                 ),
-            ),
+            )
+
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        # One vendor slot for the whole stream; the None sentinel is queued after the last chunk
+        pump_task = asyncio.ensure_future(
+            run_in_vendor_executor(GEMINI_CLIENT_NAME, _pump_tts_stream, open_stream, loop, queue, stop)
         )
+        pump_task.add_done_callback(lambda _: queue.put_nowait(None))
 
         # Stream the audio data
-        chunk_count = 0
-        total_bytes = 0
-        for chunk_response in stream:
-            if chunk_response.candidates:
-                candidate = chunk_response.candidates[0]
-                if candidate.content and candidate.content.parts:
-                    part = candidate.content.parts[0]
-                    if part.inline_data and part.inline_data.data:
-                        chunk_count += 1
-                        total_bytes += len(part.inline_data.data)
-                        yield part.inline_data.data
-            # Add more detailed logging here if stream issues persist
-            # else: print(f"[{datetime.datetime.now()}] DEBUG: TTS Stream - No relevant data in chunk_response: {chunk_response}")
-        
-        logging.info(f"TTS streaming completed - chunks: {chunk_count}, bytes: {total_bytes}, text_length: {len(text_to_speak)}")
-        
+        chunks = []
+        first_chunk_ms = None
+        while True:
+            data = await queue.get()
+            if data is None:
+                break
+            if first_chunk_ms is None:
+                first_chunk_ms = int((time.time() - start_time) * 1000)
+            chunks.append(data)
+            yield data
+        await pump_task  # Surfaces SDK errors raised mid-stream
+
+        duration_ms = int((time.time() - start_time) * 1000)
+        total_bytes = sum(len(chunk) for chunk in chunks)
+        if not chunks:
+            raise HTTPException(status_code=500, detail="TTS Stream: Failed to generate audio, no data in response.")
+        log.info("✅ TTS Stream - Synthesis completed", voice=voice_name, chunks=len(chunks), pcm_bytes=total_bytes,
+                 first_chunk_ms=first_chunk_ms, duration_ms=duration_ms, text_length=len(text_to_speak))
+
         # Track successful streaming call to PostHog (Helicone tracking happens automatically via Gateway)
         track_tts_call_to_posthog(
-            text_length=len(text_to_speak),
-            voice_name='Puck',
+            user_id=user_id,
+            session_id=session_id,
+            text_length=len(final_text_to_speak),
+            voice_name=voice_name,
+            duration_ms=duration_ms,
             success=True
         )
+        await cache.put(cache_key, b"".join(chunks))
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"[{datetime.datetime.now()}] ERROR: TTS Stream - Error during Google Gemini TTS: {e}")
+        log.exception("TTS Stream - Error during Google Gemini TTS: %s", e, voice=voice_name)
+        get_client_registry().record_error(GEMINI_CLIENT_NAME, e)
         
         # Track failed streaming call (Helicone tracking happens automatically via Gateway)
-        print(f"[{datetime.datetime.now()}] ❌ Helicone: TTS streaming call failed via Gateway - error: {str(e)}")
         track_tts_call_to_posthog(
-            text_length=len(text_to_speak),
-            voice_name='Puck',
+            user_id=user_id,
+            session_id=session_id,
+            text_length=len(final_text_to_speak),
+            voice_name=voice_name,
+            duration_ms=int((time.time() - start_time) * 1000),
             success=False,
             error=str(e)
         )
         
         raise HTTPException(status_code=500, detail=f"TTS Stream: Error during text-to-speech conversion: {str(e)}")
+    finally:
+        # Consumer stopped early (client disconnect): let the vendor thread drop the rest of the stream
+        stop.set()
+        if pump_task is not None and not pump_task.done():
+            pump_task.add_done_callback(lambda task: task.cancelled() or task.exception())
 
 
-async def text_to_speech_full(
+def pcm_to_wav(raw_pcm_data: bytes) -> bytes:
+    """Package raw Gemini TTS PCM data into an in-memory WAV file."""
+    wav_buffer = io.BytesIO()
+    with wave.open(wav_buffer, "wb") as wf:
+        wf.setnchannels(TTS_CHANNELS)       # Mono
+        wf.setsampwidth(TTS_SAMPLE_WIDTH)   # 16-bit PCM (2 bytes)
+        wf.setframerate(TTS_SAMPLE_RATE)    # 24kHz sample rate
+        wf.writeframes(raw_pcm_data)
+    return wav_buffer.getvalue()
+
+
+def wav_stream_header() -> bytes:
+    """
+    WAV header for audio whose total length is unknown up front.
+    RIFF/data sizes are set to 0xFFFFFFFF, which streaming decoders treat as "read until EOF".
+    """
+    byte_rate = TTS_SAMPLE_RATE * TTS_CHANNELS * TTS_SAMPLE_WIDTH
+    block_align = TTS_CHANNELS * TTS_SAMPLE_WIDTH
+    return (
+        b"RIFF" + struct.pack("<I", 0xFFFFFFFF) + b"WAVE"
+        + b"fmt " + struct.pack("<IHHIIHH", 16, 1, TTS_CHANNELS, TTS_SAMPLE_RATE, byte_rate, block_align, TTS_SAMPLE_WIDTH * 8)
+        + b"data" + struct.pack("<I", 0xFFFFFFFF)
+    )
+
+
+async def text_to_speech_pcm(
     text_to_speak: str, 
     voice_name: str = "Puck", 
     response_tone: Optional[str] = None,
     user_id: Optional[str] = None,
-    session_id: Optional[str] = None
+    session_id: Optional[str] = None,
+    persist: bool = False
 ) -> bytes:
     """
-    Converts text to speech using Google Gemini TTS, packages it as WAV, 
-    and returns the full audio data as bytes.
-    text_to_speak: The text to be converted to speech.
-    voice_name: The prebuilt voice name to use for TTS.
-    response_tone: Optional tone for the speech, will be prepended if provided.
-    Returns bytes of a complete WAV audio file.
+    Converts text to speech using Google Gemini TTS and returns raw PCM
+    (24kHz, mono, 16-bit little-endian) without a WAV container.
+    Used directly by the pipelined NPC endpoint, which streams sentences back to back.
+    Results are served from the audio cache; concurrent identical requests share one synthesis.
+    persist=True writes the clip to the disk tier immediately (prefetched lines that should survive restarts).
     """
+    return await get_audio_cache().get_or_create(
+        tts_pcm_cache_key(text_to_speak, voice_name, response_tone),
+        lambda: _synthesize_pcm(text_to_speak, voice_name, response_tone, user_id, session_id),
+        persist=persist
+    )
+
+
+def tts_pcm_cache_key(text_to_speak: str, voice_name: str, response_tone: Optional[str] = None) -> str:
+    """Audio cache key of the Gemini PCM for a line (shared by the full, streamed and prefetched paths)."""
+    return audio_cache_key("gemini", text_to_speak, voice=voice_name, tone=response_tone, audio_format="pcm")
+
+
+async def _synthesize_pcm(
+    text_to_speak: str,
+    voice_name: str,
+    response_tone: Optional[str],
+    user_id: Optional[str],
+    session_id: Optional[str]
+) -> bytes:
+    """Uncached Gemini TTS call behind text_to_speech_pcm."""
     if not GEMINI_API_KEY:
-        print(f"[{datetime.datetime.now()}] ERROR: TTS Full - Google GenAI client not configured. API key missing.")
+        log.error("TTS Full - Google GenAI client not configured. API key missing.")
         raise HTTPException(status_code=500, detail="TTS Full: Google GenAI client not configured. Check API key.")
 
     final_text_to_speak = text_to_speak
@@ -238,7 +368,6 @@ async def text_to_speech_full(
     try:
         # Initialize Helicone-enabled Gemini client
         client = create_helicone_gemini_client()
-        print(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Helicone-enabled Gemini client initialized for full synthesis")
 
         # Generate additional Helicone headers for context
         helicone_headers = add_helicone_headers_for_tts(
@@ -251,12 +380,16 @@ async def text_to_speech_full(
         # Track timing for analytics
         start_time = time.time()
         estimated_cost = estimate_gemini_tts_cost(len(final_text_to_speak))
-        print(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Starting synthesis. Text length: {len(final_text_to_speak)}, Estimated cost: ${estimated_cost:.6f}")
-        print(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Helicone headers: {helicone_headers}")
+        # Header names only: values carry user and session ids
+        log.debug("TTS Full - Starting synthesis", text_length=len(final_text_to_speak), voice=voice_name,
+                  estimated_cost_usd=round(estimated_cost, 6), helicone_headers=sorted(helicone_headers))
         
-        # Make the TTS call through Helicone Gateway (automatic tracking)
-        response = client.models.generate_content(
-            model="gemini-2.5-flash-preview-tts", 
+        # Make the TTS call through Helicone Gateway (automatic tracking).
+        # The SDK call is blocking, so run it on the bounded Gemini pool to keep concurrent syntheses overlapping.
+        response = await run_in_vendor_executor(
+            GEMINI_CLIENT_NAME,
+            client.models.generate_content,
+            model=TTS_MODEL, 
             contents=final_text_to_speak,
             config=genai_types.GenerateContentConfig(
                 response_modalities=["AUDIO"], # This should yield raw PCM data based on user's findings
@@ -276,19 +409,6 @@ async def text_to_speech_full(
 
         if response.candidates and response.candidates[0].content and response.candidates[0].content.parts:
             raw_pcm_data = response.candidates[0].content.parts[0].inline_data.data
-            # print(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Successfully generated {len(raw_pcm_data)} bytes of raw PCM data.") # Commented out
-
-            # Now package this raw PCM data into a WAV file in memory
-            wav_buffer = io.BytesIO()
-            with wave.open(wav_buffer, "wb") as wf:
-                wf.setnchannels(1)       # Mono
-                wf.setsampwidth(2)       # 16-bit PCM (2 bytes)
-                wf.setframerate(24000)   # 24kHz sample rate
-                wf.writeframes(raw_pcm_data)
-            
-            wav_bytes = wav_buffer.getvalue()
-            # print(f"[{datetime.datetime.now()}] DEBUG: TTS Full - Packaged PCM into WAV format, total {len(wav_bytes)} bytes.") # Commented out
-            
             # Track successful TTS call to PostHog (Helicone tracking happens automatically via Gateway)
             track_tts_call_to_posthog(
                 user_id=user_id,
@@ -299,22 +419,22 @@ async def text_to_speech_full(
                 success=True
             )
             
-            print(f"[{datetime.datetime.now()}] ✅ TTS Full - Synthesis completed successfully. Duration: {duration_ms}ms, Audio size: {len(wav_bytes)} bytes")
-            print(f"[{datetime.datetime.now()}] ✅ Helicone: TTS call completed via Gateway - user: {user_id}, cost: ${estimated_cost:.6f}, voice: {voice_name}")
+            log.info("✅ TTS Full - Synthesis completed", duration_ms=duration_ms, pcm_bytes=len(raw_pcm_data),
+                     voice=voice_name, estimated_cost_usd=round(estimated_cost, 6))
             
-            return wav_bytes
+            return raw_pcm_data
         else:
-            print(f"[{datetime.datetime.now()}] ERROR: TTS Full - No audio data received from Gemini")
+            log.error("TTS Full - No audio data received from Gemini", voice=voice_name)
             raise HTTPException(status_code=500, detail="TTS Full: Failed to generate audio, no data in response.")
 
+    except HTTPException:
+        raise
     except Exception as e:
-        print(f"[{datetime.datetime.now()}] ERROR: TTS Full - Error during Google Gemini TTS (full) or WAV packaging: {e}")
-        import traceback
-        traceback.print_exc()
+        log.exception("TTS Full - Error during Google Gemini TTS: %s", e, voice=voice_name)
+        get_client_registry().record_error(GEMINI_CLIENT_NAME, e)
         
         # Track failed TTS call to PostHog (Helicone tracking happens automatically via Gateway)
         duration_ms = int((time.time() - start_time) * 1000) if 'start_time' in locals() else 0
-        estimated_cost = estimate_gemini_tts_cost(len(final_text_to_speak)) if 'final_text_to_speak' in locals() else 0.0
         
         track_tts_call_to_posthog(
             user_id=user_id,
@@ -326,6 +446,74 @@ async def text_to_speech_full(
             error=str(e)
         )
         
-        print(f"[{datetime.datetime.now()}] ❌ Helicone: TTS call failed via Gateway - user: {user_id}, error: {str(e)}, cost: ${estimated_cost:.6f}")
-        
-        raise HTTPException(status_code=500, detail=f"TTS Full: Error during text-to-speech conversion or WAV packaging: {str(e)}") 
\ No newline at end of file
+
+        raise HTTPException(status_code=500, detail=f"TTS Full: Error during text-to-speech conversion: {str(e)}")
+
+
+async def text_to_speech_full(
+    text_to_speak: str, 
+    voice_name: str = "Puck", 
+    response_tone: Optional[str] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> bytes:
+    """
+    Converts text to speech using Google Gemini TTS, packages it as WAV, 
+    and returns the full audio data as bytes.
+    text_to_speak: The text to be converted to speech.
+    voice_name: The prebuilt voice name to use for TTS.
+    response_tone: Optional tone for the speech, will be prepended if provided.
+    Returns bytes of a complete WAV audio file.
+    """
+    raw_pcm_data = await text_to_speech_pcm(
+        text_to_speak,
+        voice_name=voice_name,
+        response_tone=response_tone,
+        user_id=user_id,
+        session_id=session_id
+    )
+    try:
+        return pcm_to_wav(raw_pcm_data)
+    except Exception as e:
+        log.error("TTS Full - Error during WAV packaging: %s", e)
+        raise HTTPException(status_code=500, detail=f"TTS Full: Error during WAV packaging: {str(e)}")
+
+
+async def text_to_speech_encoded(
+    text_to_speak: str,
+    audio_format: str = "wav",
+    voice_name: str = "Puck",
+    response_tone: Optional[str] = None,
+    user_id: Optional[str] = None,
+    session_id: Optional[str] = None
+) -> tuple:
+    """
+    Converts text to speech and returns (audio bytes, format) in the negotiated format
+    ("wav", "mp3" or "opus"; see audio_encoding.negotiate_audio_format).
+    Compressed variants are encoded on the audio_encoder pool and cached next to the PCM, so a repeated
+    phrase is neither re-synthesized nor re-encoded. If encoding fails the WAV is returned instead.
+    """
+    raw_pcm_data = await text_to_speech_pcm(
+        text_to_speak,
+        voice_name=voice_name,
+        response_tone=response_tone,
+        user_id=user_id,
+        session_id=session_id
+    )
+    if audio_format in COMPRESSED_AUDIO_FORMATS:
+        cache_key = audio_cache_key("gemini", text_to_speak, voice=voice_name, tone=response_tone, audio_format=audio_format)
+        try:
+            encoded = await get_audio_cache().get_or_create(
+                cache_key,
+                lambda: run_in_vendor_executor(
+                    "audio_encoder", encode_pcm, raw_pcm_data, audio_format, TTS_SAMPLE_RATE, TTS_CHANNELS, TTS_SAMPLE_WIDTH
+                )
+            )
+            return encoded, audio_format
+        except Exception as e:
+            log.warning("TTS - %s encoding failed, sending WAV instead: %s", audio_format, e)
+    try:
+        return pcm_to_wav(raw_pcm_data), "wav"
+    except Exception as e:
+        log.error("TTS Full - Error during WAV packaging: %s", e)
+        raise HTTPException(status_code=500, detail=f"TTS Full: Error during WAV packaging: {str(e)}")
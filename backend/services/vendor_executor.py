@@ -0,0 +1,151 @@
+"""
+Bounded per-vendor thread pools for blocking SDK calls (OpenAI, Gemini, Google Cloud, ElevenLabs).
+Keeps synchronous network calls off the event loop and stops one slow vendor from starving the others.
+"""
+
+import os
+import time
+import asyncio
+import logging
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+# Worker counts per vendor; unknown vendors get the default
+VENDOR_EXECUTOR_DEFAULT_WORKERS = int(os.getenv("VENDOR_EXECUTOR_DEFAULT_WORKERS", "8"))
+VENDOR_EXECUTOR_WORKERS = {
+    "openai": int(os.getenv("VENDOR_EXECUTOR_WORKERS_OPENAI", "16")),
+    "gemini": int(os.getenv("VENDOR_EXECUTOR_WORKERS_GEMINI", "16")),
+    "google_translate": int(os.getenv("VENDOR_EXECUTOR_WORKERS_GOOGLE_TRANSLATE", "16")),
+    "google_tts": int(os.getenv("VENDOR_EXECUTOR_WORKERS_GOOGLE_TTS", "8")),
+    "google_speech": int(os.getenv("VENDOR_EXECUTOR_WORKERS_GOOGLE_SPEECH", "8")),
+    "elevenlabs": int(os.getenv("VENDOR_EXECUTOR_WORKERS_ELEVENLABS", "8")),
+    "deepl": int(os.getenv("VENDOR_EXECUTOR_WORKERS_DEEPL", "8")),
+    # Local ffmpeg subprocesses for MP3/Opus encoding; bounded by CPU rather than a vendor quota
+    "audio_encoder": int(os.getenv("VENDOR_EXECUTOR_WORKERS_AUDIO_ENCODER", str(min(4, os.cpu_count() or 1)))),
+}
+# Calls queued beyond workers + this limit are rejected with 503 instead of piling up
+VENDOR_EXECUTOR_MAX_QUEUED = int(os.getenv("VENDOR_EXECUTOR_MAX_QUEUED", "64"))
+
+
+class VendorExecutor:
+    """A bounded thread pool for one vendor, with queue and latency counters"""
+
+    def __init__(self, vendor: str, max_workers: int, max_queued: int = VENDOR_EXECUTOR_MAX_QUEUED):
+        self.vendor = vendor
+        self.max_workers = max_workers
+        self.max_queued = max_queued
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"vendor-{vendor}")
+        self._lock = threading.Lock()
+        self.in_flight = 0      # Submitted and not yet finished (running + queued)
+        self.running = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.total_queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.total_run_time = 0.0
+
+    def _wrap(self, fn: Callable, submitted_at: float) -> Callable:
+        def run():
+            started_at = time.time()
+            wait = started_at - submitted_at
+            with self._lock:
+                self.running += 1
+                self.total_queue_wait += wait
+                self.max_queue_wait = max(self.max_queue_wait, wait)
+            ok = False
+            try:
+                result = fn()
+                ok = True
+                return result
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.total_run_time += time.time() - started_at
+                    if ok:
+                        self.completed += 1
+                    else:
+                        self.failed += 1
+        return run
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run fn(*args, **kwargs) on this vendor's pool and await the result."""
+        with self._lock:
+            if self.in_flight >= self.max_workers + self.max_queued:
+                self.rejected += 1
+                logging.warning(f"⚠️ Vendor executor '{self.vendor}' saturated ({self.in_flight} in flight) - rejecting call")
+                raise HTTPException(status_code=503, detail=f"{self.vendor} is busy, please retry shortly.")
+            self.in_flight += 1
+        call = self._wrap(functools.partial(fn, *args, **kwargs), time.time())
+        try:
+            future = self._executor.submit(call)
+        except RuntimeError:
+            # Executor already shut down; undo the in-flight count taken above
+            self._release_slot()
+            raise
+        # Released when the call finishes or is cancelled while still queued (caller timed out or went away)
+        future.add_done_callback(self._release_slot)
+        return await asyncio.wrap_future(future)
+
+    def _release_slot(self, future: Optional[Future] = None):
+        with self._lock:
+            self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            finished = self.completed + self.failed
+            return {
+                "max_workers": self.max_workers,
+                "running": self.running,
+                "queued": max(0, self.in_flight - self.running),
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+                "avg_queue_wait_ms": round(self.total_queue_wait / finished * 1000, 1) if finished else 0.0,
+                "max_queue_wait_ms": round(self.max_queue_wait * 1000, 1),
+                "avg_run_time_ms": round(self.total_run_time / finished * 1000, 1) if finished else 0.0,
+            }
+
+    def shutdown(self, wait: bool = False):
+        self._executor.shutdown(wait=wait)
+
+
+_executors: Dict[str, VendorExecutor] = {}
+_executors_lock = threading.Lock()
+
+def get_vendor_executor(vendor: str) -> VendorExecutor:
+    """Get (or lazily create) the executor for a vendor."""
+    executor = _executors.get(vendor)
+    if executor is None:
+        with _executors_lock:
+            executor = _executors.get(vendor)
+            if executor is None:
+                max_workers = VENDOR_EXECUTOR_WORKERS.get(vendor, VENDOR_EXECUTOR_DEFAULT_WORKERS)
+                executor = VendorExecutor(vendor, max_workers)
+                _executors[vendor] = executor
+                logging.info(f"✅ Vendor executor '{vendor}' created with {max_workers} workers")
+    return executor
+
+async def run_in_vendor_executor(vendor: str, fn: Callable, *args, **kwargs) -> Any:
+    """
+    Await a blocking SDK call on the vendor's bounded thread pool.
+
+    Example:
+        response = await run_in_vendor_executor("openai", openai_client.responses.parse, model=..., input=...)
+    """
+    return await get_vendor_executor(vendor).run(fn, *args, **kwargs)
+
+def get_vendor_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Per-vendor pool statistics for monitoring endpoints."""
+    return {vendor: executor.get_stats() for vendor, executor in list(_executors.items())}
+
+def shutdown_vendor_executors(wait: bool = False):
+    """Shut down all vendor pools (application shutdown)."""
+    with _executors_lock:
+        for executor in _executors.values():
+            executor.shutdown(wait=wait)
+        _executors.clear()
@@ -0,0 +1,166 @@
+"""
+Process-wide index of the curated vocabulary files (assets/data/*vocabulary*.json).
+Built once, reloaded when a file changes on disk, with O(1) Thai -> English lookup and a prefix index for compounds.
+"""
+
+import os
+import json
+import time
+import bisect
+import logging
+import threading
+from typing import Dict, List, Optional, Tuple
+
+VOCABULARY_DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "data")
+# How often lookups re-check file mtimes; 0 checks on every lookup
+VOCABULARY_INDEX_CHECK_INTERVAL = float(os.getenv("VOCABULARY_INDEX_CHECK_INTERVAL", "2.0"))
+
+
+class VocabularyIndex:
+    """
+    Thai -> English translations from every vocabulary file, including word_mapping constituents.
+    The index is swapped atomically on reload, so readers never see a half-built dict.
+    """
+
+    def __init__(self, data_dir: str = VOCABULARY_DATA_DIR, check_interval: float = VOCABULARY_INDEX_CHECK_INTERVAL):
+        self.data_dir = data_dir
+        self.check_interval = check_interval
+        self._translations: Dict[str, str] = {}
+        self._sorted_keys: List[str] = []
+        self._max_key_length = 0
+        self._mtimes: Dict[str, float] = {}
+        self._last_check = 0.0
+        self._reload_lock = threading.Lock()
+        self.reloads = 0
+        self.lookups = 0
+        self.hits = 0
+
+    def _scan_mtimes(self) -> Dict[str, float]:
+        mtimes = {}
+        if os.path.isdir(self.data_dir):
+            for filename in os.listdir(self.data_dir):
+                if filename.endswith('.json') and 'vocabulary' in filename:
+                    try:
+                        mtimes[filename] = os.stat(os.path.join(self.data_dir, filename)).st_mtime
+                    except OSError:
+                        pass
+        return mtimes
+
+    def _build(self, mtimes: Dict[str, float]):
+        translations = {}
+        for filename in sorted(mtimes):
+            try:
+                with open(os.path.join(self.data_dir, filename), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception as e:
+                logging.warning(f"Error loading vocabulary from {filename}: {e}")
+                continue
+            for item in data.get('vocabulary', []):
+                if 'thai' in item and 'english' in item:
+                    translations[item['thai']] = item['english']
+                    # Also add word_mapping constituents
+                    for mapping in item.get('word_mapping', []):
+                        if 'thai' in mapping and 'translation' in mapping:
+                            translations[mapping['thai']] = mapping['translation']
+
+        sorted_keys = sorted(translations)
+        with self._reload_lock:
+            self._translations = translations
+            self._sorted_keys = sorted_keys
+            self._max_key_length = max((len(key) for key in sorted_keys), default=0)
+            self._mtimes = mtimes
+            self.reloads += 1
+        logging.info(f"✅ Vocabulary index: {len(translations)} entries from {len(mtimes)} files")
+
+    def refresh(self, force: bool = False) -> bool:
+        """Rebuild the index if any vocabulary file was added, removed or modified. Returns True if rebuilt."""
+        now = time.time()
+        if not force and self.reloads and now - self._last_check < self.check_interval:
+            return False
+        self._last_check = now
+        mtimes = self._scan_mtimes()
+        if not force and mtimes == self._mtimes:
+            return False
+        self._build(mtimes)
+        return True
+
+    def lookup(self, word: str) -> Optional[str]:
+        """Curated translation for a Thai word or constituent, or None."""
+        self.refresh()
+        self.lookups += 1
+        translation = self._translations.get(word)
+        if translation is not None:
+            self.hits += 1
+        return translation
+
+    def words_with_prefix(self, prefix: str, limit: int = 50) -> List[str]:
+        """Vocabulary entries starting with prefix, in sorted order."""
+        self.refresh()
+        keys = self._sorted_keys
+        start = bisect.bisect_left(keys, prefix)
+        results = []
+        for key in keys[start:]:
+            if not key.startswith(prefix) or len(results) >= limit:
+                break
+            results.append(key)
+        return results
+
+    def longest_prefix_match(self, text: str, start: int = 0) -> Optional[str]:
+        """Longest vocabulary entry that text[start:] begins with."""
+        self.refresh()
+        translations = self._translations
+        for end in range(min(len(text), start + self._max_key_length), start, -1):
+            if text[start:end] in translations:
+                return text[start:end]
+        return None
+
+    def split_compound(self, word: str) -> Optional[List[str]]:
+        """
+        Split a word into known vocabulary entries (fewest pieces, preferring longer leading pieces).
+        Returns None unless the whole word is covered by at least two entries.
+        """
+        self.refresh()
+        translations = self._translations
+        n = len(word)
+        # best[i] = (piece count, pieces) for word[i:]
+        best: List[Optional[Tuple[int, List[str]]]] = [None] * (n + 1)
+        best[n] = (0, [])
+        for i in range(n - 1, -1, -1):
+            for end in range(min(n, i + self._max_key_length), i, -1):
+                rest = best[end]
+                if rest is not None and word[i:end] in translations:
+                    if best[i] is None or rest[0] + 1 < best[i][0]:
+                        best[i] = (rest[0] + 1, [word[i:end]] + rest[1])
+        if best[0] is None or best[0][0] < 2:
+            return None
+        return best[0][1]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._translations),
+            "files": len(self._mtimes),
+            "reloads": self.reloads,
+            "lookups": self.lookups,
+            "hits": self.hits,
+        }
+
+
+# Global instance getter
+_vocabulary_index = None
+_vocabulary_index_lock = threading.Lock()
+
+def get_vocabulary_index() -> VocabularyIndex:
+    """
+    Get the global vocabulary index, building it on first use.
+
+    Returns:
+        VocabularyIndex: The shared instance
+    """
+    global _vocabulary_index
+    if _vocabulary_index is None:
+        with _vocabulary_index_lock:
+            if _vocabulary_index is None:
+                index = VocabularyIndex()
+                index.refresh(force=True)
+                _vocabulary_index = index
+    return _vocabulary_index
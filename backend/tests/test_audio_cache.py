@@ -0,0 +1,67 @@
+"""
+Single-flight behaviour of AudioCache.get_or_create.
+"""
+
+import asyncio
+
+import pytest
+
+from services import audio_cache
+
+
+@pytest.fixture
+def cache(monkeypatch, tmp_path):
+    monkeypatch.setattr(audio_cache, "AUDIO_CACHE_ENABLED", True)
+    monkeypatch.setattr(audio_cache, "AUDIO_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(audio_cache.AudioCache, "_instance", None)
+    return audio_cache.AudioCache()
+
+
+def test_cancelled_producer_caller_does_not_cancel_waiters(cache):
+    async def scenario():
+        release = asyncio.Event()
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await release.wait()
+            return b"audio"
+
+        first = asyncio.ensure_future(cache.get_or_create("key", producer))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(cache.get_or_create("key", producer))
+        await asyncio.sleep(0)
+
+        first.cancel()
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await second == b"audio"
+        assert first.cancelled()
+        assert calls == 1
+        assert cache.stats["single_flight_joins"] == 1
+        assert await cache.get("key") == b"audio"
+        assert cache.get_stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
+
+
+def test_producer_failure_reaches_every_waiter_and_is_not_cached(cache):
+    async def scenario():
+        release = asyncio.Event()
+
+        async def producer():
+            await release.wait()
+            raise RuntimeError("tts down")
+
+        waiters = [asyncio.ensure_future(cache.get_or_create("key", producer)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+
+        results = await asyncio.gather(*waiters, return_exceptions=True)
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert await cache.get("key") is None
+        assert cache.get_stats()["in_flight"] == 0
+
+    asyncio.run(scenario())
@@ -0,0 +1,40 @@
+"""
+Async access to TranslationMemory: LRU hits inline, SQLite tier on worker threads.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from services import translation_memory
+
+
+@pytest.fixture
+def memory(monkeypatch, tmp_path):
+    monkeypatch.setattr(translation_memory, "TRANSLATION_MEMORY_ENABLED", True)
+    monkeypatch.setattr(translation_memory, "TRANSLATION_MEMORY_DB_PATH", os.path.join(str(tmp_path), "tm.sqlite3"))
+    monkeypatch.setattr(translation_memory.TranslationMemory, "_instance", None)
+    return translation_memory.TranslationMemory()
+
+
+def test_async_put_and_get_cover_both_tiers(memory):
+    async def scenario():
+        await memory.put_async("hello", "en-US", "th", "google", "สวัสดี")
+        await memory.put_many_async([("cat", "en", "th", "google", "แมว"), ("dog", "en", "th", "google", "หมา")])
+
+        assert await memory.get_async("hello", "en", "th", "google") == "สวัสดี"
+        assert memory.stats["memory_hits"] == 1
+
+        # Drop the LRU tier so the next lookups come from SQLite
+        memory._entries.clear()
+        found = await memory.get_many_async(["cat", "dog", "cat", "bird", " "], "en", "th", "google")
+        assert found == {"cat": "แมว", "dog": "หมา"}
+        assert memory.stats["disk_hits"] == 2
+        assert memory.stats["misses"] == 1
+
+        # Disk hits were promoted into the LRU tier
+        assert memory.get("cat", "en", "th", "google") == "แมว"
+        assert memory.stats["memory_hits"] == 2
+
+    asyncio.run(scenario())
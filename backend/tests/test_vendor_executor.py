@@ -0,0 +1,46 @@
+"""
+In-flight accounting of VendorExecutor.run.
+"""
+
+import asyncio
+import threading
+
+from services.vendor_executor import VendorExecutor
+
+
+def test_cancelled_queued_call_releases_its_slot():
+    async def scenario():
+        executor = VendorExecutor("test", max_workers=1, max_queued=4)
+        release = threading.Event()
+        ran = []
+
+        running = asyncio.ensure_future(executor.run(release.wait, 5))
+        queued = [asyncio.ensure_future(executor.run(ran.append, index)) for index in range(2)]
+        await asyncio.sleep(0.05)
+        assert executor.in_flight == 3
+
+        for task in queued:
+            task.cancel()
+        await asyncio.gather(*queued, return_exceptions=True)
+        release.set()
+        assert await running is True
+
+        assert ran == []
+        assert executor.in_flight == 0
+        assert executor.get_stats()["queued"] == 0
+        executor.shutdown(wait=True)
+
+    asyncio.run(scenario())
+
+
+def test_call_after_shutdown_releases_its_slot():
+    async def scenario():
+        executor = VendorExecutor("test", max_workers=1, max_queued=0)
+        executor.shutdown(wait=True)
+        try:
+            await executor.run(lambda: None)
+        except RuntimeError:
+            pass
+        assert executor.in_flight == 0
+
+    asyncio.run(scenario())